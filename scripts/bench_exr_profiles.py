@@ -0,0 +1,120 @@
+"""
+Write/read/disk benchmark for the intermediate EXR storage profiles.
+
+Renders one frame of the open scene (or loads --input), then saves it with
+Blender's EXR writer once per profile (bit depth x channels x codec) and
+reads it back the way the encode stages do (utils.image_io.read_image).
+Reports mean write and read time and the file size. Run inside Blender:
+
+    blender -b scene.blend --python scripts/bench_exr_profiles.py -- \
+        --input output/vr360/sequence/vr360_0001.exr --repeat 5
+
+Reads right after the writes come from the OS page cache; pass
+--drop-caches (Linux, root) to measure cold reads from disk instead.
+Results are written to <output>/exr_profiles.json and printed as a table.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import bpy
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from pe_camera_rigs.utils.image_io import read_image  # noqa: E402
+from pe_camera_rigs.utils.render import apply_exr_storage  # noqa: E402
+
+
+def parse_args():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--input", help="EXR frame to re-save (default: render the current frame)")
+    parser.add_argument("--depth", nargs="+", default=["16", "32"])
+    parser.add_argument("--color-mode", nargs="+", default=["RGB", "RGBA"])
+    parser.add_argument("--codec", nargs="+", default=["DWAA", "ZIP", "PIZ", "NONE"])
+    parser.add_argument("--repeat", type=int, default=5, help="Writes and reads per profile")
+    parser.add_argument("--drop-caches", action="store_true", help="Drop the page cache before each read")
+    parser.add_argument("--output", default="bench_exr_profiles")
+    return parser.parse_args(argv)
+
+
+def source_image(scene, args):
+    """Returns the image datablock every profile saves."""
+    if args.input:
+        return bpy.data.images.load(str(Path(args.input).resolve()), check_existing=False)
+
+    print(f"Rendering frame {scene.frame_current} at {scene.cycles.samples} samples...")
+    bpy.ops.render.render(scene=scene.name)
+    return bpy.data.images['Render Result']
+
+
+def drop_caches():
+    os.sync()
+    subprocess.run(["sh", "-c", "echo 3 > /proc/sys/vm/drop_caches"], check=True)
+
+
+def main():
+    args = parse_args()
+    scene = bpy.context.scene
+    output = Path(args.output).resolve()
+    output.mkdir(parents=True, exist_ok=True)
+
+    scene.render.image_settings.file_format = 'OPEN_EXR'
+    image = source_image(scene, args)
+
+    results = []
+    for depth, color_mode, codec in itertools.product(args.depth, args.color_mode, args.codec):
+        apply_exr_storage(scene, depth, color_mode, codec)
+        name = f"{depth}_{color_mode}_{codec}".lower()
+        path = output / f"{name}.exr"
+
+        write_seconds = []
+        read_seconds = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            image.save_render(str(path), scene=scene)
+            write_seconds.append(time.perf_counter() - start)
+
+            if args.drop_caches:
+                drop_caches()
+            start = time.perf_counter()
+            pixels = read_image(path, channels=3)
+            read_seconds.append(time.perf_counter() - start)
+
+        size = path.stat().st_size
+        megapixels = pixels.shape[0] * pixels.shape[1] / 1e6
+        results.append({
+            'depth': depth,
+            'color_mode': color_mode,
+            'codec': codec,
+            'write_seconds': round(float(np.mean(write_seconds)), 4),
+            'read_seconds': round(float(np.mean(read_seconds)), 4),
+            'read_megapixels_per_second': round(megapixels / float(np.mean(read_seconds)), 1),
+            'bytes': size,
+        })
+        print(f"{depth:>3} {color_mode:<4} {codec:<4} write={np.mean(write_seconds):7.3f}s "
+              f"read={np.mean(read_seconds):7.3f}s size={size / 2 ** 20:8.1f} MB")
+
+    report = {
+        'blend_file': bpy.data.filepath,
+        'input': args.input,
+        # Render Result reports no size, so take the one read back
+        'resolution': [pixels.shape[1], pixels.shape[0]],
+        'repeat': args.repeat,
+        'cold_reads': args.drop_caches,
+        'results': results,
+    }
+    with open(output / "exr_profiles.json", 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {output / 'exr_profiles.json'}")
+
+
+if __name__ == "__main__":
+    main()
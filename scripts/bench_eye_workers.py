@@ -0,0 +1,219 @@
+"""
+VR180 eye render throughput for different worker and thread splits.
+
+Renders the same frames of a saved VR180 scene once per split and pinning
+mode, the way Step 2 does with Render Workers above 1: the frame range is
+cut into one chunk per eye pair and every chunk is rendered by a left and a
+right eye `blender -b` process running the CLI's render step (cli.py).
+A split is WORKERSxTHREADS; THREADS 0 gives every worker as many fixed
+threads as its CPU set (utils/affinity.py) holds, so '2x0 4x0' compares
+worker counts and '4x0 4x16' an even split against oversubscription.
+'1x0' renders both eyes in one process with Blender's automatic threads,
+the baseline. Runs with plain Python:
+
+    python scripts/bench_eye_workers.py scene.blend --blender /opt/blender/blender \\
+        --splits 1x0 2x0 4x0 8x0 --frames 1-16
+
+Throughput counts eye renders per minute from the CLI progress events,
+from each process's render step start to its last frame, so Blender
+startup and file loading are left out; the wall time includes them.
+--modes pinned unpinned also runs every split without CPU sets (only the
+thread counts stay fixed). Pass --draft to render with the scene's Draft
+Mode settings. Results are written to <output> and printed as a table.
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_SRC = Path(__file__).resolve().parents[1] / "src"
+CLI_SCRIPT = REPO_SRC / "pe_camera_rigs" / "cli.py"
+
+# Stdlib only; loaded from its file so the addon package (and bpy) stays out
+_spec = importlib.util.spec_from_file_location(
+    "pe_affinity", REPO_SRC / "pe_camera_rigs" / "utils" / "affinity.py",
+)
+affinity = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(affinity)
+
+EYES = ('left', 'right')
+
+
+def parse_split(value):
+    """Parses 'WORKERSxTHREADS' into a (workers, threads) tuple."""
+    try:
+        workers, _, threads = value.lower().partition("x")
+        workers, threads = int(workers), int(threads or 0)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WORKERSxTHREADS, got '{value}'")
+    if workers < 1 or threads < 0 or (workers > 1 and workers % 2):
+        raise argparse.ArgumentTypeError(f"workers must be 1 or even, threads 0 or more: '{value}'")
+    return workers, threads
+
+
+def parse_frames(value):
+    start, _, end = value.partition("-")
+    return int(start), int(end or start)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("blend", help="Saved .blend with a VR180 rig (Step 1 done)")
+    parser.add_argument("--blender", default="blender", help="Blender executable")
+    parser.add_argument("--scene", help="Scene holding the rig, defaults to the file's active scene")
+    parser.add_argument("--splits", nargs="+", type=parse_split, default=None,
+                        help="WORKERSxTHREADS splits, default: 1x0 and the calibration candidates")
+    parser.add_argument("--modes", nargs="+", default=["pinned"], choices=["pinned", "unpinned"])
+    parser.add_argument("--frames", type=parse_frames, default=(1, 8), help="Frame range START-END")
+    parser.add_argument("--draft", action="store_true", help="Render with the scene's Draft Mode settings")
+    parser.add_argument("--output", default="bench_eye_workers.json")
+    return parser.parse_args()
+
+
+def frame_chunks(start, end, count):
+    """Same split as utils/workers.frame_chunks()."""
+    total = end - start + 1
+    count = max(1, min(count, total))
+    size, extra = divmod(total, count)
+    chunks = []
+    for index in range(count):
+        chunk_end = start + size + (1 if index < extra else 0) - 1
+        chunks.append((start, chunk_end))
+        start = chunk_end + 1
+    return chunks
+
+
+def worker_command(args, frames, threads, output, progress, eye=None):
+    command = [
+        args.blender, "--background", "--factory-startup", str(Path(args.blend).resolve()),
+        "--python-exit-code", "1",
+        "--python", str(CLI_SCRIPT),
+        "--",
+        "vr180", "render",
+        "--frames", f"{frames[0]}-{frames[1]}",
+        "--threads", str(threads),
+        "--output", str(output),
+        "--progress", str(progress),
+        "--worker",
+        "--draft" if args.draft else "--final",
+    ]
+    if args.scene:
+        command += ["--scene", args.scene]
+    if eye:
+        command += ["--eye", eye]
+    return command
+
+
+def eye_renders_per_second(progress_path):
+    """Returns (sum over processes of renders / (last frame - render step start), renders)."""
+    starts, frames = {}, {}
+    with open(progress_path, encoding='utf-8') as f:
+        for line in f:
+            record = json.loads(line)
+            if record['event'] == 'step_start':
+                starts[record['pid']] = record['time']
+            elif record['event'] == 'frame':
+                frames.setdefault(record['pid'], []).append(record['time'])
+    return sum(
+        len(times) / (times[-1] - starts[pid])
+        for pid, times in frames.items() if pid in starts and times[-1] > starts[pid]
+    ), sum(len(times) for times in frames.values())
+
+
+def run_split(args, workers, threads, pinned, tmp):
+    """Renders the frames with one split, returns its result row."""
+    label = f"{workers}x{threads}-{'pinned' if pinned else 'unpinned'}"
+    output = Path(tmp) / label
+    progress = Path(tmp) / f"{label}.jsonl"
+
+    if workers == 1:
+        # Baseline: one process, both eyes, Blender's own thread count
+        commands = [worker_command(args, args.frames, threads, output, progress)]
+        cpu_sets = [None]
+    else:
+        chunks = frame_chunks(*args.frames, workers // 2)
+        assignments = [(eye, chunk) for chunk in chunks for eye in EYES]
+        partitions = affinity.partition_cpus(len(assignments))
+        commands = [
+            worker_command(args, chunk, threads or len(cpus), output, progress, eye)
+            for (eye, chunk), cpus in zip(assignments, partitions)
+        ]
+        cpu_sets = partitions if pinned else [None] * len(commands)
+
+    # Logs go to files: an undrained pipe would stall the process writing to it
+    logs = [Path(tmp) / f"{label}_{index}.log" for index in range(len(commands))]
+    start = time.perf_counter()
+    processes = []
+    for command, cpus, log in zip(commands, cpu_sets, logs):
+        with open(log, 'w', encoding='utf-8') as f:
+            processes.append(affinity.popen_pinned(command, cpus, stdout=f, stderr=subprocess.STDOUT))
+    for process in processes:
+        process.wait()
+    wall = time.perf_counter() - start
+    for process, log in zip(processes, logs):
+        if process.returncode != 0:
+            tail = log.read_text(encoding='utf-8', errors='replace')[-2000:]
+            raise RuntimeError(f"{label}: Blender exited with {process.returncode}:\n{tail}")
+
+    rate, renders = eye_renders_per_second(progress)
+    return {
+        'split': label,
+        'workers': workers,
+        'threads': [int(command[command.index("--threads") + 1]) for command in commands],
+        'pinned': pinned and workers > 1 and affinity.can_pin(),
+        'eye_renders': renders,
+        'eye_renders_per_minute': round(rate * 60, 2),
+        'wall_seconds': round(wall, 2),
+    }
+
+
+def main():
+    args = parse_args()
+    if not Path(args.blend).exists():
+        sys.exit(f"{args.blend} not found")
+    topology = affinity.cpu_topology()
+    splits = args.splits or [(workers, 0) for workers in affinity.worker_candidates(topology)]
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="pe_bench_eye_workers_") as tmp:
+        for workers, threads in splits:
+            for mode in args.modes:
+                if workers == 1 and mode == "unpinned" and "pinned" in args.modes:
+                    # A single process is never pinned, both modes are the same run
+                    continue
+                result = run_split(args, workers, threads, mode == "pinned", tmp)
+                results.append(result)
+                print(f"{result['split']}: {result['eye_renders_per_minute']:.1f} eye renders/min", flush=True)
+
+    baseline = next((result for result in results if result['workers'] == 1), None)
+    print(f"{'split':<22} {'threads':>12} {'renders':>8} {'per min':>9} {'speedup':>8} {'wall':>8}")
+    for result in results:
+        speedup = (result['eye_renders_per_minute'] / baseline['eye_renders_per_minute']
+                   if baseline and baseline['eye_renders_per_minute'] else None)
+        threads = "auto" if result['threads'] == [0] else "+".join(str(t) for t in sorted(set(result['threads'])))
+        print(f"{result['split']:<22} {threads:>12} {result['eye_renders']:8d} "
+              f"{result['eye_renders_per_minute']:9.1f} "
+              f"{f'{speedup:.2f}x' if speedup else '-':>8} {result['wall_seconds']:7.1f}s")
+
+    report = {
+        'blender': args.blender,
+        'blend': str(Path(args.blend).resolve()),
+        'frames': list(args.frames),
+        'cpus': os.cpu_count(),
+        'numa_nodes': len(topology),
+        'physical_cores': affinity.physical_core_count(topology),
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Noise vs. samples benchmark for HDRI world importance sampling.
+
+Renders the open scene with the HDRI World setup for each importance map
+setting and sample count, and reports render time and RMSE against a
+high-sample reference render. Run inside Blender:
+
+    blender -b reference.blend --python scripts/bench_hdri_sampling.py -- \
+        --hdri /path/to/studio.exr --samples 16 32 64 128 \
+        --sampling NONE AUTOMATIC 256 1024 4096
+
+Numeric --sampling values are manual map resolutions; RESOLUTION uses the
+map size the addon picks from the render width. Results are written to
+<output>/hdri_sampling.json and printed as a table.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import bpy
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from pe_camera_rigs.utils.image_io import read_image  # noqa: E402
+from pe_camera_rigs.utils.scene_setup import setup_hdri_world, hdri_map_resolution  # noqa: E402
+
+
+def parse_args():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--hdri", required=True, help="Environment map (.hdr/.exr)")
+    parser.add_argument("--samples", type=int, nargs="+", default=[16, 32, 64, 128, 256])
+    parser.add_argument("--sampling", nargs="+", default=["NONE", "AUTOMATIC", "RESOLUTION", "512", "2048"])
+    parser.add_argument("--reference-samples", type=int, default=4096)
+    parser.add_argument("--resolution", type=int, nargs=2, metavar=("X", "Y"),
+                        help="Override the render resolution (keeps the benchmark short)")
+    parser.add_argument("--output", default="bench_hdri_sampling")
+    return parser.parse_args(argv)
+
+
+def sampling_kwargs(option):
+    """Maps a --sampling value to setup_hdri_world() arguments."""
+    if option.isdigit():
+        return {'sampling_method': 'MANUAL', 'map_resolution': int(option)}
+    return {'sampling_method': option}
+
+
+def render_to(scene, path, samples):
+    """Renders one still to a 32-bit EXR and returns the wall time."""
+    scene.cycles.samples = samples
+    scene.render.filepath = str(path)
+    start = time.perf_counter()
+    bpy.ops.render.render(write_still=True, scene=scene.name)
+    return time.perf_counter() - start
+
+
+def main():
+    args = parse_args()
+    scene = bpy.context.scene
+    output = Path(args.output).resolve()
+    output.mkdir(parents=True, exist_ok=True)
+
+    render = scene.render
+    render.engine = 'CYCLES'
+    if args.resolution:
+        render.resolution_x, render.resolution_y = args.resolution
+    render.resolution_percentage = 100
+    render.image_settings.file_format = 'OPEN_EXR'
+    render.image_settings.color_depth = '32'
+    render.image_settings.color_mode = 'RGB'
+
+    # Fixed seed, plain path tracing: differences come from the world sampling only
+    scene.cycles.seed = 0
+    scene.cycles.use_animated_seed = False
+    scene.cycles.use_adaptive_sampling = False
+    scene.cycles.use_denoising = False
+
+    setup_hdri_world(scene, args.hdri, sampling_method='MANUAL', map_resolution=4096)
+    reference_path = output / "reference.exr"
+    print(f"Rendering reference at {args.reference_samples} samples...")
+    render_to(scene, reference_path, args.reference_samples)
+    reference = read_image(reference_path, channels=3)
+
+    results = []
+    for option in args.sampling:
+        kwargs = sampling_kwargs(option)
+        world = setup_hdri_world(scene, args.hdri, **kwargs)
+        map_resolution = world.cycles.sample_map_resolution if world.cycles.sampling_method == 'MANUAL' else None
+
+        for samples in args.samples:
+            path = output / f"{option.lower()}_{samples:05d}.exr"
+            seconds = render_to(scene, path, samples)
+            pixels = read_image(path, channels=3)
+            rmse = float(np.sqrt(np.mean((pixels - reference) ** 2)))
+            results.append({
+                'sampling': option,
+                'map_resolution': map_resolution,
+                'samples': samples,
+                'seconds': round(seconds, 3),
+                'rmse': rmse,
+            })
+            print(f"{option:>10} map={map_resolution or '-':>5} spp={samples:>5} "
+                  f"time={seconds:8.2f}s rmse={rmse:.5f}")
+
+    report = {
+        'blend_file': bpy.data.filepath,
+        'hdri': args.hdri,
+        'resolution': [render.resolution_x, render.resolution_y],
+        'suggested_map_resolution': hdri_map_resolution(render.resolution_x),
+        'reference_samples': args.reference_samples,
+        'results': results,
+    }
+    with open(output / "hdri_sampling.json", 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {output / 'hdri_sampling.json'}")
+
+
+if __name__ == "__main__":
+    main()
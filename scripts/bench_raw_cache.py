@@ -0,0 +1,161 @@
+"""
+Encode-stage read throughput: DWAA EXR vs. the raw memory-mapped frame cache.
+
+Writes a short sequence of synthetic render-like frames (smooth gradients
+plus noise) at 5.7K and 8K as half-float DWAA EXRs and as 'UINT16' and
+'HALF' raw cache frames (utils/frame_cache.py). Each format is then read
+the way the encode stage consumes it, ending in an ffmpeg-ready buffer
+written to /dev/null:
+
+    exr_dwaa  read_image() + linear -> 8-bit sRGB
+    uint16    memmap written as is (what ffmpeg gets as rgb48le)
+    half      memmap + linear -> 8-bit sRGB
+
+Run inside Blender (for the bundled OpenImageIO):
+
+    blender -b --python scripts/bench_raw_cache.py -- --frames 8 --scratch /mnt/nvme/bench
+
+The frames were just written, so reads come from the page cache unless
+--drop-caches (Linux, root) is passed; cold reads show the disk's share.
+Results are written to <scratch>/raw_cache.json and printed as a table.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from pe_camera_rigs.utils.image_io import read_image, write_image  # noqa: E402
+from pe_camera_rigs.utils.stream_encode import linear_to_srgb8  # noqa: E402
+from pe_camera_rigs.utils.frame_cache import (  # noqa: E402
+    CACHE_EXTENSION,
+    open_cache_frame,
+    write_cache_frame,
+)
+
+RESOLUTIONS = {
+    '5.7K': (5760, 2880),
+    '8K': (7680, 3840),
+}
+
+
+def parse_args():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--resolutions", nargs="+", default=list(RESOLUTIONS), choices=list(RESOLUTIONS))
+    parser.add_argument("--frames", type=int, default=8, help="Frames per format and resolution")
+    parser.add_argument("--drop-caches", action="store_true", help="Drop the page cache before each format")
+    parser.add_argument("--scratch", default="bench_raw_cache", help="Folder on the disk to measure")
+    return parser.parse_args(argv)
+
+
+def synthetic_frame(width, height, seed):
+    """Linear float RGB with smooth gradients, highlights above 1 and render noise."""
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+    base = np.stack([x / width, y / height, 0.5 + 0.5 * np.sin(x / 97.0 + y / 53.0)], axis=-1)
+    base *= 1.2
+    base += rng.normal(0.0, 0.02, base.shape).astype(np.float32)
+    return np.maximum(base, 0.0, out=base)
+
+
+def drop_caches():
+    os.sync()
+    subprocess.run(["sh", "-c", "echo 3 > /proc/sys/vm/drop_caches"], check=True)
+
+
+def read_exr(path, out, sink):
+    linear_to_srgb8(read_image(path, channels=3), out)
+    sink.write(memoryview(out))
+
+
+def read_uint16(path, out, sink):
+    sink.write(memoryview(open_cache_frame(path)))
+
+
+def read_half(path, out, sink):
+    scratch = np.array(open_cache_frame(path), dtype=np.float32)
+    linear_to_srgb8(scratch, out)
+    sink.write(memoryview(out))
+
+
+READERS = {
+    'exr_dwaa': (".exr", read_exr),
+    'uint16': (CACHE_EXTENSION, read_uint16),
+    'half': (CACHE_EXTENSION, read_half),
+}
+
+
+def write_frames(folder, name, frames, width, height):
+    """Writes `frames` frames in format `name`, returns their paths."""
+    paths = []
+    for index in range(frames):
+        pixels = synthetic_frame(width, height, index)
+        extension, _ = READERS[name]
+        path = folder / f"{name}_{index:04d}{extension}"
+        if name == 'exr_dwaa':
+            write_image(str(path), pixels, bit_depth='16', exr_codec='DWAA')
+        else:
+            write_cache_frame(path, pixels, 'UINT16' if name == 'uint16' else 'HALF')
+        paths.append(path)
+    return paths
+
+
+def main():
+    args = parse_args()
+    scratch = Path(args.scratch).resolve()
+    results = []
+
+    with open(os.devnull, 'wb') as sink:
+        for label in args.resolutions:
+            width, height = RESOLUTIONS[label]
+            folder = scratch / label
+            folder.mkdir(parents=True, exist_ok=True)
+            out = np.empty((height, width, 3), dtype=np.uint8)
+
+            for name, (_, reader) in READERS.items():
+                print(f"{label}: writing {args.frames} {name} frames...")
+                paths = write_frames(folder, name, args.frames, width, height)
+                if args.drop_caches:
+                    drop_caches()
+
+                start = time.perf_counter()
+                for path in paths:
+                    reader(path, out, sink)
+                seconds = time.perf_counter() - start
+
+                total_bytes = sum(path.stat().st_size for path in paths)
+                results.append({
+                    'resolution': label,
+                    'format': name,
+                    'frames': args.frames,
+                    'seconds_per_frame': round(seconds / args.frames, 4),
+                    'frames_per_second': round(args.frames / seconds, 2),
+                    'file_megabytes_per_second': round(total_bytes / 2 ** 20 / seconds, 1),
+                    'bytes_per_frame': total_bytes // args.frames,
+                })
+                print(f"{label:>4} {name:<8} {seconds / args.frames * 1000:8.1f} ms/frame "
+                      f"{args.frames / seconds:6.2f} fps  {total_bytes / args.frames / 2 ** 20:7.1f} MB/frame")
+                for path in paths:
+                    path.unlink()
+
+    report = {
+        'frames': args.frames,
+        'cold_reads': args.drop_caches,
+        'scratch': str(scratch),
+        'results': results,
+    }
+    with open(scratch / "raw_cache.json", 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {scratch / 'raw_cache.json'}")
+
+
+if __name__ == "__main__":
+    main()
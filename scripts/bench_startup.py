@@ -0,0 +1,177 @@
+"""
+Addon startup cost: import + register time and the modules it loads.
+
+Starts `blender --background --factory-startup` once per run and source
+tree, imports pe_camera_rigs from that tree and times the import, the
+register() call and the first use of the VR pipelines (the modules the
+operators load lazily, see utils/lazy.py). Also reports how many modules
+registration loaded and whether NumPy and OpenImageIO were among them.
+Background Blender registers the headless profile (no panels); pass
+--profiles headless full to also time the full UI registration that
+PE_CAMERA_RIGS_HEADLESS=0 forces. Runs with plain Python:
+
+    python scripts/bench_startup.py --blender /opt/blender/blender --runs 10
+
+To measure the saving against an older tree, check it out next to this one
+and pass both:
+
+    git worktree add /tmp/pe_eager <commit>
+    python scripts/bench_startup.py --src current=src eager=/tmp/pe_eager/src
+
+--importtime adds Python's per-module import times (PYTHONPROFILEIMPORTTIME,
+passed through with --python-use-system-env) for the slowest imports of
+the first run. Results are written to <output> and printed as a table.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO_SRC = Path(__file__).resolve().parents[1] / "src"
+
+RESULT_MARKER = "PE_STARTUP_RESULT "
+
+# Registration profile -> PE_CAMERA_RIGS_HEADLESS (constants.HEADLESS_ENV_VAR)
+PROFILES = {
+    'headless': "1",
+    'full': "0",
+}
+
+# Runs inside Blender; {src} is filled in per tree
+PROBE = """
+import bpy, json, sys, time
+sys.path.insert(0, {src!r})
+before = set(sys.modules)
+start = time.perf_counter()
+import pe_camera_rigs
+imported = time.perf_counter()
+pe_camera_rigs.register()
+registered = time.perf_counter()
+loaded = [name for name, module in sys.modules.items()
+          if name not in before and type(module).__name__ != '_LazyModule']
+heavy = {{name: name in loaded for name in ('numpy', 'OpenImageIO')}}
+panels = hasattr(bpy.types, 'PE_PT_main_panel')
+first_use = time.perf_counter()
+for rig in ('vr180', 'vr360mono', 'vr360stereo'):
+    __import__('pe_camera_rigs.rigs.' + rig + '.pipeline', fromlist=['STEPS']).STEPS
+used = time.perf_counter()
+pe_camera_rigs.unregister()
+print({marker!r} + json.dumps({{
+    'import_ms': (imported - start) * 1000,
+    'register_ms': (registered - imported) * 1000,
+    'first_use_ms': (used - first_use) * 1000,
+    'modules': len(loaded),
+    'heavy': heavy,
+    'panels': panels,
+}}), flush=True)
+"""
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--blender", default="blender", help="Blender executable")
+    parser.add_argument("--src", nargs="+", default=[f"current={REPO_SRC}"],
+                        help="Source trees to compare as LABEL=PATH (the folder holding pe_camera_rigs)")
+    parser.add_argument("--profiles", nargs="+", default=["headless"], choices=list(PROFILES),
+                        help="Registration profiles to time per tree")
+    parser.add_argument("--runs", type=int, default=5, help="Blender starts per tree and profile")
+    parser.add_argument("--importtime", action="store_true", help="Report the slowest imports of the first run")
+    parser.add_argument("--top", type=int, default=15, help="Imports listed with --importtime")
+    parser.add_argument("--output", default="bench_startup.json")
+    return parser.parse_args()
+
+
+def parse_importtime(stderr, top):
+    """Returns the `top` slowest cumulative imports from -X importtime output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append({
+            'module': name.strip(),
+            'self_ms': int(self_us) / 1000,
+            'cumulative_ms': int(cumulative_us) / 1000,
+        })
+    rows.sort(key=lambda row: row['cumulative_ms'], reverse=True)
+    return rows[:top]
+
+
+def run_probe(blender, src, profile, importtime=False):
+    """Starts Blender once, returns (probe result, wall seconds, stderr)."""
+    command = [blender, "--background", "--factory-startup"]
+    env = dict(os.environ, PE_CAMERA_RIGS_HEADLESS=PROFILES[profile])
+    if importtime:
+        command.append("--python-use-system-env")
+        env['PYTHONPROFILEIMPORTTIME'] = "1"
+    command += ["--python-exit-code", "1",
+                "--python-expr", PROBE.format(src=str(Path(src).resolve()), marker=RESULT_MARKER)]
+
+    start = time.perf_counter()
+    completed = subprocess.run(command, capture_output=True, text=True, env=env)
+    wall = time.perf_counter() - start
+    if completed.returncode != 0:
+        raise RuntimeError(f"Blender exited with {completed.returncode}:\n{completed.stderr[-2000:]}")
+    for line in completed.stdout.splitlines():
+        if line.startswith(RESULT_MARKER):
+            return json.loads(line[len(RESULT_MARKER):]), wall, completed.stderr
+    raise RuntimeError(f"No result from Blender:\n{completed.stdout[-2000:]}")
+
+
+def main():
+    args = parse_args()
+    trees = dict(entry.split("=", 1) for entry in args.src)
+    results = []
+
+    for (label, src), profile in itertools.product(trees.items(), args.profiles):
+        if not (Path(src) / "pe_camera_rigs" / "__init__.py").exists():
+            sys.exit(f"{src} has no pe_camera_rigs package")
+        runs = []
+        slowest = None
+        for index in range(args.runs):
+            importtime = args.importtime and index == 0
+            probe, wall, stderr = run_probe(args.blender, src, profile, importtime)
+            if importtime:
+                # The profiled run is slower, keep it out of the timings
+                slowest = parse_importtime(stderr, args.top)
+                probe, wall, _ = run_probe(args.blender, src, profile)
+            probe['wall_ms'] = wall * 1000
+            runs.append(probe)
+
+        summary = {
+            'label': f"{label}/{profile}",
+            'src': str(Path(src).resolve()),
+            'profile': profile,
+            'runs': args.runs,
+            'modules': runs[0]['modules'],
+            'heavy': runs[0]['heavy'],
+            'panels': runs[0]['panels'],
+        }
+        for key in ('import_ms', 'register_ms', 'first_use_ms', 'wall_ms'):
+            summary[key] = round(statistics.median(run[key] for run in runs), 1)
+        if slowest is not None:
+            summary['slowest_imports'] = slowest
+        results.append(summary)
+
+    print(f"{'tree':<20} {'import':>9} {'register':>9} {'first use':>10} {'blender':>9} {'modules':>8}  heavy")
+    for summary in results:
+        heavy = ", ".join(name for name, loaded in summary['heavy'].items() if loaded) or "-"
+        print(f"{summary['label']:<20} {summary['import_ms']:7.1f}ms {summary['register_ms']:7.1f}ms "
+              f"{summary['first_use_ms']:8.1f}ms {summary['wall_ms']:7.0f}ms {summary['modules']:8d}  {heavy}")
+        for row in summary.get('slowest_imports', []):
+            print(f"    {row['cumulative_ms']:8.1f}ms  {row['module']}")
+
+    report = {'blender': args.blender, 'results': results}
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -26,30 +26,61 @@ bl_info = {
     "category": "Camera",
 }
 
-import bpy
-from . import preferences
-from . import ui
-from . import rigs
+import os
+
+from .constants import HEADLESS_ENV_VAR
+
+try:
+    import bpy
+except ImportError:
+    # Imported outside Blender, e.g. for the bpy-free utils.rig_math evaluator
+    bpy = None
+
+if bpy is not None:
+    from . import preferences
+    from . import ui
+    from . import rigs
 
 # Classes that need to be registered at the top level
 top_level_classes = (
     preferences.PE_AddonPreferences,
-)
+) if bpy is not None else ()
+
+# Profile of the last register(), so unregister() removes the same classes
+_headless = False
+
+def is_headless():
+    """
+    Whether register() uses the headless profile: no panels, only what the
+    pipelines, the CLI and scripted operators need.
+
+    HEADLESS_ENV_VAR set to "1" or "0" forces the profile on or off; otherwise
+    background Blender (`blender -b`, render nodes and workers) is headless.
+    """
+    value = os.environ.get(HEADLESS_ENV_VAR, "").strip()
+    if value:
+        return value != "0"
+    return bpy.app.background
 
 def register():
     """Registers all addon classes and submodules."""
+    global _headless
+    _headless = is_headless()
+
     for cls in top_level_classes:
         bpy.utils.register_class(cls)
     
     # Register submodules
-    ui.register()
-    rigs.register()
+    if not _headless:
+        ui.register()
+    rigs.register(headless=_headless)
 
 def unregister():
     """Unregisters all addon classes and submodules."""
     # Unregister submodules in reverse order
-    rigs.unregister()
-    ui.unregister()
+    rigs.unregister(headless=_headless)
+    if not _headless:
+        ui.unregister()
 
     for cls in reversed(top_level_classes):
         bpy.utils.unregister_class(cls)
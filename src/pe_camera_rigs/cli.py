@@ -0,0 +1,473 @@
+"""
+Headless command-line entry point for the VR workflows.
+
+Runs the same workflow steps as the panel operators (rigs/*/pipeline.py) in
+a background Blender, without windows, workspaces or the selection:
+
+    blender -b scene.blend --python src/pe_camera_rigs/cli.py -- \
+        vr180 render composite encode --frames 1-500 --workers 8 \
+        --progress progress.jsonl
+
+With the addon installed, the module can be run instead of the file:
+
+    blender -b scene.blend --python-expr \
+        "import sys, pe_camera_rigs.cli as cli; sys.exit(cli.main())" -- vr180 all
+
+The 'stream' step renders and encodes at once: each finished frame is
+piped to ffmpeg while the next one renders (see utils/stream_encode.py).
+
+Steps run in the order given and share one Blender session, so the
+compositor scene built by 'composite' is there for 'encode'. The .blend is
+never saved unless --save is passed.
+
+With --workers N the render step is split into N frame chunks, each rendered
+by a child `blender -b` on the saved .blend. Progress is written as JSON
+lines (one object per event) to --progress, a file or '-' for stdout; child
+processes append to the same file. --pin gives every child its own set of
+physical cores, NUMA node by node, and a matching thread count (see
+utils/affinity.py). VR180 renders the eyes in separate processes on its
+own when 'Render Workers' is above 1; --eye left|right renders one eye only.
+
+Every run is recorded as a job in the rig's job store
+(<output_path>/jobs.jsonl, see utils/job_queue.py). With --enqueue the
+steps are only queued; the 'queue' command then runs the queued jobs of the
+open .blend back to back, across scenes and rigs, resuming interrupted
+renders at the first unfinished frame:
+
+    blender -b scene.blend --python src/pe_camera_rigs/cli.py -- vr180 all --enqueue
+    blender -b scene.blend --python src/pe_camera_rigs/cli.py -- queue --workers 4
+
+Exit codes: 0 success, 1 step failed, 2 bad arguments, 3 missing input
+(an earlier step has not run, or the rig is missing from the scene).
+"""
+
+import argparse
+import copy
+import importlib
+import json
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+import bpy
+
+logger = logging.getLogger(__name__)
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_MISSING_INPUT = 3
+
+# Rig -> scene settings attribute
+RIG_SETTINGS = {
+    'vr180': "pe_vr180_settings",
+    'vr360mono': "pe_vr360_mono_settings",
+    'vr360stereo': "pe_vr360_stereo_settings",
+}
+
+# Renders per frame of the render step (VR180 renders each eye separately)
+RENDERS_PER_FRAME = {
+    'vr180': 2,
+}
+
+
+class ProgressLog:
+    """Writes progress events as JSON lines to a file (appended) or stdout."""
+
+    def __init__(self, path=None):
+        self.path = path
+        if path is None:
+            self.stream = None
+        elif path == "-":
+            self.stream = sys.stdout
+        else:
+            self.stream = open(path, 'a', encoding='utf-8', buffering=1)
+
+    def emit(self, event, **fields):
+        if self.stream is None:
+            return
+        record = {'event': event, 'time': round(time.time(), 3), 'pid': os.getpid()}
+        record.update(fields)
+        self.stream.write(json.dumps(record) + "\n")
+        self.stream.flush()
+
+    def close(self):
+        if self.stream is not None and self.stream is not sys.stdout:
+            self.stream.close()
+
+
+def parse_frames(value):
+    """Parses 'start-end' or a single frame into a (start, end) tuple."""
+    try:
+        start, _, end = value.partition("-")
+        start = int(start)
+        end = int(end) if end else start
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected START-END, got '{value}'")
+    if end < start:
+        raise argparse.ArgumentTypeError(f"end frame {end} is before start frame {start}")
+    return start, end
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="pe_camera_rigs.cli",
+        description="Run PE Camera Rigs VR workflow steps in background Blender",
+    )
+    parser.add_argument("rig", choices=[*sorted(RIG_SETTINGS), 'queue'],
+                        help="Workflow rig, or 'queue' to run the queued jobs")
+    parser.add_argument(
+        "steps", nargs="*",
+        help="Steps to run in order (vr180/vr360mono: render composite encode; "
+             "vr360stereo: render pack encode), 'all', or 'stream' to encode while rendering",
+    )
+    parser.add_argument("--enqueue", action="store_true", help="Queue the steps instead of running them")
+    parser.add_argument("--scene", help="Scene holding the rig (default: the file's active scene)")
+    parser.add_argument("--frames", type=parse_frames, help="Frame range START-END for the render step")
+    parser.add_argument("--workers", type=int, default=1, help="Blender processes sharing the render step")
+    parser.add_argument("--threads", type=int, default=0, help="Render threads per process (0 = auto)")
+    parser.add_argument("--pin", action="store_true",
+                        help="Pin each --workers process to its own CPU set (Linux, NUMA aware)")
+    parser.add_argument("--eye", choices=['left', 'right'], help="vr180: render only this eye")
+    parser.add_argument("--output", help="Override the rig's output folder")
+    draft = parser.add_mutually_exclusive_group()
+    draft.add_argument("--draft", dest="draft", action="store_true", default=None, help="Force Draft Mode on")
+    draft.add_argument("--final", dest="draft", action="store_false", help="Force Draft Mode off")
+    parser.add_argument("--progress", help="JSON-lines progress file, or '-' for stdout")
+    parser.add_argument("--save", action="store_true", help="Save the .blend after the steps")
+    # Set on worker children: they record no job of their own, only their
+    # frames on the parent's job (--job) if it has one
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--job", help=argparse.SUPPRESS)
+    # Set on worker children of GPU scenes: --factory-startup reset the Cycles devices
+    parser.add_argument("--device-type", help=argparse.SUPPRESS)
+    return parser
+
+
+def load_addon():
+    """Imports the addon package, registering it when this file runs as a script."""
+    if __package__:
+        package = importlib.import_module(__package__)
+    else:
+        # Run with --python: import the package this file belongs to
+        package_dir = Path(__file__).resolve().parent
+        if str(package_dir.parent) not in sys.path:
+            sys.path.insert(0, str(package_dir.parent))
+        package = importlib.import_module(package_dir.name)
+
+    # --factory-startup leaves the addon disabled
+    if not hasattr(bpy.types.Scene, RIG_SETTINGS['vr180']):
+        package.register()
+    return package
+
+
+def child_arguments(args, job_id=None):
+    """CLI arguments passed on to the child processes rendering frame chunks."""
+    command = []
+    # Children load the saved file, so in-memory overrides are passed on
+    if args.output:
+        command += ["--output", args.output]
+    if args.draft is not None:
+        command.append("--draft" if args.draft else "--final")
+    if args.progress and args.progress != "-":
+        command += ["--progress", args.progress]
+    if job_id:
+        command += ["--job", job_id]
+    return command
+
+
+def render_in_workers(package, args, scene, progress, job_id=None):
+    """
+    Splits the render step across child Blender processes.
+
+    With --pin every child gets its own CPU set (utils/affinity.py) and as
+    many fixed render threads as the set has CPUs.
+    """
+    if not bpy.data.filepath:
+        raise ValueError("--workers needs a saved .blend file")
+    workers = importlib.import_module(f"{package.__name__}.utils.workers")
+    affinity = importlib.import_module(f"{package.__name__}.utils.affinity")
+    blender = importlib.import_module(f"{package.__name__}.utils.blender")
+
+    start, end = args.frames or (scene.frame_start, scene.frame_end)
+    chunks = workers.frame_chunks(start, end, args.workers)
+    cpu_sets = affinity.partition_cpus(len(chunks)) if args.pin else None
+    if cpu_sets:
+        threads = [args.threads or len(cpus) for cpus in cpu_sets]
+    else:
+        threads = [args.threads or max(1, (os.cpu_count() or 1) // len(chunks))] * len(chunks)
+    progress.emit('workers', chunks=chunks, threads=threads, cpus=cpu_sets)
+
+    commands = [
+        workers.cli_worker_command(
+            bpy.data.filepath, args.rig, scene.name, chunk, chunk_threads, child_arguments(args, job_id),
+            device_type=blender.gpu_compute_device_type(scene),
+        )
+        for chunk, chunk_threads in zip(chunks, threads)
+    ]
+    workers.run_workers(commands, len(commands), cpu_sets)
+
+
+def apply_overrides(args, scene):
+    """Applies command-line overrides to the scene and its rig settings."""
+    settings = getattr(scene, RIG_SETTINGS[args.rig])
+    if args.output:
+        settings.output_path = args.output
+    if args.draft is not None:
+        if not hasattr(settings, "draft_mode"):
+            raise ValueError(f"{args.rig} has no Draft Mode")
+        settings.draft_mode = args.draft
+    if args.threads > 0:
+        scene.render.threads_mode = 'FIXED'
+        scene.render.threads = args.threads
+    if args.worker and hasattr(settings, "render_workers"):
+        # The launching process split the work already
+        settings.render_workers = 1
+    if args.eye:
+        # With one eye per process, the launching process converts the pairs
+        settings.frame_cache = False
+
+
+def run(args, progress, job_id=None):
+    """
+    Runs the requested steps, returns the exit code.
+
+    The run is recorded in the rig's job store: as a new job, or on `job_id`
+    when the queue runs a queued job. Worker children only add their
+    frames to the parent's job (--worker, with --job if the parent has one).
+    """
+    package = load_addon()
+    pipeline = importlib.import_module(f"{package.__name__}.rigs.{args.rig}.pipeline")
+    job_queue = importlib.import_module(f"{package.__name__}.utils.job_queue")
+
+    steps = list(pipeline.STEPS) if args.steps == ["all"] else args.steps
+    known = [*pipeline.STEPS, 'stream']
+    unknown = [step for step in steps if step not in known]
+    if unknown or not steps:
+        progress.emit('error', message=f"Unknown {args.rig} steps: {', '.join(unknown) or 'none given'}")
+        logger.error("Unknown %s steps %s, expected %s", args.rig, unknown, known)
+        return EXIT_USAGE
+
+    scene = bpy.data.scenes.get(args.scene) if args.scene else bpy.context.scene
+    if scene is None:
+        progress.emit('error', message=f"Scene '{args.scene}' not found")
+        return EXIT_USAGE
+
+    if args.enqueue:
+        return enqueue(args, scene, steps, progress)
+
+    current = {'step': None}
+
+    def on_frame(render_scene, *_):
+        camera = render_scene.camera.name if render_scene.camera else None
+        progress.emit('frame', scene=render_scene.name, frame=render_scene.frame_current, camera=camera)
+        # Only the render step resumes per frame (stream renders straight into the video)
+        if store is not None and current['step'] == 'render' and (job_id or args.job):
+            store.frame_done(job_id or args.job, current['step'], render_scene.frame_current, camera)
+
+    def record_failure(error):
+        # Worker children leave the job status to their parent
+        if store is not None and job_id is not None and not args.worker:
+            store.set_status(job_id, job_queue.JOB_FAILED, step=step, message=str(error))
+
+    store = None
+    bpy.app.handlers.render_post.append(on_frame)
+    progress.emit('start', rig=args.rig, steps=steps, scene=scene.name, file=bpy.data.filepath)
+    step = None
+    try:
+        apply_overrides(args, scene)
+        if args.device_type:
+            blender = importlib.import_module(f"{package.__name__}.utils.blender")
+            if not blender.enable_gpu_compute(args.device_type):
+                logger.warning("No %s device found, rendering on the CPU", args.device_type)
+        settings = getattr(scene, RIG_SETTINGS[args.rig])
+        store = settings.job_store()
+        if args.worker:
+            current['step'] = 'render'
+        elif job_id is None:
+            job_id = store.add(
+                args.rig, scene.name, steps, frames=args.frames, blend=bpy.data.filepath,
+                draft=getattr(settings, "draft_mode", False), status=job_queue.JOB_RUNNING,
+            )
+        else:
+            store.set_status(job_id, job_queue.JOB_RUNNING)
+
+        # VR180's Render Workers record their frames on this job, for resume
+        job_options = {'job_id': job_id or args.job} if args.rig == 'vr180' else {}
+
+        for step in steps:
+            current['step'] = step
+            progress.emit('step_start', step=step)
+            if not args.worker:
+                store.set_status(job_id, job_queue.JOB_RUNNING, step=step)
+            step_start = time.perf_counter()
+            frames = args.frames or (None, None)
+            if step == 'stream' and args.workers > 1:
+                pipeline.STREAM(
+                    scene, *frames, render=lambda: render_in_workers(package, args, scene, progress, job_id)
+                )
+            elif step == 'stream':
+                pipeline.STREAM(scene, *frames, **job_options)
+            elif step == 'render' and args.workers > 1:
+                render_in_workers(package, args, scene, progress, job_id)
+            elif step == 'render' and args.eye:
+                pipeline.STEPS[step](scene, *frames, eyes=(args.eye,))
+            elif step == 'render':
+                pipeline.STEPS[step](scene, *frames, **job_options)
+            else:
+                pipeline.STEPS[step](scene)
+            seconds = time.perf_counter() - step_start
+            progress.emit('step_done', step=step, seconds=round(seconds, 3))
+            if not args.worker:
+                store.step_done(job_id, step, seconds)
+
+        if args.save:
+            bpy.ops.wm.save_mainfile()
+
+    except (ValueError, FileNotFoundError) as e:
+        progress.emit('error', step=step, message=str(e))
+        logger.error("%s", e)
+        record_failure(e)
+        return EXIT_MISSING_INPUT
+    except Exception as e:
+        progress.emit('error', step=step, message=str(e))
+        logger.exception("Step '%s' failed", step)
+        record_failure(e)
+        return EXIT_FAILED
+    finally:
+        bpy.app.handlers.render_post.remove(on_frame)
+
+    if not args.worker:
+        store.set_status(job_id, job_queue.JOB_DONE)
+    progress.emit('done', job=job_id)
+    return EXIT_OK
+
+
+def enqueue(args, scene, steps, progress):
+    """Adds the steps to the rig's job store as a queued job."""
+    if not bpy.data.filepath:
+        progress.emit('error', message="--enqueue needs a saved .blend file")
+        logger.error("--enqueue needs a saved .blend file")
+        return EXIT_USAGE
+    if args.output:
+        # The queue finds jobs through the saved output path
+        progress.emit('error', message="--output cannot be queued, set the rig's output path and save")
+        logger.error("--output cannot be queued, set the rig's output path and save")
+        return EXIT_USAGE
+
+    settings = getattr(scene, RIG_SETTINGS[args.rig])
+    draft = getattr(settings, "draft_mode", False) if args.draft is None else args.draft
+    job_id = settings.job_store().add(
+        args.rig, scene.name, steps, frames=args.frames, blend=bpy.data.filepath, draft=draft,
+    )
+    progress.emit('queued', job=job_id, rig=args.rig, steps=steps, scene=scene.name)
+    logger.info("Queued %s job %s: %s", args.rig, job_id, " ".join(steps))
+    return EXIT_OK
+
+
+def queue_stores():
+    """Job stores of every rig in every scene of the open file, one per path."""
+    stores = {}
+    for scene in bpy.data.scenes:
+        for attribute in RIG_SETTINGS.values():
+            store = getattr(scene, attribute).job_store()
+            stores.setdefault(store.path, store)
+    return list(stores.values())
+
+
+def run_queue(args, progress):
+    """
+    Runs the queued jobs of the open .blend in the order they were queued.
+
+    Jobs left RUNNING by a dead process are requeued first; an interrupted
+    render resumes at its first unfinished frame. A failed job does not stop
+    the queue. Returns EXIT_FAILED if any job failed.
+    """
+    package = load_addon()
+    job_queue = importlib.import_module(f"{package.__name__}.utils.job_queue")
+
+    stores = queue_stores()
+    for store in stores:
+        requeued = store.recover()
+        if requeued:
+            logger.info("Requeued %d interrupted job(s) in %s", requeued, store.path)
+
+    queued = sorted(
+        ((store, job) for store in stores for job in store.jobs()
+         if job['status'] == job_queue.JOB_QUEUED and job['blend'] == bpy.data.filepath),
+        key=lambda item: item[1]['created'],
+    )
+    progress.emit('queue', jobs=[job['id'] for _, job in queued])
+    logger.info("%d queued job(s)", len(queued))
+
+    exit_code = EXIT_OK
+    for store, job in queued:
+        steps = job_queue.remaining_steps(job)
+        scene = bpy.data.scenes.get(job['scene'])
+        frames = tuple(job['frames']) if job['frames'] else None
+        if scene is not None and 'render' in steps and job['frames_done']:
+            start, end = frames or (scene.frame_start, scene.frame_end)
+            frames = job_queue.resume_frames(job, start, end, RENDERS_PER_FRAME.get(job['rig'], 1))
+            if frames is None:
+                # Every frame rendered, only the step record was lost
+                store.step_done(job['id'], 'render', 0.0)
+                steps.remove('render')
+            elif frames[0] > start:
+                logger.info("Job %s resumes rendering at frame %d", job['id'], frames[0])
+
+        if not steps:
+            store.set_status(job['id'], job_queue.JOB_DONE)
+            continue
+
+        job_args = copy.copy(args)
+        job_args.rig = job['rig']
+        job_args.scene = job['scene']
+        job_args.steps = steps
+        job_args.frames = frames
+        job_args.draft = job.get('draft', False)
+        job_args.output = None
+        if run(job_args, progress, job_id=job['id']) != EXIT_OK:
+            exit_code = EXIT_FAILED
+            # Failed before it started (e.g. its scene is gone): keep it out of the next run
+            if store.job(job['id'])['status'] == job_queue.JOB_QUEUED:
+                store.set_status(job['id'], job_queue.JOB_FAILED, message="Could not start, see the log")
+    return exit_code
+
+
+def main(argv=None):
+    """Parses the arguments after '--' and runs the steps, returns the exit code."""
+    if argv is None:
+        argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+
+    try:
+        args = build_parser().parse_args(argv)
+    except SystemExit as e:
+        # argparse exits with 2 on bad arguments and 0 after --help
+        return e.code
+
+    if args.workers < 1:
+        logger.error("--workers must be at least 1")
+        return EXIT_USAGE
+
+    if args.rig == 'queue' and (args.steps or args.enqueue):
+        logger.error("'queue' takes no steps and cannot be queued")
+        return EXIT_USAGE
+
+    if args.eye and args.rig != 'vr180':
+        logger.error("--eye only applies to vr180")
+        return EXIT_USAGE
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+    progress = ProgressLog(args.progress)
+    try:
+        if args.rig == 'queue':
+            return run_queue(args, progress)
+        return run(args, progress)
+    finally:
+        progress.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,6 +11,7 @@ used throughout the addon.
 ORBIT_TEMPLATE_CAM_NAME = "Orbit_Template_Cam"
 ORBIT_CONTROLLER_NAME = "Orbit_Controller"
 ORBIT_NODE_GROUP_NAME = "Orbit_Camera_Rig"
+ORBIT_BAKED_CAM_NAME = "Orbit_Baked_Cam"
 
 # ============================================================================
 # Isometric Rig Constants
@@ -33,9 +34,26 @@ VR180_COMPOSITOR_SCENE_NAME = "VR180_Compositor"
 VR360_CAM_NAME = "VR360_Camera"
 VR360_COMPOSITOR_SCENE_NAME = "VR360_Compositor"
 
+# ============================================================================
+# VR360 Stereo Rig Constants
+# ============================================================================
+VR360_STEREO_CAM_NAME = "VR360_Stereo_Camera"
+VR360_STEREO_COMPOSITOR_SCENE_NAME = "VR360_Stereo_Compositor"
+
 # ============================================================================
 # Scene Element Constants
 # ============================================================================
 REFERENCE_CAPSULE_NAME = "Reference_Capsule"
 REFERENCE_SPHERE_NAME = "Reference_Sphere"
 CYCLORAMA_NAME = "Cyclorama"
+
+# ============================================================================
+# Output Layout Constants
+# ============================================================================
+DRAFT_DIR_NAME = "draft"  # Draft renders live in <output>/<rig>/draft/
+
+# ============================================================================
+# Registration Constants
+# ============================================================================
+# "1" registers without panels, "0" with them; unset follows bpy.app.background
+HEADLESS_ENV_VAR = "PE_CAMERA_RIGS_HEADLESS"
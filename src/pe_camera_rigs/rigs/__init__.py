@@ -4,6 +4,7 @@ from . import isometric
 from . import orbit
 from . import vr180
 from . import vr360mono
+from . import vr360stereo
 # ... etc
 
 # All rig modules that should be registered.
@@ -12,12 +13,14 @@ rig_modules = [
     orbit,
     vr180,
     vr360mono,
+    vr360stereo,
 ]
 
-def register():
+def register(headless=False):
+    """Registers every rig; `headless` skips their panels."""
     for module in rig_modules:
-        module.register()
+        module.register(headless)
 
-def unregister():
+def unregister(headless=False):
     for module in reversed(rig_modules):
-        module.unregister()
+        module.unregister(headless)
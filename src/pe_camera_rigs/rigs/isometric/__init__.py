@@ -6,18 +6,31 @@ from . import panels
 from . import properties
 
 classes = (
+    operators.ISOMETRIC_OT_add_controller,
+    operators.ISOMETRIC_OT_batch_render,
+    operators.ISOMETRIC_OT_pack_atlas,
+)
+
+# Sidebar panels, skipped by the headless registration profile
+ui_classes = (
     panels.ISOMETRIC_PT_add_panel,
+    panels.ISOMETRIC_PT_batch_render,
     panels.ISOMETRIC_PT_controller_settings,
-    operators.ISOMETRIC_OT_add_controller,
 )
 
-def register():
+def register(headless=False):
     # Register properties first (must come before classes that use them)
     properties.register()
     for cls in classes:
         bpy.utils.register_class(cls)
+    if not headless:
+        for cls in ui_classes:
+            bpy.utils.register_class(cls)
 
-def unregister():
+def unregister(headless=False):
+    if not headless:
+        for cls in reversed(ui_classes):
+            bpy.utils.unregister_class(cls)
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
     # Unregister properties last
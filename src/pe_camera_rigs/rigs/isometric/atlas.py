@@ -0,0 +1,208 @@
+"""
+Sprite atlas packing for isometric renders.
+
+Frames are loaded as NumPy arrays, trimmed to their alpha bounding box,
+bin-packed and blitted into one preallocated atlas array, then written
+together with a JSON index (TexturePacker "hash" layout). All pixel work
+is vectorized: Python only loops over frames, never over pixels.
+"""
+
+import json
+import math
+from pathlib import Path
+
+import numpy as np
+
+from ...utils.image_io import read_image, write_image
+
+ATLAS_EXTENSIONS = ('.png', '.exr')
+
+# Frames are trimmed in stacks of this many to bound peak memory
+TRIM_CHUNK_SIZE = 64
+
+
+def alpha_bounding_boxes(alphas, threshold=0.0):
+    """
+    Computes the opaque bounding box of a stack of alpha channels.
+
+    Args:
+        alphas (np.ndarray): (N, H, W) alpha values
+        threshold (float): Pixels with alpha above this count as opaque
+
+    Returns:
+        np.ndarray: (N, 4) int array of (x, y, w, h); fully transparent
+            frames get a 1x1 box at the origin
+    """
+    mask = alphas > threshold
+    rows = mask.any(axis=2)  # (N, H)
+    cols = mask.any(axis=1)  # (N, W)
+    height, width = alphas.shape[1:]
+
+    top = rows.argmax(axis=1)
+    bottom = height - rows[:, ::-1].argmax(axis=1)
+    left = cols.argmax(axis=1)
+    right = width - cols[:, ::-1].argmax(axis=1)
+
+    boxes = np.stack([left, top, right - left, bottom - top], axis=1)
+    empty = ~rows.any(axis=1)
+    boxes[empty] = (0, 0, 1, 1)
+    return boxes.astype(np.int64)
+
+
+def pack_shelves(sizes, padding=0, max_width=None, power_of_two=False):
+    """
+    Packs rectangles with a next-fit decreasing-height shelf algorithm.
+
+    Args:
+        sizes (np.ndarray): (N, 2) array of (w, h)
+        padding (int): Gap between rectangles in pixels
+        max_width (int, optional): Atlas width. Defaults to a width that
+            keeps the atlas roughly square.
+        power_of_two (bool): Round the atlas size up to powers of two
+
+    Returns:
+        tuple: ((N, 2) array of (x, y) positions, atlas width, atlas height)
+    """
+    sizes = np.asarray(sizes, dtype=np.int64).reshape(-1, 2)
+    padded = sizes + padding
+
+    if max_width is None:
+        side = math.sqrt(int(padded.prod(axis=1).sum()))
+        # Shelves waste some space; power-of-two rounding already leaves slack
+        max_width = int(math.ceil(side if power_of_two else side * 1.1))
+    max_width = max(max_width, int(sizes[:, 0].max()))
+    if power_of_two:
+        max_width = 1 << int(math.ceil(math.log2(max_width)))
+
+    positions = np.zeros_like(sizes)
+    order = np.lexsort((-sizes[:, 0], -sizes[:, 1]))  # tallest first, then widest
+
+    x = y = shelf_height = 0
+    for i in order:
+        w, h = padded[i]
+        if x + w > max_width + padding and x > 0:
+            y += shelf_height
+            x = shelf_height = 0
+        positions[i] = (x, y)
+        x += w
+        shelf_height = max(shelf_height, h)
+
+    width = int((positions[:, 0] + sizes[:, 0]).max())
+    height = int((positions[:, 1] + sizes[:, 1]).max())
+    if power_of_two:
+        width = 1 << int(math.ceil(math.log2(width)))
+        height = 1 << int(math.ceil(math.log2(height)))
+    return positions, width, height
+
+
+def load_trimmed_frames(paths, trim=True, threshold=0.0):
+    """
+    Loads frames and crops them to their alpha bounding box.
+
+    Frames of equal size are trimmed together, TRIM_CHUNK_SIZE at a time.
+
+    Returns:
+        tuple: (list of cropped (h, w, 4) arrays, (N, 4) trim boxes,
+            (N, 2) source sizes as (w, h))
+    """
+    crops, boxes, source_sizes = [], [], []
+
+    for start in range(0, len(paths), TRIM_CHUNK_SIZE):
+        chunk = [read_image(path, channels=4) for path in paths[start:start + TRIM_CHUNK_SIZE]]
+        for pixels in chunk:
+            source_sizes.append((pixels.shape[1], pixels.shape[0]))
+
+        if trim and len({p.shape for p in chunk}) == 1:
+            chunk_boxes = alpha_bounding_boxes(np.stack([p[:, :, 3] for p in chunk]), threshold)
+        elif trim:
+            chunk_boxes = np.concatenate([alpha_bounding_boxes(p[np.newaxis, :, :, 3], threshold) for p in chunk])
+        else:
+            chunk_boxes = np.array([(0, 0, p.shape[1], p.shape[0]) for p in chunk], dtype=np.int64)
+
+        for pixels, (x, y, w, h) in zip(chunk, chunk_boxes):
+            crops.append(pixels[y:y + h, x:x + w].copy())
+        boxes.append(chunk_boxes)
+
+    return crops, np.concatenate(boxes), np.array(source_sizes, dtype=np.int64)
+
+
+def build_sprite_atlas(frames, atlas_path, padding=2, trim=True, power_of_two=False, threshold=0.0):
+    """
+    Packs rendered frames into one atlas image plus a JSON index.
+
+    Args:
+        frames (list): Dicts with a 'name' and 'path' key; every other key
+            is copied into the frame's index entry as metadata
+        atlas_path (str): Output image path (.png or .exr). The index is
+            written next to it with a .json suffix.
+        padding (int): Gap between sprites in pixels
+        trim (bool): Crop transparent borders before packing
+        power_of_two (bool): Round the atlas size up to powers of two
+        threshold (float): Alpha threshold used for trimming
+
+    Returns:
+        dict: The JSON index that was written
+    """
+    if not frames:
+        raise ValueError("No frames to pack")
+
+    atlas_path = Path(atlas_path)
+    crops, boxes, source_sizes = load_trimmed_frames([f['path'] for f in frames], trim, threshold)
+
+    positions, width, height = pack_shelves(boxes[:, 2:], padding, power_of_two=power_of_two)
+    atlas = np.zeros((height, width, 4), dtype=np.float32)
+
+    index = {}
+    for frame, crop, (x, y), (tx, ty, tw, th), (sw, sh) in zip(frames, crops, positions, boxes, source_sizes):
+        atlas[y:y + th, x:x + tw] = crop
+
+        meta = {k: v for k, v in frame.items() if k not in ('name', 'path')}
+        index[frame['name']] = {
+            'frame': {'x': int(x), 'y': int(y), 'w': int(tw), 'h': int(th)},
+            'rotated': False,
+            'trimmed': bool(tw != sw or th != sh),
+            'spriteSourceSize': {'x': int(tx), 'y': int(ty), 'w': int(tw), 'h': int(th)},
+            'sourceSize': {'w': int(sw), 'h': int(sh)},
+            **meta,
+        }
+
+    write_image(atlas_path, atlas)
+
+    document = {
+        'frames': index,
+        'meta': {
+            'app': "PE Camera Rigs",
+            'image': atlas_path.name,
+            'format': "RGBA8888" if atlas_path.suffix.lower() == '.png' else "RGBAhalf",
+            'size': {'w': width, 'h': height},
+            'scale': "1",
+        },
+    }
+    with open(atlas_path.with_suffix('.json'), 'w', encoding='utf-8') as f:
+        json.dump(document, f, indent=2)
+
+    return document
+
+
+def collect_frames(directory, exclude=()):
+    """
+    Finds rendered frames below a directory for packing.
+
+    Args:
+        directory (str): Root directory to search recursively
+        exclude (iterable): Paths to skip, e.g. a previous atlas
+
+    Returns:
+        list: Frame dicts with 'name' (path relative to the root, without
+            extension) and 'path', sorted by name
+    """
+    root = Path(directory)
+    excluded = {Path(p).resolve() for p in exclude}
+    frames = []
+    for path in sorted(root.rglob("*")):
+        if path.suffix.lower() in ATLAS_EXTENSIONS and path.resolve() not in excluded:
+            frames.append({
+                'name': path.relative_to(root).with_suffix('').as_posix(),
+                'path': str(path),
+            })
+    return frames
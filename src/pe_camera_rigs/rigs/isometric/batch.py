@@ -0,0 +1,112 @@
+"""
+Batch rendering of isometric projections and rotation steps.
+
+Every controller is rendered once per projection and heading by changing
+only its Geometry Nodes inputs between renders. Persistent data keeps the
+scene sync from the first render, so each extra view costs just the
+camera change and the samples.
+"""
+
+from pathlib import Path
+
+import bpy
+
+from ...utils.blender import get_modifier_input, set_modifier_input, find_generated_camera
+from ...utils.rig_math import evaluate_isometric
+from .properties import PROJECTION_TYPE_TO_INDEX
+
+ISO_MODIFIER_NAME = "Isometric Camera"
+
+# Inputs the batch overrides; restored after each controller
+BATCH_INPUTS = ("Projection Type", "Custom Rotation Z", "Custom Tilt X", "Custom Roll Y")
+
+
+def find_isometric_controllers(scene):
+    """Returns all objects in the scene carrying an isometric GN modifier."""
+    return [obj for obj in scene.objects if obj.modifiers.get(ISO_MODIFIER_NAME)]
+
+
+def render_isometric_batch(scene, view_layer, controllers, projections, rotation_steps, output_dir):
+    """
+    Renders every controller for each projection and rotation step.
+
+    Args:
+        scene (bpy.types.Scene): Scene to render
+        view_layer (bpy.types.ViewLayer): View layer used to find the generated cameras
+        controllers (list): Isometric controller objects
+        projections (list): Projection identifiers, e.g. ['GAME_2_1', 'DIMETRIC']
+        rotation_steps (int): Headings per projection (8 for 8-direction sprites)
+        output_dir (str): Directory for the rendered frames
+
+    Returns:
+        list: One dict per rendered frame with 'name', 'path', 'controller',
+            'projection', 'step' and 'angle' (heading in degrees)
+    """
+    render = scene.render
+    original_settings = {
+        'use_persistent_data': render.use_persistent_data,
+        'film_transparent': render.film_transparent,
+        'filepath': render.filepath,
+        'camera': scene.camera,
+        'file_format': render.image_settings.file_format,
+        'color_mode': render.image_settings.color_mode,
+    }
+
+    rotations = evaluate_isometric(projections, rotation_steps)
+    output_dir = Path(output_dir)
+    frames = []
+
+    try:
+        render.use_persistent_data = True
+        render.film_transparent = True
+        render.image_settings.file_format = 'PNG'
+        render.image_settings.color_mode = 'RGBA'
+
+        for controller in controllers:
+            mod = controller.modifiers.get(ISO_MODIFIER_NAME)
+            saved_inputs = {name: get_modifier_input(mod, name) for name in BATCH_INPUTS}
+
+            view_layer.update()
+            camera = find_generated_camera(view_layer.depsgraph, controller)
+            if camera is None:
+                raise RuntimeError(f"Could not find the generated camera of '{controller.name}'")
+            scene.camera = camera
+
+            try:
+                # Preset angles are fed through CUSTOM so the heading can be offset
+                set_modifier_input(mod, "Projection Type", PROJECTION_TYPE_TO_INDEX['CUSTOM'])
+
+                for projection, headings in zip(projections, rotations):
+                    for step, (tilt_x, roll_y, rotation_z) in enumerate(headings):
+                        set_modifier_input(mod, "Custom Tilt X", float(tilt_x))
+                        set_modifier_input(mod, "Custom Roll Y", float(roll_y))
+                        set_modifier_input(mod, "Custom Rotation Z", float(rotation_z))
+                        controller.update_tag()
+
+                        name = f"{controller.name}_{projection.lower()}_{step:02d}"
+                        path = output_dir / controller.name / projection / f"{name}.png"
+                        render.filepath = str(path)
+                        bpy.ops.render.render(write_still=True, scene=scene.name)
+
+                        frames.append({
+                            'name': name,
+                            'path': str(path),
+                            'controller': controller.name,
+                            'projection': projection,
+                            'step': step,
+                            'angle': step * 360.0 / len(headings),
+                        })
+            finally:
+                for name, value in saved_inputs.items():
+                    if value is not None:
+                        set_modifier_input(mod, name, value)
+                controller.update_tag()
+    finally:
+        render.use_persistent_data = original_settings['use_persistent_data']
+        render.film_transparent = original_settings['film_transparent']
+        render.filepath = original_settings['filepath']
+        render.image_settings.file_format = original_settings['file_format']
+        render.image_settings.color_mode = original_settings['color_mode']
+        scene.camera = original_settings['camera']
+
+    return frames
@@ -1,10 +1,19 @@
 import bpy
 import math
-from ...utils.nodes import create_isometric_camera_node_group
-from ...utils.blender import set_modifier_input
-from .properties import PROJECTION_TYPES
+import logging
+from pathlib import Path
+from ...utils.blender import set_modifier_input, find_generated_camera
+from ...utils.lazy import lazy_import
+from .properties import PROJECTION_TYPES, BATCH_PROJECTION_TYPES
 from ...constants import ISO_TEMPLATE_CAM_NAME, ISO_CONTROLLER_NAME
 
+logger = logging.getLogger(__name__)
+
+# Loaded on first use, so registering the operators stays cheap
+nodes = lazy_import("...utils.nodes", __package__)
+batch = lazy_import(".batch", __package__)
+atlas = lazy_import(".atlas", __package__)
+
 class ISOMETRIC_OT_add_controller(bpy.types.Operator):
     """Adds an Isometric Camera Controller to the scene"""
     bl_idname = "cgt.add_isometric_controller"
@@ -39,7 +48,7 @@ class ISOMETRIC_OT_add_controller(bpy.types.Operator):
             context.collection.objects.link(template_cam_obj)
 
             # 2. Create the Geometry Node group
-            node_group = create_isometric_camera_node_group()
+            node_group = nodes.create_isometric_camera_node_group()
 
             if not node_group:
                 self.report({'ERROR'}, "Failed to create isometric camera node group")
@@ -88,12 +97,7 @@ class ISOMETRIC_OT_add_controller(bpy.types.Operator):
             context.view_layer.update()
             depsgraph = context.evaluated_depsgraph_get()
 
-            generated_cam_obj = None
-            for obj_instance in depsgraph.object_instances:
-                if obj_instance.parent and obj_instance.parent.original == controller and obj_instance.is_instance:
-                    if obj_instance.object.original.type == 'CAMERA':
-                        generated_cam_obj = obj_instance.object.original
-                        break
+            generated_cam_obj = find_generated_camera(depsgraph, controller)
 
             if generated_cam_obj:
                 context.scene.camera = generated_cam_obj
@@ -120,3 +124,111 @@ class ISOMETRIC_OT_add_controller(bpy.types.Operator):
             if controller and controller.name in bpy.data.objects:
                 bpy.data.objects.remove(controller, do_unlink=True)
             return {'CANCELLED'}
+
+
+def atlas_output_path(settings):
+    """Atlas image path for the batch settings' output folder and format."""
+    extension = ".exr" if settings.atlas_format == 'EXR' else ".png"
+    return Path(bpy.path.abspath(settings.output_path)) / f"atlas{extension}"
+
+
+class ISOMETRIC_OT_batch_render(bpy.types.Operator):
+    """Renders every isometric controller in several projections and headings"""
+    bl_idname = "cgt.isometric_batch_render"
+    bl_label = "Batch Render Projections"
+    bl_description = "Renders each isometric controller for the chosen projections and rotation steps, then packs a sprite atlas"
+    bl_options = {'REGISTER'}
+
+    @classmethod
+    def poll(cls, context):
+        """Only enable if the scene has an isometric controller."""
+        return bool(batch.find_isometric_controllers(context.scene))
+
+    def execute(self, context):
+        settings = context.scene.pe_iso_batch
+
+        # Keep the enum order so atlas rows are stable between runs
+        projections = [name for name, _, _ in BATCH_PROJECTION_TYPES if name in settings.projections]
+        if not projections:
+            self.report({'ERROR'}, "Select at least one projection to render")
+            return {'CANCELLED'}
+
+        controllers = batch.find_isometric_controllers(context.scene)
+        if settings.selected_only:
+            controllers = [obj for obj in controllers if obj.select_get()]
+        if not controllers:
+            self.report({'ERROR'}, "No isometric controllers to render")
+            return {'CANCELLED'}
+
+        output_dir = Path(bpy.path.abspath(settings.output_path))
+
+        try:
+            frames = batch.render_isometric_batch(
+                context.scene, context.view_layer, controllers,
+                projections, settings.rotation_steps, output_dir
+            )
+
+            if settings.build_atlas:
+                atlas.build_sprite_atlas(
+                    frames, atlas_output_path(settings),
+                    padding=settings.atlas_padding,
+                    trim=settings.trim_sprites,
+                    power_of_two=settings.power_of_two,
+                )
+
+        except (IOError, OSError, PermissionError) as e:
+            self.report({'ERROR'}, f"File system error: {str(e)}")
+            return {'CANCELLED'}
+        except (RuntimeError, ValueError) as e:
+            self.report({'ERROR'}, f"Batch render error: {str(e)}")
+            return {'CANCELLED'}
+        except Exception as e:
+            # Catch unexpected errors but log them
+            logger.exception("Unexpected error during isometric batch render")
+            self.report({'ERROR'}, f"Unexpected error during batch render: {str(e)}")
+            return {'CANCELLED'}
+
+        self.report({'INFO'}, f"Rendered {len(frames)} frames to {output_dir}")
+        return {'FINISHED'}
+
+
+class ISOMETRIC_OT_pack_atlas(bpy.types.Operator):
+    """Packs previously rendered isometric frames into a sprite atlas"""
+    bl_idname = "cgt.isometric_pack_atlas"
+    bl_label = "Pack Sprite Atlas"
+    bl_description = "Trims, bin-packs and blits every PNG/EXR frame in the output folder into one atlas with a JSON index"
+    bl_options = {'REGISTER'}
+
+    def execute(self, context):
+        settings = context.scene.pe_iso_batch
+        output_dir = Path(bpy.path.abspath(settings.output_path))
+        atlas_path = atlas_output_path(settings)
+
+        if not output_dir.exists():
+            self.report({'ERROR'}, f"Output folder not found: {output_dir}. Run the batch render first.")
+            return {'CANCELLED'}
+
+        # Never pack a previous atlas into the new one
+        previous = [output_dir / f"atlas{ext}" for ext in (".png", ".exr")]
+        frames = atlas.collect_frames(output_dir, exclude=previous)
+        if not frames:
+            self.report({'ERROR'}, f"No PNG or EXR frames found in {output_dir}")
+            return {'CANCELLED'}
+
+        try:
+            document = atlas.build_sprite_atlas(
+                frames, atlas_path,
+                padding=settings.atlas_padding,
+                trim=settings.trim_sprites,
+                power_of_two=settings.power_of_two,
+            )
+        except (IOError, OSError, PermissionError) as e:
+            self.report({'ERROR'}, f"File system error: {str(e)}")
+            return {'CANCELLED'}
+        except ValueError as e:
+            self.report({'ERROR'}, f"Atlas error: {str(e)}")
+            return {'CANCELLED'}
+
+        size = document['meta']['size']
+        self.report({'INFO'}, f"Packed {len(frames)} frames into {atlas_path.name} ({size['w']}x{size['h']})")
+        return {'FINISHED'}
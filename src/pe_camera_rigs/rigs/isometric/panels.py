@@ -25,6 +25,42 @@ class ISOMETRIC_PT_add_panel(bpy.types.Panel):
         op.initial_preset = context.scene.pe_iso_cam_add_props.initial_preset
 
 
+class ISOMETRIC_PT_batch_render(bpy.types.Panel):
+    """Sub-panel for batch rendering projections and sprite atlases."""
+    bl_label = "Batch Render"
+    bl_idname = "ISOMETRIC_PT_batch_render"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_parent_id = 'ISOMETRIC_PT_add_panel'
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        layout = self.layout
+        settings = context.scene.pe_iso_batch
+
+        col = layout.column(align=True)
+        col.label(text="Projections:")
+        col.prop(settings, "projections")
+
+        col = layout.column(align=True)
+        col.prop(settings, "rotation_steps")
+        col.prop(settings, "selected_only")
+        col.prop(settings, "output_path", text="")
+
+        box = layout.box()
+        box.prop(settings, "build_atlas")
+        col = box.column(align=True)
+        col.prop(settings, "atlas_format")
+        col.prop(settings, "trim_sprites")
+        col.prop(settings, "atlas_padding")
+        col.prop(settings, "power_of_two")
+
+        col = layout.column()
+        col.scale_y = 1.3
+        col.operator("cgt.isometric_batch_render", icon='RENDER_ANIMATION')
+        col.operator("cgt.isometric_pack_atlas", icon='IMAGE_DATA')
+
+
 class ISOMETRIC_PT_controller_settings(bpy.types.Panel):
     """Draws the UI in the Object Properties panel for the controller."""
     bl_label = "Isometric Camera Controller"
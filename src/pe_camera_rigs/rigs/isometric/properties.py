@@ -23,6 +23,10 @@ PROJECTION_TYPE_TO_INDEX = {
 }
 
 
+# Presets that can be batch rendered (CUSTOM has no fixed angles)
+BATCH_PROJECTION_TYPES = [item for item in PROJECTION_TYPES if item[0] != 'CUSTOM']
+
+
 # === Update Callbacks ===
 
 def update_projection_type(self, context):
@@ -155,15 +159,91 @@ class PE_IsometricCameraSettings(bpy.types.PropertyGroup):
     )
 
 
+class PE_IsometricBatchSettings(bpy.types.PropertyGroup):
+    """Scene-level settings for batch rendering isometric controllers."""
+
+    projections: bpy.props.EnumProperty(
+        name="Projections",
+        items=BATCH_PROJECTION_TYPES,
+        options={'ENUM_FLAG'},
+        default={'GAME_2_1', 'TRUE_ISOMETRIC'},
+        description="Projection presets to render for every controller"
+    )
+
+    rotation_steps: bpy.props.IntProperty(
+        name="Rotation Steps",
+        description="Number of evenly spaced headings per projection (8 for 8-direction sprites)",
+        default=8,
+        min=1,
+        max=64
+    )
+
+    selected_only: bpy.props.BoolProperty(
+        name="Selected Controllers Only",
+        description="Only render selected isometric controllers instead of all in the scene",
+        default=False
+    )
+
+    output_path: bpy.props.StringProperty(
+        name="Output Path",
+        subtype='DIR_PATH',
+        default="//renders/isometric/",
+        description="Directory for rendered frames and the sprite atlas"
+    )
+
+    build_atlas: bpy.props.BoolProperty(
+        name="Build Sprite Atlas",
+        description="Pack all rendered frames into one atlas image with a JSON index",
+        default=True
+    )
+
+    atlas_format: bpy.props.EnumProperty(
+        name="Atlas Format",
+        items=[
+            ('PNG', "PNG", "8-bit RGBA atlas for game engines"),
+            ('EXR', "OpenEXR", "Half-float RGBA atlas for further compositing"),
+        ],
+        default='PNG',
+        description="File format of the sprite atlas"
+    )
+
+    trim_sprites: bpy.props.BoolProperty(
+        name="Trim Transparent Borders",
+        description="Crop each frame to its opaque bounding box before packing",
+        default=True
+    )
+
+    atlas_padding: bpy.props.IntProperty(
+        name="Padding",
+        description="Gap between sprites in the atlas, in pixels",
+        default=2,
+        min=0,
+        max=64,
+        subtype='PIXEL'
+    )
+
+    power_of_two: bpy.props.BoolProperty(
+        name="Power of Two",
+        description="Round the atlas size up to powers of two",
+        default=False
+    )
+
+
 def register():
     bpy.utils.register_class(PE_IsometricCameraAddProps)
     bpy.utils.register_class(PE_IsometricCameraSettings)
+    bpy.utils.register_class(PE_IsometricBatchSettings)
 
     # Scene property for add panel
     bpy.types.Scene.pe_iso_cam_add_props = bpy.props.PointerProperty(
         type=PE_IsometricCameraAddProps
     )
 
+    # Scene property for batch rendering
+    bpy.types.Scene.pe_iso_batch = bpy.props.PointerProperty(
+        type=PE_IsometricBatchSettings
+    )
+
     # Object property for controller settings
     bpy.types.Object.pe_iso_cam = bpy.props.PointerProperty(
         type=PE_IsometricCameraSettings
@@ -173,8 +253,10 @@ def register():
 def unregister():
     # Remove properties first
     del bpy.types.Object.pe_iso_cam
+    del bpy.types.Scene.pe_iso_batch
     del bpy.types.Scene.pe_iso_cam_add_props
 
     # Unregister classes
+    bpy.utils.unregister_class(PE_IsometricBatchSettings)
     bpy.utils.unregister_class(PE_IsometricCameraSettings)
     bpy.utils.unregister_class(PE_IsometricCameraAddProps)
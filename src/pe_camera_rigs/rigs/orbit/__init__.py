@@ -7,20 +7,38 @@ from . import properties
 
 classes = (
     properties.PE_OrbitCameraAddProps,
-    panels.ORBIT_PT_add_panel,
+    properties.PE_OrbitBatchSettings,
     operators.ORBIT_OT_add_controller,
+    operators.ORBIT_OT_bake_camera,
+    operators.ORBIT_OT_batch_render,
+)
+
+# Sidebar panels, skipped by the headless registration profile
+ui_classes = (
+    panels.ORBIT_PT_add_panel,
+    panels.ORBIT_PT_batch_render,
 )
 
-def register():
+def register(headless=False):
     for cls in classes:
         bpy.utils.register_class(cls)
 
     # Add the property group to Blender's Scene type
     bpy.types.Scene.pe_orbit_cam_add_props = bpy.props.PointerProperty(type=properties.PE_OrbitCameraAddProps)
+    bpy.types.Scene.pe_orbit_batch = bpy.props.PointerProperty(type=properties.PE_OrbitBatchSettings)
+
+    if not headless:
+        for cls in ui_classes:
+            bpy.utils.register_class(cls)
+
 
+def unregister(headless=False):
+    if not headless:
+        for cls in reversed(ui_classes):
+            bpy.utils.unregister_class(cls)
 
-def unregister():
     # Delete the custom property from Blender's Scene type
+    del bpy.types.Scene.pe_orbit_batch
     del bpy.types.Scene.pe_orbit_cam_add_props
 
     for cls in reversed(classes):
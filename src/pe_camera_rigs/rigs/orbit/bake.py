@@ -0,0 +1,117 @@
+"""
+Bakes a procedural orbit rig to a plain keyframed camera.
+
+The orbit path is sampled for the whole frame range at once with the
+NumPy evaluator in utils.rig_math, and written to F-curves with
+keyframe_points.foreach_set(). The scene frame is never stepped, so
+baking thousands of frames takes milliseconds.
+"""
+
+import bpy
+import numpy as np
+from mathutils import Vector
+
+from ...utils.animation import write_fcurve
+from ...utils.blender import get_modifier_input, safe_object_delete
+from ...utils.rig_math import EASING_LINEAR, sample_orbit_path, look_at_euler
+from ...constants import ORBIT_BAKED_CAM_NAME
+
+
+def read_orbit_controller(controller):
+    """
+    Reads the current orbit settings from a controller's modifier.
+
+    Args:
+        controller (bpy.types.Object): An Orbit_Controller empty
+
+    Returns:
+        dict: Keyword arguments for sample_orbit_path(), plus 'focal_length',
+            'template' and 'target' objects. None if no orbit modifier exists.
+    """
+    mod = controller.modifiers.get("Orbit Camera")
+    if not mod or not mod.node_group:
+        return None
+
+    target = get_modifier_input(mod, "Target Object")
+    return {
+        'radius': get_modifier_input(mod, "Orbit Radius", 3.0),
+        'height': get_modifier_input(mod, "Camera Height", 1.5),
+        'duration': get_modifier_input(mod, "Duration (Frames)", 240),
+        'speed_multiplier': get_modifier_input(mod, "Speed Multiplier", 1.0),
+        'reverse': bool(get_modifier_input(mod, "Reverse Direction", False)),
+        'easing': get_modifier_input(mod, "Easing", EASING_LINEAR),
+        'start_angle_offset': get_modifier_input(mod, "Start Angle Offset", 0.0),
+        'target_location': tuple(target.matrix_world.translation) if target else (0.0, 0.0, 0.0),
+        'focal_length': get_modifier_input(mod, "Focal Length", 35.0),
+        'template': get_modifier_input(mod, "Camera Template Object"),
+        'target': target,
+    }
+
+
+def bake_orbit_controller(controller, frame_start, frame_end, remove_controller=False):
+    """
+    Bakes an orbit controller to a new keyframed camera object.
+
+    The baked camera is linked to the controller's first collection and
+    placed in world space, so it stays valid once the controller is removed.
+
+    Args:
+        controller (bpy.types.Object): An Orbit_Controller empty
+        frame_start (int): First frame to bake
+        frame_end (int): Last frame to bake (inclusive)
+        remove_controller (bool): Delete the controller and its template
+            camera after baking
+
+    Returns:
+        bpy.types.Object: The baked camera object
+
+    Raises:
+        ValueError: If the controller has no orbit modifier or the range is empty
+    """
+    params = read_orbit_controller(controller)
+    if params is None:
+        raise ValueError(f"'{controller.name}' has no Orbit Camera modifier")
+    if frame_end < frame_start:
+        raise ValueError("Bake range is empty: end frame is before start frame")
+    if not controller.users_collection:
+        raise ValueError(f"'{controller.name}' is not linked to any collection")
+
+    template = params.pop('template')
+    focal_length = params.pop('focal_length')
+    params.pop('target')
+
+    frames = np.arange(frame_start, frame_end + 1, dtype=np.float64)
+    local_locations = sample_orbit_path(frames, **params)
+
+    # GN output lives in the controller's space; bring it to world space
+    matrix = np.array(controller.matrix_world, dtype=np.float64)
+    locations = local_locations @ matrix[:3, :3].T + matrix[:3, 3]
+    target = matrix[:3, :3] @ np.asarray(params['target_location']) + matrix[:3, 3]
+    rotations = look_at_euler(locations, target)
+
+    # Create the plain camera, keeping any user tweaks from the template
+    if template and template.type == 'CAMERA':
+        cam_data = template.data.copy()
+    else:
+        cam_data = bpy.data.cameras.new(name=f"{ORBIT_BAKED_CAM_NAME}Data")
+    cam_data.lens = focal_length
+
+    camera = bpy.data.objects.new(name=ORBIT_BAKED_CAM_NAME, object_data=cam_data)
+    controller.users_collection[0].objects.link(camera)
+    camera.rotation_mode = 'XYZ'
+    camera.location = Vector(locations[0])
+    camera.rotation_euler = tuple(rotations[0])
+
+    camera.animation_data_create()
+    action = bpy.data.actions.new(name=f"{camera.name}Action")
+    camera.animation_data.action = action
+
+    for axis in range(3):
+        write_fcurve(action, "location", axis, frames, locations[:, axis], group="Object Transforms")
+        write_fcurve(action, "rotation_euler", axis, frames, rotations[:, axis], group="Object Transforms")
+
+    if remove_controller:
+        safe_object_delete(controller)
+        safe_object_delete(template)
+
+    return camera
@@ -0,0 +1,162 @@
+"""
+Turntable batch rendering for many orbit rigs in one Blender session.
+
+Each Orbit_Controller (or each SKU collection holding one) is rendered in
+turn: the scene camera is switched to its generated camera, the frame
+range is fitted to its Duration (Frames), and frames go to a per-rig
+folder. Persistent data keeps the scene synced between rigs, so hundreds
+of turntables pay for startup and scene load once.
+"""
+
+import json
+import logging
+import math
+import time
+from pathlib import Path
+
+import bpy
+
+from ...utils.blender import get_modifier_input, find_generated_camera
+
+logger = logging.getLogger(__name__)
+
+ORBIT_MODIFIER_NAME = "Orbit Camera"
+BATCH_REPORT_NAME = "batch_report.json"
+
+
+def find_orbit_controllers(objects):
+    """Returns the objects carrying an orbit GN modifier."""
+    return [obj for obj in objects if obj.modifiers.get(ORBIT_MODIFIER_NAME)]
+
+
+def collect_batch_jobs(scene, source='ALL', parent_collection=None):
+    """
+    Builds the list of turntable jobs for a batch.
+
+    Args:
+        scene (bpy.types.Scene): Scene holding the rigs
+        source (str): 'ALL' controllers in the scene, 'SELECTED' controllers,
+            or 'COLLECTIONS' to render each child collection of
+            `parent_collection` as one SKU
+        parent_collection (bpy.types.Collection): Parent of the SKU collections
+
+    Returns:
+        list: Dicts with 'name', 'controller' and 'collection' (None unless
+            source is 'COLLECTIONS')
+    """
+    if source == 'COLLECTIONS':
+        if parent_collection is None:
+            raise ValueError("Choose a parent collection holding one collection per SKU")
+        jobs = []
+        for collection in parent_collection.children:
+            controllers = find_orbit_controllers(collection.all_objects)
+            if controllers:
+                jobs.append({'name': collection.name, 'controller': controllers[0], 'collection': collection})
+            else:
+                logger.warning("Skipping collection '%s': no orbit controller", collection.name)
+        return jobs
+
+    controllers = find_orbit_controllers(scene.objects)
+    if source == 'SELECTED':
+        controllers = [obj for obj in controllers if obj.select_get()]
+    return [{'name': obj.name, 'controller': obj, 'collection': None} for obj in controllers]
+
+
+def orbit_frame_count(controller):
+    """Frames needed for one full revolution of a controller."""
+    mod = controller.modifiers.get(ORBIT_MODIFIER_NAME)
+    duration = get_modifier_input(mod, "Duration (Frames)", 240)
+    speed = get_modifier_input(mod, "Speed Multiplier", 1.0) or 1.0
+    return max(1, int(math.ceil(duration / speed)))
+
+
+def render_orbit_batch(scene, view_layer, jobs, output_dir):
+    """
+    Renders one turntable per job and writes a summary report.
+
+    A failing rig is recorded in the report and the batch moves on.
+
+    Args:
+        scene (bpy.types.Scene): Scene to render
+        view_layer (bpy.types.ViewLayer): View layer used to find the generated cameras
+        jobs (list): Jobs from collect_batch_jobs()
+        output_dir (str): Root folder; each rig renders to <output_dir>/<name>/
+
+    Returns:
+        dict: The report written to <output_dir>/batch_report.json
+    """
+    render = scene.render
+    original_settings = {
+        'use_persistent_data': render.use_persistent_data,
+        'filepath': render.filepath,
+        'frame_start': scene.frame_start,
+        'frame_end': scene.frame_end,
+        'camera': scene.camera,
+    }
+    # Only one SKU collection is visible at a time
+    sku_collections = [job['collection'] for job in jobs if job['collection'] is not None]
+    original_hide_render = {c.name: c.hide_render for c in sku_collections}
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    results = []
+    batch_start = time.perf_counter()
+
+    try:
+        render.use_persistent_data = True
+
+        for index, job in enumerate(jobs, start=1):
+            controller = job['controller']
+            rig_dir = output_dir / bpy.path.clean_name(job['name'])
+            result = {'name': job['name'], 'controller': controller.name, 'output': str(rig_dir)}
+            logger.info("Rendering turntable %d/%d: %s", index, len(jobs), job['name'])
+            start = time.perf_counter()
+
+            try:
+                for collection in sku_collections:
+                    collection.hide_render = collection is not job['collection']
+
+                view_layer.update()
+                camera = find_generated_camera(view_layer.depsgraph, controller)
+                if camera is None:
+                    raise RuntimeError("Could not find the generated camera")
+
+                frame_count = orbit_frame_count(controller)
+                scene.camera = camera
+                scene.frame_start = original_settings['frame_start']
+                scene.frame_end = original_settings['frame_start'] + frame_count - 1
+
+                rig_dir.mkdir(parents=True, exist_ok=True)
+                render.filepath = str(rig_dir / "frame_")
+                bpy.ops.render.render(animation=True, scene=scene.name)
+
+                result.update(status='done', frames=frame_count)
+            except (RuntimeError, OSError) as e:
+                logger.error("Turntable '%s' failed: %s", job['name'], e)
+                result.update(status='failed', error=str(e))
+
+            result['seconds'] = round(time.perf_counter() - start, 3)
+            results.append(result)
+    finally:
+        render.use_persistent_data = original_settings['use_persistent_data']
+        render.filepath = original_settings['filepath']
+        scene.frame_start = original_settings['frame_start']
+        scene.frame_end = original_settings['frame_end']
+        scene.camera = original_settings['camera']
+        for collection in sku_collections:
+            collection.hide_render = original_hide_render[collection.name]
+
+    report = {
+        'blend_file': bpy.data.filepath,
+        'scene': scene.name,
+        'total_seconds': round(time.perf_counter() - batch_start, 3),
+        'rigs': len(results),
+        'succeeded': sum(1 for r in results if r['status'] == 'done'),
+        'failed': sum(1 for r in results if r['status'] == 'failed'),
+        'frames': sum(r.get('frames', 0) for r in results),
+        'results': results,
+    }
+    with open(output_dir / BATCH_REPORT_NAME, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    return report
@@ -1,9 +1,19 @@
 import bpy
 import math
-from ...utils.nodes import create_orbit_camera_node_group
-from ...utils.blender import set_modifier_input
+import logging
+from pathlib import Path
+from ...utils.blender import set_modifier_input, find_generated_camera
+from ...utils.lazy import lazy_import
 from ...constants import ORBIT_TEMPLATE_CAM_NAME, ORBIT_CONTROLLER_NAME
 
+logger = logging.getLogger(__name__)
+
+# Loaded on first use, so registering the operators stays cheap
+nodes = lazy_import("...utils.nodes", __package__)
+rig_math = lazy_import("...utils.rig_math", __package__)
+bake = lazy_import(".bake", __package__)
+batch = lazy_import(".batch", __package__)
+
 # Define presets with initial values for the modifier inputs
 # These correspond to the order of inputs in create_orbit_camera_node_group()
 ORBIT_PRESETS = {
@@ -56,7 +66,7 @@ class ORBIT_OT_add_controller(bpy.types.Operator):
             context.collection.objects.link(template_cam_obj) # Link it so it saves
 
             # 2. Create the Geometry Node group for the orbit logic
-            node_group = create_orbit_camera_node_group()
+            node_group = nodes.create_orbit_camera_node_group()
 
             if not node_group:
                 self.report({'ERROR'}, "Failed to create orbit camera node group")
@@ -93,8 +103,7 @@ class ORBIT_OT_add_controller(bpy.types.Operator):
             set_modifier_input(mod, "Reverse Direction", initial_values['reverse'])
 
             # Easing is a bit special, needs to be mapped from string to int
-            easing_map = {"LINEAR": 0, "EASE_IN_OUT": 1, "EASE_IN": 2, "EASE_OUT": 3}
-            set_modifier_input(mod, "Easing", easing_map.get(initial_values['easing'], 0))
+            set_modifier_input(mod, "Easing", rig_math.EASING_MODES.get(initial_values['easing'], 0))
 
             # 6. Make the new rig active
             bpy.ops.object.select_all(action='DESELECT')
@@ -106,14 +115,7 @@ class ORBIT_OT_add_controller(bpy.types.Operator):
             context.view_layer.update()
             depsgraph = context.evaluated_depsgraph_get()
 
-            generated_cam_obj = None
-            for obj_instance in depsgraph.object_instances:
-                # Check if the object instance is from our controller's modifier and is a camera
-                if obj_instance.parent and obj_instance.parent.original == controller and obj_instance.is_instance:
-                    if obj_instance.object.original.type == 'CAMERA':
-                        # This is the instanced camera object.
-                        generated_cam_obj = obj_instance.object.original
-                        break
+            generated_cam_obj = find_generated_camera(depsgraph, controller)
 
             if generated_cam_obj:
                 context.scene.camera = generated_cam_obj
@@ -150,3 +152,99 @@ class ORBIT_OT_add_controller(bpy.types.Operator):
             if controller and controller.name in bpy.data.objects:
                 bpy.data.objects.remove(controller, do_unlink=True)
             return {'CANCELLED'}
+
+
+class ORBIT_OT_bake_camera(bpy.types.Operator):
+    """Bakes the active Orbit Controller to a plain keyframed camera"""
+    bl_idname = "cgt.bake_orbit_camera"
+    bl_label = "Bake Orbit Camera"
+    bl_description = "Samples the orbit path over the frame range and keys it on a regular camera, for render farms and other DCCs"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    use_scene_range: bpy.props.BoolProperty(
+        name="Use Scene Frame Range",
+        description="Bake from the scene start to end frame",
+        default=True
+    )
+    frame_start: bpy.props.IntProperty(name="Start Frame", default=1)
+    frame_end: bpy.props.IntProperty(name="End Frame", default=250)
+    remove_controller: bpy.props.BoolProperty(
+        name="Remove Controller",
+        description="Delete the Geometry Nodes controller and its template camera after baking",
+        default=False
+    )
+
+    @classmethod
+    def poll(cls, context):
+        """Only enable if the active object is an orbit controller."""
+        obj = context.active_object
+        return obj is not None and obj.modifiers.get("Orbit Camera") is not None
+
+    def execute(self, context):
+        controller = context.active_object
+        scene = context.scene
+
+        if self.use_scene_range:
+            frame_start, frame_end = scene.frame_start, scene.frame_end
+        else:
+            frame_start, frame_end = self.frame_start, self.frame_end
+
+        try:
+            camera = bake.bake_orbit_controller(
+                controller, frame_start, frame_end,
+                remove_controller=self.remove_controller
+            )
+        except ValueError as e:
+            self.report({'ERROR'}, str(e))
+            return {'CANCELLED'}
+        except RuntimeError as e:
+            self.report({'ERROR'}, f"Blender API error: {str(e)}")
+            return {'CANCELLED'}
+
+        # The generated GN camera is gone (or about to be replaced), use the baked one
+        scene.camera = camera
+        for obj in context.selected_objects:
+            obj.select_set(False)
+        context.view_layer.objects.active = camera
+        camera.select_set(True)
+
+        self.report({'INFO'}, f"Baked {frame_end - frame_start + 1} frames to '{camera.name}'.")
+        return {'FINISHED'}
+
+
+class ORBIT_OT_batch_render(bpy.types.Operator):
+    """Renders a turntable for every orbit rig in one session"""
+    bl_idname = "cgt.orbit_batch_render"
+    bl_label = "Batch Render Turntables"
+    bl_description = "Renders each orbit rig over its own duration into per-rig folders and writes a summary report"
+    bl_options = {'REGISTER'}
+
+    def execute(self, context):
+        settings = context.scene.pe_orbit_batch
+
+        try:
+            jobs = batch.collect_batch_jobs(context.scene, settings.source, settings.parent_collection)
+        except ValueError as e:
+            self.report({'ERROR'}, str(e))
+            return {'CANCELLED'}
+
+        if not jobs:
+            self.report({'ERROR'}, "No orbit rigs to render")
+            return {'CANCELLED'}
+
+        output_dir = Path(bpy.path.abspath(settings.output_path))
+
+        try:
+            report = batch.render_orbit_batch(context.scene, context.view_layer, jobs, output_dir)
+        except (IOError, OSError, PermissionError) as e:
+            self.report({'ERROR'}, f"File system error: {str(e)}")
+            return {'CANCELLED'}
+        except Exception as e:
+            # Catch unexpected errors but log them
+            logger.exception("Unexpected error during turntable batch")
+            self.report({'ERROR'}, f"Unexpected error during turntable batch: {str(e)}")
+            return {'CANCELLED'}
+
+        level = 'WARNING' if report['failed'] else 'INFO'
+        self.report({level}, f"Rendered {report['succeeded']}/{report['rigs']} turntables in {report['total_seconds']:.0f}s. Report: {output_dir}")
+        return {'FINISHED'}
@@ -25,3 +25,35 @@ class ORBIT_PT_add_panel(bpy.types.Panel):
         # The operator button will use the value from the dropdown
         op = col.operator("cgt.add_orbit_controller", text="Add Orbit Rig", icon='CAMERA_DATA')
         op.preset = context.scene.pe_orbit_cam_add_props.preset
+
+        # Bake the active controller to a plain keyframed camera
+        obj = context.active_object
+        if obj is not None and obj.modifiers.get("Orbit Camera") is not None:
+            layout.separator()
+            col = layout.column(align=True)
+            col.label(text=f"Active: {obj.name}")
+            col.operator("cgt.bake_orbit_camera", text="Bake to Keyframes", icon='KEYINGSET')
+
+
+class ORBIT_PT_batch_render(bpy.types.Panel):
+    """Sub-panel for rendering many orbit turntables in one job."""
+    bl_label = "Batch Turntables"
+    bl_idname = "ORBIT_PT_batch_render"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_parent_id = 'ORBIT_PT_add_panel'
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        layout = self.layout
+        settings = context.scene.pe_orbit_batch
+
+        col = layout.column(align=True)
+        col.prop(settings, "source", text="")
+        if settings.source == 'COLLECTIONS':
+            col.prop(settings, "parent_collection", text="")
+        col.prop(settings, "output_path", text="")
+
+        col = layout.column()
+        col.scale_y = 1.3
+        col.operator("cgt.orbit_batch_render", icon='RENDER_ANIMATION')
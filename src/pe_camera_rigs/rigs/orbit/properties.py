@@ -18,3 +18,28 @@ class PE_OrbitCameraAddProps(bpy.types.PropertyGroup):
         default='PRODUCT',
         description="Select the initial preset for the new orbit camera rig"
     )
+
+
+class PE_OrbitBatchSettings(bpy.types.PropertyGroup):
+    """Scene-level settings for batch rendering orbit turntables."""
+    source: bpy.props.EnumProperty(
+        name="Rigs",
+        items=[
+            ('ALL', "All Controllers", "Render every orbit controller in the scene"),
+            ('SELECTED', "Selected Controllers", "Render only selected orbit controllers"),
+            ('COLLECTIONS', "SKU Collections", "Render each child collection of a parent collection as its own turntable"),
+        ],
+        default='ALL',
+        description="Which orbit rigs to render"
+    )
+    parent_collection: bpy.props.PointerProperty(
+        name="Parent Collection",
+        type=bpy.types.Collection,
+        description="Collection whose children each hold one product and its orbit controller"
+    )
+    output_path: bpy.props.StringProperty(
+        name="Output Path",
+        subtype='DIR_PATH',
+        default="//renders/turntables/",
+        description="Root folder; every rig renders into its own sub-folder"
+    )
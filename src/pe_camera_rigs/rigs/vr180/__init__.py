@@ -1,9 +1,12 @@
 import bpy
 
-from . import rig
 from .operators import (
     VR180_OT_CreateScene,
+    VR180_OT_BakeIPDSchedule,
+    VR180_OT_ClearIPDSchedule,
     VR180_OT_RenderSequences,
+    VR180_OT_EstimateRender,
+    VR180_OT_CalibrateWorkers,
     VR180_OT_SetupCompositor,
     VR180_OT_RenderYouTube,
 )
@@ -12,22 +15,36 @@ from .properties import PE_VR180SceneSettings, PE_VR180RigSettings
 
 classes = (
     VR180_OT_CreateScene,
+    VR180_OT_BakeIPDSchedule,
+    VR180_OT_ClearIPDSchedule,
     VR180_OT_RenderSequences,
+    VR180_OT_EstimateRender,
+    VR180_OT_CalibrateWorkers,
     VR180_OT_SetupCompositor,
     VR180_OT_RenderYouTube,
-    VR180_PT_Workflow,
     PE_VR180SceneSettings,
     PE_VR180RigSettings,
 )
 
-def register():
+# Sidebar panels, skipped by the headless registration profile
+ui_classes = (
+    VR180_PT_Workflow,
+)
+
+def register(headless=False):
     for cls in classes:
         bpy.utils.register_class(cls)
     bpy.types.Scene.pe_vr180_settings = bpy.props.PointerProperty(type=PE_VR180SceneSettings)
     bpy.types.Object.pe_vr180_rig_settings = bpy.props.PointerProperty(type=PE_VR180RigSettings)
+    if not headless:
+        for cls in ui_classes:
+            bpy.utils.register_class(cls)
 
 
-def unregister():
+def unregister(headless=False):
+    if not headless:
+        for cls in reversed(ui_classes):
+            bpy.utils.unregister_class(cls)
     del bpy.types.Scene.pe_vr180_settings
     del bpy.types.Object.pe_vr180_rig_settings
     for cls in reversed(classes):
@@ -1,27 +1,52 @@
 import bpy
+import json
 import math
 import os
 import logging
 from pathlib import Path
+
 from bpy.types import Operator
-from bpy.props import EnumProperty, FloatProperty, BoolProperty
+from bpy.props import EnumProperty, FloatProperty, BoolProperty, IntProperty
 
 logger = logging.getLogger(__name__)
 
-from .rig import create_vr180_rig
+from ...utils.lazy import lazy_import
+from ...utils import job_queue
 from ...utils.scene_setup import (
     create_lighting_preset,
     create_cyclorama,
-    add_reference_sphere,
+    add_reference_capsule,
+    LIGHTING_PRESET_ITEMS,
+    hdri_file_exists,
+)
+from ...utils.render import (
+    snapshot_render_settings,
+    restore_render_settings,
+    estimate_sequence,
+    format_duration,
 )
 from ...constants import (
     VR180_RIG_NAME,
     VR180_LEFT_CAM_NAME,
     VR180_RIGHT_CAM_NAME,
     VR180_COMPOSITOR_SCENE_NAME,
-    REFERENCE_CAPSULE_NAME,
 )
 
+# Loaded on first use, so registering the operators stays cheap
+np = lazy_import("numpy")
+camera_rig = lazy_import(".rig", __package__)
+pipeline = lazy_import(".pipeline", __package__)
+animation = lazy_import("...utils.animation", __package__)
+rig_math = lazy_import("...utils.rig_math", __package__)
+
+
+def _track(scene, step):
+    """Records an operator step in the rig's job store, which the panel reads."""
+    settings = scene.pe_vr180_settings
+    return job_queue.track_step(
+        settings.job_store(), 'vr180', scene.name, step, blend=bpy.data.filepath, draft=settings.draft_mode,
+    )
+
 class VR180_OT_CreateScene(Operator):
     """Create VR180 Scene - Sets up a VR180 rig and scene elements"""
     bl_idname = "vr180.create_scene"
@@ -32,10 +57,7 @@ class VR180_OT_CreateScene(Operator):
     # Operator properties to receive settings from the UI panel
     lighting_preset: EnumProperty(
         name="Lighting",
-        items=[
-            ('NONE', "None", "No lights added"),
-            ('3POINT_STUDIO', "3-Point (Studio)", "Professional 3-point studio lighting"),
-        ],
+        items=LIGHTING_PRESET_ITEMS,
         default='3POINT_STUDIO',
     )
     include_cyclorama: BoolProperty(name="Cyclorama Stage", default=True)
@@ -46,8 +68,12 @@ class VR180_OT_CreateScene(Operator):
     def execute(self, context):
         settings = context.scene.pe_vr180_settings
 
+        if self.lighting_preset == 'HDRI' and not hdri_file_exists(settings.hdri_path):
+            self.report({'ERROR'}, f"HDRI not found: '{settings.hdri_path}'. Choose a .hdr/.exr file.")
+            return {'CANCELLED'}
+
         # 1. Create the parented VR180 camera rig
-        rig, left_cam, right_cam = create_vr180_rig(context)
+        rig, left_cam, right_cam = camera_rig.create_vr180_rig(context.collection, ipd=settings.ipd)
         
         # 2. Assign rig-specific settings from the UI to the rig's custom properties
         if hasattr(rig, "pe_vr180_rig_settings"):
@@ -57,13 +83,15 @@ class VR180_OT_CreateScene(Operator):
 
         # 3. Create lighting, cyclorama, and reference objects
         if self.lighting_preset != 'NONE':
-            create_lighting_preset(context, preset=self.lighting_preset)
+            create_lighting_preset(
+                context.collection, preset=self.lighting_preset,
+                scene=context.scene, hdri=settings.hdri_settings(),
+            )
         if self.include_cyclorama:
-            create_cyclorama(context, size=self.cyclorama_size, color=self.cyclorama_color)
+            create_cyclorama(context.collection, size=self.cyclorama_size, color=self.cyclorama_color)
         if self.include_reference:
             # For VR180, a capsule is better than a sphere for human scale
-            bpy.ops.mesh.primitive_capsule_add(radius=0.25, depth=1.3, location=(0,0,0.9))
-            context.active_object.name = REFERENCE_CAPSULE_NAME
+            add_reference_capsule(context.collection)
             
         # 4. Auto-configure scene settings
         context.scene.render.engine = 'CYCLES'
@@ -80,6 +108,70 @@ class VR180_OT_CreateScene(Operator):
         self.report({'INFO'}, "VR180 Scene created! Adjust rig IPD in the 'Object Properties' tab.")
         return {'FINISHED'}
 
+class VR180_OT_BakeIPDSchedule(Operator):
+    """Bake IPD Schedule - Keys the eye separation from the distance to a subject"""
+    bl_idname = "vr180.bake_ipd_schedule"
+    bl_label = "Bake IPD Schedule"
+    bl_description = (
+        "Samples the rig-to-subject distance over the frame range and bakes a per-frame "
+        "IPD into the eye cameras' F-curves"
+    )
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        """Only enable if the VR180 rig exists and a subject is chosen."""
+        settings = context.scene.pe_vr180_settings
+        return VR180_RIG_NAME in bpy.data.objects and settings.ipd_subject is not None
+
+    def execute(self, context):
+        scene = context.scene
+        settings = scene.pe_vr180_settings
+        rig = bpy.data.objects.get(VR180_RIG_NAME)
+
+        if settings.ipd_min > settings.ipd_max:
+            self.report({'ERROR'}, "Min IPD is larger than Max IPD")
+            return {'CANCELLED'}
+        if scene.frame_end < scene.frame_start:
+            self.report({'ERROR'}, "Invalid frame range: End frame is before start frame")
+            return {'CANCELLED'}
+
+        try:
+            frames = np.arange(scene.frame_start, scene.frame_end + 1, dtype=np.float64)
+            distances = animation.subject_distances(scene, rig, settings.ipd_subject, frames)
+            ipd = rig_math.ipd_schedule(distances, **settings.ipd_schedule_settings())
+            camera_rig.bake_vr180_ipd(rig, frames, ipd)
+
+        except ValueError as e:
+            self.report({'ERROR'}, str(e))
+            return {'CANCELLED'}
+        except RuntimeError as e:
+            self.report({'ERROR'}, f"Blender API error: {str(e)}")
+            return {'CANCELLED'}
+        except Exception as e:
+            logger.exception("Unexpected error baking IPD schedule")
+            self.report({'ERROR'}, f"Unexpected error baking IPD schedule: {str(e)}")
+            return {'CANCELLED'}
+
+        self.report({'INFO'}, f"Baked IPD {ipd.min():.1f}-{ipd.max():.1f} mm over {len(frames)} frames")
+        return {'FINISHED'}
+
+class VR180_OT_ClearIPDSchedule(Operator):
+    """Clear IPD Schedule - Returns the eyes to the rig's static IPD"""
+    bl_idname = "vr180.clear_ipd_schedule"
+    bl_label = "Clear IPD Schedule"
+    bl_description = "Removes the baked IPD keys and places the eyes at the rig's IPD"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        return VR180_RIG_NAME in bpy.data.objects
+
+    def execute(self, context):
+        camera_rig.clear_vr180_ipd_schedule(bpy.data.objects[VR180_RIG_NAME])
+        self.report({'INFO'}, "IPD schedule cleared")
+        return {'FINISHED'}
+
 class VR180_OT_RenderSequences(Operator):
     """Render EXR Sequences - Crash-safe left/right eye sequences"""
     bl_idname = "vr180.render_sequences"
@@ -137,72 +229,23 @@ class VR180_OT_RenderSequences(Operator):
         return True
 
     def execute(self, context):
-        settings = context.scene.pe_vr180_settings
-
         # Validate preconditions before starting render
         if not self._validate_preconditions(context):
             return {'CANCELLED'}
 
-        # Store original render settings
-        render = context.scene.render
-        original_settings = {
-            'engine': render.engine,
-            'filepath': render.filepath,
-            'resolution_x': render.resolution_x,
-            'resolution_y': render.resolution_y,
-            'resolution_percentage': render.resolution_percentage,
-            'camera': context.scene.camera,
-            'image_settings': {
-                'file_format': render.image_settings.file_format,
-                'color_mode': render.image_settings.color_mode,
-                'color_depth': render.image_settings.color_depth,
-                'exr_codec': render.image_settings.exr_codec,
-            }
-        }
-
         try:
-            # 1. Detect the VR180 rig and its cameras
-            rig = bpy.data.objects.get(VR180_RIG_NAME)
-            if not rig:
-                self.report({'ERROR'}, f"No {VR180_RIG_NAME} found! Please run Step 1 first.")
-                return {'CANCELLED'}
-
-            left_cam_obj = bpy.data.objects.get(VR180_LEFT_CAM_NAME)
-            right_cam_obj = bpy.data.objects.get(VR180_RIGHT_CAM_NAME)
-
-            if not left_cam_obj or not right_cam_obj or left_cam_obj.parent != rig or right_cam_obj.parent != rig:
-                self.report({'ERROR'}, "Could not find left/right cameras. Please run Step 1 first.")
-                return {'CANCELLED'}
-
-            # 2. Create output folders
-            output_base_path = bpy.path.abspath(settings.output_path)
-            left_folder = Path(output_base_path) / "vr180" / "left"
-            right_folder = Path(output_base_path) / "vr180" / "right"
-            left_folder.mkdir(parents=True, exist_ok=True)
-            right_folder.mkdir(parents=True, exist_ok=True)
-
-            # 3. Configure render settings for OpenEXR
-            context.scene.render.engine = 'CYCLES'
-            context.scene.render.image_settings.file_format = 'OPEN_EXR'
-            context.scene.render.image_settings.color_depth = '32'
-            context.scene.render.image_settings.exr_codec = 'DWAA'
-            
-            # Per-eye resolution
-            context.scene.render.resolution_x = int(settings.resolution_x / 2)
-            context.scene.render.resolution_y = settings.resolution_y
-
-            # 4. Render Left Eye Sequence
-            context.scene.camera = left_cam_obj
-            context.scene.render.filepath = str(left_folder / "left_")
-            bpy.ops.render.render(animation=True)
-            self.report({'INFO'}, f"Rendered Left Eye sequence to {left_folder}")
-
-            # 5. Render Right Eye Sequence
-            context.scene.camera = right_cam_obj
-            context.scene.render.filepath = str(right_folder / "right_")
-            bpy.ops.render.render(animation=True)
-            self.report({'INFO'}, f"Rendered Right Eye sequence to {right_folder}")
+            if context.scene.pe_vr180_settings.stream_encode:
+                with _track(context.scene, 'stream') as job_id:
+                    video_path = pipeline.stream_sequences(context.scene, job_id=job_id)
+                self.report({'INFO'}, f"Rendered sequences and encoded {video_path}")
+            else:
+                with _track(context.scene, 'render') as job_id:
+                    folders = pipeline.render_sequences(context.scene, job_id=job_id)
+                self.report({'INFO'}, f"Rendered left/right eye sequences to {folders['left'].parent}")
 
+        except ValueError as e:
+            self.report({'ERROR'}, str(e))
+            return {'CANCELLED'}
         except (IOError, OSError, PermissionError) as e:
             self.report({'ERROR'}, f"File system error: {str(e)}")
             return {'CANCELLED'}
@@ -214,24 +257,131 @@ class VR180_OT_RenderSequences(Operator):
             logger.exception("Unexpected error during render")
             self.report({'ERROR'}, f"Unexpected error during render: {str(e)}")
             return {'CANCELLED'}
-        finally:
-            # 6. Restore original render settings
-            render = context.scene.render
-            render.engine = original_settings['engine']
-            render.filepath = original_settings['filepath']
-            render.resolution_x = original_settings['resolution_x']
-            render.resolution_y = original_settings['resolution_y']
-            render.resolution_percentage = original_settings['resolution_percentage']
-            render.image_settings.file_format = original_settings['image_settings']['file_format']
-            render.image_settings.color_mode = original_settings['image_settings']['color_mode']
-            render.image_settings.color_depth = original_settings['image_settings']['color_depth']
-            render.image_settings.exr_codec = original_settings['image_settings']['exr_codec']
-            context.scene.camera = original_settings['camera']
-        
+
         self.report({'INFO'}, "VR180 Sequences Rendered!")
         return {'FINISHED'}
 
 
+class VR180_OT_EstimateRender(Operator):
+    """Estimate Render - Trial-renders a few frames to predict time, disk and memory"""
+    bl_idname = "vr180.estimate_render"
+    bl_label = "Estimate Render"
+    bl_description = (
+        "Renders a few stratified frames at reduced resolution and samples, then "
+        "extrapolates time, disk usage and peak memory of the full sequence"
+    )
+    bl_options = {'REGISTER'}
+
+    trial_frames: IntProperty(name="Trial Frames", default=5, min=1, max=50)
+    resolution_scale: FloatProperty(name="Resolution Scale", default=0.25, min=0.05, max=1.0)
+    sample_scale: FloatProperty(name="Sample Scale", default=0.125, min=0.01, max=1.0)
+
+    @classmethod
+    def poll(cls, context):
+        """Only enable if VR180 scene has been created."""
+        return VR180_RIG_NAME in bpy.data.objects
+
+    def execute(self, context):
+        scene = context.scene
+        settings = scene.pe_vr180_settings
+
+        if scene.frame_end < scene.frame_start:
+            self.report({'ERROR'}, "Invalid frame range: End frame is before start frame")
+            return {'CANCELLED'}
+
+        left_cam_obj = bpy.data.objects.get(VR180_LEFT_CAM_NAME)
+        right_cam_obj = bpy.data.objects.get(VR180_RIGHT_CAM_NAME)
+        if not left_cam_obj or not right_cam_obj:
+            self.report({'ERROR'}, "Could not find left/right cameras. Please run Step 1 first.")
+            return {'CANCELLED'}
+
+        original_settings = snapshot_render_settings(scene)
+        try:
+            pipeline.configure_eye_render(scene, settings)
+            estimate = estimate_sequence(
+                scene, [left_cam_obj, right_cam_obj], scene.frame_start, scene.frame_end,
+                frame_count=self.trial_frames,
+                resolution_scale=self.resolution_scale,
+                sample_scale=self.sample_scale,
+            )
+
+            output_dir = settings.workflow_dir()
+            output_dir.mkdir(parents=True, exist_ok=True)
+            with open(output_dir / "estimate.json", 'w', encoding='utf-8') as f:
+                json.dump(estimate, f, indent=2)
+
+        except (IOError, OSError, PermissionError) as e:
+            self.report({'ERROR'}, f"File system error: {str(e)}")
+            return {'CANCELLED'}
+        except RuntimeError as e:
+            self.report({'ERROR'}, f"Render error: {str(e)}")
+            return {'CANCELLED'}
+        except Exception as e:
+            logger.exception("Unexpected error during render estimate")
+            self.report({'ERROR'}, f"Unexpected error during render estimate: {str(e)}")
+            return {'CANCELLED'}
+        finally:
+            restore_render_settings(scene, original_settings)
+
+        settings.estimate_total_seconds = estimate['total_seconds']
+        settings.estimate_seconds_per_frame = estimate['seconds_per_frame']
+        settings.estimate_disk_mb = estimate['total_bytes'] / (1024 * 1024)
+        settings.estimate_peak_memory_mb = estimate['peak_memory_mb'] or 0.0
+
+        self.report({'INFO'}, (
+            f"Estimated {format_duration(estimate['total_seconds'])} for "
+            f"{estimate['frames']} frames x 2 eyes, {settings.estimate_disk_mb / 1024:.1f} GB"
+        ))
+        return {'FINISHED'}
+
+
+class VR180_OT_CalibrateWorkers(Operator):
+    """Calibrate Workers - Times short renders with different worker counts"""
+    bl_idname = "vr180.calibrate_workers"
+    bl_label = "Calibrate Render Workers"
+    bl_description = (
+        "Renders a few frames of a reduced copy of the scene with different numbers of pinned eye "
+        "processes and keeps the fastest count for Render Workers 0 (Auto). Needs the rig's frame range"
+    )
+    bl_options = {'REGISTER'}
+
+    renders_per_worker: IntProperty(name="Frames per Worker", default=2, min=1, max=20)
+
+    @classmethod
+    def poll(cls, context):
+        """Only enable if VR180 scene has been created."""
+        return VR180_RIG_NAME in bpy.data.objects
+
+    def execute(self, context):
+        scene = context.scene
+
+        if scene.frame_end < scene.frame_start:
+            self.report({'ERROR'}, "Invalid frame range: End frame is before start frame")
+            return {'CANCELLED'}
+
+        try:
+            calibration = pipeline.calibrate_workers(scene, renders_per_worker=self.renders_per_worker)
+        except ValueError as e:
+            self.report({'ERROR'}, str(e))
+            return {'CANCELLED'}
+        except (IOError, OSError, PermissionError) as e:
+            self.report({'ERROR'}, f"File system error: {str(e)}")
+            return {'CANCELLED'}
+        except RuntimeError as e:
+            self.report({'ERROR'}, f"Render error: {str(e)}")
+            return {'CANCELLED'}
+        except Exception as e:
+            logger.exception("Unexpected error during worker calibration")
+            self.report({'ERROR'}, f"Unexpected error during worker calibration: {str(e)}")
+            return {'CANCELLED'}
+
+        rates = ", ".join(
+            f"{result['workers']}: {result['eye_renders_per_minute']:.1f}/min" for result in calibration['results']
+        )
+        self.report({'INFO'}, f"Fastest with {calibration['workers']} render worker(s) ({rates})")
+        return {'FINISHED'}
+
+
 class VR180_OT_SetupCompositor(Operator):
     """Setup Compositor - Auto-loads sequences and creates nodes"""
     bl_idname = "vr180.setup_compositor"
@@ -244,9 +394,8 @@ class VR180_OT_SetupCompositor(Operator):
         """Only enable if VR180 sequences have been rendered."""
         settings = context.scene.pe_vr180_settings
         try:
-            output_base_path = bpy.path.abspath(settings.output_path)
-            left_folder = Path(output_base_path) / "vr180" / "left"
-            right_folder = Path(output_base_path) / "vr180" / "right"
+            left_folder = settings.workflow_dir() / "left"
+            right_folder = settings.workflow_dir() / "right"
             return left_folder.exists() and right_folder.exists()
         except:
             return False
@@ -257,9 +406,8 @@ class VR180_OT_SetupCompositor(Operator):
 
         # Check that sequences were rendered
         try:
-            output_base_path = bpy.path.abspath(settings.output_path)
-            left_folder = Path(output_base_path) / "vr180" / "left"
-            right_folder = Path(output_base_path) / "vr180" / "right"
+            left_folder = settings.workflow_dir() / "left"
+            right_folder = settings.workflow_dir() / "right"
 
             # Check folders exist
             if not left_folder.exists():
@@ -294,119 +442,24 @@ class VR180_OT_SetupCompositor(Operator):
         return True
 
     def execute(self, context):
-        settings = context.scene.pe_vr180_settings
-
         # Validate preconditions
         if not self._validate_preconditions(context):
             return {'CANCELLED'}
 
-        # Store original state
-        original_scene = context.window.scene
-        original_active = context.view_layer.objects.active
-        original_selected = list(context.selected_objects)
-
         try:
-            # Create or get compositor scene
-            if VR180_COMPOSITOR_SCENE_NAME in bpy.data.scenes:
-                comp_scene = bpy.data.scenes[VR180_COMPOSITOR_SCENE_NAME]
-            else:
-                comp_scene = bpy.data.scenes.new(VR180_COMPOSITOR_SCENE_NAME)
-
-            # Switch to compositor scene for setup
-            context.window.scene = comp_scene
+            with _track(context.scene, 'composite'):
+                pipeline.setup_compositor(context.scene)
 
-            # Enable compositor
-            comp_scene.use_nodes = True
-            comp_scene.render.use_compositing = True
-
-            # Clear existing nodes
-            comp_scene.node_tree.nodes.clear()
-
-            # Auto-detect sequence paths
-            output_base_path = bpy.path.abspath(settings.output_path)
-            left_path = str(Path(output_base_path) / "vr180" / "left" / "left_")
-            right_path = str(Path(output_base_path) / "vr180" / "right" / "right_")
-
-            # Create nodes
-            nodes = comp_scene.node_tree.nodes
-            links = comp_scene.node_tree.links
-
-            # Left eye chain
-            left_img = nodes.new('CompositorNodeImage')
-            left_img.location = (-800, 200)
-            left_img.label = "Left Eye"
-            left_img.file_format = 'OPEN_EXR'
-            left_img.filepath = left_path
-            
-            # Need to find the frame count from the rendered sequences
-            # For now, use a placeholder frame_end
-            left_img.frame_duration = bpy.context.scene.frame_end - bpy.context.scene.frame_start + 1
-
-            left_denoise = nodes.new('CompositorNodeDenoise')
-            left_denoise.location = (-500, 200)
-            # Denoise settings will come from render_quality setting
-
-            left_translate = nodes.new('CompositorNodeTranslate')
-            left_translate.location = (-200, 200)
-            left_translate.inputs['X'].default_value = 0
-            left_translate.inputs['Y'].default_value = 0
-
-            # Right eye chain
-            right_img = nodes.new('CompositorNodeImage')
-            right_img.location = (-800, -200)
-            right_img.label = "Right Eye"
-            right_img.file_format = 'OPEN_EXR'
-            right_img.filepath = right_path
-            right_img.frame_duration = bpy.context.scene.frame_end - bpy.context.scene.frame_start + 1
-
-
-            right_denoise = nodes.new('CompositorNodeDenoise')
-            right_denoise.location = (-500, -200)
-
-            right_translate = nodes.new('CompositorNodeTranslate')
-            right_translate.location = (-200, -200)
-            right_translate.inputs['X'].default_value = settings.resolution_x / 2 # Offset to right half
-            right_translate.inputs['Y'].default_value = 0
-
-            # Combine node
-            alpha_over = nodes.new('CompositorNodeAlphaOver')
-            alpha_over.location = (100, 0)
-
-            # Output nodes
-            composite = nodes.new('CompositorNodeComposite')
-            composite.location = (400, 100)
-
-            viewer = nodes.new('CompositorNodeViewer')
-            viewer.location = (400, -100)
-
-            # Link nodes
-            links.new(left_img.outputs['Image'], left_denoise.inputs['Image'])
-            links.new(left_denoise.outputs['Image'], left_translate.inputs['Image'])
-            links.new(left_translate.outputs['Image'], alpha_over.inputs[1])
-
-            links.new(right_img.outputs['Image'], right_denoise.inputs['Image'])
-            links.new(right_denoise.outputs['Image'], right_translate.inputs['Image'])
-            links.new(right_translate.outputs['Image'], alpha_over.inputs[2])
-
-            links.new(alpha_over.outputs['Image'], composite.inputs['Image'])
-            links.new(alpha_over.outputs['Image'], viewer.inputs['Image'])
-
-            # Configure scene settings for compositor output
-            comp_scene.render.resolution_x = settings.resolution_x
-            comp_scene.render.resolution_y = settings.resolution_y
-            comp_scene.frame_start = context.scene.frame_start
-            comp_scene.frame_end = context.scene.frame_end
-
-            # Switch to Compositing workspace
-            # This requires finding the workspace by name, which might not always exist or be named consistently.
-            # For robust production, it's safer to ensure a workspace exists or provide an option.
-            # For spec, assume it exists.
+            # Switch to the Compositing workspace for manual tweaks, when the file has one
             if "Compositing" in bpy.data.workspaces:
                 context.window.workspace = bpy.data.workspaces["Compositing"]
 
             self.report({'INFO'}, "Compositor Ready! Make manual tweaks, then click Step 4")
             return {'FINISHED'}
 
+        except ValueError as e:
+            self.report({'ERROR'}, str(e))
+            return {'CANCELLED'}
         except (IOError, OSError) as e:
             self.report({'ERROR'}, f"File system error accessing sequences: {str(e)}")
             return {'CANCELLED'}
@@ -421,18 +474,6 @@ class VR180_OT_SetupCompositor(Operator):
             logger.exception("Unexpected error setting up compositor")
             self.report({'ERROR'}, f"Unexpected error setting up compositor: {str(e)}")
             return {'CANCELLED'}
-        finally:
-            # Restore original scene context
-            context.window.scene = original_scene
-
-            # Restore original selection and active object
-            if original_active and original_active.name in bpy.data.objects:
-                context.view_layer.objects.active = original_active
-
-            bpy.ops.object.select_all(action='DESELECT')
-            for obj in original_selected:
-                if obj and obj.name in bpy.data.objects:
-                    obj.select_set(True)
 
 
 class VR180_OT_RenderYouTube(Operator):
@@ -444,8 +485,8 @@ class VR180_OT_RenderYouTube(Operator):
 
     @classmethod
     def poll(cls, context):
-        """Only enable if compositor scene exists."""
-        return VR180_COMPOSITOR_SCENE_NAME in bpy.data.scenes
+        """Only enable if compositor scene exists (or the video comes from the frame cache)."""
+        return VR180_COMPOSITOR_SCENE_NAME in bpy.data.scenes or context.scene.pe_vr180_settings.frame_cache
 
     def _validate_preconditions(self, context):
         """Validate that compositor scene exists with valid node setup."""
@@ -478,50 +519,19 @@ class VR180_OT_RenderYouTube(Operator):
         return True
 
     def execute(self, context):
-        settings = context.scene.pe_vr180_settings
-        original_scene = context.window.scene
-
-        # Validate preconditions
-        if not self._validate_preconditions(context):
+        # Validate preconditions (the frame cache needs no compositor)
+        if not context.scene.pe_vr180_settings.frame_cache and not self._validate_preconditions(context):
             return {'CANCELLED'}
 
         try:
-            # 1. Find the compositor scene
-            comp_scene = bpy.data.scenes.get(VR180_COMPOSITOR_SCENE_NAME)
-
-            # 2. Set active scene to compositor
-            context.window.scene = comp_scene
-
-            # 3. Configure render settings for YouTube video
-            output_base_path = bpy.path.abspath(settings.output_path)
-            final_output_path = Path(output_base_path) / "vr180" / "youtube_vr180"
-            final_output_path.mkdir(parents=True, exist_ok=True)
-            
-            comp_scene.render.filepath = str(final_output_path / "vr180_sbs_")
-            
-            comp_scene.render.image_settings.file_format = 'FFMPEG'
-            
-            # Container
-            comp_scene.render.ffmpeg.format = 'MPEG4'
-
-            # Codec
-            comp_scene.render.ffmpeg.codec = 'H264' # Using H264 for broader compatibility, though H265 is also good
-            
-            # Quality / Bitrate
-            comp_scene.render.ffmpeg.constant_rate_factor = 'PERC_LOSSLESS' # Visually lossless
-            
-            # Encoding speed
-            comp_scene.render.ffmpeg.ffmpeg_preset = 'SLOW' # Slower encoding for better quality/compression
-            
-            # Audio (optional, for now no audio)
-            comp_scene.render.ffmpeg.audio_codec = 'NONE'
-
-            # 4. Trigger the render
-            bpy.ops.render.render(animation=True)
-
-            self.report({'INFO'}, f"Final video rendered to: {comp_scene.render.filepath}")
+            with _track(context.scene, 'encode'):
+                final_output_path = pipeline.encode_video(context.scene)
+            self.report({'INFO'}, f"Final video rendered to: {final_output_path}")
             return {'FINISHED'}
 
+        except ValueError as e:
+            self.report({'ERROR'}, str(e))
+            return {'CANCELLED'}
         except (IOError, OSError, PermissionError) as e:
             self.report({'ERROR'}, f"File system error: {str(e)}")
             return {'CANCELLED'}
@@ -536,6 +546,3 @@ class VR180_OT_RenderYouTube(Operator):
             logger.exception("Unexpected error rendering video")
             self.report({'ERROR'}, f"Unexpected error rendering video: {str(e)}")
             return {'CANCELLED'}
-        finally:
-            # 5. Restore original scene
-            context.window.scene = original_scene
\ No newline at end of file
@@ -0,0 +1,606 @@
+"""
+VR180 workflow steps without UI context.
+
+The workflow operators and the headless CLI (pe_camera_rigs.cli) both call
+these functions. They take the scene explicitly, render with
+`bpy.ops.render.render(scene=...)`, and never touch `context.window`,
+workspaces or the selection, so they also run under `blender --background`.
+"""
+
+import json
+import logging
+import os
+import tempfile
+from contextlib import nullcontext
+from functools import partial
+from pathlib import Path
+from types import SimpleNamespace
+
+import bpy
+
+from ...utils import affinity
+from ...utils.blender import gpu_compute_device_type
+from ...utils.workers import cli_worker_command, frame_chunks, run_workers
+from ...utils.stream_encode import StreamAssembler, FrameWatcher, remove_frames
+from ...utils.frame_cache import CACHE_EXTENSION, FrameCacheWriter, encode_cache_sequence
+from ...utils.render_cache import RENDER_CACHE_DIR_NAME, RenderCache
+from ...utils.render import (
+    RENDER_SETTINGS_PATHS,
+    snapshot_render_settings,
+    restore_render_settings,
+    apply_render_quality,
+    apply_denoise_mode,
+    apply_exr_storage,
+    denoised_output,
+)
+from ...constants import (
+    VR180_RIG_NAME,
+    VR180_LEFT_CAM_NAME,
+    VR180_RIGHT_CAM_NAME,
+    VR180_COMPOSITOR_SCENE_NAME,
+)
+
+logger = logging.getLogger(__name__)
+
+# Sequence renders may also narrow the frame range and step through frames
+SEQUENCE_SETTINGS_PATHS = RENDER_SETTINGS_PATHS + ("frame_start", "frame_end", "frame_current")
+
+EYES = ('left', 'right')
+
+# Worker calibration renders a reduced copy of the scene: draft settings
+# with these values, and this many frames per eye process
+CALIBRATION_SETTINGS = {
+    'draft_mode': True,
+    'draft_resolution_percentage': 50,
+    'draft_samples': 64,
+    'render_cache': False,
+    'frame_cache': False,
+}
+CALIBRATION_RENDERS_PER_WORKER = 2
+
+
+def configure_eye_render(scene, settings):
+    """Configures Cycles, EXR storage, denoising, per-eye resolution and samples (draft or quality preset)."""
+    render = scene.render
+    render.engine = 'CYCLES'
+    render.image_settings.file_format = 'OPEN_EXR'
+    apply_exr_storage(scene, settings.exr_depth, settings.exr_color_mode, settings.exr_codec)
+    apply_denoise_mode(scene, settings.denoise_mode)
+
+    # Per-eye resolution
+    render.resolution_x = int(settings.resolution_x / 2)
+    render.resolution_y = settings.resolution_y
+
+    apply_render_quality(scene, settings.render_quality, denoised=settings.denoise_mode != 'NONE')
+
+    if settings.draft_mode:
+        render.resolution_percentage = settings.draft_resolution_percentage
+        scene.cycles.samples = settings.draft_samples
+
+
+def eye_cameras():
+    """
+    Returns the (left, right) cameras of the VR180 rig.
+
+    Raises:
+        ValueError: If the rig or one of its cameras is missing
+    """
+    rig = bpy.data.objects.get(VR180_RIG_NAME)
+    left = bpy.data.objects.get(VR180_LEFT_CAM_NAME)
+    right = bpy.data.objects.get(VR180_RIGHT_CAM_NAME)
+    if rig is None:
+        raise ValueError(f"No {VR180_RIG_NAME} found. Run Step 1 (Create VR180 Scene) first.")
+    if not left or not right or left.parent != rig or right.parent != rig:
+        raise ValueError("Could not find left/right cameras. Run Step 1 first.")
+    return left, right
+
+
+def render_sequences(scene, frame_start=None, frame_end=None, on_frame=None, eyes=EYES, job_id=None):
+    """
+    Renders the left and right eye EXR sequences.
+
+    Eyes are interleaved (left N, right N, left N+1...), so every finished
+    frame has both eyes on disk: a crash leaves complete pairs, and a
+    streaming encode can consume frame N while N+1 renders.
+
+    With render_cache on, eyes whose evaluated scene matches an earlier
+    render are linked from the store instead (utils/render_cache.py).
+
+    With more than one render worker (settings.worker_count()), each eye
+    renders in its own background processes instead, see
+    _render_eye_workers().
+
+    Args:
+        scene (bpy.types.Scene): Scene holding the rig and pe_vr180_settings
+        frame_start (int, optional): First frame, defaults to the scene's
+        frame_end (int, optional): Last frame, defaults to the scene's
+        on_frame (callable, optional): Called with the frame number once both eyes are written
+        eyes (tuple): Eyes to render, e.g. ('left',) in a worker process
+        job_id (str, optional): Job in the rig's job store; worker processes
+            record their finished frames on it, so an interrupted render resumes
+
+    Returns:
+        dict: 'left' and 'right' sequence folders
+
+    Raises:
+        ValueError: If the rig is missing, or the frame cache is combined
+            with compositor denoising
+    """
+    settings = scene.pe_vr180_settings
+    left_cam_obj, right_cam_obj = eye_cameras()
+    cache = _cache_writer(settings, on_frame)
+    if cache is not None:
+        on_frame = cache.frame_ready
+
+    folders = {
+        'left': settings.workflow_dir() / "left",
+        'right': settings.workflow_dir() / "right",
+    }
+    for folder in folders.values():
+        folder.mkdir(parents=True, exist_ok=True)
+
+    workers = settings.worker_count() if tuple(eyes) == EYES else 1
+    if workers > 1:
+        with cache or nullcontext():
+            _render_eye_workers(
+                scene, settings, scene.frame_start if frame_start is None else frame_start,
+                scene.frame_end if frame_end is None else frame_end, workers, on_frame, job_id,
+            )
+        logger.info("Rendered left/right eye sequences to %s with %d workers", settings.workflow_dir(), workers)
+        return folders
+
+    render_cache = None
+    if settings.render_cache:
+        # Shared by draft and final runs; the digest covers the resolution
+        render_cache = RenderCache(Path(bpy.path.abspath(settings.output_path)) / RENDER_CACHE_DIR_NAME, scene)
+
+    original_settings = snapshot_render_settings(scene, SEQUENCE_SETTINGS_PATHS)
+    try:
+        configure_eye_render(scene, settings)
+        if frame_start is not None:
+            scene.frame_start = frame_start
+        if frame_end is not None:
+            scene.frame_end = frame_end
+
+        with cache or nullcontext():
+            for frame in range(scene.frame_start, scene.frame_end + 1):
+                scene.frame_set(frame)
+                for eye, cam_obj, exr_path in zip(EYES, (left_cam_obj, right_cam_obj),
+                                                  eye_frame_paths(settings, frame)):
+                    if eye not in eyes:
+                        continue
+                    scene.camera = cam_obj
+                    key = render_cache.frame_key(cam_obj) if render_cache is not None else None
+                    if key is not None and render_cache.reuse(key, exr_path):
+                        continue
+                    if key is not None:
+                        render_cache.release(exr_path)
+                    # Same names as an animation render: left_0001.exr
+                    scene.render.filepath = str(folders[eye] / f"{eye}_{frame:04d}")
+                    bpy.ops.render.render(write_still=True, scene=scene.name)
+                    if key is not None:
+                        render_cache.store(key, exr_path)
+                if on_frame is not None:
+                    on_frame(frame)
+        logger.info("Rendered left/right eye sequences to %s", settings.workflow_dir())
+        if render_cache is not None:
+            logger.info(
+                "Render cache: reused %d, rendered %d, uncacheable %d eye frames; pruned %d stored frames",
+                render_cache.reused, render_cache.rendered, render_cache.uncacheable, render_cache.prune(),
+            )
+    finally:
+        restore_render_settings(scene, original_settings)
+
+    return folders
+
+
+def _eye_worker_commands(blend_path, scene, frame_start, frame_end, workers, output, pin=True, extra=()):
+    """
+    Commands and CPU sets of `workers` eye processes (half per eye) on a saved scene.
+
+    The frame range is split into workers // 2 chunks, each rendered by a
+    left and a right eye process, so both eyes of a chunk advance together.
+    Every process gets its own CPU set (utils/affinity.py) and as many
+    fixed render threads; `pin` also restricts it to that set.
+
+    Returns:
+        tuple: (commands, CPU sets to pin to or None)
+    """
+    chunks = frame_chunks(frame_start, frame_end, workers // 2)
+    assignments = [(eye, chunk) for chunk in chunks for eye in EYES]
+    cpu_sets = affinity.partition_cpus(len(assignments))
+    device_type = gpu_compute_device_type(scene)
+    commands = [
+        cli_worker_command(
+            blend_path, 'vr180', scene.name, chunk, len(cpus), ['--eye', eye, '--output', str(output), *extra],
+            device_type=device_type,
+        )
+        for (eye, chunk), cpus in zip(assignments, cpu_sets)
+    ]
+    return commands, cpu_sets if pin else None
+
+
+def _render_eye_workers(scene, settings, frame_start, frame_end, workers, on_frame=None, job_id=None):
+    """
+    Renders the eye sequences in `workers` background processes.
+
+    Two Cycles processes left to pick their own threads fight over every
+    core and evict each other's caches; pinned to disjoint CPU sets inside
+    a NUMA node each keeps its cores, caches and memory. The processes load
+    a saved copy of the scene. Finished frames are picked up by watching
+    the eye folders, the way streaming does with CLI workers. With `job_id`
+    the processes record every finished eye on that job (--job), like the
+    CLI's --workers children.
+    """
+    output = Path(bpy.path.abspath(settings.output_path))
+    with tempfile.TemporaryDirectory(prefix="pe_vr180_workers_") as tmp:
+        blend_path = os.path.join(tmp, "scene.blend")
+        bpy.ops.wm.save_as_mainfile(filepath=blend_path, copy=True)
+        commands, cpu_sets = _eye_worker_commands(
+            blend_path, scene, frame_start, frame_end, workers, output, pin=settings.pin_workers,
+            extra=['--job', job_id] if job_id else (),
+        )
+        logger.info(
+            "Rendering frames %d-%d in %d eye processes%s", frame_start, frame_end, len(commands),
+            " pinned to CPU sets" if cpu_sets and affinity.can_pin() else "",
+        )
+
+        frame_inputs = partial(eye_frame_paths, settings)
+        # The stream and the frame cache consume whatever EXRs exist, and a
+        # failed run must not leave old and new eyes mixed: start from none
+        remove_frames(frame_inputs, frame_start, frame_end)
+        watched = SimpleNamespace(
+            frame_inputs=frame_inputs, frame_start=frame_start, frame_end=frame_end, frame_ready=on_frame,
+        )
+        with FrameWatcher(watched) if on_frame is not None else nullcontext():
+            run_workers(commands, len(commands), cpu_sets)
+
+
+def _eye_renders_per_second(progress_path):
+    """
+    Eye renders per second of all processes logging to a CLI progress file.
+
+    Each process is timed from its render step start to its last frame, so
+    Blender startup and file loading are left out.
+    """
+    starts = {}
+    frames = {}
+    with open(progress_path, encoding='utf-8') as f:
+        for line in f:
+            record = json.loads(line)
+            if record['event'] == 'step_start':
+                starts[record['pid']] = record['time']
+            elif record['event'] == 'frame':
+                frames.setdefault(record['pid'], []).append(record['time'])
+    return sum(
+        len(times) / (times[-1] - starts[pid])
+        for pid, times in frames.items() if pid in starts and times[-1] > starts[pid]
+    )
+
+
+def calibrate_workers(scene, candidates=None, renders_per_worker=CALIBRATION_RENDERS_PER_WORKER):
+    """
+    Measures eye render throughput for several worker counts and keeps the best.
+
+    Each candidate renders a reduced copy of the scene (CALIBRATION_SETTINGS)
+    into a temporary folder: 1 as one process rendering both eyes, larger
+    counts as pinned eye processes like Step 2. The winner is stored in
+    settings.calibrated_workers with the machine's CPU count, and used while
+    Render Workers is 0 (Auto) on a machine with that CPU count.
+
+    Args:
+        scene (bpy.types.Scene): Scene holding the rig and pe_vr180_settings
+        candidates (list, optional): Worker counts, defaults to affinity.worker_candidates()
+        renders_per_worker (int): Frames each eye process renders
+
+    Returns:
+        dict: 'workers' (the best count) and 'results', a list of
+            {'workers', 'eye_renders_per_minute'}
+
+    Raises:
+        ValueError: If the rig is missing
+        RuntimeError: If a calibration render fails
+    """
+    settings = scene.pe_vr180_settings
+    eye_cameras()
+    candidates = sorted(set(candidates or affinity.worker_candidates()))
+    frame_start = scene.frame_start
+    frame_end = min(scene.frame_end, frame_start + max(1, candidates[-1] // 2) * renders_per_worker - 1)
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="pe_vr180_calibrate_") as tmp:
+        blend_path = os.path.join(tmp, "scene.blend")
+        original = {name: getattr(settings, name) for name in CALIBRATION_SETTINGS}
+        try:
+            for name, value in CALIBRATION_SETTINGS.items():
+                setattr(settings, name, value)
+            bpy.ops.wm.save_as_mainfile(filepath=blend_path, copy=True)
+        finally:
+            for name, value in original.items():
+                setattr(settings, name, value)
+
+        for workers in candidates:
+            progress = os.path.join(tmp, f"progress_{workers}.jsonl")
+            output = os.path.join(tmp, f"output_{workers}")
+            if workers < 2:
+                commands = [cli_worker_command(
+                    blend_path, 'vr180', scene.name, (frame_start, frame_end), 0,
+                    ['--output', output, '--progress', progress], device_type=gpu_compute_device_type(scene),
+                )]
+                cpu_sets = None
+            else:
+                commands, cpu_sets = _eye_worker_commands(
+                    blend_path, scene, frame_start, frame_end, workers, output,
+                    pin=settings.pin_workers, extra=['--progress', progress],
+                )
+            run_workers(commands, len(commands), cpu_sets)
+            rate = _eye_renders_per_second(progress) * 60
+            logger.info("Calibration: %d worker(s), %.1f eye renders per minute", workers, rate)
+            results.append({'workers': workers, 'eye_renders_per_minute': round(rate, 2)})
+
+    best = max(results, key=lambda result: result['eye_renders_per_minute'])
+    settings.calibrated_workers = best['workers']
+    settings.calibrated_cpu_count = os.cpu_count() or 1
+    return {'workers': best['workers'], 'results': results}
+
+
+def eye_frame_paths(settings, frame):
+    """Left and right EXR paths of one frame, as named by the sequence render."""
+    return [
+        settings.workflow_dir() / "left" / f"left_{frame:04d}.exr",
+        settings.workflow_dir() / "right" / f"right_{frame:04d}.exr",
+    ]
+
+
+def cache_frame_paths(settings, frame):
+    """Left and right raw frame cache paths of one frame."""
+    return [
+        settings.workflow_dir() / "cache" / f"left_{frame:04d}{CACHE_EXTENSION}",
+        settings.workflow_dir() / "cache" / f"right_{frame:04d}{CACHE_EXTENSION}",
+    ]
+
+
+def _cache_writer(settings, on_frame):
+    """FrameCacheWriter reporting on to on_frame, or None when the cache is off."""
+    if not settings.frame_cache:
+        return None
+    if settings.denoise_mode == 'COMPOSITOR':
+        raise ValueError("Raw Frame Cache skips the compositor. Use Denoise 'In Render (OIDN)' instead.")
+    return FrameCacheWriter(
+        lambda frame: eye_frame_paths(settings, frame), lambda frame: cache_frame_paths(settings, frame),
+        settings.frame_cache_format, on_frame=on_frame,
+    )
+
+
+def stream_sequences(scene, frame_start=None, frame_end=None, render=None, job_id=None):
+    """
+    Renders the eye sequences and encodes the SBS video as frames finish.
+
+    Each frame is packed and piped to ffmpeg while the next one renders, so
+    the video is ready shortly after the last frame. The EXRs are kept, so
+    Steps 3 and 4 can still rebuild the video with compositor tweaks.
+
+    Args:
+        scene (bpy.types.Scene): Scene holding the rig and pe_vr180_settings
+        frame_start (int, optional): First frame, defaults to the scene's
+        frame_end (int, optional): Last frame, defaults to the scene's
+        render (callable, optional): Renders the frames elsewhere (e.g. worker
+            processes) instead of here; finished frames are then picked up by
+            watching the eye folders
+        job_id (str, optional): Passed on to render_sequences()
+
+    Returns:
+        pathlib.Path: The video file
+
+    Raises:
+        ValueError: If the rig is missing, ffmpeg/OpenImageIO are unavailable, or
+            denoise_mode is 'COMPOSITOR' (the stream skips the compositor)
+    """
+    settings = scene.pe_vr180_settings
+    eye_cameras()
+    if settings.denoise_mode == 'COMPOSITOR':
+        raise ValueError("Encode While Rendering skips the compositor. Use Denoise 'In Render (OIDN)' instead.")
+    frame_start = scene.frame_start if frame_start is None else frame_start
+    frame_end = scene.frame_end if frame_end is None else frame_end
+
+    video_folder = settings.workflow_dir() / "youtube_vr180"
+    video_folder.mkdir(parents=True, exist_ok=True)
+    # Same name Blender gives an animation render of this range
+    video_path = video_folder / f"vr180_sbs_{frame_start:04d}-{frame_end:04d}.mp4"
+
+    assembler = StreamAssembler(
+        lambda frame: eye_frame_paths(settings, frame), 'SBS', frame_start, frame_end,
+        str(video_path), scene.render.fps / scene.render.fps_base,
+        quality='DRAFT' if settings.draft_mode else 'FINAL',
+    )
+    with assembler:
+        if render is None:
+            render_sequences(scene, frame_start, frame_end, on_frame=assembler.frame_ready, job_id=job_id)
+        else:
+            with FrameWatcher(assembler):
+                render()
+
+    logger.info("Streamed %d frames to %s", assembler.encoded, video_path)
+    return video_path
+
+
+def _load_sequence(folder, prefix):
+    """Loads an EXR sequence as an image datablock, returns (image, frame count)."""
+    files = sorted(folder.glob(f"{prefix}*.exr"))
+    if not files:
+        raise ValueError(f"No {prefix}*.exr files found in {folder}. Run Step 2 (Render Sequences) first.")
+    image = bpy.data.images.load(str(files[0]), check_existing=True)
+    image.source = 'SEQUENCE'
+    return image, len(files)
+
+
+def setup_compositor(scene):
+    """
+    Creates (or rebuilds) the compositor scene that joins both eyes side by side.
+
+    Args:
+        scene (bpy.types.Scene): Scene holding pe_vr180_settings and the frame range
+
+    Returns:
+        bpy.types.Scene: The compositor scene
+
+    Raises:
+        ValueError: If the eye sequences have not been rendered
+    """
+    settings = scene.pe_vr180_settings
+    left_image, left_count = _load_sequence(settings.workflow_dir() / "left", "left_")
+    right_image, right_count = _load_sequence(settings.workflow_dir() / "right", "right_")
+
+    expected_frames = scene.frame_end - scene.frame_start + 1
+    if min(left_count, right_count) < expected_frames:
+        logger.warning(
+            "Incomplete sequences: expected %d frames, found %d left and %d right",
+            expected_frames, left_count, right_count,
+        )
+
+    comp_scene = bpy.data.scenes.get(VR180_COMPOSITOR_SCENE_NAME)
+    if comp_scene is None:
+        comp_scene = bpy.data.scenes.new(VR180_COMPOSITOR_SCENE_NAME)
+
+    comp_scene.use_nodes = True
+    comp_scene.render.use_compositing = True
+    comp_scene.node_tree.nodes.clear()
+
+    nodes = comp_scene.node_tree.nodes
+    links = comp_scene.node_tree.links
+    sbs_width, sbs_height = settings.output_resolution()
+
+    # One chain per eye: image -> (guided denoise) -> translate into its half
+    eye_outputs = []
+    for eye, image, count, y, offset_x in (
+        ("Left Eye", left_image, left_count, 200, 0),
+        ("Right Eye", right_image, right_count, -200, sbs_width / 2),
+    ):
+        image_node = nodes.new('CompositorNodeImage')
+        image_node.location = (-800, y)
+        image_node.label = eye
+        image_node.image = image
+        image_node.frame_duration = count
+        image_node.frame_start = scene.frame_start
+
+        # 'RENDER' frames are denoised already, 'NONE' stays noisy on purpose
+        eye_image = image_node.outputs['Image']
+        if settings.denoise_mode == 'COMPOSITOR':
+            eye_image = denoised_output(nodes, links, image_node, (-500, y))
+
+        translate = nodes.new('CompositorNodeTranslate')
+        translate.location = (-200, y)
+        translate.inputs['X'].default_value = offset_x
+        translate.inputs['Y'].default_value = 0
+
+        links.new(eye_image, translate.inputs['Image'])
+        eye_outputs.append(translate.outputs['Image'])
+
+    alpha_over = nodes.new('CompositorNodeAlphaOver')
+    alpha_over.location = (100, 0)
+    links.new(eye_outputs[0], alpha_over.inputs[1])
+    links.new(eye_outputs[1], alpha_over.inputs[2])
+
+    composite = nodes.new('CompositorNodeComposite')
+    composite.location = (400, 100)
+    viewer = nodes.new('CompositorNodeViewer')
+    viewer.location = (400, -100)
+    links.new(alpha_over.outputs['Image'], composite.inputs['Image'])
+    links.new(alpha_over.outputs['Image'], viewer.inputs['Image'])
+
+    comp_scene.render.resolution_x = sbs_width
+    comp_scene.render.resolution_y = sbs_height
+    comp_scene.render.resolution_percentage = 100
+    # Step 4 encodes to the matching folder even if Draft Mode is toggled meanwhile
+    comp_scene["pe_draft"] = settings.draft_mode
+    comp_scene.frame_start = scene.frame_start
+    comp_scene.frame_end = scene.frame_end
+    comp_scene.render.fps = scene.render.fps
+
+    return comp_scene
+
+
+def encode_cached_video(scene):
+    """
+    Encodes the SBS MP4 from the raw frame cache, without the compositor.
+
+    Args:
+        scene (bpy.types.Scene): Scene holding pe_vr180_settings and the frame range
+
+    Returns:
+        pathlib.Path: Folder holding the video
+
+    Raises:
+        ValueError: If the first frame is not cached, or ffmpeg is unavailable
+    """
+    settings = scene.pe_vr180_settings
+    video_folder = settings.workflow_dir() / "youtube_vr180"
+    video_folder.mkdir(parents=True, exist_ok=True)
+    video_path = video_folder / f"vr180_sbs_{scene.frame_start:04d}-{scene.frame_end:04d}.mp4"
+
+    encoded = encode_cache_sequence(
+        lambda frame: cache_frame_paths(settings, frame), 'SBS', scene.frame_start, scene.frame_end,
+        str(video_path), scene.render.fps / scene.render.fps_base,
+        quality='DRAFT' if settings.draft_mode else 'FINAL',
+    )
+    logger.info("Encoded %d cached frames to %s", encoded, video_path)
+    return video_folder
+
+
+def encode_video(scene):
+    """
+    Renders the compositor scene to the final SBS MP4.
+
+    With the raw frame cache enabled, encodes from the cache instead
+    (encode_cached_video()).
+
+    Args:
+        scene (bpy.types.Scene): Scene holding pe_vr180_settings
+
+    Returns:
+        pathlib.Path: Folder holding the video
+
+    Raises:
+        ValueError: If the compositor scene has not been set up
+    """
+    settings = scene.pe_vr180_settings
+    if settings.frame_cache:
+        return encode_cached_video(scene)
+    comp_scene = bpy.data.scenes.get(VR180_COMPOSITOR_SCENE_NAME)
+    if comp_scene is None or not comp_scene.use_nodes or not comp_scene.node_tree:
+        raise ValueError(f"Compositor scene '{VR180_COMPOSITOR_SCENE_NAME}' not set up. Run Step 3 first.")
+    if not any(node.type == 'COMPOSITE' for node in comp_scene.node_tree.nodes):
+        raise ValueError("Compositor missing Composite output node. Run Step 3 again.")
+
+    is_draft = bool(comp_scene.get("pe_draft", False))
+    final_output_path = settings.workflow_dir(draft=is_draft) / "youtube_vr180"
+    final_output_path.mkdir(parents=True, exist_ok=True)
+
+    render = comp_scene.render
+    render.filepath = str(final_output_path / "vr180_sbs_")
+    render.image_settings.file_format = 'FFMPEG'
+    render.ffmpeg.format = 'MPEG4'
+    render.ffmpeg.codec = 'H264'  # Using H264 for broader compatibility, though H265 is also good
+
+    # Quality / Bitrate and encoding speed (drafts favour turnaround)
+    if is_draft:
+        render.ffmpeg.constant_rate_factor = 'MEDIUM'
+        render.ffmpeg.ffmpeg_preset = 'REALTIME'
+    else:
+        render.ffmpeg.constant_rate_factor = 'PERC_LOSSLESS'  # Visually lossless
+        render.ffmpeg.ffmpeg_preset = 'BEST'  # Slower encoding for better quality/compression
+    render.ffmpeg.audio_codec = 'NONE'
+
+    bpy.ops.render.render(animation=True, scene=comp_scene.name)
+    return final_output_path
+
+
+# Step name -> function(scene), in workflow order. Only 'render' takes a frame range.
+STEPS = {
+    'render': render_sequences,
+    'composite': setup_compositor,
+    'encode': encode_video,
+}
+
+# Render and encode in one pipelined step, replacing all of STEPS
+STREAM = stream_sequences
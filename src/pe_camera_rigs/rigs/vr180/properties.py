@@ -1,4 +1,32 @@
 import bpy
+import os
+from pathlib import Path
+
+from ...utils.scene_setup import LIGHTING_PRESET_ITEMS, HDRI_SAMPLING_ITEMS
+from ...utils.render import (
+    DENOISE_MODE_ITEMS,
+    EXR_DEPTH_ITEMS,
+    EXR_COLOR_MODE_ITEMS,
+    EXR_CODEC_ITEMS,
+    FRAME_CACHE_FORMAT_ITEMS,
+)
+from ...utils.job_queue import JobStore, QUEUE_FILE_NAME
+from ...utils.lazy import lazy_import
+from ...constants import DRAFT_DIR_NAME
+
+camera_rig = lazy_import(".rig", __package__)
+affinity = lazy_import("...utils.affinity", __package__)
+
+# Combined SBS resolution of each preset
+RESOLUTION_PRESETS = {
+    'YOUTUBE_4K': (3840, 1920),
+    'YOUTUBE_5_7K': (5760, 2880),
+    'YOUTUBE_8K': (7680, 3840),
+}
+
+def _update_rig_ipd(self, context):
+    """Moves the eye cameras when the rig's IPD changes."""
+    camera_rig.apply_vr180_ipd(self.id_data, self.ipd)
 
 class PE_VR180RigSettings(bpy.types.PropertyGroup):
     """Rig-specific settings for the VR180 camera rig controller."""
@@ -9,7 +37,8 @@ class PE_VR180RigSettings(bpy.types.PropertyGroup):
         min=0.0,
         max=120.0,
         subtype='DISTANCE',
-        unit='LENGTH'
+        unit='LENGTH',
+        update=_update_rig_ipd,
     )
 
 class PE_VR180SceneSettings(bpy.types.PropertyGroup):
@@ -26,6 +55,27 @@ class PE_VR180SceneSettings(bpy.types.PropertyGroup):
         unit='LENGTH'
     )
 
+    # -- IPD schedule, baked from the distance to a subject --
+    ipd_subject: bpy.props.PointerProperty(
+        name="Subject",
+        type=bpy.types.Object,
+        description="Object whose distance to the rig sets the IPD on each frame"
+    )
+    ipd_ratio: bpy.props.FloatProperty(
+        name="Distance Ratio",
+        default=30.0,
+        min=5.0, max=100.0,
+        description="Subject distance divided by the IPD (1/30 rule: 1.92m gives 64mm)"
+    )
+    ipd_min: bpy.props.FloatProperty(name="Min IPD (mm)", default=5.0, min=0.0, max=120.0)
+    ipd_max: bpy.props.FloatProperty(name="Max IPD (mm)", default=64.0, min=0.0, max=120.0)
+    ipd_smoothing: bpy.props.IntProperty(
+        name="Smoothing",
+        default=0,
+        min=0, max=120,
+        description="Moving-average width in frames, so depth does not pump with jittery motion"
+    )
+
     # -- Resolution Presets --
     resolution_preset: bpy.props.EnumProperty(
         name="Resolution Preset",
@@ -64,20 +114,65 @@ class PE_VR180SceneSettings(bpy.types.PropertyGroup):
         default='PRODUCTION',
         description="Sets the Cycles render samples and other quality-related settings."
     )
+    denoise_mode: bpy.props.EnumProperty(
+        name="Denoise",
+        items=DENOISE_MODE_ITEMS,
+        default='RENDER',
+        description="Where the eye renders are denoised. Guided denoising lets the quality presets "
+                    "use a quarter of the samples"
+    )
+    exr_depth: bpy.props.EnumProperty(
+        name="EXR Depth",
+        items=EXR_DEPTH_ITEMS,
+        default='16',
+        description="Float precision of the intermediate eye EXRs."
+    )
+    exr_color_mode: bpy.props.EnumProperty(
+        name="EXR Channels",
+        items=EXR_COLOR_MODE_ITEMS,
+        default='RGB',
+        description="Channels written to the intermediate eye EXRs."
+    )
+    exr_codec: bpy.props.EnumProperty(
+        name="EXR Codec",
+        items=EXR_CODEC_ITEMS,
+        default='DWAA',
+        description="Compression of the intermediate eye EXRs."
+    )
 
     # -- Step 1 Settings (Lighting, Cyclorama, Reference - Initial values for operators) --
     lighting_preset: bpy.props.EnumProperty(
         name="Lighting Preset",
-        items=[
-            ('NONE', "None", "No lights added"),
-            ('3POINT_STUDIO', "3-Point (Studio)", "Professional 3-point studio lighting"),
-            ('3POINT_OUTDOOR', "3-Point (Outdoor)", "Outdoor 3-point with sun"),
-            # ... more presets could go here
-        ],
+        items=LIGHTING_PRESET_ITEMS,
         default='3POINT_STUDIO',
         description="Select a lighting setup to automatically add to the scene."
     )
 
+    hdri_path: bpy.props.StringProperty(
+        name="HDRI",
+        subtype='FILE_PATH',
+        default="",
+        description="Local .hdr/.exr environment map used by the HDRI World preset."
+    )
+    hdri_strength: bpy.props.FloatProperty(
+        name="HDRI Strength",
+        default=1.0,
+        min=0.0, soft_max=10.0,
+        description="Brightness of the environment map."
+    )
+    hdri_sampling_method: bpy.props.EnumProperty(
+        name="Importance Sampling",
+        items=HDRI_SAMPLING_ITEMS,
+        default='RESOLUTION',
+        description="How Cycles builds the world importance map."
+    )
+    hdri_map_resolution: bpy.props.IntProperty(
+        name="Map Resolution",
+        default=1024,
+        min=256, max=8192,
+        description="Importance map resolution used with Manual sampling."
+    )
+
     include_cyclorama: bpy.props.BoolProperty(
         name="Include Procedural Cyclorama",
         default=True,
@@ -118,6 +213,78 @@ class PE_VR180SceneSettings(bpy.types.PropertyGroup):
         description="Directory to save EXR sequences and final video. Use '//' for project root."
     )
 
+    # -- Draft Mode --
+    draft_mode: bpy.props.BoolProperty(
+        name="Draft Mode",
+        default=False,
+        description="Render quick low-resolution previews into a separate draft/ folder. Final frames are never overwritten."
+    )
+    draft_resolution_percentage: bpy.props.IntProperty(
+        name="Draft Resolution",
+        subtype='PERCENTAGE',
+        default=25,
+        min=1, max=100,
+        description="Resolution of draft renders, as a percentage of the final per-eye resolution."
+    )
+    draft_samples: bpy.props.IntProperty(
+        name="Draft Samples",
+        default=16,
+        min=1, max=4096,
+        description="Cycles samples for draft renders."
+    )
+
+    # -- Step 2 Settings --
+    stream_encode: bpy.props.BoolProperty(
+        name="Encode While Rendering",
+        default=False,
+        description="Encode the video while the sequence renders: each finished frame is piped to ffmpeg, "
+                    "so the MP4 is ready right after the last frame. Needs ffmpeg on PATH. "
+                    "EXRs are still written for Steps 3-4"
+    )
+    frame_cache: bpy.props.BoolProperty(
+        name="Raw Frame Cache",
+        default=False,
+        description="Also keep every frame uncompressed in cache/, so Step 4 encodes straight from "
+                    "memory-mapped files without the compositor. Fastest on local NVMe scratch disks; "
+                    "needs ffmpeg on PATH"
+    )
+    frame_cache_format: bpy.props.EnumProperty(
+        name="Cache Format",
+        items=FRAME_CACHE_FORMAT_ITEMS,
+        default='UINT16',
+        description="Pixel format of the raw frame cache."
+    )
+    render_cache: bpy.props.BoolProperty(
+        name="Reuse Unchanged Frames",
+        default=False,
+        description="Hash the evaluated scene of every eye frame and hard-link the EXR of an earlier render "
+                    "with the same hash instead of rendering it again. Frames with motion blur, particles "
+                    "or volumes always render"
+    )
+    render_workers: bpy.props.IntProperty(
+        name="Render Workers",
+        default=1,
+        min=0, max=64,
+        description="Background Blender processes rendering the eyes at once, half per eye, each on its own "
+                    "CPU set with a fixed thread count. 1 renders in this Blender; 0 picks the calibrated count, "
+                    "or one from the core count. Odd counts are rounded down"
+    )
+    pin_workers: bpy.props.BoolProperty(
+        name="Pin to CPU Sets",
+        default=True,
+        description="Restrict every render worker to its own cores, NUMA node by node (Linux only)"
+    )
+
+    # -- Worker Calibration (written by vr180.calibrate_workers) --
+    calibrated_workers: bpy.props.IntProperty(name="Calibrated Workers", default=0)
+    calibrated_cpu_count: bpy.props.IntProperty(name="Calibrated CPU Count", default=0)
+
+    # -- Render Estimate (written by vr180.estimate_render) --
+    estimate_total_seconds: bpy.props.FloatProperty(name="Estimated Time", default=0.0)
+    estimate_seconds_per_frame: bpy.props.FloatProperty(name="Seconds per Frame", default=0.0)
+    estimate_disk_mb: bpy.props.FloatProperty(name="Estimated Disk (MB)", default=0.0)
+    estimate_peak_memory_mb: bpy.props.FloatProperty(name="Estimated Peak Memory (MB)", default=0.0)
+
     # -- Step 4 Settings --
     auto_inject_metadata: bpy.props.BoolProperty(
         name="Auto-inject VR180 Metadata",
@@ -135,3 +302,53 @@ class PE_VR180SceneSettings(bpy.types.PropertyGroup):
         description="Delete the intermediate EXR sequences after the final MP4 is rendered and metadata injected."
     )
 
+    def workflow_dir(self, draft=None):
+        """Root folder of the sequences and video; the draft/ subtree in draft mode."""
+        root = Path(bpy.path.abspath(self.output_path)) / "vr180"
+        if self.draft_mode if draft is None else draft:
+            return root / DRAFT_DIR_NAME
+        return root
+
+    def job_store(self):
+        """Job queue store of this rig (utils/job_queue.py) under the output path."""
+        return JobStore(Path(bpy.path.abspath(self.output_path)) / QUEUE_FILE_NAME)
+
+    def worker_count(self):
+        """Render processes for Step 2: 1, or an even count resolved from render_workers."""
+        workers = self.render_workers
+        if workers == 0:
+            # A calibration only holds on the machine it ran on
+            if self.calibrated_workers and self.calibrated_cpu_count == (os.cpu_count() or 1):
+                workers = self.calibrated_workers
+            else:
+                workers = affinity.default_worker_count()
+        return 1 if workers < 2 else workers - workers % 2
+
+    def output_resolution(self):
+        """SBS (width, height) of the rendered sequences, reduced in draft mode."""
+        scale = self.draft_resolution_percentage / 100 if self.draft_mode else 1.0
+        return int(self.resolution_x / 2 * scale) * 2, int(self.resolution_y * scale)
+
+    def sbs_resolution(self):
+        """Returns the combined SBS (width, height) of the current preset."""
+        return RESOLUTION_PRESETS.get(self.resolution_preset, (self.resolution_x, self.resolution_y))
+
+    def ipd_schedule_settings(self):
+        """Keyword arguments for rig_math.ipd_schedule() from these settings."""
+        return {
+            'ratio': self.ipd_ratio,
+            'min_ipd': self.ipd_min,
+            'max_ipd': self.ipd_max,
+            'smoothing': self.ipd_smoothing,
+        }
+
+    def hdri_settings(self):
+        """Keyword arguments for setup_hdri_world() from these settings."""
+        return {
+            'filepath': self.hdri_path,
+            'strength': self.hdri_strength,
+            'sampling_method': self.hdri_sampling_method,
+            'map_resolution': self.hdri_map_resolution,
+            # Two 180° eyes side by side cover the same texels as one 360° frame
+            'render_width': self.sbs_resolution()[0],
+        }
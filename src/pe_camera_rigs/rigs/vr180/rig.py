@@ -1,11 +1,18 @@
 import bpy
 import math
+import numpy as np
+
+from ...utils.animation import ensure_action, write_fcurve, remove_fcurve
 from ...constants import VR180_RIG_NAME, VR180_LEFT_CAM_NAME, VR180_RIGHT_CAM_NAME
 
-def create_vr180_rig(context):
+def create_vr180_rig(collection, ipd=64.0):
     """
     Creates a parented VR180 stereo camera rig.
 
+    Args:
+        collection (bpy.types.Collection): Collection to link the rig into
+        ipd (float): Interpupillary distance in millimeters
+
     Returns:
         (tuple): The main rig empty, the left camera object, and the right camera object.
     """
@@ -13,7 +20,7 @@ def create_vr180_rig(context):
     rig = bpy.data.objects.new(name=VR180_RIG_NAME, object_data=None)
     rig.empty_display_type = 'CIRCLE'
     rig.location = (0, 0, 1.6) # Default eye level
-    context.collection.objects.link(rig)
+    collection.objects.link(rig)
 
     # 2. Create the left camera
     left_cam_data = bpy.data.cameras.new("VR180_Camera_Left_Data")
@@ -31,29 +38,81 @@ def create_vr180_rig(context):
         cam_data.cycles.panorama_type = 'FISHEYE_EQUISOLID'
         cam_data.cycles.fisheye_fov = math.radians(190)
         cam_data.lens = 5.2
-        context.collection.objects.link(cam_obj)
-
-    # 5. Add custom properties to the rig controller
-    # This assumes a 'PE_VR180RigSettings' PropertyGroup is defined in properties.py
-    # and registered to bpy.types.Object
-    
-    # 6. Use drivers to link the IPD property to the camera positions
-    ipd_path = 'pe_vr180_rig_settings.ipd'
-
-    # Left camera X location driver
-    d_left = left_cam_obj.driver_add('location', 0).driver
-    v_left = d_left.variables.new()
-    v_left.name = 'ipd'
-    v_left.targets[0].id = rig
-    v_left.targets[0].data_path = ipd_path
-    d_left.expression = '-ipd / 2000.0' # Convert mm to meters and divide by 2
-
-    # Right camera X location driver
-    d_right = right_cam_obj.driver_add('location', 0).driver
-    v_right = d_right.variables.new()
-    v_right.name = 'ipd'
-    v_right.targets[0].id = rig
-    v_right.targets[0].data_path = ipd_path
-    d_right.expression = 'ipd / 2000.0' # Convert mm to meters and divide by 2
+        collection.objects.link(cam_obj)
+
+    # 5. Place the eyes. IPD edits go through the PE_VR180RigSettings.ipd
+    # update callback, so no driver is evaluated on depsgraph updates
+    apply_vr180_ipd(rig, ipd)
 
     return rig, left_cam_obj, right_cam_obj
+
+
+def vr180_eye_cameras(rig):
+    """Returns the (left, right) camera children of a VR180 rig, None where missing."""
+    left = right = None
+    for child in rig.children:
+        if child.name.startswith(VR180_LEFT_CAM_NAME):
+            left = child
+        elif child.name.startswith(VR180_RIGHT_CAM_NAME):
+            right = child
+    return left, right
+
+
+def apply_vr180_ipd(rig, ipd=None):
+    """
+    Writes the eye camera X locations for an IPD.
+
+    Rigs created before the eyes were placed directly carry Python drivers
+    on location X; they are removed so the written value sticks.
+
+    Args:
+        rig (bpy.types.Object): VR180 rig empty
+        ipd (float, optional): IPD in millimeters, defaults to the rig's setting
+    """
+    if ipd is None:
+        ipd = rig.pe_vr180_rig_settings.ipd
+    half = ipd / 2000.0  # mm to meters, half per eye
+
+    for cam_obj, sign in zip(vr180_eye_cameras(rig), (-1.0, 1.0)):
+        if cam_obj is None:
+            continue
+        anim = cam_obj.animation_data
+        if anim and anim.drivers.find('location', index=0):
+            cam_obj.driver_remove('location', 0)
+        cam_obj.location.x = sign * half
+
+
+def bake_vr180_ipd(rig, frames, ipd):
+    """
+    Bakes a per-frame IPD into the eye cameras' X location F-curves.
+
+    Each eye gets one F-curve written with a single foreach_set(), so the
+    schedule plays back and renders with no driver or handler. It overrides
+    the static rig IPD until cleared with clear_vr180_ipd_schedule().
+
+    Args:
+        rig (bpy.types.Object): VR180 rig empty
+        frames (np.ndarray): (N,) frame numbers
+        ipd (np.ndarray): (N,) IPD in millimeters, e.g. from rig_math.ipd_schedule()
+
+    Raises:
+        ValueError: If the rig has no eye cameras
+    """
+    left, right = vr180_eye_cameras(rig)
+    if left is None or right is None:
+        raise ValueError(f"'{rig.name}' is missing its left or right camera")
+
+    half = np.asarray(ipd, dtype=np.float64) / 2000.0
+    for cam_obj, sign in ((left, -1.0), (right, 1.0)):
+        anim = cam_obj.animation_data
+        if anim and anim.drivers.find('location', index=0):
+            cam_obj.driver_remove('location', 0)
+        write_fcurve(ensure_action(cam_obj), "location", 0, frames, sign * half, group="Object Transforms")
+
+
+def clear_vr180_ipd_schedule(rig):
+    """Removes a baked IPD schedule and puts the eyes back at the rig's static IPD."""
+    for cam_obj in vr180_eye_cameras(rig):
+        if cam_obj is not None:
+            remove_fcurve(cam_obj, "location", 0)
+    apply_vr180_ipd(rig)
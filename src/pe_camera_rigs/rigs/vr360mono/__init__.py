@@ -4,6 +4,7 @@ from . import properties
 from .operators import (
     VR360_OT_CreateScene,
     VR360_OT_RenderSequence,
+    VR360_OT_EstimateRender,
     VR360_OT_SetupCompositor,
     VR360_OT_RenderYouTube,
 )
@@ -12,17 +13,28 @@ from .panels import VR360_PT_Workflow
 classes = (
     VR360_OT_CreateScene,
     VR360_OT_RenderSequence,
+    VR360_OT_EstimateRender,
     VR360_OT_SetupCompositor,
     VR360_OT_RenderYouTube,
+)
+
+# Sidebar panels, skipped by the headless registration profile
+ui_classes = (
     VR360_PT_Workflow,
 )
 
-def register():
+def register(headless=False):
     properties.register()
     for cls in classes:
         bpy.utils.register_class(cls)
+    if not headless:
+        for cls in ui_classes:
+            bpy.utils.register_class(cls)
 
-def unregister():
+def unregister(headless=False):
+    if not headless:
+        for cls in reversed(ui_classes):
+            bpy.utils.unregister_class(cls)
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
     properties.unregister()
@@ -1,23 +1,44 @@
 import bpy
+import json
 import math
 import os
 import logging
 from pathlib import Path
 from bpy.types import Operator
-from bpy.props import EnumProperty, BoolProperty
+from bpy.props import EnumProperty, BoolProperty, FloatProperty, IntProperty
 
 logger = logging.getLogger(__name__)
 
-from .rig import create_vr360_camera
+from ...utils.lazy import lazy_import
+from ...utils import job_queue
 from ...utils.scene_setup import (
     create_lighting_preset,
     create_cyclorama,
-    add_reference_sphere
+    add_reference_sphere,
+    hdri_file_exists,
 )
 from ...utils.blender import detect_and_enable_gpu
+from ...utils.render import (
+    snapshot_render_settings,
+    restore_render_settings,
+    estimate_sequence,
+    format_duration,
+)
 from .properties import PE_VR360MonoSceneSettings
 from ...constants import VR360_CAM_NAME, VR360_COMPOSITOR_SCENE_NAME
 
+# Loaded on first use, so registering the operators stays cheap
+camera_rig = lazy_import(".rig", __package__)
+pipeline = lazy_import(".pipeline", __package__)
+
+
+def _track(scene, step):
+    """Records an operator step in the rig's job store, which the panel reads."""
+    settings = scene.pe_vr360_mono_settings
+    return job_queue.track_step(
+        settings.job_store(), 'vr360mono', scene.name, step, blend=bpy.data.filepath, draft=settings.draft_mode,
+    )
+
 class VR360_OT_CreateScene(Operator):
     """Create VR360 Scene - Sets up a 360 Mono rig and scene elements"""
     bl_idname = "vr360mono.create_scene"
@@ -28,9 +49,13 @@ class VR360_OT_CreateScene(Operator):
     def execute(self, context):
         settings = context.scene.pe_vr360_mono_settings
 
+        if settings.lighting_preset == 'HDRI' and not hdri_file_exists(settings.hdri_path):
+            self.report({'ERROR'}, f"HDRI not found: '{settings.hdri_path}'. Choose a .hdr/.exr file.")
+            return {'CANCELLED'}
+
         try:
             # 1. Create the VR360 camera
-            camera = create_vr360_camera(context, height=1.6)
+            camera = camera_rig.create_vr360_camera(context.collection, height=1.6)
 
             # 2. Set resolution based on preset
             if settings.resolution_preset == '5K':
@@ -44,13 +69,16 @@ class VR360_OT_CreateScene(Operator):
 
             # 3. Create lighting
             if settings.lighting_preset != 'NONE':
-                create_lighting_preset(context=context, preset=settings.lighting_preset)
+                create_lighting_preset(
+                    context.collection, preset=settings.lighting_preset,
+                    scene=context.scene, hdri=settings.hdri_settings(),
+                )
 
             # 4. Create Cyclorama and Reference
             if settings.include_cyclorama:
-                create_cyclorama(context, settings.cyclorama_size, settings.cyclorama_color)
+                create_cyclorama(context.collection, settings.cyclorama_size, settings.cyclorama_color)
             if settings.include_reference:
-                add_reference_sphere(context)
+                add_reference_sphere(context.collection)
 
             # 5. Auto-configure scene
             context.scene.render.engine = 'CYCLES'
@@ -132,52 +160,23 @@ class VR360_OT_RenderSequence(Operator):
         return True
 
     def execute(self, context):
-        settings = context.scene.pe_vr360_mono_settings
-
         # Validate preconditions before starting render
         if not self._validate_preconditions(context):
             return {'CANCELLED'}
 
-        # Store original render settings
-        render = context.scene.render
-        original_settings = {
-            'engine': render.engine,
-            'filepath': render.filepath,
-            'resolution_x': render.resolution_x,
-            'resolution_y': render.resolution_y,
-            'resolution_percentage': render.resolution_percentage,
-            'camera': context.scene.camera,
-            'image_settings': {
-                'file_format': render.image_settings.file_format,
-                'color_mode': render.image_settings.color_mode,
-                'color_depth': render.image_settings.color_depth,
-                'exr_codec': render.image_settings.exr_codec,
-            }
-        }
-
         try:
-            # 1. Detect the VR360 camera
-            camera = bpy.data.objects.get(VR360_CAM_NAME)
-            if not camera:
-                self.report({'ERROR'}, f"No {VR360_CAM_NAME} found! Please create scene first.")
-                return {'CANCELLED'}
-
-            # 2. Create output folder
-            output_base_path = bpy.path.abspath(settings.output_path)
-            sequence_folder = Path(output_base_path) / "vr360" / "sequence"
-            sequence_folder.mkdir(parents=True, exist_ok=True)
-
-            # 3. Configure render settings for OpenEXR
-            context.scene.render.image_settings.file_format = 'OPEN_EXR'
-            context.scene.render.image_settings.color_depth = '32'
-            context.scene.render.image_settings.exr_codec = 'DWAA'
-            
-            # 4. Render Sequence
-            context.scene.camera = camera
-            context.scene.render.filepath = str(sequence_folder / "vr360_")
-            bpy.ops.render.render(animation=True)
-            self.report({'INFO'}, f"Rendered 360 Mono sequence to {sequence_folder}")
+            if context.scene.pe_vr360_mono_settings.stream_encode:
+                with _track(context.scene, 'stream'):
+                    video_path = pipeline.stream_sequence(context.scene)
+                self.report({'INFO'}, f"Rendered 360 Mono sequence and encoded {video_path}")
+            else:
+                with _track(context.scene, 'render'):
+                    sequence_folder = pipeline.render_sequence(context.scene)
+                self.report({'INFO'}, f"Rendered 360 Mono sequence to {sequence_folder}")
 
+        except ValueError as e:
+            self.report({'ERROR'}, str(e))
+            return {'CANCELLED'}
         except (IOError, OSError, PermissionError) as e:
             self.report({'ERROR'}, f"File system error: {str(e)}")
             return {'CANCELLED'}
@@ -189,23 +188,81 @@ class VR360_OT_RenderSequence(Operator):
             logger.exception("Unexpected error rendering sequence")
             self.report({'ERROR'}, f"Unexpected error rendering sequence: {str(e)}")
             return {'CANCELLED'}
-        finally:
-            # 5. Restore original render settings
-            render = context.scene.render
-            render.engine = original_settings['engine']
-            render.filepath = original_settings['filepath']
-            render.resolution_x = original_settings['resolution_x']
-            render.resolution_y = original_settings['resolution_y']
-            render.resolution_percentage = original_settings['resolution_percentage']
-            render.image_settings.file_format = original_settings['image_settings']['file_format']
-            render.image_settings.color_mode = original_settings['image_settings']['color_mode']
-            render.image_settings.color_depth = original_settings['image_settings']['color_depth']
-            render.image_settings.exr_codec = original_settings['image_settings']['exr_codec']
-            context.scene.camera = original_settings['camera']
 
         self.report({'INFO'}, "VR360 Mono Sequence Rendered!")
         return {'FINISHED'}
 
+class VR360_OT_EstimateRender(Operator):
+    """Estimate Render - Trial-renders a few frames to predict time, disk and memory"""
+    bl_idname = "vr360mono.estimate_render"
+    bl_label = "Estimate Render"
+    bl_description = (
+        "Renders a few stratified frames at reduced resolution and samples, then "
+        "extrapolates time, disk usage and peak memory of the full sequence"
+    )
+    bl_options = {'REGISTER'}
+
+    trial_frames: IntProperty(name="Trial Frames", default=5, min=1, max=50)
+    resolution_scale: FloatProperty(name="Resolution Scale", default=0.25, min=0.05, max=1.0)
+    sample_scale: FloatProperty(name="Sample Scale", default=0.125, min=0.01, max=1.0)
+
+    @classmethod
+    def poll(cls, context):
+        """Only enable if VR360 scene has been created."""
+        return VR360_CAM_NAME in bpy.data.objects
+
+    def execute(self, context):
+        scene = context.scene
+        settings = scene.pe_vr360_mono_settings
+
+        if scene.frame_end < scene.frame_start:
+            self.report({'ERROR'}, "Invalid frame range: End frame is before start frame")
+            return {'CANCELLED'}
+
+        camera = bpy.data.objects.get(VR360_CAM_NAME)
+        if not camera:
+            self.report({'ERROR'}, f"No {VR360_CAM_NAME} found! Please create scene first.")
+            return {'CANCELLED'}
+
+        original_settings = snapshot_render_settings(scene)
+        try:
+            pipeline.configure_sequence_render(scene, settings)
+            estimate = estimate_sequence(
+                scene, [camera], scene.frame_start, scene.frame_end,
+                frame_count=self.trial_frames,
+                resolution_scale=self.resolution_scale,
+                sample_scale=self.sample_scale,
+            )
+
+            output_dir = settings.workflow_dir()
+            output_dir.mkdir(parents=True, exist_ok=True)
+            with open(output_dir / "estimate.json", 'w', encoding='utf-8') as f:
+                json.dump(estimate, f, indent=2)
+
+        except (IOError, OSError, PermissionError) as e:
+            self.report({'ERROR'}, f"File system error: {str(e)}")
+            return {'CANCELLED'}
+        except RuntimeError as e:
+            self.report({'ERROR'}, f"Render error: {str(e)}")
+            return {'CANCELLED'}
+        except Exception as e:
+            logger.exception("Unexpected error during render estimate")
+            self.report({'ERROR'}, f"Unexpected error during render estimate: {str(e)}")
+            return {'CANCELLED'}
+        finally:
+            restore_render_settings(scene, original_settings)
+
+        settings.estimate_total_seconds = estimate['total_seconds']
+        settings.estimate_seconds_per_frame = estimate['seconds_per_frame']
+        settings.estimate_disk_mb = estimate['total_bytes'] / (1024 * 1024)
+        settings.estimate_peak_memory_mb = estimate['peak_memory_mb'] or 0.0
+
+        self.report({'INFO'}, (
+            f"Estimated {format_duration(estimate['total_seconds'])} for "
+            f"{estimate['frames']} frames, {settings.estimate_disk_mb / 1024:.1f} GB"
+        ))
+        return {'FINISHED'}
+
 class VR360_OT_SetupCompositor(Operator):
     """Setup Compositor - Auto-loads sequence and creates nodes"""
     bl_idname = "vr360mono.setup_compositor"
@@ -218,8 +275,7 @@ class VR360_OT_SetupCompositor(Operator):
         """Only enable if VR360 sequence has been rendered."""
         settings = context.scene.pe_vr360_mono_settings
         try:
-            output_base_path = bpy.path.abspath(settings.output_path)
-            sequence_folder = Path(output_base_path) / "vr360" / "sequence"
+            sequence_folder = settings.workflow_dir() / "sequence"
             return sequence_folder.exists()
         except:
             return False
@@ -230,8 +286,7 @@ class VR360_OT_SetupCompositor(Operator):
 
         # Check that sequence was rendered
         try:
-            output_base_path = bpy.path.abspath(settings.output_path)
-            sequence_folder = Path(output_base_path) / "vr360" / "sequence"
+            sequence_folder = settings.workflow_dir() / "sequence"
 
             # Check folder exists
             if not sequence_folder.exists():
@@ -257,69 +312,19 @@ class VR360_OT_SetupCompositor(Operator):
         return True
 
     def execute(self, context):
-        settings = context.scene.pe_vr360_mono_settings
-
         # Validate preconditions
         if not self._validate_preconditions(context):
             return {'CANCELLED'}
 
-        # Store original state
-        original_scene = context.window.scene
-        original_active = context.view_layer.objects.active
-        original_selected = list(context.selected_objects)
-
         try:
-            # 1. Create or get compositor scene
-            if VR360_COMPOSITOR_SCENE_NAME in bpy.data.scenes:
-                comp_scene = bpy.data.scenes[VR360_COMPOSITOR_SCENE_NAME]
-            else:
-                comp_scene = bpy.data.scenes.new(VR360_COMPOSITOR_SCENE_NAME)
-
-            context.window.scene = comp_scene
-            comp_scene.use_nodes = True
-            comp_scene.node_tree.nodes.clear()
-
-            # 2. Auto-detect sequence path
-            output_base_path = bpy.path.abspath(settings.output_path)
-            sequence_path = str(Path(output_base_path) / "vr360" / "sequence" / "vr360_")
-
-            # 3. Create nodes
-            nodes = comp_scene.node_tree.nodes
-            links = comp_scene.node_tree.links
-
-            image_node = nodes.new('CompositorNodeImage')
-            image_node.location = (-400, 0)
-            image_node.filepath = sequence_path
-            image_node.frame_duration = original_scene.frame_end - original_scene.frame_start + 1
-
-            denoise_node = nodes.new('CompositorNodeDenoise')
-            denoise_node.location = (-150, 0)
-
-            composite_node = nodes.new('CompositorNodeComposite')
-            composite_node.location = (100, 0)
-
-            viewer_node = nodes.new('CompositorNodeViewer')
-            viewer_node.location = (100, -150)
-
-            # 4. Link nodes
-            links.new(image_node.outputs['Image'], denoise_node.inputs['Image'])
-            links.new(denoise_node.outputs['Image'], composite_node.inputs['Image'])
-            links.new(denoise_node.outputs['Image'], viewer_node.inputs['Image'])
-            
-            # 5. Configure scene settings for compositor output
-            if settings.resolution_preset == '5K':
-                comp_scene.render.resolution_x = 5120
-                comp_scene.render.resolution_y = 2560
-            elif settings.resolution_preset == '8K':
-                comp_scene.render.resolution_x = 7680
-                comp_scene.render.resolution_y = 3840
-
-            comp_scene.frame_start = original_scene.frame_start
-            comp_scene.frame_end = original_scene.frame_end
-
+            with _track(context.scene, 'composite'):
+                pipeline.setup_compositor(context.scene)
             self.report({'INFO'}, "360 Mono Compositor Ready!")
             return {'FINISHED'}
 
+        except ValueError as e:
+            self.report({'ERROR'}, str(e))
+            return {'CANCELLED'}
         except (IOError, OSError) as e:
             self.report({'ERROR'}, f"File system error accessing sequence: {str(e)}")
             return {'CANCELLED'}
@@ -334,18 +339,6 @@ class VR360_OT_SetupCompositor(Operator):
             logger.exception("Unexpected error setting up compositor")
             self.report({'ERROR'}, f"Unexpected error setting up compositor: {str(e)}")
             return {'CANCELLED'}
-        finally:
-            # Restore original scene context
-            context.window.scene = original_scene
-
-            # Restore original selection and active object
-            if original_active and original_active.name in bpy.data.objects:
-                context.view_layer.objects.active = original_active
-
-            bpy.ops.object.select_all(action='DESELECT')
-            for obj in original_selected:
-                if obj and obj.name in bpy.data.objects:
-                    obj.select_set(True)
 
 class VR360_OT_RenderYouTube(Operator):
     """Render YouTube Video - Renders the final 360 mono video"""
@@ -356,8 +349,8 @@ class VR360_OT_RenderYouTube(Operator):
 
     @classmethod
     def poll(cls, context):
-        """Only enable if compositor scene exists."""
-        return VR360_COMPOSITOR_SCENE_NAME in bpy.data.scenes
+        """Only enable if compositor scene exists (or the video comes from the frame cache)."""
+        return VR360_COMPOSITOR_SCENE_NAME in bpy.data.scenes or context.scene.pe_vr360_mono_settings.frame_cache
 
     def _validate_preconditions(self, context):
         """Validate that compositor scene exists with valid node setup."""
@@ -390,40 +383,19 @@ class VR360_OT_RenderYouTube(Operator):
         return True
 
     def execute(self, context):
-        settings = context.scene.pe_vr360_mono_settings
-        original_scene = context.window.scene
-
-        # Validate preconditions
-        if not self._validate_preconditions(context):
+        # Validate preconditions (the frame cache needs no compositor)
+        if not context.scene.pe_vr360_mono_settings.frame_cache and not self._validate_preconditions(context):
             return {'CANCELLED'}
 
         try:
-            # 1. Find the compositor scene
-            comp_scene = bpy.data.scenes.get(VR360_COMPOSITOR_SCENE_NAME)
-
-            # 2. Set active scene to compositor
-            context.window.scene = comp_scene
-
-            # 3. Configure render settings for YouTube video
-            output_base_path = bpy.path.abspath(settings.output_path)
-            final_output_path = Path(output_base_path) / "vr360" / "youtube_vr360"
-            final_output_path.mkdir(parents=True, exist_ok=True)
-            
-            comp_scene.render.filepath = str(final_output_path / "vr360_mono_")
-            
-            comp_scene.render.image_settings.file_format = 'FFMPEG'
-            comp_scene.render.ffmpeg.format = 'MPEG4'
-            comp_scene.render.ffmpeg.codec = 'H264'
-            comp_scene.render.ffmpeg.constant_rate_factor = 'PERC_LOSSLESS'
-            comp_scene.render.ffmpeg.ffmpeg_preset = 'SLOW'
-            comp_scene.render.ffmpeg.audio_codec = 'NONE'
-
-            # 4. Trigger the render
-            bpy.ops.render.render(animation=True)
-
-            self.report({'INFO'}, f"Final 360 mono video rendered to: {comp_scene.render.filepath}")
+            with _track(context.scene, 'encode'):
+                final_output_path = pipeline.encode_video(context.scene)
+            self.report({'INFO'}, f"Final 360 mono video rendered to: {final_output_path}")
             return {'FINISHED'}
 
+        except ValueError as e:
+            self.report({'ERROR'}, str(e))
+            return {'CANCELLED'}
         except (IOError, OSError, PermissionError) as e:
             self.report({'ERROR'}, f"File system error: {str(e)}")
             return {'CANCELLED'}
@@ -438,6 +410,3 @@ class VR360_OT_RenderYouTube(Operator):
             logger.exception("Unexpected error rendering video")
             self.report({'ERROR'}, f"Unexpected error rendering video: {str(e)}")
             return {'CANCELLED'}
-        finally:
-            # 5. Restore original scene
-            context.window.scene = original_scene
\ No newline at end of file
@@ -1,7 +1,8 @@
 import bpy
 from bpy.types import Panel
-from pathlib import Path
 from ...constants import VR360_CAM_NAME, VR360_COMPOSITOR_SCENE_NAME
+from ...utils.render import format_duration
+from ...utils import job_queue
 
 class VR360_PT_Workflow(Panel):
     """VR360 Mono Professional 4-Step Workflow Panel"""
@@ -34,7 +35,20 @@ class VR360_PT_Workflow(Panel):
         col = box.column(align=True)
         col.prop(settings, "resolution_preset")
         col.prop(settings, "render_quality")
+        col.prop(settings, "denoise_mode")
+        row = col.row(align=True)
+        row.label(text="EXR:")
+        row.prop(settings, "exr_depth", text="")
+        row.prop(settings, "exr_color_mode", text="")
+        row.prop(settings, "exr_codec", text="")
         col.prop(settings, "output_path")
+        col.separator()
+        col.prop(settings, "draft_mode", icon='MOD_DECIM')
+        if settings.draft_mode:
+            sub = col.column(align=True)
+            sub.prop(settings, "draft_resolution_percentage")
+            sub.prop(settings, "draft_samples")
+            sub.label(text="Renders to the draft/ folder", icon='INFO')
 
         layout.separator()
 
@@ -43,6 +57,13 @@ class VR360_PT_Workflow(Panel):
         box.label(text="STEP 1: Create Scene", icon='SCENE_DATA')
         col = box.column(align=True)
         col.prop(settings, "lighting_preset")
+        if settings.lighting_preset == 'HDRI':
+            sub = col.column(align=True)
+            sub.prop(settings, "hdri_path")
+            sub.prop(settings, "hdri_strength")
+            sub.prop(settings, "hdri_sampling_method")
+            if settings.hdri_sampling_method == 'MANUAL':
+                sub.prop(settings, "hdri_map_resolution")
         col.prop(settings, "include_cyclorama")
         if settings.include_cyclorama:
             sub = col.column(align=True)
@@ -70,23 +91,54 @@ class VR360_PT_Workflow(Panel):
 
         # Check if Step 1 is complete
         step1_complete = VR360_CAM_NAME in bpy.data.objects
+
+        # Steps 2 and 4 are complete once their last recorded run finished
+        # (utils/job_queue.py); output from before the job store is probed on disk
+        try:
+            store = settings.job_store()
+            done = job_queue.completed_steps(store, context.scene.name, settings.draft_mode)
+        except (OSError, ValueError):
+            store = None
+            done = None
+        if done is not None:
+            step2_complete = bool({'render', 'stream'} & done)
+        else:
+            try:
+                step2_complete = (settings.workflow_dir() / "sequence").exists()
+            except:
+                step2_complete = False
+
         if not step1_complete:
             col.enabled = False
             col.label(text="Complete Step 1 first", icon='INFO')
 
+        row = col.row(align=True)
+        row.prop(settings, "tile_bands")
+        sub = row.row(align=True)
+        sub.enabled = settings.tile_bands > 1
+        sub.prop(settings, "tile_workers")
+        col.prop(settings, "stream_encode")
+        row = col.row(align=True)
+        row.prop(settings, "frame_cache")
+        sub = row.row(align=True)
+        sub.enabled = settings.frame_cache
+        sub.prop(settings, "frame_cache_format", text="")
+        col.operator("vr360mono.estimate_render", icon='TIME')
         col.operator("vr360mono.render_sequence", icon='RENDER_STILL')
 
+        if settings.estimate_total_seconds > 0:
+            est = col.box().column(align=True)
+            est.label(text=f"ETA: {format_duration(settings.estimate_total_seconds)} "
+                           f"({settings.estimate_seconds_per_frame:.1f}s/frame)", icon='TIME')
+            est.label(text=f"Disk: {settings.estimate_disk_mb / 1024:.1f} GB", icon='DISK_DRIVE')
+            if settings.estimate_peak_memory_mb > 0:
+                est.label(text=f"Peak Memory: {settings.estimate_peak_memory_mb / 1024:.1f} GB", icon='MEMORY')
+
         # Show status if sequence rendered
-        if step1_complete:
-            try:
-                output_base_path = bpy.path.abspath(settings.output_path)
-                sequence_folder = Path(output_base_path) / "vr360" / "sequence"
-                if sequence_folder.exists():
-                    col.separator()
-                    col.label(text="Sequence Rendered!", icon='CHECKMARK')
-                    col.label(text="Next: Step 3", icon='FORWARD')
-            except:
-                pass
+        if step1_complete and step2_complete:
+            col.separator()
+            col.label(text="Sequence Rendered!", icon='CHECKMARK')
+            col.label(text="Next: Step 3", icon='FORWARD')
 
         layout.separator()
 
@@ -96,15 +148,6 @@ class VR360_PT_Workflow(Panel):
         col = box.column(align=True)
         col.scale_y = 1.3
 
-        # Check if Step 2 is complete
-        step2_complete = False
-        try:
-            output_base_path = bpy.path.abspath(settings.output_path)
-            sequence_folder = Path(output_base_path) / "vr360" / "sequence"
-            step2_complete = sequence_folder.exists()
-        except:
-            pass
-
         if not step2_complete:
             col.enabled = False
             col.label(text="Complete Step 2 first", icon='INFO')
@@ -127,19 +170,32 @@ class VR360_PT_Workflow(Panel):
 
         # Check if Step 3 is complete
         step3_complete = VR360_COMPOSITOR_SCENE_NAME in bpy.data.scenes
-        if not step3_complete:
+        if settings.frame_cache:
+            col.label(text="Encodes from the raw frame cache", icon='INFO')
+        elif not step3_complete:
             col.enabled = False
             col.label(text="Complete Step 3 first", icon='INFO')
 
         col.operator("vr360mono.render_youtube", icon='RENDER_OUTPUT')
 
         # Show status if final video rendered
-        if step3_complete:
+        if done is not None:
+            video_complete = bool({'encode', 'stream'} & done)
+        else:
             try:
-                output_base_path = bpy.path.abspath(settings.output_path)
-                final_output_path = Path(output_base_path) / "vr360" / "youtube_vr360"
-                if final_output_path.exists():
-                    col.separator()
-                    col.label(text="Video Complete!", icon='CHECKMARK')
+                video_complete = step3_complete and (settings.workflow_dir() / "youtube_vr360").exists()
             except:
-                pass
+                video_complete = False
+        if video_complete:
+            col.separator()
+            col.label(text="Video Complete!", icon='CHECKMARK')
+
+        # Render queue (CLI --enqueue / queue, and the operators' own runs)
+        lines = job_queue.queue_status_lines(store) if store is not None else []
+        if lines:
+            layout.separator()
+            box = layout.box()
+            box.label(text="Render Queue", icon='SORTTIME')
+            col = box.column(align=True)
+            for text, icon in lines:
+                col.label(text=text, icon=icon)
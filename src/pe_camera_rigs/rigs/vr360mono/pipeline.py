@@ -0,0 +1,341 @@
+"""
+VR360 Mono workflow steps without UI context.
+
+Shared by the workflow operators and the headless CLI (pe_camera_rigs.cli).
+Scenes are passed explicitly and rendered with
+`bpy.ops.render.render(scene=...)`, so nothing here needs `context.window`.
+"""
+
+import logging
+import os
+import tempfile
+from contextlib import nullcontext
+
+import bpy
+
+from ...utils.workers import render_frame_bands
+from ...utils.stream_encode import StreamAssembler, FrameWatcher
+from ...utils.frame_cache import CACHE_EXTENSION, FrameCacheWriter, encode_cache_sequence
+from ...utils.render import (
+    RENDER_SETTINGS_PATHS,
+    snapshot_render_settings,
+    restore_render_settings,
+    apply_render_quality,
+    apply_denoise_mode,
+    apply_exr_storage,
+    denoised_output,
+    frame_written_callback,
+)
+from ...constants import VR360_CAM_NAME, VR360_COMPOSITOR_SCENE_NAME
+
+logger = logging.getLogger(__name__)
+
+# Sequence renders may also narrow the frame range and step through frames
+SEQUENCE_SETTINGS_PATHS = RENDER_SETTINGS_PATHS + ("frame_start", "frame_end", "frame_current")
+
+
+def configure_sequence_render(scene, settings):
+    """Configures Cycles, EXR storage, denoising and samples (draft or quality preset) for the sequence."""
+    render = scene.render
+    render.engine = 'CYCLES'
+    render.image_settings.file_format = 'OPEN_EXR'
+    apply_exr_storage(scene, settings.exr_depth, settings.exr_color_mode, settings.exr_codec)
+    apply_denoise_mode(scene, settings.denoise_mode)
+
+    apply_render_quality(scene, settings.render_quality, denoised=settings.denoise_mode != 'NONE')
+
+    if settings.draft_mode:
+        render.resolution_percentage = settings.draft_resolution_percentage
+        scene.cycles.samples = settings.draft_samples
+
+
+def _render_tiled(scene, settings, sequence_folder, on_frame=None):
+    """Renders each frame as horizontal bands in background worker processes."""
+    with tempfile.TemporaryDirectory(prefix="pe_vr360_bands_") as band_dir:
+        # Workers load a copy of the configured scene
+        blend_path = os.path.join(band_dir, "scene.blend")
+        bpy.ops.wm.save_as_mainfile(filepath=blend_path, copy=True)
+
+        for frame in range(scene.frame_start, scene.frame_end + 1):
+            # Same names as an animation render, so later steps find the frames
+            output = sequence_folder / f"vr360_{frame:04d}{scene.render.file_extension}"
+            render_frame_bands(
+                blend_path, scene, frame, settings.tile_bands, settings.tile_workers,
+                str(output), band_dir,
+            )
+            if on_frame is not None:
+                on_frame(frame)
+
+
+def sequence_frame_path(settings, frame):
+    """EXR path of one frame, as named by the sequence render."""
+    return settings.workflow_dir() / "sequence" / f"vr360_{frame:04d}.exr"
+
+
+def cache_frame_path(settings, frame):
+    """Raw frame cache path of one frame."""
+    return settings.workflow_dir() / "cache" / f"vr360_{frame:04d}{CACHE_EXTENSION}"
+
+
+def _cache_writer(settings, on_frame):
+    """FrameCacheWriter reporting on to on_frame, or None when the cache is off."""
+    if not settings.frame_cache:
+        return None
+    if settings.denoise_mode == 'COMPOSITOR':
+        raise ValueError("Raw Frame Cache skips the compositor. Use Denoise 'In Render (OIDN)' instead.")
+    return FrameCacheWriter(
+        lambda frame: [sequence_frame_path(settings, frame)], lambda frame: [cache_frame_path(settings, frame)],
+        settings.frame_cache_format, on_frame=on_frame,
+    )
+
+
+def render_sequence(scene, frame_start=None, frame_end=None, on_frame=None):
+    """
+    Renders the equirectangular EXR sequence, band-tiled when tile_bands > 1.
+
+    Args:
+        scene (bpy.types.Scene): Scene holding the camera and pe_vr360_mono_settings
+        frame_start (int, optional): First frame, defaults to the scene's
+        frame_end (int, optional): Last frame, defaults to the scene's
+        on_frame (callable, optional): Called with the frame number once its EXR is written
+
+    Returns:
+        pathlib.Path: The sequence folder
+
+    Raises:
+        ValueError: If the VR360 camera is missing, or band tiling or the
+            frame cache is combined with compositor denoising
+    """
+    settings = scene.pe_vr360_mono_settings
+    camera = bpy.data.objects.get(VR360_CAM_NAME)
+    if camera is None:
+        raise ValueError(f"No {VR360_CAM_NAME} found. Run Step 1 (Create VR360 Scene) first.")
+    if settings.tile_bands > 1 and settings.denoise_mode == 'COMPOSITOR':
+        raise ValueError("Band tiling cannot keep the denoising passes. Use Denoise 'In Render (OIDN)' instead.")
+    cache = _cache_writer(settings, on_frame)
+    if cache is not None:
+        on_frame = cache.frame_ready
+
+    sequence_folder = settings.workflow_dir() / "sequence"
+    sequence_folder.mkdir(parents=True, exist_ok=True)
+
+    original_settings = snapshot_render_settings(scene, SEQUENCE_SETTINGS_PATHS)
+    try:
+        configure_sequence_render(scene, settings)
+        if frame_start is not None:
+            scene.frame_start = frame_start
+        if frame_end is not None:
+            scene.frame_end = frame_end
+
+        scene.camera = camera
+        with cache or nullcontext():
+            if settings.tile_bands > 1:
+                _render_tiled(scene, settings, sequence_folder, on_frame)
+            else:
+                scene.render.filepath = str(sequence_folder / "vr360_")
+                with frame_written_callback(scene, on_frame):
+                    bpy.ops.render.render(animation=True, scene=scene.name)
+        logger.info("Rendered 360 Mono sequence to %s", sequence_folder)
+    finally:
+        restore_render_settings(scene, original_settings)
+
+    return sequence_folder
+
+
+def stream_sequence(scene, frame_start=None, frame_end=None, render=None):
+    """
+    Renders the sequence and encodes the 360 video as frames finish.
+
+    Each frame is piped to ffmpeg while the next one renders, so the video
+    is ready shortly after the last frame. The EXRs are kept, so Steps 3
+    and 4 can still rebuild the video through the compositor.
+
+    Args:
+        scene (bpy.types.Scene): Scene holding the camera and pe_vr360_mono_settings
+        frame_start (int, optional): First frame, defaults to the scene's
+        frame_end (int, optional): Last frame, defaults to the scene's
+        render (callable, optional): Renders the frames elsewhere (e.g. worker
+            processes) instead of here; finished frames are then picked up by
+            watching the sequence folder
+
+    Returns:
+        pathlib.Path: The video file
+
+    Raises:
+        ValueError: If the camera is missing, ffmpeg/OpenImageIO are unavailable, or
+            denoise_mode is 'COMPOSITOR' (the stream skips the compositor)
+    """
+    settings = scene.pe_vr360_mono_settings
+    if bpy.data.objects.get(VR360_CAM_NAME) is None:
+        raise ValueError(f"No {VR360_CAM_NAME} found. Run Step 1 (Create VR360 Scene) first.")
+    if settings.denoise_mode == 'COMPOSITOR':
+        raise ValueError("Encode While Rendering skips the compositor. Use Denoise 'In Render (OIDN)' instead.")
+    frame_start = scene.frame_start if frame_start is None else frame_start
+    frame_end = scene.frame_end if frame_end is None else frame_end
+
+    video_folder = settings.workflow_dir() / "youtube_vr360"
+    video_folder.mkdir(parents=True, exist_ok=True)
+    # Same name Blender gives an animation render of this range
+    video_path = video_folder / f"vr360_mono_{frame_start:04d}-{frame_end:04d}.mp4"
+
+    assembler = StreamAssembler(
+        lambda frame: [sequence_frame_path(settings, frame)], 'MONO', frame_start, frame_end,
+        str(video_path), scene.render.fps / scene.render.fps_base,
+        quality='DRAFT' if settings.draft_mode else 'FINAL',
+    )
+    with assembler:
+        if render is None:
+            render_sequence(scene, frame_start, frame_end, on_frame=assembler.frame_ready)
+        else:
+            with FrameWatcher(assembler):
+                render()
+
+    logger.info("Streamed %d frames to %s", assembler.encoded, video_path)
+    return video_path
+
+
+def setup_compositor(scene):
+    """
+    Creates (or rebuilds) the compositor scene reading the rendered sequence.
+
+    Args:
+        scene (bpy.types.Scene): Scene holding pe_vr360_mono_settings and the frame range
+
+    Returns:
+        bpy.types.Scene: The compositor scene
+
+    Raises:
+        ValueError: If the sequence has not been rendered
+    """
+    settings = scene.pe_vr360_mono_settings
+    sequence_folder = settings.workflow_dir() / "sequence"
+    sequence_files = sorted(sequence_folder.glob("vr360_*.exr"))
+    if not sequence_files:
+        raise ValueError("No VR360 EXR files found. Run Step 2 (Render Sequence) first.")
+
+    expected_frames = scene.frame_end - scene.frame_start + 1
+    if len(sequence_files) < expected_frames:
+        logger.warning("Incomplete sequence: expected %d frames, found %d", expected_frames, len(sequence_files))
+
+    comp_scene = bpy.data.scenes.get(VR360_COMPOSITOR_SCENE_NAME)
+    if comp_scene is None:
+        comp_scene = bpy.data.scenes.new(VR360_COMPOSITOR_SCENE_NAME)
+
+    comp_scene.use_nodes = True
+    comp_scene.node_tree.nodes.clear()
+
+    nodes = comp_scene.node_tree.nodes
+    links = comp_scene.node_tree.links
+
+    image_node = nodes.new('CompositorNodeImage')
+    image_node.location = (-400, 0)
+    image_node.image = bpy.data.images.load(str(sequence_files[0]), check_existing=True)
+    image_node.image.source = 'SEQUENCE'
+    image_node.frame_duration = len(sequence_files)
+    image_node.frame_start = scene.frame_start
+
+    # 'RENDER' frames are denoised already, 'NONE' stays noisy on purpose
+    result = image_node.outputs['Image']
+    if settings.denoise_mode == 'COMPOSITOR':
+        result = denoised_output(nodes, links, image_node, (-150, 0))
+
+    composite_node = nodes.new('CompositorNodeComposite')
+    composite_node.location = (100, 0)
+
+    viewer_node = nodes.new('CompositorNodeViewer')
+    viewer_node.location = (100, -150)
+
+    links.new(result, composite_node.inputs['Image'])
+    links.new(result, viewer_node.inputs['Image'])
+
+    comp_scene.render.resolution_x, comp_scene.render.resolution_y = settings.output_resolution()
+    comp_scene.render.resolution_percentage = 100
+    # Step 4 encodes to the matching folder even if Draft Mode is toggled meanwhile
+    comp_scene["pe_draft"] = settings.draft_mode
+
+    comp_scene.frame_start = scene.frame_start
+    comp_scene.frame_end = scene.frame_end
+    comp_scene.render.fps = scene.render.fps
+
+    return comp_scene
+
+
+def encode_cached_video(scene):
+    """
+    Encodes the 360 mono MP4 from the raw frame cache, without the compositor.
+
+    Args:
+        scene (bpy.types.Scene): Scene holding pe_vr360_mono_settings and the frame range
+
+    Returns:
+        pathlib.Path: Folder holding the video
+
+    Raises:
+        ValueError: If the first frame is not cached, or ffmpeg is unavailable
+    """
+    settings = scene.pe_vr360_mono_settings
+    video_folder = settings.workflow_dir() / "youtube_vr360"
+    video_folder.mkdir(parents=True, exist_ok=True)
+    video_path = video_folder / f"vr360_mono_{scene.frame_start:04d}-{scene.frame_end:04d}.mp4"
+
+    encoded = encode_cache_sequence(
+        lambda frame: [cache_frame_path(settings, frame)], 'MONO', scene.frame_start, scene.frame_end,
+        str(video_path), scene.render.fps / scene.render.fps_base,
+        quality='DRAFT' if settings.draft_mode else 'FINAL',
+    )
+    logger.info("Encoded %d cached frames to %s", encoded, video_path)
+    return video_folder
+
+
+def encode_video(scene):
+    """
+    Renders the compositor scene to the final 360 mono MP4.
+
+    With the raw frame cache enabled, encodes from the cache instead
+    (encode_cached_video()).
+
+    Args:
+        scene (bpy.types.Scene): Scene holding pe_vr360_mono_settings
+
+    Returns:
+        pathlib.Path: Folder holding the video
+
+    Raises:
+        ValueError: If the compositor scene has not been set up
+    """
+    settings = scene.pe_vr360_mono_settings
+    if settings.frame_cache:
+        return encode_cached_video(scene)
+    comp_scene = bpy.data.scenes.get(VR360_COMPOSITOR_SCENE_NAME)
+    if comp_scene is None or not comp_scene.use_nodes or not comp_scene.node_tree:
+        raise ValueError(f"Compositor scene '{VR360_COMPOSITOR_SCENE_NAME}' not set up. Run Step 3 first.")
+    if not any(node.type == 'COMPOSITE' for node in comp_scene.node_tree.nodes):
+        raise ValueError("Compositor missing Composite output node. Run Step 3 again.")
+
+    is_draft = bool(comp_scene.get("pe_draft", False))
+    final_output_path = settings.workflow_dir(draft=is_draft) / "youtube_vr360"
+    final_output_path.mkdir(parents=True, exist_ok=True)
+
+    render = comp_scene.render
+    render.filepath = str(final_output_path / "vr360_mono_")
+    render.image_settings.file_format = 'FFMPEG'
+    render.ffmpeg.format = 'MPEG4'
+    render.ffmpeg.codec = 'H264'
+    # Drafts favour turnaround over quality
+    render.ffmpeg.constant_rate_factor = 'MEDIUM' if is_draft else 'PERC_LOSSLESS'
+    render.ffmpeg.ffmpeg_preset = 'REALTIME' if is_draft else 'BEST'
+    render.ffmpeg.audio_codec = 'NONE'
+
+    bpy.ops.render.render(animation=True, scene=comp_scene.name)
+    return final_output_path
+
+
+# Step name -> function(scene), in workflow order. Only 'render' takes a frame range.
+STEPS = {
+    'render': render_sequence,
+    'composite': setup_compositor,
+    'encode': encode_video,
+}
+
+# Render and encode in one pipelined step, replacing all of STEPS
+STREAM = stream_sequence
@@ -1,12 +1,31 @@
 import bpy
+from pathlib import Path
 from bpy.props import (
     StringProperty,
     EnumProperty,
     BoolProperty,
+    FloatProperty,
+    IntProperty,
     PointerProperty,
 )
 from bpy.types import PropertyGroup
 
+from ...utils.scene_setup import LIGHTING_PRESET_ITEMS, HDRI_SAMPLING_ITEMS
+from ...utils.render import (
+    DENOISE_MODE_ITEMS,
+    EXR_DEPTH_ITEMS,
+    EXR_COLOR_MODE_ITEMS,
+    EXR_CODEC_ITEMS,
+    FRAME_CACHE_FORMAT_ITEMS,
+)
+from ...utils.job_queue import JobStore, QUEUE_FILE_NAME
+from ...constants import DRAFT_DIR_NAME
+
+RESOLUTION_PRESETS = {
+    '5K': (5120, 2560),
+    '8K': (7680, 3840),
+}
+
 class PE_VR360MonoSceneSettings(PropertyGroup):
     resolution_preset: EnumProperty(
         name="Resolution Preset",
@@ -21,14 +40,42 @@ class PE_VR360MonoSceneSettings(PropertyGroup):
     render_quality: EnumProperty(
         name="Render Quality",
         items=[
-            ('PREVIEW', "Preview (256 samples)", "Fast preview render"),
-            ('PRODUCTION', "Production (512 samples)", "Balanced quality for production"),
-            ('FINAL', "Final (1024 samples)", "High quality for final render"),
+            ('PREVIEW', "Preview (256 / 64 denoised)", "Fast preview render"),
+            ('PRODUCTION', "Production (512 / 128 denoised)", "Balanced quality for production"),
+            ('FINAL', "Final (1024 / 256 denoised)", "High quality for final render"),
         ],
         default='PRODUCTION',
         description="Render quality preset"
     )
 
+    denoise_mode: EnumProperty(
+        name="Denoise",
+        items=DENOISE_MODE_ITEMS,
+        default='RENDER',
+        description="Where the sequence is denoised. Guided denoising lets the quality presets use a quarter of the samples"
+    )
+
+    exr_depth: EnumProperty(
+        name="EXR Depth",
+        items=EXR_DEPTH_ITEMS,
+        default='16',
+        description="Float precision of the intermediate EXR sequence"
+    )
+
+    exr_color_mode: EnumProperty(
+        name="EXR Channels",
+        items=EXR_COLOR_MODE_ITEMS,
+        default='RGB',
+        description="Channels written to the intermediate EXR sequence"
+    )
+
+    exr_codec: EnumProperty(
+        name="EXR Codec",
+        items=EXR_CODEC_ITEMS,
+        default='DWAA',
+        description="Compression of the intermediate EXR sequence"
+    )
+
     output_path: StringProperty(
         name="Output Path",
         subtype='DIR_PATH',
@@ -36,15 +83,74 @@ class PE_VR360MonoSceneSettings(PropertyGroup):
         description="Directory to save rendered files"
     )
 
+    draft_mode: BoolProperty(
+        name="Draft Mode",
+        default=False,
+        description="Render quick low-resolution previews into a separate draft/ folder"
+    )
+    draft_resolution_percentage: IntProperty(name="Draft Resolution", subtype='PERCENTAGE', default=25, min=1, max=100)
+    draft_samples: IntProperty(name="Draft Samples", default=16, min=1, max=4096)
+
+    stream_encode: BoolProperty(
+        name="Encode While Rendering",
+        default=False,
+        description="Encode the video while the sequence renders: each finished frame is piped to ffmpeg, "
+                    "so the MP4 is ready right after the last frame. Needs ffmpeg on PATH. "
+                    "EXRs are still written for Steps 3-4"
+    )
+
+    frame_cache: BoolProperty(
+        name="Raw Frame Cache",
+        default=False,
+        description="Also keep every frame uncompressed in cache/, so Step 4 encodes straight from "
+                    "memory-mapped files. Fastest on local NVMe scratch disks; needs ffmpeg on PATH"
+    )
+
+    frame_cache_format: EnumProperty(
+        name="Cache Format",
+        items=FRAME_CACHE_FORMAT_ITEMS,
+        default='UINT16',
+        description="Pixel format of the raw frame cache"
+    )
+
+    tile_bands: IntProperty(
+        name="Bands",
+        default=1,
+        min=1, max=32,
+        description="Split each frame into this many horizontal bands, each rendered in its own "
+                    "background process and stitched back together (1 = render whole frames)"
+    )
+    tile_workers: IntProperty(
+        name="Workers",
+        default=2,
+        min=1, max=64,
+        description="Band worker processes running at once"
+    )
+
+    # Render estimate, written by vr360mono.estimate_render
+    estimate_total_seconds: FloatProperty(name="Estimated Time", default=0.0)
+    estimate_seconds_per_frame: FloatProperty(name="Seconds per Frame", default=0.0)
+    estimate_disk_mb: FloatProperty(name="Estimated Disk (MB)", default=0.0)
+    estimate_peak_memory_mb: FloatProperty(name="Estimated Peak Memory (MB)", default=0.0)
+
     lighting_preset: EnumProperty(
         name="Lighting",
-        items=[
-            ('NONE', "None", "No lights added"),
-            ('3POINT_STUDIO', "3-Point (Studio)", "Professional 3-point studio lighting"),
-            ('3POINT_OUTDOOR', "3-Point (Outdoor)", "Outdoor 3-point with sun"),
-        ],
+        items=LIGHTING_PRESET_ITEMS,
         default='3POINT_STUDIO',
     )
+    hdri_path: StringProperty(
+        name="HDRI",
+        subtype='FILE_PATH',
+        default='',
+        description="Local .hdr/.exr environment map used by the HDRI World preset"
+    )
+    hdri_strength: FloatProperty(name="HDRI Strength", default=1.0, min=0.0, soft_max=10.0)
+    hdri_sampling_method: EnumProperty(
+        name="Importance Sampling",
+        items=HDRI_SAMPLING_ITEMS,
+        default='RESOLUTION',
+    )
+    hdri_map_resolution: IntProperty(name="Map Resolution", default=1024, min=256, max=8192)
     include_cyclorama: BoolProperty(name="Cyclorama Stage", default=True)
     cyclorama_size: EnumProperty(
         name="Size",
@@ -58,6 +164,33 @@ class PE_VR360MonoSceneSettings(PropertyGroup):
     )
     include_reference: BoolProperty(name="Person-Scale Reference", default=True)
 
+    def workflow_dir(self, draft=None):
+        """Root folder of the sequence and video; the draft/ subtree in draft mode."""
+        root = Path(bpy.path.abspath(self.output_path)) / "vr360"
+        if self.draft_mode if draft is None else draft:
+            return root / DRAFT_DIR_NAME
+        return root
+
+    def job_store(self):
+        """Job queue store of this rig (utils/job_queue.py) under the output path."""
+        return JobStore(Path(bpy.path.abspath(self.output_path)) / QUEUE_FILE_NAME)
+
+    def output_resolution(self):
+        """(width, height) of the rendered sequence, reduced in draft mode."""
+        width, height = RESOLUTION_PRESETS[self.resolution_preset]
+        scale = self.draft_resolution_percentage / 100 if self.draft_mode else 1.0
+        return int(width * scale), int(height * scale)
+
+    def hdri_settings(self):
+        """Keyword arguments for setup_hdri_world() from these settings."""
+        return {
+            'filepath': self.hdri_path,
+            'strength': self.hdri_strength,
+            'sampling_method': self.hdri_sampling_method,
+            'map_resolution': self.hdri_map_resolution,
+            'render_width': RESOLUTION_PRESETS[self.resolution_preset][0],
+        }
+
 
 classes = (
     PE_VR360MonoSceneSettings,
@@ -2,24 +2,26 @@ import bpy
 import math
 from ...constants import VR360_CAM_NAME
 
-def create_vr360_camera(context, height=1.6):
+def create_vr360_camera(collection, height=1.6):
     """
     Creates a single, level, equirectangular camera for VR360 Mono.
 
+    Args:
+        collection (bpy.types.Collection): Collection to link the camera into
+        height (float): Camera height in meters
+
     Returns:
         (bpy.types.Object): The created camera object.
     """
-    bpy.ops.object.camera_add(location=(0, 0, height))
-    camera = context.active_object
-    camera.name = VR360_CAM_NAME
-    
-    cam_data = camera.data
+    cam_data = bpy.data.cameras.new(f"{VR360_CAM_NAME}_Data")
     cam_data.type = 'PANO'
     cam_data.cycles.panorama_type = 'EQUIRECTANGULAR'
-    
+
+    camera = bpy.data.objects.new(VR360_CAM_NAME, cam_data)
+    camera.location = (0, 0, height)
+
     # Level the camera
-    camera.rotation_euler[0] = math.radians(90)
-    camera.rotation_euler[1] = 0
-    camera.rotation_euler[2] = 0
+    camera.rotation_euler = (math.radians(90), 0, 0)
 
-    return camera
\ No newline at end of file
+    collection.objects.link(camera)
+    return camera
@@ -0,0 +1,42 @@
+import bpy
+
+from . import properties
+from .operators import (
+    VR360STEREO_OT_CreateScene,
+    VR360STEREO_OT_BakeIPDSchedule,
+    VR360STEREO_OT_ClearIPDSchedule,
+    VR360STEREO_OT_RenderSequence,
+    VR360STEREO_OT_PackTopBottom,
+    VR360STEREO_OT_RenderYouTube,
+)
+from .panels import VR360STEREO_PT_Workflow
+
+classes = (
+    VR360STEREO_OT_CreateScene,
+    VR360STEREO_OT_BakeIPDSchedule,
+    VR360STEREO_OT_ClearIPDSchedule,
+    VR360STEREO_OT_RenderSequence,
+    VR360STEREO_OT_PackTopBottom,
+    VR360STEREO_OT_RenderYouTube,
+)
+
+# Sidebar panels, skipped by the headless registration profile
+ui_classes = (
+    VR360STEREO_PT_Workflow,
+)
+
+def register(headless=False):
+    properties.register()
+    for cls in classes:
+        bpy.utils.register_class(cls)
+    if not headless:
+        for cls in ui_classes:
+            bpy.utils.register_class(cls)
+
+def unregister(headless=False):
+    if not headless:
+        for cls in reversed(ui_classes):
+            bpy.utils.unregister_class(cls)
+    for cls in reversed(classes):
+        bpy.utils.unregister_class(cls)
+    properties.unregister()
@@ -0,0 +1,319 @@
+import bpy
+import os
+import logging
+from pathlib import Path
+from bpy.types import Operator
+
+logger = logging.getLogger(__name__)
+
+from ...utils.lazy import lazy_import
+from ...utils import job_queue
+from ...utils.scene_setup import (
+    create_lighting_preset,
+    create_cyclorama,
+    add_reference_sphere,
+    hdri_file_exists,
+)
+from ...utils.blender import detect_and_enable_gpu
+from ...constants import VR360_STEREO_CAM_NAME
+
+# Loaded on first use, so registering the operators stays cheap
+np = lazy_import("numpy")
+camera_rig = lazy_import(".rig", __package__)
+pipeline = lazy_import(".pipeline", __package__)
+animation = lazy_import("...utils.animation", __package__)
+rig_math = lazy_import("...utils.rig_math", __package__)
+
+
+def _track(scene, step):
+    """Records an operator step in the rig's job store, which the panel reads."""
+    settings = scene.pe_vr360_stereo_settings
+    return job_queue.track_step(
+        settings.job_store(), 'vr360stereo', scene.name, step, blend=bpy.data.filepath, draft=False,
+    )
+
+class VR360STEREO_OT_CreateScene(Operator):
+    """Create VR360 Stereo Scene - Sets up an omni-directional stereo camera and scene elements"""
+    bl_idname = "vr360stereo.create_scene"
+    bl_label = "1. Create VR360 Stereo Scene"
+    bl_description = "Creates a VR360 Stereo scene with a spherical stereo camera, lighting, cyclorama, and reference objects"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        settings = context.scene.pe_vr360_stereo_settings
+
+        if settings.lighting_preset == 'HDRI' and not hdri_file_exists(settings.hdri_path):
+            self.report({'ERROR'}, f"HDRI not found: '{settings.hdri_path}'. Choose a .hdr/.exr file.")
+            return {'CANCELLED'}
+
+        try:
+            # 1. Create the stereo camera
+            camera = camera_rig.create_vr360_stereo_camera(
+                context.collection, height=1.6, ipd=settings.ipd,
+                pole_merge_from=settings.pole_merge_from,
+                pole_merge_to=settings.pole_merge_to,
+            )
+
+            # 2. Per-eye resolution; both eyes come from one multiview render
+            context.scene.render.resolution_x, context.scene.render.resolution_y = settings.eye_resolution()
+            camera_rig.configure_stereo_views(context.scene)
+
+            # 3. Create lighting
+            if settings.lighting_preset != 'NONE':
+                create_lighting_preset(
+                    context.collection, preset=settings.lighting_preset,
+                    scene=context.scene, hdri=settings.hdri_settings(),
+                )
+
+            # 4. Create Cyclorama and Reference
+            if settings.include_cyclorama:
+                create_cyclorama(context.collection, settings.cyclorama_size, settings.cyclorama_color)
+            if settings.include_reference:
+                add_reference_sphere(context.collection)
+
+            # 5. Spherical stereo is a Cycles feature
+            context.scene.render.engine = 'CYCLES'
+
+            gpu_name = detect_and_enable_gpu()
+            if gpu_name:
+                self.report({'INFO'}, f"GPU rendering enabled: {gpu_name}")
+            else:
+                self.report({'INFO'}, "Using CPU rendering (no GPU detected)")
+
+            # Set camera as active
+            context.scene.camera = camera
+            bpy.ops.object.select_all(action='DESELECT')
+            camera.select_set(True)
+            context.view_layer.objects.active = camera
+
+            self.report({'INFO'}, "VR360 Stereo Scene Created!")
+            return {'FINISHED'}
+
+        except (KeyError, AttributeError) as e:
+            self.report({'ERROR'}, f"Data error creating scene: {str(e)}")
+            return {'CANCELLED'}
+        except RuntimeError as e:
+            self.report({'ERROR'}, f"Blender API error: {str(e)}")
+            return {'CANCELLED'}
+        except Exception as e:
+            logger.exception("Unexpected error creating VR360 stereo scene")
+            self.report({'ERROR'}, f"Unexpected error creating VR360 stereo scene: {str(e)}")
+            return {'CANCELLED'}
+
+class VR360STEREO_OT_BakeIPDSchedule(Operator):
+    """Bake IPD Schedule - Keys the interocular distance from the distance to a subject"""
+    bl_idname = "vr360stereo.bake_ipd_schedule"
+    bl_label = "Bake IPD Schedule"
+    bl_description = (
+        "Samples the camera-to-subject distance over the frame range and bakes a per-frame "
+        "interocular distance into the camera's F-curve"
+    )
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        """Only enable if the stereo camera exists and a subject is chosen."""
+        settings = context.scene.pe_vr360_stereo_settings
+        return VR360_STEREO_CAM_NAME in bpy.data.objects and settings.ipd_subject is not None
+
+    def execute(self, context):
+        scene = context.scene
+        settings = scene.pe_vr360_stereo_settings
+        camera = bpy.data.objects.get(VR360_STEREO_CAM_NAME)
+
+        if settings.ipd_min > settings.ipd_max:
+            self.report({'ERROR'}, "Min IPD is larger than Max IPD")
+            return {'CANCELLED'}
+        if scene.frame_end < scene.frame_start:
+            self.report({'ERROR'}, "Invalid frame range: End frame is before start frame")
+            return {'CANCELLED'}
+
+        try:
+            frames = np.arange(scene.frame_start, scene.frame_end + 1, dtype=np.float64)
+            distances = animation.subject_distances(scene, camera, settings.ipd_subject, frames)
+            ipd = rig_math.ipd_schedule(distances, **settings.ipd_schedule_settings())
+            camera_rig.bake_stereo_ipd(camera, frames, ipd)
+
+        except RuntimeError as e:
+            self.report({'ERROR'}, f"Blender API error: {str(e)}")
+            return {'CANCELLED'}
+        except Exception as e:
+            logger.exception("Unexpected error baking IPD schedule")
+            self.report({'ERROR'}, f"Unexpected error baking IPD schedule: {str(e)}")
+            return {'CANCELLED'}
+
+        self.report({'INFO'}, f"Baked IPD {ipd.min():.1f}-{ipd.max():.1f} mm over {len(frames)} frames")
+        return {'FINISHED'}
+
+class VR360STEREO_OT_ClearIPDSchedule(Operator):
+    """Clear IPD Schedule - Returns the camera to a static IPD"""
+    bl_idname = "vr360stereo.clear_ipd_schedule"
+    bl_label = "Clear IPD Schedule"
+    bl_description = "Removes the baked IPD keys and sets the IPD from the scene settings"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        return VR360_STEREO_CAM_NAME in bpy.data.objects
+
+    def execute(self, context):
+        settings = context.scene.pe_vr360_stereo_settings
+        camera_rig.clear_stereo_ipd_schedule(bpy.data.objects[VR360_STEREO_CAM_NAME], settings.ipd)
+        self.report({'INFO'}, "IPD schedule cleared")
+        return {'FINISHED'}
+
+class VR360STEREO_OT_RenderSequence(Operator):
+    """Render Stereo EXR Sequence - Renders both eyes of every frame in one pass"""
+    bl_idname = "vr360stereo.render_sequence"
+    bl_label = "2. Render Stereo Sequence"
+    bl_description = "Renders a crash-safe per-eye OpenEXR sequence with Cycles spherical stereo"
+    bl_options = {'REGISTER'}
+
+    @classmethod
+    def poll(cls, context):
+        """Only enable if the VR360 stereo scene has been created."""
+        return VR360_STEREO_CAM_NAME in bpy.data.objects
+
+    def _validate_preconditions(self, context):
+        """Validate all prerequisites before starting render."""
+        settings = context.scene.pe_vr360_stereo_settings
+
+        if context.scene.frame_end <= context.scene.frame_start:
+            self.report({'ERROR'}, "Invalid frame range: End frame must be greater than start frame")
+            return False
+
+        camera = bpy.data.objects.get(VR360_STEREO_CAM_NAME)
+        if camera is None:
+            self.report({'ERROR'}, f"{VR360_STEREO_CAM_NAME} not found. Please run Step 1 (Create VR360 Stereo Scene) first.")
+            return False
+        if not camera.data.stereo.use_spherical_stereo:
+            self.report({'WARNING'}, "Spherical stereo is off on the camera; both eyes will use one offset for the whole panorama.")
+
+        try:
+            output_path = Path(bpy.path.abspath(settings.output_path))
+
+            if not output_path.parent.exists():
+                self.report({'ERROR'}, f"Output directory does not exist: {output_path.parent}")
+                return False
+
+            if not os.access(output_path.parent, os.W_OK):
+                self.report({'ERROR'}, f"Output directory not writable: {output_path.parent}")
+                return False
+
+        except (OSError, PermissionError) as e:
+            self.report({'ERROR'}, f"Cannot access output path: {str(e)}")
+            return False
+
+        return True
+
+    def execute(self, context):
+        if not self._validate_preconditions(context):
+            return {'CANCELLED'}
+
+        try:
+            if context.scene.pe_vr360_stereo_settings.stream_encode:
+                with _track(context.scene, 'stream'):
+                    video_path = pipeline.stream_sequence(context.scene)
+                self.report({'INFO'}, f"Rendered stereo eyes and encoded {video_path}. "
+                                      "Inject top/bottom spatial metadata before uploading.")
+            else:
+                with _track(context.scene, 'render'):
+                    eyes_folder = pipeline.render_sequence(context.scene)
+                self.report({'INFO'}, f"Rendered stereo eyes to {eyes_folder}")
+
+        except ValueError as e:
+            self.report({'ERROR'}, str(e))
+            return {'CANCELLED'}
+        except (IOError, OSError, PermissionError) as e:
+            self.report({'ERROR'}, f"File system error: {str(e)}")
+            return {'CANCELLED'}
+        except RuntimeError as e:
+            self.report({'ERROR'}, f"Render error: {str(e)}")
+            return {'CANCELLED'}
+        except Exception as e:
+            logger.exception("Unexpected error rendering stereo sequence")
+            self.report({'ERROR'}, f"Unexpected error rendering stereo sequence: {str(e)}")
+            return {'CANCELLED'}
+
+        self.report({'INFO'}, "VR360 Stereo Sequence Rendered!")
+        return {'FINISHED'}
+
+class VR360STEREO_OT_PackTopBottom(Operator):
+    """Pack Top/Bottom - Stacks the left and right eye of each frame into one image"""
+    bl_idname = "vr360stereo.pack_top_bottom"
+    bl_label = "3. Pack Top/Bottom"
+    bl_description = "Packs the per-eye frames into top/bottom frames (left eye on top), one frame at a time"
+    bl_options = {'REGISTER'}
+
+    @classmethod
+    def poll(cls, context):
+        """Only enable if the eyes have been rendered."""
+        settings = context.scene.pe_vr360_stereo_settings
+        try:
+            return (settings.workflow_dir() / "eyes").exists()
+        except:
+            return False
+
+    def execute(self, context):
+        try:
+            with _track(context.scene, 'pack'):
+                written, found = pipeline.pack_frames(context.scene)
+
+        except ValueError as e:
+            self.report({'ERROR'}, f"Cannot pack frames: {str(e)}")
+            return {'CANCELLED'}
+        except (IOError, OSError, PermissionError) as e:
+            self.report({'ERROR'}, f"File system error: {str(e)}")
+            return {'CANCELLED'}
+        except RuntimeError as e:
+            self.report({'ERROR'}, f"Image error: {str(e)}")
+            return {'CANCELLED'}
+        except Exception as e:
+            logger.exception("Unexpected error packing top/bottom frames")
+            self.report({'ERROR'}, f"Unexpected error packing top/bottom frames: {str(e)}")
+            return {'CANCELLED'}
+
+        self.report({'INFO'}, f"Packed {written} top/bottom frames ({found - written} already packed)")
+        return {'FINISHED'}
+
+class VR360STEREO_OT_RenderYouTube(Operator):
+    """Render YouTube Video - Encodes the packed top/bottom frames"""
+    bl_idname = "vr360stereo.render_youtube"
+    bl_label = "4. Render YouTube Video"
+    bl_description = "Encodes the top/bottom frames into the final 360 stereo video"
+    bl_options = {'REGISTER'}
+
+    @classmethod
+    def poll(cls, context):
+        """Only enable if frames have been packed (or cached)."""
+        settings = context.scene.pe_vr360_stereo_settings
+        try:
+            folder = "cache" if settings.frame_cache else "top_bottom"
+            return (settings.workflow_dir() / folder).exists()
+        except:
+            return False
+
+    def execute(self, context):
+        try:
+            with _track(context.scene, 'encode'):
+                final_output_path = pipeline.encode_video(context.scene)
+            self.report({'INFO'}, f"Final 360 stereo video rendered to: {final_output_path}. "
+                                  "Inject top/bottom spatial metadata before uploading.")
+            return {'FINISHED'}
+
+        except ValueError as e:
+            self.report({'ERROR'}, str(e))
+            return {'CANCELLED'}
+        except (IOError, OSError, PermissionError) as e:
+            self.report({'ERROR'}, f"File system error: {str(e)}")
+            return {'CANCELLED'}
+        except RuntimeError as e:
+            self.report({'ERROR'}, f"Render error: {str(e)}")
+            return {'CANCELLED'}
+        except (KeyError, AttributeError) as e:
+            self.report({'ERROR'}, f"Scene/node data error: {str(e)}")
+            return {'CANCELLED'}
+        except Exception as e:
+            logger.exception("Unexpected error rendering stereo video")
+            self.report({'ERROR'}, f"Unexpected error rendering stereo video: {str(e)}")
+            return {'CANCELLED'}
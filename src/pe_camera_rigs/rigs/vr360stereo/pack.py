@@ -0,0 +1,120 @@
+"""
+Top/bottom packing of the per-eye VR360 stereo frames.
+
+Multiview writes each eye to its own file (`eyes_0001_L.exr`,
+`eyes_0001_R.exr`). Frames are packed one at a time into a reused
+(2 * height, width) buffer, left eye on top as YouTube and most players
+expect, so memory stays at one eye pair plus one packed frame however
+long the sequence is.
+"""
+
+import logging
+import os
+import re
+from pathlib import Path
+
+import numpy as np
+
+from ...utils.image_io import read_image, write_image
+
+logger = logging.getLogger(__name__)
+
+EYE_PREFIX = "eyes_"
+PACKED_PREFIX = "vr360_tb_"
+
+# Multiview appends the view suffix after the frame number
+EYE_FILE_PATTERN = re.compile(r"^" + EYE_PREFIX + r"(\d+)_L(\.\w+)$")
+
+
+def eye_pair_paths(eyes_dir, frame, extension=".exr"):
+    """Left and right paths multiview writes for one frame."""
+    eyes_dir = Path(eyes_dir)
+    return [
+        eyes_dir / f"{EYE_PREFIX}{frame:04d}_L{extension}",
+        eyes_dir / f"{EYE_PREFIX}{frame:04d}_R{extension}",
+    ]
+
+
+def find_eye_pairs(eyes_dir):
+    """
+    Finds frames that have both eye files.
+
+    Args:
+        eyes_dir (str): Folder holding the per-eye renders
+
+    Returns:
+        list: (frame, left_path, right_path) tuples sorted by frame
+    """
+    pairs = []
+    for left in Path(eyes_dir).iterdir():
+        match = EYE_FILE_PATTERN.match(left.name)
+        if not match:
+            continue
+        right = left.with_name(f"{EYE_PREFIX}{match.group(1)}_R{match.group(2)}")
+        if right.exists():
+            pairs.append((int(match.group(1)), left, right))
+        else:
+            logger.warning("Skipping frame %s: right eye missing", match.group(1))
+    return sorted(pairs)
+
+
+def _packed_is_current(output_path, left_path, right_path):
+    """Whether a packed frame exists and is newer than both of its eyes."""
+    try:
+        packed = output_path.stat().st_mtime_ns
+        return packed > max(os.stat(left_path).st_mtime_ns, os.stat(right_path).st_mtime_ns)
+    except OSError:
+        return False
+
+
+def pack_top_bottom(pairs, output_dir, bit_depth='16', exr_codec='DWAA', skip_existing=True):
+    """
+    Packs eye pairs into top/bottom frames, streaming one frame at a time.
+
+    Args:
+        pairs (list): Pairs from find_eye_pairs()
+        output_dir (str): Folder for the packed `vr360_tb_####.exr` frames
+        bit_depth (str): EXR bit depth of the packed frames
+        exr_codec (str): EXR codec of the packed frames
+        skip_existing (bool): Keep packed frames already on disk that are
+            newer than both eyes, so an interrupted pack resumes where it
+            stopped; frames whose eyes were rendered again are repacked
+
+    Returns:
+        int: Number of frames written
+
+    Raises:
+        ValueError: If the eyes of a frame differ in size, or a frame differs
+            from the first one
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    packed = None
+    written = 0
+    for frame, left_path, right_path in pairs:
+        output_path = output_dir / f"{PACKED_PREFIX}{frame:04d}.exr"
+        if skip_existing and _packed_is_current(output_path, left_path, right_path):
+            continue
+
+        left = read_image(left_path, channels=3)
+        right = read_image(right_path, channels=3)
+        if left.shape != right.shape:
+            raise ValueError(f"Frame {frame}: eyes differ in size ({left.shape} vs {right.shape})")
+
+        height = left.shape[0]
+        if packed is None:
+            packed = np.empty((2 * height, left.shape[1], 3), dtype=np.float32)
+        elif packed.shape[0] != 2 * height or packed.shape[1] != left.shape[1]:
+            raise ValueError(f"Frame {frame}: size changed within the sequence")
+
+        packed[:height] = left
+        packed[height:] = right
+        # Release the eyes before the next pair is read
+        del left, right
+
+        write_image(str(output_path), packed, bit_depth=bit_depth, exr_codec=exr_codec)
+        written += 1
+
+    logger.info("Packed %d top/bottom frames into %s", written, output_dir)
+    return written
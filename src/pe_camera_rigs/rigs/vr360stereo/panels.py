@@ -0,0 +1,174 @@
+import bpy
+from bpy.types import Panel
+from ...constants import VR360_STEREO_CAM_NAME
+from ...utils import job_queue
+
+class VR360STEREO_PT_Workflow(Panel):
+    """VR360 Stereo Professional 4-Step Workflow Panel"""
+    bl_label = "VR360 Stereo Professional Workflow"
+    bl_idname = "VR360STEREO_PT_workflow"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_parent_id = 'PE_PT_main_panel'
+    bl_order = 5
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        layout = self.layout
+        settings = context.scene.pe_vr360_stereo_settings
+
+        # Quick Start Guide
+        box = layout.box()
+        box.label(text="Quick Start Guide", icon='INFO')
+        col = box.column(align=True)
+        col.label(text="1. Click 'Create Scene'")
+        col.label(text="2. Add your assets")
+        col.label(text="3. Click 'Render Stereo Sequence'")
+        col.label(text="4. Click 'Pack Top/Bottom'")
+        col.label(text="5. Click 'Render YouTube Video'")
+
+        layout.separator()
+
+        box = layout.box()
+        box.label(text="Global Settings", icon='PREFERENCES')
+        col = box.column(align=True)
+        col.prop(settings, "resolution_preset")
+        col.prop(settings, "render_quality")
+        col.prop(settings, "denoise_mode")
+        row = col.row(align=True)
+        row.label(text="EXR:")
+        row.prop(settings, "exr_depth", text="")
+        row.prop(settings, "exr_color_mode", text="")
+        row.prop(settings, "exr_codec", text="")
+        col.prop(settings, "output_path")
+
+        layout.separator()
+
+        # STEP 1: Create Scene
+        box = layout.box()
+        box.label(text="STEP 1: Create Scene", icon='SCENE_DATA')
+        col = box.column(align=True)
+        col.prop(settings, "ipd")
+        row = col.row(align=True)
+        row.prop(settings, "pole_merge_from", text="Pole Merge")
+        row.prop(settings, "pole_merge_to", text="to")
+        col.separator()
+        col.prop(settings, "lighting_preset")
+        if settings.lighting_preset == 'HDRI':
+            sub = col.column(align=True)
+            sub.prop(settings, "hdri_path")
+            sub.prop(settings, "hdri_strength")
+            sub.prop(settings, "hdri_sampling_method")
+            if settings.hdri_sampling_method == 'MANUAL':
+                sub.prop(settings, "hdri_map_resolution")
+        col.prop(settings, "include_cyclorama")
+        if settings.include_cyclorama:
+            sub = col.column(align=True)
+            sub.prop(settings, "cyclorama_size")
+            sub.prop(settings, "cyclorama_color")
+        col.prop(settings, "include_reference")
+
+        col.separator()
+        col.scale_y = 1.3
+        col.operator("vr360stereo.create_scene", icon='ADD')
+
+        step1_complete = VR360_STEREO_CAM_NAME in bpy.data.objects
+        if step1_complete:
+            col.separator()
+            col.label(text="Scene Created!", icon='CHECKMARK')
+            col.label(text="Next: Add content, then Step 2", icon='FORWARD')
+
+            sub = box.box().column(align=True)
+            sub.label(text="IPD Schedule", icon='DRIVER_DISTANCE')
+            sub.prop(settings, "ipd_subject")
+            sub.prop(settings, "ipd_ratio")
+            row = sub.row(align=True)
+            row.prop(settings, "ipd_min", text="Min")
+            row.prop(settings, "ipd_max", text="Max")
+            sub.prop(settings, "ipd_smoothing")
+            row = sub.row(align=True)
+            row.operator("vr360stereo.bake_ipd_schedule", icon='KEYFRAME')
+            row.operator("vr360stereo.clear_ipd_schedule", text="", icon='X')
+
+        layout.separator()
+
+        # STEP 2: Render both eyes in one multiview pass
+        box = layout.box()
+        box.label(text="STEP 2: Render Stereo Sequence", icon='RENDER_ANIMATION')
+        col = box.column(align=True)
+        col.scale_y = 1.3
+        if not step1_complete:
+            col.enabled = False
+            col.label(text="Complete Step 1 first", icon='INFO')
+        col.prop(settings, "stream_encode")
+        row = col.row(align=True)
+        row.prop(settings, "frame_cache")
+        sub = row.row(align=True)
+        sub.enabled = settings.frame_cache
+        sub.prop(settings, "frame_cache_format", text="")
+        col.operator("vr360stereo.render_sequence", icon='RENDER_STILL')
+
+        # Steps are complete once their last recorded run finished (utils/job_queue.py);
+        # output from before the job store is probed on disk
+        try:
+            store = settings.job_store()
+            done = job_queue.completed_steps(store, context.scene.name)
+        except (OSError, ValueError):
+            store = None
+            done = None
+
+        if done is not None:
+            step2_complete = bool({'render', 'stream'} & done)
+        else:
+            try:
+                step2_complete = (settings.workflow_dir() / "eyes").exists()
+            except:
+                step2_complete = False
+        if step1_complete and step2_complete:
+            col.separator()
+            col.label(text="Eyes Rendered!", icon='CHECKMARK')
+            col.label(text="Next: Step 3", icon='FORWARD')
+
+        layout.separator()
+
+        # STEP 3: Pack Top/Bottom
+        box = layout.box()
+        box.label(text="STEP 3: Pack Top/Bottom", icon='IMAGE_DATA')
+        col = box.column(align=True)
+        col.scale_y = 1.3
+        if not step2_complete:
+            col.enabled = False
+            col.label(text="Complete Step 2 first", icon='INFO')
+        col.operator("vr360stereo.pack_top_bottom", icon='NODETREE')
+
+        if done is not None:
+            step3_complete = 'pack' in done
+        else:
+            try:
+                step3_complete = (settings.workflow_dir() / "top_bottom").exists()
+            except:
+                step3_complete = False
+
+        layout.separator()
+
+        # STEP 4: Render YouTube Video
+        box = layout.box()
+        box.label(text="STEP 4: Render YouTube Video", icon='FILE_MOVIE')
+        col = box.column(align=True)
+        col.scale_y = 1.3
+        if settings.frame_cache:
+            col.label(text="Encodes from the raw frame cache", icon='INFO')
+        elif not step3_complete:
+            col.enabled = False
+            col.label(text="Complete Step 3 first", icon='INFO')
+        col.operator("vr360stereo.render_youtube", icon='RENDER_OUTPUT')
+
+        # Render queue (CLI --enqueue / queue, and the operators' own runs)
+        lines = job_queue.queue_status_lines(store) if store is not None else []
+        if lines:
+            layout.separator()
+            box = layout.box()
+            box.label(text="Render Queue", icon='SORTTIME')
+            col = box.column(align=True)
+            for text, icon in lines:
+                col.label(text=text, icon=icon)
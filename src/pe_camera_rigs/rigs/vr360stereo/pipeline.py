@@ -0,0 +1,293 @@
+"""
+VR360 Stereo workflow steps without UI context.
+
+Shared by the workflow operators and the headless CLI (pe_camera_rigs.cli).
+Scenes are passed explicitly and rendered with
+`bpy.ops.render.render(scene=...)`, so nothing here needs `context.window`.
+"""
+
+import logging
+from contextlib import nullcontext
+
+import bpy
+
+from .rig import configure_stereo_views
+from .pack import EYE_PREFIX, PACKED_PREFIX, eye_pair_paths, find_eye_pairs, pack_top_bottom
+from ...utils.stream_encode import StreamAssembler, FrameWatcher
+from ...utils.frame_cache import CACHE_EXTENSION, FrameCacheWriter, encode_cache_sequence
+from ...utils.render import (
+    RENDER_SETTINGS_PATHS,
+    snapshot_render_settings,
+    restore_render_settings,
+    apply_render_quality,
+    apply_denoise_mode,
+    apply_exr_storage,
+    frame_written_callback,
+)
+from ...constants import VR360_STEREO_CAM_NAME, VR360_STEREO_COMPOSITOR_SCENE_NAME
+
+logger = logging.getLogger(__name__)
+
+# The sequence render also switches multiview on and may narrow the frame range
+STEREO_RENDER_SETTINGS_PATHS = RENDER_SETTINGS_PATHS + (
+    "render.use_multiview",
+    "render.views_format",
+    "render.image_settings.views_format",
+    "frame_start",
+    "frame_end",
+)
+
+
+def configure_stereo_render(scene, settings):
+    """Configures Cycles, per-eye multiview EXR output, denoising and samples for the sequence."""
+    render = scene.render
+    render.engine = 'CYCLES'
+    render.resolution_x, render.resolution_y = settings.eye_resolution()
+    render.resolution_percentage = 100
+    render.image_settings.file_format = 'OPEN_EXR'
+    apply_exr_storage(scene, settings.exr_depth, settings.exr_color_mode, settings.exr_codec)
+    configure_stereo_views(scene)
+    apply_denoise_mode(scene, settings.denoise_mode)
+
+    apply_render_quality(scene, settings.render_quality, denoised=settings.denoise_mode != 'NONE')
+
+
+def _cache_writer(settings, on_frame):
+    """FrameCacheWriter reporting on to on_frame, or None when the cache is off."""
+    if not settings.frame_cache:
+        return None
+    eyes_folder = settings.workflow_dir() / "eyes"
+    cache_folder = settings.workflow_dir() / "cache"
+    return FrameCacheWriter(
+        lambda frame: eye_pair_paths(eyes_folder, frame),
+        lambda frame: eye_pair_paths(cache_folder, frame, extension=CACHE_EXTENSION),
+        settings.frame_cache_format, on_frame=on_frame,
+    )
+
+
+def render_sequence(scene, frame_start=None, frame_end=None, on_frame=None):
+    """
+    Renders both eyes of every frame in one multiview pass.
+
+    Args:
+        scene (bpy.types.Scene): Scene holding the camera and pe_vr360_stereo_settings
+        frame_start (int, optional): First frame, defaults to the scene's
+        frame_end (int, optional): Last frame, defaults to the scene's
+        on_frame (callable, optional): Called with the frame number once both eyes are written
+
+    Returns:
+        pathlib.Path: The eyes folder
+
+    Raises:
+        ValueError: If the stereo camera is missing
+    """
+    settings = scene.pe_vr360_stereo_settings
+    camera = bpy.data.objects.get(VR360_STEREO_CAM_NAME)
+    if camera is None:
+        raise ValueError(f"No {VR360_STEREO_CAM_NAME} found. Run Step 1 (Create VR360 Stereo Scene) first.")
+    cache = _cache_writer(settings, on_frame)
+    if cache is not None:
+        on_frame = cache.frame_ready
+
+    eyes_folder = settings.workflow_dir() / "eyes"
+    eyes_folder.mkdir(parents=True, exist_ok=True)
+
+    original_settings = snapshot_render_settings(scene, STEREO_RENDER_SETTINGS_PATHS)
+    try:
+        configure_stereo_render(scene, settings)
+        if frame_start is not None:
+            scene.frame_start = frame_start
+        if frame_end is not None:
+            scene.frame_end = frame_end
+
+        # One render per frame writes eyes_####_L.exr and eyes_####_R.exr
+        scene.camera = camera
+        scene.render.filepath = str(eyes_folder / EYE_PREFIX)
+        with cache or nullcontext(), frame_written_callback(scene, on_frame):
+            bpy.ops.render.render(animation=True, scene=scene.name)
+        logger.info("Rendered stereo eyes to %s", eyes_folder)
+    finally:
+        restore_render_settings(scene, original_settings)
+
+    return eyes_folder
+
+
+def stream_sequence(scene, frame_start=None, frame_end=None, render=None):
+    """
+    Renders the eyes and encodes the top/bottom video as frames finish.
+
+    Each eye pair is stacked (left on top) and piped to ffmpeg while the
+    next frame renders, skipping the packed EXR stage. The eye EXRs are
+    kept, so Steps 3 and 4 still work afterwards.
+
+    Args:
+        scene (bpy.types.Scene): Scene holding the camera and pe_vr360_stereo_settings
+        frame_start (int, optional): First frame, defaults to the scene's
+        frame_end (int, optional): Last frame, defaults to the scene's
+        render (callable, optional): Renders the frames elsewhere (e.g. worker
+            processes) instead of here; finished frames are then picked up by
+            watching the eyes folder
+
+    Returns:
+        pathlib.Path: The video file
+
+    Raises:
+        ValueError: If the camera is missing, or ffmpeg/OpenImageIO are unavailable
+    """
+    settings = scene.pe_vr360_stereo_settings
+    if bpy.data.objects.get(VR360_STEREO_CAM_NAME) is None:
+        raise ValueError(f"No {VR360_STEREO_CAM_NAME} found. Run Step 1 (Create VR360 Stereo Scene) first.")
+    frame_start = scene.frame_start if frame_start is None else frame_start
+    frame_end = scene.frame_end if frame_end is None else frame_end
+
+    eyes_folder = settings.workflow_dir() / "eyes"
+    video_folder = settings.workflow_dir() / "youtube_vr360_stereo"
+    video_folder.mkdir(parents=True, exist_ok=True)
+    # Same name Blender gives an animation render of this range
+    video_path = video_folder / f"vr360_stereo_tb_{frame_start:04d}-{frame_end:04d}.mp4"
+
+    assembler = StreamAssembler(
+        lambda frame: eye_pair_paths(eyes_folder, frame), 'TB', frame_start, frame_end,
+        str(video_path), scene.render.fps / scene.render.fps_base,
+    )
+    with assembler:
+        if render is None:
+            render_sequence(scene, frame_start, frame_end, on_frame=assembler.frame_ready)
+        else:
+            with FrameWatcher(assembler):
+                render()
+
+    logger.info("Streamed %d frames to %s", assembler.encoded, video_path)
+    return video_path
+
+
+def pack_frames(scene):
+    """
+    Packs every rendered eye pair into a top/bottom frame.
+
+    Args:
+        scene (bpy.types.Scene): Scene holding pe_vr360_stereo_settings and the frame range
+
+    Returns:
+        tuple: (frames written, frames found)
+
+    Raises:
+        ValueError: If no eye pairs have been rendered, or the eyes differ in size
+    """
+    settings = scene.pe_vr360_stereo_settings
+    pairs = find_eye_pairs(settings.workflow_dir() / "eyes")
+    if not pairs:
+        raise ValueError("No stereo eye pairs found. Run Step 2 (Render Stereo Sequence) first.")
+
+    expected_frames = scene.frame_end - scene.frame_start + 1
+    if len(pairs) < expected_frames:
+        logger.warning("Incomplete sequence: expected %d frames, found %d", expected_frames, len(pairs))
+
+    written = pack_top_bottom(
+        pairs, settings.workflow_dir() / "top_bottom", bit_depth=settings.exr_depth, exr_codec=settings.exr_codec,
+    )
+    return written, len(pairs)
+
+
+def encode_cached_video(scene):
+    """
+    Encodes the top/bottom MP4 from the raw eye cache, skipping the pack step.
+
+    16-bit eyes are stacked by writing left then right into the ffmpeg pipe.
+
+    Args:
+        scene (bpy.types.Scene): Scene holding pe_vr360_stereo_settings and the frame range
+
+    Returns:
+        pathlib.Path: Folder holding the video
+
+    Raises:
+        ValueError: If the first frame is not cached, or ffmpeg is unavailable
+    """
+    settings = scene.pe_vr360_stereo_settings
+    cache_folder = settings.workflow_dir() / "cache"
+    video_folder = settings.workflow_dir() / "youtube_vr360_stereo"
+    video_folder.mkdir(parents=True, exist_ok=True)
+    video_path = video_folder / f"vr360_stereo_tb_{scene.frame_start:04d}-{scene.frame_end:04d}.mp4"
+
+    encoded = encode_cache_sequence(
+        lambda frame: eye_pair_paths(cache_folder, frame, extension=CACHE_EXTENSION), 'TB',
+        scene.frame_start, scene.frame_end, str(video_path), scene.render.fps / scene.render.fps_base,
+    )
+    logger.info("Encoded %d cached frames to %s", encoded, video_path)
+    return video_folder
+
+
+def encode_video(scene):
+    """
+    Encodes the packed top/bottom frames into the final 360 stereo MP4.
+
+    With the raw frame cache enabled, encodes from the cache instead
+    (encode_cached_video()).
+
+    Args:
+        scene (bpy.types.Scene): Scene holding pe_vr360_stereo_settings
+
+    Returns:
+        pathlib.Path: Folder holding the video
+
+    Raises:
+        ValueError: If no frames have been packed
+    """
+    settings = scene.pe_vr360_stereo_settings
+    if settings.frame_cache:
+        return encode_cached_video(scene)
+    packed_files = sorted((settings.workflow_dir() / "top_bottom").glob(f"{PACKED_PREFIX}*.exr"))
+    if not packed_files:
+        raise ValueError("No top/bottom frames found. Run Step 3 (Pack Top/Bottom) first.")
+
+    comp_scene = bpy.data.scenes.get(VR360_STEREO_COMPOSITOR_SCENE_NAME)
+    if comp_scene is None:
+        comp_scene = bpy.data.scenes.new(VR360_STEREO_COMPOSITOR_SCENE_NAME)
+
+    comp_scene.use_nodes = True
+    comp_scene.node_tree.nodes.clear()
+
+    nodes = comp_scene.node_tree.nodes
+    image_node = nodes.new('CompositorNodeImage')
+    image_node.location = (-300, 0)
+    image_node.image = bpy.data.images.load(str(packed_files[0]), check_existing=True)
+    image_node.image.source = 'SEQUENCE'
+    image_node.frame_duration = len(packed_files)
+    image_node.frame_start = scene.frame_start
+
+    composite_node = nodes.new('CompositorNodeComposite')
+    composite_node.location = (0, 0)
+    comp_scene.node_tree.links.new(image_node.outputs['Image'], composite_node.inputs['Image'])
+
+    comp_scene.render.resolution_x, comp_scene.render.resolution_y = settings.packed_resolution()
+    comp_scene.render.resolution_percentage = 100
+    comp_scene.frame_start = scene.frame_start
+    comp_scene.frame_end = scene.frame_start + len(packed_files) - 1
+    comp_scene.render.fps = scene.render.fps
+
+    final_output_path = settings.workflow_dir() / "youtube_vr360_stereo"
+    final_output_path.mkdir(parents=True, exist_ok=True)
+
+    render = comp_scene.render
+    render.filepath = str(final_output_path / "vr360_stereo_tb_")
+    render.image_settings.file_format = 'FFMPEG'
+    render.ffmpeg.format = 'MPEG4'
+    render.ffmpeg.codec = 'H264'
+    render.ffmpeg.constant_rate_factor = 'PERC_LOSSLESS'
+    render.ffmpeg.ffmpeg_preset = 'GOOD'
+    render.ffmpeg.audio_codec = 'NONE'
+
+    bpy.ops.render.render(animation=True, scene=comp_scene.name)
+    return final_output_path
+
+
+# Step name -> function(scene), in workflow order. Only 'render' takes a frame range.
+STEPS = {
+    'render': render_sequence,
+    'pack': pack_frames,
+    'encode': encode_video,
+}
+
+# Render and encode in one pipelined step, replacing all of STEPS
+STREAM = stream_sequence
@@ -0,0 +1,228 @@
+import bpy
+from pathlib import Path
+from bpy.props import (
+    StringProperty,
+    EnumProperty,
+    BoolProperty,
+    FloatProperty,
+    IntProperty,
+    PointerProperty,
+)
+from bpy.types import PropertyGroup
+
+from ...utils.scene_setup import LIGHTING_PRESET_ITEMS, HDRI_SAMPLING_ITEMS
+from ...utils.render import (
+    DENOISE_MODE_ITEMS,
+    EXR_DEPTH_ITEMS,
+    EXR_COLOR_MODE_ITEMS,
+    EXR_CODEC_ITEMS,
+    FRAME_CACHE_FORMAT_ITEMS,
+)
+from ...utils.job_queue import JobStore, QUEUE_FILE_NAME
+
+# Per-eye equirect size; the packed top/bottom frame is twice as tall
+RESOLUTION_PRESETS = {
+    '4K': (3840, 1920),
+    '5_7K': (5760, 2880),
+}
+
+class PE_VR360StereoSceneSettings(PropertyGroup):
+    resolution_preset: EnumProperty(
+        name="Resolution Preset",
+        items=[
+            ('4K', "4K (3840x3840 TB)", "3840x1920 per eye, packed top/bottom"),
+            ('5_7K', "5.7K (5760x5760 TB)", "5760x2880 per eye, packed top/bottom"),
+        ],
+        default='4K',
+        description="Per-eye resolution of the stereo panorama"
+    )
+
+    render_quality: EnumProperty(
+        name="Render Quality",
+        items=[
+            ('PREVIEW', "Preview (256 / 64 denoised)", "Fast preview render"),
+            ('PRODUCTION', "Production (512 / 128 denoised)", "Balanced quality for production"),
+            ('FINAL', "Final (1024 / 256 denoised)", "High quality for final render"),
+        ],
+        default='PRODUCTION',
+        description="Render quality preset"
+    )
+
+    denoise_mode: EnumProperty(
+        name="Denoise",
+        # Packing reads the eye EXRs directly, so the passes would have no consumer
+        items=[item for item in DENOISE_MODE_ITEMS if item[0] != 'COMPOSITOR'],
+        default='RENDER',
+        description="Denoise both eyes in Cycles with albedo and normal guides, which lets the quality presets use a quarter of the samples"
+    )
+
+    exr_depth: EnumProperty(
+        name="EXR Depth",
+        items=EXR_DEPTH_ITEMS,
+        default='16',
+        description="Float precision of the intermediate EXR sequence"
+    )
+
+    exr_color_mode: EnumProperty(
+        name="EXR Channels",
+        items=EXR_COLOR_MODE_ITEMS,
+        default='RGB',
+        description="Channels written to the intermediate EXR sequence"
+    )
+
+    exr_codec: EnumProperty(
+        name="EXR Codec",
+        items=EXR_CODEC_ITEMS,
+        default='DWAA',
+        description="Compression of the intermediate EXR sequence"
+    )
+
+    output_path: StringProperty(
+        name="Output Path",
+        subtype='DIR_PATH',
+        default='//output/',
+        description="Directory to save rendered files"
+    )
+
+    stream_encode: BoolProperty(
+        name="Encode While Rendering",
+        default=False,
+        description="Encode the video while the sequence renders: each finished frame is piped to ffmpeg, "
+                    "so the MP4 is ready right after the last frame. Needs ffmpeg on PATH. "
+                    "EXRs are still written for Steps 3-4"
+    )
+
+    frame_cache: BoolProperty(
+        name="Raw Frame Cache",
+        default=False,
+        description="Also keep every frame uncompressed in cache/, so Step 4 encodes straight from "
+                    "memory-mapped files. Fastest on local NVMe scratch disks; needs ffmpeg on PATH"
+    )
+
+    frame_cache_format: EnumProperty(
+        name="Cache Format",
+        items=FRAME_CACHE_FORMAT_ITEMS,
+        default='UINT16',
+        description="Pixel format of the raw frame cache"
+    )
+
+    ipd: FloatProperty(
+        name="IPD (mm)",
+        default=64.0,
+        min=50.0, max=80.0,
+        description="Interpupillary distance of the new camera"
+    )
+    pole_merge_from: FloatProperty(
+        name="Pole Merge From",
+        default=60.0,
+        min=0.0, max=90.0,
+        description="Elevation in degrees where the eye offset starts fading towards the poles"
+    )
+    pole_merge_to: FloatProperty(
+        name="Pole Merge To",
+        default=75.0,
+        min=0.0, max=90.0,
+        description="Elevation in degrees where both eyes meet"
+    )
+
+    ipd_subject: PointerProperty(
+        name="Subject",
+        type=bpy.types.Object,
+        description="Object whose distance to the camera sets the IPD on each frame"
+    )
+    ipd_ratio: FloatProperty(
+        name="Distance Ratio",
+        default=30.0,
+        min=5.0, max=100.0,
+        description="Subject distance divided by the IPD (1/30 rule: 1.92m gives 64mm)"
+    )
+    ipd_min: FloatProperty(name="Min IPD (mm)", default=5.0, min=0.0, max=120.0)
+    ipd_max: FloatProperty(name="Max IPD (mm)", default=64.0, min=0.0, max=120.0)
+    ipd_smoothing: IntProperty(
+        name="Smoothing",
+        default=0,
+        min=0, max=120,
+        description="Moving-average width in frames, so depth does not pump with jittery motion"
+    )
+
+    lighting_preset: EnumProperty(
+        name="Lighting",
+        items=LIGHTING_PRESET_ITEMS,
+        default='3POINT_STUDIO',
+    )
+    hdri_path: StringProperty(
+        name="HDRI",
+        subtype='FILE_PATH',
+        default='',
+        description="Local .hdr/.exr environment map used by the HDRI World preset"
+    )
+    hdri_strength: FloatProperty(name="HDRI Strength", default=1.0, min=0.0, soft_max=10.0)
+    hdri_sampling_method: EnumProperty(
+        name="Importance Sampling",
+        items=HDRI_SAMPLING_ITEMS,
+        default='RESOLUTION',
+    )
+    hdri_map_resolution: IntProperty(name="Map Resolution", default=1024, min=256, max=8192)
+    include_cyclorama: BoolProperty(name="Cyclorama Stage", default=True)
+    cyclorama_size: EnumProperty(
+        name="Size",
+        items=[('SMALL', "10m × 10m", ""), ('MEDIUM', "20m × 20m", ""), ('LARGE', "30m × 30m", "")],
+        default='MEDIUM',
+    )
+    cyclorama_color: EnumProperty(
+        name="Color",
+        items=[('WHITE', "White", ""), ('GRAY', "Neutral Gray", ""), ('BLACK', "Black", "")],
+        default='GRAY',
+    )
+    include_reference: BoolProperty(name="Person-Scale Reference", default=True)
+
+    def workflow_dir(self):
+        """Root folder of the eye renders, packed frames and video."""
+        return Path(bpy.path.abspath(self.output_path)) / "vr360stereo"
+
+    def job_store(self):
+        """Job queue store of this rig (utils/job_queue.py) under the output path."""
+        return JobStore(Path(bpy.path.abspath(self.output_path)) / QUEUE_FILE_NAME)
+
+    def ipd_schedule_settings(self):
+        """Keyword arguments for rig_math.ipd_schedule() from these settings."""
+        return {
+            'ratio': self.ipd_ratio,
+            'min_ipd': self.ipd_min,
+            'max_ipd': self.ipd_max,
+            'smoothing': self.ipd_smoothing,
+        }
+
+    def eye_resolution(self):
+        """(width, height) of one eye."""
+        return RESOLUTION_PRESETS[self.resolution_preset]
+
+    def packed_resolution(self):
+        """(width, height) of the top/bottom frame."""
+        width, height = self.eye_resolution()
+        return width, 2 * height
+
+    def hdri_settings(self):
+        """Keyword arguments for setup_hdri_world() from these settings."""
+        return {
+            'filepath': self.hdri_path,
+            'strength': self.hdri_strength,
+            'sampling_method': self.hdri_sampling_method,
+            'map_resolution': self.hdri_map_resolution,
+            'render_width': RESOLUTION_PRESETS[self.resolution_preset][0],
+        }
+
+
+classes = (
+    PE_VR360StereoSceneSettings,
+)
+
+def register():
+    for cls in classes:
+        bpy.utils.register_class(cls)
+    bpy.types.Scene.pe_vr360_stereo_settings = PointerProperty(type=PE_VR360StereoSceneSettings)
+
+def unregister():
+    del bpy.types.Scene.pe_vr360_stereo_settings
+    for cls in reversed(classes):
+        bpy.utils.unregister_class(cls)
@@ -0,0 +1,86 @@
+import bpy
+import math
+import numpy as np
+
+from ...utils.animation import ensure_action, write_fcurve, remove_fcurve
+from ...constants import VR360_STEREO_CAM_NAME
+
+def create_vr360_stereo_camera(collection, height=1.6, ipd=64.0,
+                               pole_merge_from=60.0, pole_merge_to=75.0):
+    """
+    Creates a single equirectangular camera rendering omni-directional stereo.
+
+    Cycles' spherical stereo offsets every pixel's ray origin by half the
+    interocular distance perpendicular to that pixel's viewing direction, so
+    each column of the panorama sees the correct parallax. Two plain
+    equirect cameras side by side are only correct straight ahead and swap
+    eyes behind the viewer. Towards the poles the offset is faded out (pole
+    merge) so the zenith and nadir do not show two diverging images.
+
+    Args:
+        collection (bpy.types.Collection): Collection to link the camera into
+        height (float): Camera height in meters
+        ipd (float): Interpupillary distance in millimeters
+        pole_merge_from (float): Elevation in degrees where the IPD starts fading
+        pole_merge_to (float): Elevation in degrees where both eyes meet
+
+    Returns:
+        (bpy.types.Object): The created camera object.
+    """
+    cam_data = bpy.data.cameras.new(f"{VR360_STEREO_CAM_NAME}_Data")
+    cam_data.type = 'PANO'
+    cam_data.cycles.panorama_type = 'EQUIRECTANGULAR'
+
+    stereo = cam_data.stereo
+    # Parallel axes: an ODS panorama has no convergence plane, the headset converges
+    stereo.convergence_mode = 'PARALLEL'
+    stereo.interocular_distance = ipd / 1000.0
+    stereo.use_spherical_stereo = True
+    stereo.use_pole_merge = True
+    stereo.pole_merge_angle_from = math.radians(pole_merge_from)
+    stereo.pole_merge_angle_to = math.radians(max(pole_merge_from, pole_merge_to))
+
+    camera = bpy.data.objects.new(VR360_STEREO_CAM_NAME, cam_data)
+    camera.location = (0, 0, height)
+
+    # Level the camera
+    camera.rotation_euler = (math.radians(90), 0, 0)
+
+    collection.objects.link(camera)
+    return camera
+
+
+def configure_stereo_views(scene):
+    """
+    Enables multiview with the left/right stereo views, written as one file per eye.
+
+    A single render then produces both eyes from the one camera; the
+    separate files feed the top/bottom packing stage.
+    """
+    render = scene.render
+    render.use_multiview = True
+    render.views_format = 'STEREO_3D'
+    for view_name in ('left', 'right'):
+        view = render.views.get(view_name)
+        if view is not None:
+            view.use = True
+    render.image_settings.views_format = 'INDIVIDUAL'
+
+
+def bake_stereo_ipd(camera, frames, ipd):
+    """
+    Bakes a per-frame IPD into the camera's interocular distance.
+
+    Args:
+        camera (bpy.types.Object): VR360 stereo camera
+        frames (np.ndarray): (N,) frame numbers
+        ipd (np.ndarray): (N,) IPD in millimeters, e.g. from rig_math.ipd_schedule()
+    """
+    meters = np.asarray(ipd, dtype=np.float64) / 1000.0
+    write_fcurve(ensure_action(camera.data), "stereo.interocular_distance", 0, frames, meters)
+
+
+def clear_stereo_ipd_schedule(camera, ipd):
+    """Removes a baked IPD schedule and sets a static IPD in millimeters."""
+    remove_fcurve(camera.data, "stereo.interocular_distance", 0)
+    camera.data.stereo.interocular_distance = ipd / 1000.0
@@ -0,0 +1,217 @@
+"""
+CPU sets for render worker processes.
+
+When several Blender processes render at once, each Cycles instance starts
+one thread per logical CPU by default, so the processes oversubscribe the
+machine, migrate between cores and evict each other's caches. Giving every
+worker its own set of physical cores (with their SMT siblings), kept
+inside one NUMA node where possible, and a matching fixed thread count
+avoids that. Because Linux places memory on the node of the CPU that first
+touches it, a pinned worker's scene data also stays local.
+
+The topology is read from sysfs; pinning needs os.sched_setaffinity
+(Linux). Elsewhere the partitions still size each worker's thread count,
+but the processes are not pinned. Only the standard library is used, so
+the benchmark scripts import this module outside Blender.
+"""
+
+import logging
+import os
+import subprocess
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+SYSFS_NODES = Path("/sys/devices/system/node")
+SYSFS_CPUS = Path("/sys/devices/system/cpu")
+
+# Below this, splitting a machine into eye pairs costs more than it saves
+MIN_CORES_PER_WORKER = 4
+
+# Cycles keeps scaling up to about this many cores per process; bigger
+# machines get one more eye pair per this many cores
+CORES_PER_EYE_PAIR = 16
+
+
+def can_pin():
+    """Whether worker processes can be pinned to CPU sets on this platform."""
+    return hasattr(os, 'sched_setaffinity')
+
+
+def parse_cpu_list(text):
+    """Parses a sysfs CPU list such as '0-3,8,10-11' into a list of CPU ids."""
+    cpus = []
+    for part in text.strip().split(","):
+        if not part:
+            continue
+        first, _, last = part.partition("-")
+        cpus.extend(range(int(first), int(last or first) + 1))
+    return cpus
+
+
+def usable_cpus():
+    """CPUs this process may run on, sorted."""
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def _read_cpu_list(path):
+    try:
+        return parse_cpu_list(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def cpu_topology():
+    """
+    Usable CPUs grouped by NUMA node and physical core.
+
+    Returns:
+        list: One list per NUMA node of cores, each a tuple of the core's
+            logical CPU ids (SMT siblings). Without sysfs, one node with one
+            CPU per core.
+    """
+    usable = set(usable_cpus())
+
+    nodes = []
+    node_dirs = sorted(SYSFS_NODES.glob("node[0-9]*"), key=lambda path: int(path.name[4:]))
+    for node_dir in node_dirs:
+        cpus = _read_cpu_list(node_dir / "cpulist")
+        if cpus:
+            nodes.append([cpu for cpu in cpus if cpu in usable])
+    nodes = [node for node in nodes if node]
+    listed = {cpu for node in nodes for cpu in node}
+    if not nodes or listed != usable:
+        # No NUMA information (or it disagrees with the affinity mask): one node
+        nodes = [sorted(usable)]
+
+    topology = []
+    for node in nodes:
+        cores = {}
+        for cpu in node:
+            siblings = _read_cpu_list(SYSFS_CPUS / f"cpu{cpu}" / "topology" / "thread_siblings_list")
+            key = tuple(sibling for sibling in (siblings or [cpu]) if sibling in usable) or (cpu,)
+            cores[key] = True
+        topology.append(sorted(cores))
+    return topology
+
+
+def physical_core_count(topology=None):
+    """Number of usable physical cores."""
+    topology = cpu_topology() if topology is None else topology
+    return sum(len(node) for node in topology)
+
+
+def _split(items, count):
+    """Splits items into `count` contiguous groups of near-equal size (some empty if too few)."""
+    return [items[index * len(items) // count:(index + 1) * len(items) // count] for index in range(count)]
+
+
+def partition_cpus(count, topology=None):
+    """
+    Splits the usable CPUs into `count` disjoint sets, one per worker.
+
+    Workers are spread over the NUMA nodes in proportion to their cores and
+    never span a node unless there are fewer workers than nodes. Within a
+    node each worker gets whole physical cores; only when a node has fewer
+    cores than workers are SMT siblings split up.
+
+    Args:
+        count (int): Number of workers
+        topology (list, optional): cpu_topology() result
+
+    Returns:
+        list: `count` sorted lists of CPU ids; neighbouring workers get
+            neighbouring cores
+    """
+    topology = cpu_topology() if topology is None else topology
+    count = max(1, int(count))
+
+    if count <= len(topology):
+        sets = [[] for _ in range(count)]
+        for index, node in enumerate(topology):
+            sets[index % count].extend(cpu for core in node for cpu in core)
+        return [sorted(cpus) for cpus in sets]
+
+    # Workers per node in proportion to its cores (largest remainder), one at least
+    total = sum(len(node) for node in topology)
+    quotas = [count * len(node) / total for node in topology]
+    shares = [max(1, int(quota)) for quota in quotas]
+    while sum(shares) < count:
+        index = max(range(len(topology)), key=lambda i: quotas[i] - shares[i])
+        shares[index] += 1
+    while sum(shares) > count:
+        index = min((i for i in range(len(topology)) if shares[i] > 1), key=lambda i: quotas[i] - shares[i])
+        shares[index] -= 1
+
+    sets = []
+    for node, share in zip(topology, shares):
+        units = node if len(node) >= share else [(cpu,) for core in node for cpu in core]
+        groups = _split(units, share)
+        for index, group in enumerate(groups):
+            if not group:
+                # More workers than CPUs on the node: share them round-robin
+                group = [units[index % len(units)]]
+            sets.append(sorted(cpu for core in group for cpu in core))
+    return sets
+
+
+def default_worker_count(topology=None):
+    """
+    Worker processes for a per-eye render when nothing was calibrated.
+
+    One eye pair per NUMA node, plus one per CORES_PER_EYE_PAIR physical
+    cores on big nodes; 1 (render in one process) on machines too small to
+    give each worker MIN_CORES_PER_WORKER cores.
+    """
+    topology = cpu_topology() if topology is None else topology
+    cores = physical_core_count(topology)
+    if cores < 2 * MIN_CORES_PER_WORKER:
+        return 1
+    pairs = max(len(topology), cores // CORES_PER_EYE_PAIR)
+    pairs = min(pairs, cores // (2 * MIN_CORES_PER_WORKER))
+    return 2 * pairs
+
+
+def worker_candidates(topology=None):
+    """
+    Worker counts worth calibrating: 1 (one process), then doubling eye
+    pairs while every worker keeps MIN_CORES_PER_WORKER cores, plus
+    default_worker_count().
+    """
+    topology = cpu_topology() if topology is None else topology
+    cores = physical_core_count(topology)
+    candidates = {1, default_worker_count(topology)}
+    workers = 2
+    while workers * MIN_CORES_PER_WORKER <= cores:
+        candidates.add(workers)
+        workers *= 2
+    return sorted(candidates)
+
+
+def popen_pinned(command, cpus=None, **kwargs):
+    """
+    Starts a process restricted to `cpus` from its first instruction.
+
+    A new process inherits the CPU affinity of the thread that starts it,
+    so this thread is pinned for the spawn and restored afterwards. Blender
+    starts its thread pools during startup; pinning the process afterwards
+    would leave those threads on every CPU.
+
+    Args:
+        command (list): Command line
+        cpus (list, optional): CPU ids; None or an unsupported platform starts it unpinned
+        **kwargs: Passed to subprocess.Popen
+
+    Returns:
+        subprocess.Popen: The process
+    """
+    if not cpus or not can_pin():
+        return subprocess.Popen(command, **kwargs)
+    previous = os.sched_getaffinity(0)
+    os.sched_setaffinity(0, cpus)
+    try:
+        return subprocess.Popen(command, **kwargs)
+    finally:
+        os.sched_setaffinity(0, previous)
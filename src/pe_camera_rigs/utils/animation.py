@@ -0,0 +1,129 @@
+"""
+Animation helpers for baking sampled values to F-curves.
+
+Bakes write a whole frame range in one keyframe_points.foreach_set() call
+instead of inserting keys frame by frame, so the result plays back with
+no drivers or handlers.
+"""
+
+import bpy
+import numpy as np
+
+# Enum value of 'LINEAR' in Keyframe.interpolation, for foreach_set()
+KEYFRAME_INTERPOLATION_LINEAR = 1
+
+
+def ensure_action(id_data, name=None):
+    """Returns the action of an ID block, creating and assigning one if needed."""
+    anim = id_data.animation_data or id_data.animation_data_create()
+    if anim.action is None:
+        anim.action = bpy.data.actions.new(name=name or f"{id_data.name}Action")
+    return anim.action
+
+
+def write_fcurve(action, data_path, index, frames, values, group=None):
+    """
+    Replaces an F-curve with linear keys in a single foreach_set() call.
+
+    Args:
+        action (bpy.types.Action): Action to write into
+        data_path (str): RNA path of the animated property
+        index (int): Array index of the property
+        frames (np.ndarray): (N,) frame numbers
+        values (np.ndarray): (N,) values
+        group (str, optional): Action group name
+
+    Returns:
+        bpy.types.FCurve: The new F-curve
+    """
+    fcurve = action.fcurves.find(data_path, index=index)
+    if fcurve:
+        action.fcurves.remove(fcurve)
+    fcurve = action.fcurves.new(data_path, index=index, action_group=group or "")
+
+    count = len(frames)
+    co = np.empty(count * 2, dtype=np.float32)
+    co[0::2] = frames
+    co[1::2] = values
+
+    fcurve.keyframe_points.add(count)
+    fcurve.keyframe_points.foreach_set('co', co)
+    fcurve.keyframe_points.foreach_set(
+        'interpolation', np.full(count, KEYFRAME_INTERPOLATION_LINEAR, dtype=np.int32)
+    )
+    fcurve.update()
+    return fcurve
+
+
+def remove_fcurve(id_data, data_path, index=0):
+    """Removes an F-curve from an ID block's action. Returns True if one existed."""
+    anim = id_data.animation_data
+    if anim is None or anim.action is None:
+        return False
+    fcurve = anim.action.fcurves.find(data_path, index=index)
+    if fcurve is None:
+        return False
+    anim.action.fcurves.remove(fcurve)
+    return True
+
+
+def _is_plain_animated(obj):
+    """True if an object's transform comes only from its own action."""
+    anim = obj.animation_data
+    return (
+        obj.parent is None
+        and not obj.constraints
+        and (anim is None or (not anim.drivers and not anim.nla_tracks))
+    )
+
+
+def sample_world_locations(scene, obj, frames):
+    """
+    Samples an object's world location over frames.
+
+    Unparented, unconstrained objects are read straight from their location
+    F-curves, without changing the scene frame. Anything else (parents,
+    constraints, drivers, NLA) steps the scene once per frame so the
+    depsgraph resolves it; the original frame is restored.
+
+    Args:
+        scene (bpy.types.Scene): Scene holding the object
+        obj (bpy.types.Object): Object to sample
+        frames (array-like): (N,) frame numbers
+
+    Returns:
+        np.ndarray: (N, 3) world locations
+    """
+    frames = np.asarray(frames, dtype=np.float64)
+
+    if _is_plain_animated(obj):
+        locations = np.tile(np.array(obj.location, dtype=np.float64), (len(frames), 1))
+        action = obj.animation_data.action if obj.animation_data else None
+        if action is not None:
+            for axis in range(3):
+                fcurve = action.fcurves.find("location", index=axis)
+                if fcurve is not None:
+                    locations[:, axis] = [fcurve.evaluate(frame) for frame in frames]
+        return locations + np.array(obj.delta_location, dtype=np.float64)
+
+    original_frame = scene.frame_current
+    locations = np.empty((len(frames), 3), dtype=np.float64)
+    try:
+        for i, frame in enumerate(frames):
+            scene.frame_set(int(frame))
+            locations[i] = obj.matrix_world.translation
+    finally:
+        scene.frame_set(original_frame)
+    return locations
+
+
+def subject_distances(scene, origin, subject, frames):
+    """
+    Distance from one object to another on every frame.
+
+    Returns:
+        np.ndarray: (N,) distances in meters
+    """
+    origins = sample_world_locations(scene, origin, frames)
+    targets = sample_world_locations(scene, subject, frames)
+    return np.linalg.norm(targets - origins, axis=1)
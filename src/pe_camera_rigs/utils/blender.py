@@ -52,6 +52,48 @@ def detect_and_enable_gpu():
         return None
 
 
+def gpu_compute_device_type(scene):
+    """
+    Cycles compute device type worker processes need to render `scene` like this session.
+
+    Workers start with --factory-startup, which resets the Cycles device
+    preferences: a scene set to render on the GPU would silently render on
+    the CPU there unless the type is passed on (see enable_gpu_compute()).
+
+    Returns:
+        str: compute_device_type (e.g. 'OPTIX'), or None if the scene renders on the CPU
+    """
+    if scene.render.engine != 'CYCLES' or scene.cycles.device != 'GPU':
+        return None
+    try:
+        device_type = bpy.context.preferences.addons['cycles'].preferences.compute_device_type
+    except (AttributeError, KeyError):
+        return None
+    return None if device_type == 'NONE' else device_type
+
+
+def enable_gpu_compute(device_type):
+    """
+    Enables every Cycles device of `device_type` in this session's preferences.
+
+    Returns:
+        int: Devices enabled; 0 means GPU scenes render on the CPU
+    """
+    try:
+        cycles_prefs = bpy.context.preferences.addons['cycles'].preferences
+        cycles_prefs.compute_device_type = device_type
+    except (AttributeError, KeyError, TypeError):
+        # Cycles unavailable, or this build does not support the device type
+        return 0
+    cycles_prefs.refresh_devices()
+    enabled = 0
+    for device in cycles_prefs.devices:
+        if device.type == device_type:
+            device.use = True
+            enabled += 1
+    return enabled
+
+
 def validate_output_path(filepath, scene=None):
     """
     Validates that a render output path is writable and has sufficient disk space.
@@ -125,6 +167,28 @@ def get_active_camera_or_create(context):
     return cam_obj
 
 
+def find_generated_camera(depsgraph, controller):
+    """
+    Find the camera instanced by a Geometry Nodes controller.
+
+    GN rigs instance their template camera; this returns the original
+    camera object behind that instance so it can be used as scene camera.
+
+    Args:
+        depsgraph (bpy.types.Depsgraph): An evaluated depsgraph
+        controller (bpy.types.Object): The controller object with the GN modifier
+
+    Returns:
+        bpy.types.Object: The camera object, or None if not found
+    """
+    for obj_instance in depsgraph.object_instances:
+        # Check if the object instance is from our controller's modifier and is a camera
+        if obj_instance.parent and obj_instance.parent.original == controller and obj_instance.is_instance:
+            if obj_instance.object.original.type == 'CAMERA':
+                return obj_instance.object.original
+    return None
+
+
 def safe_object_delete(obj, do_unlink=True):
     """
     Safely delete an object with existence checking.
@@ -173,3 +237,31 @@ def set_modifier_input(modifier, socket_name, value):
             modifier[input_socket.identifier] = value
             return True
     return False
+
+
+def get_modifier_input(modifier, socket_name, default=None):
+    """
+    Safely read a Geometry Nodes modifier input by socket name.
+
+    Counterpart to set_modifier_input(). Returns the value currently stored
+    on the modifier, not the node group's default.
+
+    Args:
+        modifier: The Geometry Nodes modifier
+        socket_name (str): Name of the input socket
+        default: Value returned if the socket or value cannot be found
+
+    Returns:
+        The socket value, or `default` if not found
+
+    Example:
+        >>> modifier = controller.modifiers.get('Orbit Camera')
+        >>> radius = get_modifier_input(modifier, 'Orbit Radius', 3.0)
+    """
+    if not hasattr(modifier, 'node_group') or not modifier.node_group:
+        return default
+
+    for input_socket in modifier.node_group.inputs:
+        if input_socket.name == socket_name:
+            return modifier.get(input_socket.identifier, default)
+    return default
@@ -0,0 +1,270 @@
+"""
+Raw frame cache: uncompressed intermediate frames read through numpy.memmap.
+
+On fast local scratch disks, decoding compressed EXRs dominates the encode
+stage. With the cache enabled, the render stage also converts every
+finished frame into a raw file (a small header followed by the pixels, row
+0 at the top) in a writer thread while the next frame renders. The encode
+stage maps those files with numpy.memmap and hands the pages straight to
+the ffmpeg pipe: no decode and, for mono and top/bottom layouts, no copy.
+
+Cache formats:
+    'UINT16': display-encoded 16-bit sRGB, piped to ffmpeg as rgb48le
+    'HALF':   linear half float (keeps HDR values), converted to 8-bit sRGB
+              when encoded
+
+The EXRs are still written, so Steps 3-4 can rebuild the video through
+the compositor. Converting needs the OpenImageIO module bundled with
+Blender, like the streaming encode.
+"""
+
+import logging
+import os
+import queue
+import struct
+import threading
+
+import numpy as np
+
+from .image_io import HAS_OIIO, read_image
+from .stream_encode import FrameEncoder, linear_to_srgb8, SRGB_LUT_SIZE
+
+logger = logging.getLogger(__name__)
+
+CACHE_EXTENSION = ".praw"
+
+# magic, format code, height, width, channels; padded so the pixels start 64-byte aligned
+CACHE_MAGIC = b"PERAWFR1"
+CACHE_HEADER = struct.Struct("<8s4sIII")
+CACHE_HEADER_SIZE = 64
+
+# Cache format (render.FRAME_CACHE_FORMAT_ITEMS) -> (header code, pixel dtype)
+CACHE_FORMATS = {
+    'UINT16': (b"u2\0\0", np.dtype('<u2')),
+    'HALF': (b"f2\0\0", np.dtype('<f2')),
+}
+
+# Linear [0, 1] in 65536 steps -> 16-bit sRGB
+_linear = np.linspace(0.0, 1.0, SRGB_LUT_SIZE)
+SRGB16_LUT = np.round(65535.0 * np.where(
+    _linear <= 0.0031308, 12.92 * _linear, 1.055 * np.power(_linear, 1 / 2.4) - 0.055
+)).astype('<u2')
+del _linear
+
+
+def write_cache_frame(path, pixels, cache_format='UINT16'):
+    """
+    Writes a linear float (height, width, channels) array as a raw cache frame.
+
+    The file is written under a temporary name and renamed, so readers never
+    map a partial frame.
+    """
+    code, dtype = CACHE_FORMATS[cache_format]
+    height, width, channels = pixels.shape
+    if cache_format == 'UINT16':
+        np.clip(pixels, 0.0, 1.0, out=pixels)
+        pixels *= SRGB_LUT_SIZE - 1
+        pixels += 0.5
+        data = SRGB16_LUT[pixels.astype(np.uint16)]
+    else:
+        data = pixels.astype(dtype)
+
+    path = str(path)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    header = CACHE_HEADER.pack(CACHE_MAGIC, code, height, width, channels)
+    with open(f"{path}.tmp", 'wb') as f:
+        f.write(header.ljust(CACHE_HEADER_SIZE, b"\0"))
+        data.tofile(f)
+    os.replace(f"{path}.tmp", path)
+
+
+def open_cache_frame(path):
+    """
+    Maps a raw cache frame read-only.
+
+    Returns:
+        np.memmap: (height, width, channels) pixels, uint16 sRGB or float16 linear
+
+    Raises:
+        ValueError: If the file is not a cache frame
+    """
+    with open(path, 'rb') as f:
+        header = f.read(CACHE_HEADER.size)
+    if len(header) < CACHE_HEADER.size:
+        raise ValueError(f"{path} is not a frame cache file")
+    magic, code, height, width, channels = CACHE_HEADER.unpack(header)
+    dtypes = dict(CACHE_FORMATS.values())
+    if magic != CACHE_MAGIC or code not in dtypes:
+        raise ValueError(f"{path} is not a frame cache file")
+    return np.memmap(path, dtype=dtypes[code], mode='r', offset=CACHE_HEADER_SIZE,
+                     shape=(height, width, channels))
+
+
+class FrameCacheWriter(threading.Thread):
+    """
+    Converts finished frames to cache files in the background.
+
+    Args:
+        frame_inputs (callable): frame -> EXR paths
+        frame_outputs (callable): frame -> cache paths, one per input
+        cache_format (str): CACHE_FORMATS key
+        on_frame (callable, optional): Also called with every reported frame,
+            to chain another consumer (e.g. a StreamAssembler)
+    """
+
+    def __init__(self, frame_inputs, frame_outputs, cache_format='UINT16', on_frame=None):
+        super().__init__(name="pe-frame-cache", daemon=True)
+        if not HAS_OIIO:
+            raise ValueError("Raw Frame Cache needs the OpenImageIO module bundled with Blender")
+        self.frame_inputs = frame_inputs
+        self.frame_outputs = frame_outputs
+        self.cache_format = cache_format
+        self.on_frame = on_frame
+        # Holds frame numbers only, so it never needs a bound
+        self.queue = queue.Queue()
+        self.written = 0
+        self.error = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.finish()
+            return
+        try:
+            self.finish()
+        except RuntimeError:
+            logger.exception("Frame cache failed after an earlier error")
+
+    def frame_ready(self, frame):
+        """Reports that all images of `frame` are written."""
+        if self.error is not None:
+            raise RuntimeError(f"Frame cache failed: {self.error}") from self.error
+        self.queue.put(frame)
+        if self.on_frame is not None:
+            self.on_frame(frame)
+
+    def finish(self):
+        """
+        Waits for the queued frames.
+
+        Returns:
+            int: Frames written
+
+        Raises:
+            RuntimeError: If reading or writing a frame failed
+        """
+        if self.is_alive():
+            self.queue.put(None)
+            self.join()
+        if self.error is not None:
+            raise RuntimeError(f"Frame cache failed: {self.error}") from self.error
+        return self.written
+
+    def run(self):
+        while True:
+            frame = self.queue.get()
+            if frame is None:
+                return
+            try:
+                for source, target in zip(self.frame_inputs(frame), self.frame_outputs(frame)):
+                    write_cache_frame(target, read_image(source, channels=3), self.cache_format)
+                self.written += 1
+            except Exception as e:
+                logger.exception("Frame cache failed at frame %d", frame)
+                self.error = e
+                return
+
+
+def encode_cache_sequence(frame_inputs, layout, frame_start, frame_end, output_path, fps, quality='FINAL'):
+    """
+    Encodes cached frames to H.264 in frame order.
+
+    16-bit frames go to ffmpeg as rgb48le; mono and top/bottom frames are
+    written straight from the mapped files, side-by-side frames through one
+    reused buffer. Half-float frames are converted to 8-bit sRGB first.
+
+    Args:
+        frame_inputs (callable): frame -> cache paths (one for 'MONO', two otherwise)
+        layout (str): 'MONO', 'SBS' (first image left) or 'TB' (first image on top)
+        frame_start (int): First frame of the video
+        frame_end (int): Last frame of the video
+        output_path (str): Video file
+        fps (float): Frame rate
+        quality (str): STREAM_QUALITY key
+
+    Returns:
+        int: Frames encoded
+
+    Raises:
+        ValueError: If the first frame is not cached, or frames differ in size or format
+        RuntimeError: If ffmpeg fails
+    """
+    encoder = None
+    buffer = None
+    scratch = None
+    cache_dtype = None
+    encoded = 0
+    try:
+        for frame in range(frame_start, frame_end + 1):
+            paths = frame_inputs(frame)
+            if not all(os.path.exists(path) for path in paths):
+                if frame == frame_start:
+                    raise ValueError(f"Frame {frame} is not in the frame cache")
+                logger.warning("Frame %d missing from the frame cache, video stops there", frame)
+                break
+
+            images = [open_cache_frame(path) for path in paths]
+            height, width = images[0].shape[:2]
+            rows = height * 2 if layout == 'TB' else height
+            cols = width * 2 if layout == 'SBS' else width
+            if encoder is None:
+                cache_dtype = images[0].dtype
+                is_16bit = cache_dtype == CACHE_FORMATS['UINT16'][1]
+                encoder = FrameEncoder(
+                    output_path, cols, rows, fps, quality, pix_fmt="rgb48le" if is_16bit else "rgb24",
+                )
+                buffer = np.empty((rows, cols, 3), dtype=cache_dtype if is_16bit else np.uint8)
+                scratch = None if is_16bit else np.empty((height, width, 3), dtype=np.float32)
+            for image in images:
+                if image.dtype != cache_dtype or image.shape != (height, width, 3) \
+                        or buffer.shape[:2] != (rows, cols):
+                    raise ValueError(f"Frame {frame} differs in size or format from the first frame")
+
+            if is_16bit and layout != 'SBS':
+                # Page cache -> pipe, the frame never passes through a Python buffer
+                for image in images:
+                    encoder.write(image)
+            else:
+                for index, image in enumerate(images):
+                    if layout == 'SBS':
+                        target = buffer[:, index * width:(index + 1) * width]
+                    elif layout == 'TB':
+                        target = buffer[index * height:(index + 1) * height]
+                    else:
+                        target = buffer
+                    if is_16bit:
+                        target[...] = image
+                    else:
+                        np.copyto(scratch, image)
+                        linear_to_srgb8(scratch, target)
+                encoder.write(buffer)
+            # Unmap before the next frame
+            del images
+            encoded += 1
+    except BaseException:
+        if encoder is not None:
+            try:
+                encoder.close()
+            except RuntimeError:
+                logger.exception("ffmpeg failed after an earlier error")
+        raise
+
+    if encoder is not None:
+        encoder.close()
+    expected = frame_end - frame_start + 1
+    if encoded < expected:
+        logger.warning("Encoded %d of %d cached frames to %s", encoded, expected, output_path)
+    return encoded
@@ -0,0 +1,142 @@
+"""
+Image file I/O as NumPy arrays for the addon's pipeline stages.
+
+Uses the OpenImageIO module bundled with Blender when it is available,
+and falls back to bpy image datablocks otherwise. Arrays are always
+float32, shaped (height, width, channels), with row 0 at the top.
+"""
+
+import os
+
+import bpy
+import numpy as np
+
+try:
+    import OpenImageIO as oiio
+except ImportError:
+    # Not bundled with every Blender build, use bpy images instead
+    oiio = None
+
+HAS_OIIO = oiio is not None
+
+
+def read_image(filepath, channels=None):
+    """
+    Reads an image file into a float32 array.
+
+    Args:
+        filepath (str): Path to a PNG, EXR or any format Blender can read
+        channels (int, optional): Number of channels to return (e.g. 3 to
+            drop alpha, 4 to add an opaque one). Defaults to the file's.
+
+    Returns:
+        np.ndarray: (height, width, channels) pixels, values as stored in
+            the file (linear for EXR, display-encoded for PNG)
+    """
+    if oiio is not None:
+        buf = oiio.ImageBuf(str(filepath))
+        pixels = buf.get_pixels(oiio.FLOAT)
+        if pixels is None or buf.has_error:
+            raise OSError(f"Cannot read image {filepath}: {buf.geterror()}")
+        pixels = np.asarray(pixels, dtype=np.float32)
+    else:
+        pixels = _read_with_bpy(str(filepath))
+
+    if channels is not None and pixels.shape[2] != channels:
+        pixels = _match_channels(pixels, channels)
+    return pixels
+
+
+def write_image(filepath, pixels, bit_depth=None, exr_codec='ZIP'):
+    """
+    Writes a float array to an image file, format chosen by extension.
+
+    Args:
+        filepath (str): Output path ending in .png or .exr
+        pixels (np.ndarray): (height, width, channels) array, row 0 at the top
+        bit_depth (str, optional): '8'/'16' for PNG, '16'/'32' for EXR.
+            Defaults to 8-bit PNG and half-float EXR.
+        exr_codec (str): EXR compression (Blender exr_codec identifier).
+            Only honoured by the OpenImageIO writer.
+    """
+    filepath = str(filepath)
+    is_exr = filepath.lower().endswith('.exr')
+    if bit_depth is None:
+        bit_depth = '16' if is_exr else '8'
+
+    os.makedirs(os.path.dirname(os.path.abspath(filepath)), exist_ok=True)
+    pixels = np.ascontiguousarray(pixels, dtype=np.float32)
+
+    if oiio is not None:
+        _write_with_oiio(filepath, pixels, is_exr, bit_depth, exr_codec)
+    else:
+        _write_with_bpy(filepath, pixels, is_exr, bit_depth, exr_codec)
+
+
+def _match_channels(pixels, channels):
+    """Drops or pads channels; padded alpha is opaque."""
+    height, width, current = pixels.shape
+    if current > channels:
+        return pixels[:, :, :channels]
+
+    result = np.ones((height, width, channels), dtype=np.float32)
+    if current == 1:
+        result[:, :, :min(channels, 3)] = pixels
+    else:
+        result[:, :, :current] = pixels
+    return result
+
+
+def _read_with_bpy(filepath):
+    image = bpy.data.images.load(filepath, check_existing=False)
+    try:
+        width, height = image.size
+        channels = image.channels
+        pixels = np.empty(width * height * channels, dtype=np.float32)
+        image.pixels.foreach_get(pixels)
+    finally:
+        bpy.data.images.remove(image)
+
+    # Blender stores rows bottom-up
+    return pixels.reshape(height, width, channels)[::-1]
+
+
+def _write_with_oiio(filepath, pixels, is_exr, bit_depth, exr_codec):
+    height, width, channels = pixels.shape
+    if is_exr:
+        pixel_type = oiio.FLOAT if bit_depth == '32' else oiio.HALF
+    else:
+        pixel_type = oiio.UINT16 if bit_depth == '16' else oiio.UINT8
+
+    spec = oiio.ImageSpec(width, height, channels, pixel_type)
+    if is_exr:
+        codec = exr_codec.lower()
+        spec.attribute("compression", "none" if codec == 'none' else codec)
+
+    out = oiio.ImageOutput.create(filepath)
+    if out is None:
+        raise OSError(f"Cannot create image {filepath}: {oiio.geterror()}")
+    try:
+        if not out.open(filepath, spec) or not out.write_image(pixels):
+            raise OSError(f"Cannot write image {filepath}: {out.geterror()}")
+    finally:
+        out.close()
+
+
+def _write_with_bpy(filepath, pixels, is_exr, bit_depth, exr_codec):
+    height, width, channels = pixels.shape
+    rgba = _match_channels(pixels, 4)
+
+    image = bpy.data.images.new(
+        name=os.path.basename(filepath), width=width, height=height,
+        alpha=channels == 4, float_buffer=is_exr
+    )
+    try:
+        image.pixels.foreach_set(rgba[::-1].ravel())
+        image.filepath_raw = filepath
+        image.file_format = 'OPEN_EXR' if is_exr else 'PNG'
+        if is_exr:
+            image.use_half_precision = bit_depth != '32'
+        image.save()
+    finally:
+        bpy.data.images.remove(image)
@@ -0,0 +1,311 @@
+"""
+Render job queue persisted as JSON lines under a rig's output path.
+
+A job is one run of workflow steps (rig, scene, steps, frame range). Every
+change is appended to `<output_path>/jobs.jsonl` as one record and the
+current state is the replay of all records, so the file survives crashes
+(a torn last line is skipped) and other processes, like the CLI workers,
+can append to it:
+
+    {"type": "job", "id": "...", "rig": "vr180", "scene": "Scene", "steps": ["render", "encode"], ...}
+    {"type": "status", "id": "...", "status": "RUNNING", "pid": 4242, "host": "node07", ...}
+    {"type": "frame", "id": "...", "step": "render", "frame": 12, "camera": "VR180_Camera_Left", ...}
+    {"type": "step", "id": "...", "step": "render", "seconds": 812.4, ...}
+
+The CLI queues jobs with --enqueue and runs them back to back with the
+'queue' command; operators record the step they run, so the panels read
+workflow state from the store. Only the standard library is used.
+"""
+
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+QUEUE_FILE_NAME = "jobs.jsonl"
+
+JOB_QUEUED = 'QUEUED'
+JOB_RUNNING = 'RUNNING'
+JOB_DONE = 'DONE'
+JOB_FAILED = 'FAILED'
+
+# path -> ((mtime_ns, size), jobs); panels replay the file on every redraw
+_replay_cache = {}
+
+
+def _process_alive(pid):
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OSError):
+        # Exists but belongs to someone else, or the platform cannot tell
+        return True
+    return True
+
+
+class JobStore:
+    """
+    Append-only job store in one JSON-lines file.
+
+    Args:
+        path (str | Path): The jobs.jsonl file; created on the first write
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+
+    def _append(self, record_type, job_id, **fields):
+        record = {'type': record_type, 'id': job_id, 'time': round(time.time(), 3)}
+        record.update(fields)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        line = (json.dumps(record) + "\n").encode('utf-8')
+        # One write per line in append mode: concurrent writers never interleave a record
+        with open(self.path, 'a+b') as f:
+            if f.seek(0, os.SEEK_END):
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    # Close the torn line a crashed writer left, so it does not swallow this record
+                    line = b"\n" + line
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def add(self, rig, scene, steps, frames=None, blend="", draft=False, status=JOB_QUEUED):
+        """
+        Records a new job.
+
+        Args:
+            rig (str): Workflow rig ('vr180', 'vr360mono', 'vr360stereo')
+            scene (str): Scene holding the rig
+            steps (list): Pipeline step names, in order
+            frames (tuple, optional): (start, end) of the render step, None for the scene range
+            blend (str): .blend file the job belongs to
+            draft (bool): Whether the job renders the draft/ subtree
+            status (str): JOB_QUEUED, or JOB_RUNNING when it starts right away
+
+        Returns:
+            str: Job id
+        """
+        job_id = uuid.uuid4().hex[:12]
+        self._append(
+            'job', job_id, rig=rig, scene=scene, steps=list(steps),
+            frames=list(frames) if frames else None, blend=blend, draft=draft,
+        )
+        self.set_status(job_id, status)
+        return job_id
+
+    def set_status(self, job_id, status, step=None, message=None):
+        """Records a status change; RUNNING also records this process, for recovery."""
+        fields = {'status': status}
+        if status == JOB_RUNNING:
+            fields.update(pid=os.getpid(), host=socket.gethostname())
+        if step is not None:
+            fields['step'] = step
+        if message is not None:
+            fields['message'] = message
+        self._append('status', job_id, **fields)
+
+    def step_done(self, job_id, step, seconds):
+        """Records a finished step."""
+        self._append('step', job_id, step=step, seconds=round(seconds, 3))
+
+    def frame_done(self, job_id, step, frame, camera=None):
+        """Records one finished render of `step`."""
+        self._append('frame', job_id, step=step, frame=frame, camera=camera)
+
+    def jobs(self):
+        """
+        Replays the file.
+
+        Returns:
+            list: Job dicts in creation order with the 'job' record fields plus
+                'status', 'step', 'message', 'pid', 'host', 'created',
+                'updated', 'done_steps' (list) and 'frames_done' (frame -> set of
+                cameras rendered, so a re-rendered eye counts once)
+        """
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return []
+        key = (stat.st_mtime_ns, stat.st_size)
+        cached = _replay_cache.get(self.path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        jobs = {}
+        with open(self.path, encoding='utf-8') as f:
+            for number, line in enumerate(f, 1):
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A writer died mid-line; the records after it are still valid
+                    logger.warning("Skipping unreadable line %d of %s", number, self.path)
+                    continue
+                job_id = record.get('id')
+                if record.get('type') == 'job':
+                    job = {key: value for key, value in record.items() if key not in ('type', 'time')}
+                    job.update(
+                        status=JOB_QUEUED, step=None, message=None, pid=None, host=None,
+                        created=record['time'], updated=record['time'], done_steps=[], frames_done={},
+                    )
+                    jobs[job_id] = job
+                    continue
+                job = jobs.get(job_id)
+                if job is None:
+                    continue
+                job['updated'] = record['time']
+                if record['type'] == 'status':
+                    job.update(
+                        status=record['status'], step=record.get('step'), message=record.get('message'),
+                        pid=record.get('pid', job['pid']), host=record.get('host', job['host']),
+                    )
+                elif record['type'] == 'step':
+                    job['done_steps'].append(record['step'])
+                elif record['type'] == 'frame':
+                    job['frames_done'].setdefault(record['frame'], set()).add(record.get('camera'))
+
+        result = list(jobs.values())
+        _replay_cache[self.path] = (key, result)
+        return result
+
+    def job(self, job_id):
+        """Returns the job dict, or None."""
+        return next((job for job in self.jobs() if job['id'] == job_id), None)
+
+    def recover(self):
+        """
+        Requeues jobs left RUNNING by a process that no longer exists on this host.
+
+        Returns:
+            int: Jobs requeued
+        """
+        host = socket.gethostname()
+        requeued = 0
+        for job in self.jobs():
+            if job['status'] == JOB_RUNNING and job['host'] == host and not _process_alive(job['pid']):
+                self.set_status(job['id'], JOB_QUEUED, step=job['step'], message="Interrupted, requeued")
+                requeued += 1
+        return requeued
+
+
+def is_stale(job):
+    """Whether a RUNNING job's process has died (only known on its own host)."""
+    return (job['status'] == JOB_RUNNING and job['host'] == socket.gethostname()
+            and not _process_alive(job['pid']))
+
+
+def remaining_steps(job):
+    """Steps of the job that have not finished, in order."""
+    return [step for step in job['steps'] if step not in job['done_steps']]
+
+
+def resume_frames(job, frame_start, frame_end, renders_per_frame=1):
+    """
+    Frame range left to render after an interruption.
+
+    Frames are rendered in order, so the render resumes at the first frame
+    with fewer than `renders_per_frame` distinct cameras recorded (e.g. 2
+    for VR180, one per eye).
+
+    Returns:
+        tuple: (start, end), or None if every frame is done
+    """
+    done = job['frames_done']
+    for frame in range(frame_start, frame_end + 1):
+        if len(done.get(frame, ())) < renders_per_frame:
+            return frame, frame_end
+    return None
+
+
+def completed_steps(store, scene, draft=False):
+    """
+    Steps whose latest run for `scene` finished, for the panels.
+
+    Returns:
+        set: Step names, or None if no job of `scene` is recorded yet (e.g.
+            output rendered before the store existed)
+    """
+    latest = {}
+    for job in store.jobs():
+        if job['scene'] != scene or job.get('draft', False) != draft:
+            continue
+        for step in job['steps']:
+            latest[step] = job
+    if not latest:
+        return None
+    return {step for step, job in latest.items() if step in job['done_steps']}
+
+
+def queue_summary(store):
+    """
+    Counts jobs by status for the panels; stale RUNNING jobs count as 'INTERRUPTED'.
+
+    Returns:
+        dict: Status -> count, plus 'running' (the live RUNNING job or None)
+    """
+    summary = {JOB_QUEUED: 0, JOB_RUNNING: 0, JOB_DONE: 0, JOB_FAILED: 0, 'INTERRUPTED': 0, 'running': None}
+    for job in store.jobs():
+        if is_stale(job):
+            summary['INTERRUPTED'] += 1
+            continue
+        summary[job['status']] += 1
+        if job['status'] == JOB_RUNNING:
+            summary['running'] = job
+    return summary
+
+
+def queue_status_lines(store):
+    """
+    Queue status for the panels.
+
+    Returns:
+        list: (text, icon) tuples, empty when nothing is queued or running
+            and the last finished job succeeded
+    """
+    summary = queue_summary(store)
+    lines = []
+    running = summary['running']
+    if running is not None:
+        text = f"Running: {running['step'] or ', '.join(remaining_steps(running))}"
+        if running['frames_done']:
+            text += f" ({len(running['frames_done'])} frames done)"
+        lines.append((text, 'RENDER_ANIMATION'))
+    if summary[JOB_QUEUED]:
+        lines.append((f"Queued: {summary[JOB_QUEUED]}", 'SORTTIME'))
+    if summary['INTERRUPTED']:
+        lines.append((f"Interrupted: {summary['INTERRUPTED']}", 'ERROR'))
+    # Older failures were followed by other runs, only the latest one matters
+    finished = [job for job in store.jobs() if job['status'] in (JOB_DONE, JOB_FAILED)]
+    last = max(finished, key=lambda job: job['updated'], default=None)
+    if last is not None and last['status'] == JOB_FAILED:
+        lines.append((f"Failed: {last['step'] or ', '.join(last['steps'])}: {last['message']}", 'CANCEL'))
+    return lines
+
+
+@contextmanager
+def track_step(store, rig, scene, step, blend="", draft=False, frames=None):
+    """
+    Records one step run (e.g. an operator) as a job: RUNNING while the body
+    runs, then DONE, or FAILED with the exception message.
+
+    Yields:
+        str: Job id
+    """
+    job_id = store.add(rig, scene, [step], frames=frames, blend=blend, draft=draft, status=JOB_RUNNING)
+    start = time.perf_counter()
+    try:
+        yield job_id
+    except BaseException as e:
+        store.set_status(job_id, JOB_FAILED, step=step, message=str(e) or type(e).__name__)
+        raise
+    store.step_done(job_id, step, time.perf_counter() - start)
+    store.set_status(job_id, JOB_DONE)
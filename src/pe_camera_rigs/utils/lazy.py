@@ -0,0 +1,51 @@
+"""
+Deferred imports for the modules behind the operators.
+
+The addon registers its operators, panels and property groups at every
+Blender startup, render nodes included, but the node builders, pipelines
+and NumPy/OpenImageIO code they call are only needed once an operator
+runs. Modules on the registration path (operators, panels, properties and
+the utils they import for enum items) take handles from lazy_import()
+instead of `from x import y`, so their imports cost a module lookup and
+the real import happens on the first attribute access.
+"""
+
+import importlib.util
+import sys
+
+
+def lazy_import(name, package=None):
+    """
+    Returns module `name`, executed on the first attribute access.
+
+    Modules that are already imported are returned as is. Only attribute
+    access defers the import: `from x import y` on the returned module, or
+    passing it to code that inspects it, loads it immediately.
+
+    Args:
+        name (str): Module name, relative names resolved against `package`
+        package (str, optional): `__package__` of the caller for relative names
+
+    Returns:
+        module: The module, or a lazy module that loads itself when used
+
+    Raises:
+        ModuleNotFoundError: If the module does not exist
+    """
+    name = importlib.util.resolve_name(name, package)
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+    spec.loader = importlib.util.LazyLoader(spec.loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+
+    # Like a regular import, bind the submodule on its package
+    parent, _, child = name.rpartition(".")
+    if parent:
+        setattr(sys.modules[parent], child, module)
+    return module
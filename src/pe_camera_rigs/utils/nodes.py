@@ -1,5 +1,6 @@
 import bpy
 import math
+from .rig_math import ISOMETRIC_PRESET_ANGLES
 
 def create_orbit_camera_node_group():
     """
@@ -395,47 +396,26 @@ def create_isometric_camera_node_group():
     # === PRESET ANGLE DEFINITIONS ===
     # Define rotation vectors for each projection type (Rotation Z, Tilt X, Roll Y)
 
-    # GAME_2_1: 26.565° tilt, 45° rotation
-    game_2_1_vec = nodes.new('ShaderNodeCombineXYZ')
-    game_2_1_vec.location = (-600, 600)
-    game_2_1_vec.inputs[0].default_value = math.radians(26.565)  # Tilt X
-    game_2_1_vec.inputs[1].default_value = 0.0  # Roll Y
-    game_2_1_vec.inputs[2].default_value = math.radians(45.0)  # Rotation Z
+    # Angles come from rig_math so the GN tree and the NumPy evaluator agree
+    def preset_vector(preset, location):
+        vec = nodes.new('ShaderNodeCombineXYZ')
+        vec.location = location
+        for axis, angle in enumerate(ISOMETRIC_PRESET_ANGLES[preset]):
+            vec.inputs[axis].default_value = angle
+        return vec
 
+    # GAME_2_1: 26.565° tilt, 45° rotation
+    game_2_1_vec = preset_vector('GAME_2_1', (-600, 600))
     # GAME_4_3: 30° tilt, 45° rotation
-    game_4_3_vec = nodes.new('ShaderNodeCombineXYZ')
-    game_4_3_vec.location = (-600, 450)
-    game_4_3_vec.inputs[0].default_value = math.radians(30.0)
-    game_4_3_vec.inputs[1].default_value = 0.0
-    game_4_3_vec.inputs[2].default_value = math.radians(45.0)
-
+    game_4_3_vec = preset_vector('GAME_4_3', (-600, 450))
     # TRUE_ISOMETRIC: arctan(sin(45°)) = 35.264° tilt, 45° rotation
-    true_iso_vec = nodes.new('ShaderNodeCombineXYZ')
-    true_iso_vec.location = (-600, 300)
-    true_iso_vec.inputs[0].default_value = math.radians(35.264)
-    true_iso_vec.inputs[1].default_value = 0.0
-    true_iso_vec.inputs[2].default_value = math.radians(45.0)
-
+    true_iso_vec = preset_vector('TRUE_ISOMETRIC', (-600, 300))
     # DIMETRIC: 30° tilt, 45° rotation
-    dimetric_vec = nodes.new('ShaderNodeCombineXYZ')
-    dimetric_vec.location = (-600, 150)
-    dimetric_vec.inputs[0].default_value = math.radians(30.0)
-    dimetric_vec.inputs[1].default_value = 0.0
-    dimetric_vec.inputs[2].default_value = math.radians(45.0)
-
+    dimetric_vec = preset_vector('DIMETRIC', (-600, 150))
     # MILITARY: 90° tilt (top-down), 0° rotation
-    military_vec = nodes.new('ShaderNodeCombineXYZ')
-    military_vec.location = (-600, 0)
-    military_vec.inputs[0].default_value = math.radians(90.0)
-    military_vec.inputs[1].default_value = 0.0
-    military_vec.inputs[2].default_value = 0.0
-
+    military_vec = preset_vector('MILITARY', (-600, 0))
     # CAVALIER: 0° tilt, 45° rotation
-    cavalier_vec = nodes.new('ShaderNodeCombineXYZ')
-    cavalier_vec.location = (-600, -150)
-    cavalier_vec.inputs[0].default_value = 0.0
-    cavalier_vec.inputs[1].default_value = 0.0
-    cavalier_vec.inputs[2].default_value = math.radians(45.0)
+    cavalier_vec = preset_vector('CAVALIER', (-600, -150))
 
     # CUSTOM: Use custom angle inputs
     custom_vec = nodes.new('ShaderNodeCombineXYZ')
@@ -0,0 +1,367 @@
+"""
+Render settings helpers and the trial-render estimator.
+
+Shared by the VR workflows: quality presets, saving/restoring the render
+settings an operator changes, and extrapolating time, disk usage and
+memory of a full sequence from a few small stratified renders.
+"""
+
+import logging
+import os
+import re
+import tempfile
+import time
+from contextlib import contextmanager
+from functools import reduce
+from pathlib import Path
+
+import bpy
+
+from .lazy import lazy_import
+
+# Only the estimator needs NumPy; the enum items below are imported at registration
+np = lazy_import("numpy")
+
+logger = logging.getLogger(__name__)
+
+# Cycles samples of the render_quality presets
+RENDER_QUALITY_SAMPLES = {
+    'PREVIEW': 256,
+    'PRODUCTION': 512,
+    'FINAL': 1024,
+}
+
+# Guided denoising (albedo + normal) reaches the same quality with a quarter of the samples
+DENOISED_QUALITY_SAMPLES = {
+    'PREVIEW': 64,
+    'PRODUCTION': 128,
+    'FINAL': 256,
+}
+
+# denoise_mode of the VR sequence renders
+DENOISE_MODE_ITEMS = [
+    ('RENDER', "In Render (OIDN)",
+     "Cycles denoises every frame with OpenImageDenoise, guided by albedo and normal passes"),
+    ('COMPOSITOR', "Compositor (Guided)",
+     "Write albedo and normal passes to multilayer EXRs; the compositor Denoise node uses them"),
+    ('NONE', "None", "No denoising, full preset samples"),
+]
+
+# Intermediate EXR storage of the VR sequences (image_settings identifiers).
+# The sequences only feed an 8-bit video, so half float RGB loses nothing
+# visible and writes and reads 2-2.7x fewer bytes than full float RGBA.
+EXR_DEPTH_ITEMS = [
+    ('16', "Half Float", "16-bit float, plenty for an 8/10-bit video"),
+    ('32', "Full Float", "32-bit float, for grading or reuse outside the encode"),
+]
+EXR_COLOR_MODE_ITEMS = [
+    ('RGB', "RGB", "Color only; the VR encodes never use alpha"),
+    ('RGBA', "RGBA", "Keep the alpha channel"),
+]
+EXR_CODEC_ITEMS = [
+    ('DWAA', "DWAA", "Lossy, smallest files, fast to decode"),
+    ('ZIP', "ZIP", "Lossless, 16-scanline blocks"),
+    ('PIZ', "PIZ", "Lossless wavelet, good on noisy renders"),
+    ('NONE', "None", "Uncompressed; fastest on local NVMe, largest files"),
+]
+
+# Raw frame cache formats (utils/frame_cache.py CACHE_FORMATS)
+FRAME_CACHE_FORMAT_ITEMS = [
+    ('UINT16', "16-bit sRGB", "Display-encoded frames piped to ffmpeg without any conversion"),
+    ('HALF', "Half Float (Linear)", "Linear frames that keep HDR values; converted to 8-bit sRGB when encoded"),
+]
+
+# Scene settings the render operators change, as paths relative to the scene
+RENDER_SETTINGS_PATHS = (
+    "render.engine",
+    "render.filepath",
+    "render.resolution_x",
+    "render.resolution_y",
+    "render.resolution_percentage",
+    "render.image_settings.file_format",
+    "render.image_settings.color_mode",
+    "render.image_settings.color_depth",
+    "render.image_settings.exr_codec",
+    "cycles.samples",
+    "cycles.use_denoising",
+    "cycles.denoiser",
+    "cycles.denoising_input_passes",
+    "cycles.denoising_prefilter",
+    "view_layers.cycles.denoising_store_passes",
+    "camera",
+)
+
+# Paths starting with this are read and written on every view layer
+VIEW_LAYERS_PREFIX = "view_layers."
+
+# Render result + Cycles film buffers, bytes per pixel (RGBA float, x2)
+FILM_BYTES_PER_PIXEL = 32
+
+# "Peak:123.45M" (Cycles) or "Peak 123.45M" in the render stats line
+PEAK_MEMORY_PATTERN = re.compile(r"Peak[:\s]+([\d.]+)\s*([KMG])", re.IGNORECASE)
+MEMORY_UNITS_MB = {'K': 1 / 1024, 'M': 1.0, 'G': 1024.0}
+
+
+def snapshot_render_settings(scene, paths=RENDER_SETTINGS_PATHS):
+    """
+    Saves scene settings so an operator can restore them afterwards.
+
+    Args:
+        scene (bpy.types.Scene): Scene to read
+        paths (tuple): Dotted attribute paths relative to the scene;
+            "view_layers.<path>" is read on every view layer
+
+    Returns:
+        dict: Path -> value (view layer name -> value for view layer paths)
+    """
+    snapshot = {}
+    for path in paths:
+        if path.startswith(VIEW_LAYERS_PREFIX):
+            layer_path = path[len(VIEW_LAYERS_PREFIX):].split(".")
+            snapshot[path] = {layer.name: reduce(getattr, layer_path, layer) for layer in scene.view_layers}
+        else:
+            snapshot[path] = reduce(getattr, path.split("."), scene)
+    return snapshot
+
+
+def _set_path(owner, path, value):
+    *owner_path, attr = path.split(".")
+    setattr(reduce(getattr, owner_path, owner), attr, value)
+
+
+def restore_render_settings(scene, snapshot):
+    """Restores settings saved by snapshot_render_settings()."""
+    for path, value in snapshot.items():
+        if path.startswith(VIEW_LAYERS_PREFIX):
+            for name, layer_value in value.items():
+                layer = scene.view_layers.get(name)
+                if layer is not None:
+                    _set_path(layer, path[len(VIEW_LAYERS_PREFIX):], layer_value)
+        else:
+            _set_path(scene, path, value)
+
+
+def apply_render_quality(scene, quality, denoised=False):
+    """Sets Cycles samples from a render_quality preset identifier (fewer when denoised)."""
+    samples = DENOISED_QUALITY_SAMPLES if denoised else RENDER_QUALITY_SAMPLES
+    scene.cycles.samples = samples.get(quality, samples['PRODUCTION'])
+
+
+def apply_denoise_mode(scene, mode):
+    """
+    Configures Cycles denoising for a DENOISE_MODE_ITEMS identifier.
+
+    'RENDER' enables OpenImageDenoise with albedo + normal guides. 'COMPOSITOR'
+    stores the Denoising Data passes on every view layer and switches the
+    output to multilayer EXR, so the passes reach the compositor. 'NONE'
+    turns both off.
+    """
+    cycles = scene.cycles
+    cycles.use_denoising = mode == 'RENDER'
+    if mode == 'RENDER':
+        cycles.denoiser = 'OPENIMAGEDENOISE'
+        cycles.denoising_input_passes = 'RGB_ALBEDO_NORMAL'
+        cycles.denoising_prefilter = 'ACCURATE'
+
+    for layer in scene.view_layers:
+        layer.cycles.denoising_store_passes = mode == 'COMPOSITOR'
+    if mode == 'COMPOSITOR':
+        scene.render.image_settings.file_format = 'OPEN_EXR_MULTILAYER'
+
+
+def denoised_output(nodes, links, image_node, location):
+    """
+    Returns the compositor socket carrying the denoised image of `image_node`.
+
+    Adds a Denoise node guided by the image's Denoising Albedo/Normal passes
+    (written by denoise_mode 'COMPOSITOR'). Without those passes the image is
+    denoised unguided, which smears fine texture, and a warning is logged.
+    """
+    denoise = nodes.new('CompositorNodeDenoise')
+    denoise.location = location
+    denoise.use_hdr = True
+    denoise.prefilter = 'ACCURATE'
+    links.new(image_node.outputs['Image'], denoise.inputs['Image'])
+
+    albedo = image_node.outputs.get('Denoising Albedo')
+    normal = image_node.outputs.get('Denoising Normal')
+    if albedo is None or normal is None:
+        logger.warning("%s has no denoising passes, denoising unguided", image_node.image.name)
+    else:
+        links.new(albedo, denoise.inputs['Albedo'])
+        links.new(normal, denoise.inputs['Normal'])
+    return denoise.outputs['Image']
+
+
+def apply_exr_storage(scene, color_depth='16', color_mode='RGB', codec='DWAA'):
+    """Sets the scene's EXR bit depth, channels and codec (EXR_*_ITEMS identifiers)."""
+    image_settings = scene.render.image_settings
+    image_settings.color_depth = color_depth
+    image_settings.color_mode = color_mode
+    image_settings.exr_codec = codec
+
+
+@contextmanager
+def frame_written_callback(scene, on_frame):
+    """
+    Calls on_frame(frame) after each frame of `scene` is written, while the block runs.
+
+    Uses the render_write handler, which fires once all views of a frame
+    are on disk. Does nothing when on_frame is None.
+    """
+    if on_frame is None:
+        yield
+        return
+
+    def on_write(render_scene, *_):
+        if render_scene.name == scene.name:
+            on_frame(render_scene.frame_current)
+
+    bpy.app.handlers.render_write.append(on_write)
+    try:
+        yield
+    finally:
+        bpy.app.handlers.render_write.remove(on_write)
+
+
+def stratified_frames(frame_start, frame_end, count):
+    """
+    Picks frames spread over a range: the middle frame of `count` equal strata.
+
+    Returns:
+        list: Unique frame numbers in ascending order
+    """
+    total = frame_end - frame_start + 1
+    count = max(1, min(count, total))
+    centers = frame_start + (np.arange(count) + 0.5) * total / count
+    return sorted({int(f) for f in np.floor(centers)})
+
+
+def format_duration(seconds):
+    """Formats seconds as e.g. '2h 05m' or '3m 20s'."""
+    seconds = int(round(seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    if hours:
+        return f"{hours}h {minutes:02d}m"
+    if minutes:
+        return f"{minutes}m {secs:02d}s"
+    return f"{secs}s"
+
+
+def _render_trial(scene, filepath):
+    """Renders one still, returns (seconds, file size in bytes)."""
+    scene.render.filepath = filepath
+    start = time.perf_counter()
+    bpy.ops.render.render(write_still=True, scene=scene.name)
+    seconds = time.perf_counter() - start
+
+    written = Path(filepath + scene.render.file_extension)
+    size = written.stat().st_size if written.exists() else 0
+    logger.debug("Trial %s: %.2fs, %d bytes", written.name, seconds, size)
+    return seconds, size
+
+
+def estimate_sequence(scene, cameras, frame_start, frame_end, frame_count=5,
+                      resolution_scale=0.25, sample_scale=0.125):
+    """
+    Estimates a full sequence render from a few reduced trial renders.
+
+    The scene must already be configured like the real render (resolution,
+    samples, output format). Trial frames are spread over the range with
+    stratified_frames() and rendered per camera at reduced resolution and
+    samples. One extra 1-sample render measures the fixed per-frame cost
+    (sync, BVH, file output), which does not scale with pixels x samples.
+
+    Args:
+        scene (bpy.types.Scene): Configured scene
+        cameras (list): Camera objects rendered per frame (both eyes for VR180)
+        frame_start (int): First frame of the sequence
+        frame_end (int): Last frame of the sequence
+        frame_count (int): Number of trial frames
+        resolution_scale (float): Trial resolution as a fraction of the full one
+        sample_scale (float): Trial samples as a fraction of the full ones
+
+    Returns:
+        dict: Estimate with 'total_seconds', 'seconds_per_frame',
+            'bytes_per_frame', 'total_bytes', 'peak_memory_mb' (None when
+            Blender reported no memory stats) and the trial details
+    """
+    render = scene.render
+    full_samples = scene.cycles.samples
+    full_percentage = render.resolution_percentage
+    full_pixels = render.resolution_x * render.resolution_y * (full_percentage / 100) ** 2
+
+    trial_percentage = max(1, int(round(full_percentage * resolution_scale)))
+    trial_samples = max(1, int(round(full_samples * sample_scale)))
+    trial_pixels = render.resolution_x * render.resolution_y * (trial_percentage / 100) ** 2
+    work_ratio = (full_pixels * full_samples) / (trial_pixels * trial_samples)
+    pixel_ratio = full_pixels / trial_pixels
+
+    frames = stratified_frames(frame_start, frame_end, frame_count)
+    sequence_frames = frame_end - frame_start + 1
+    original_frame = scene.frame_current
+    peaks = []
+
+    def on_render_stats(stats):
+        match = PEAK_MEMORY_PATTERN.search(stats)
+        if match:
+            peaks.append(float(match.group(1)) * MEMORY_UNITS_MB[match.group(2).upper()])
+
+    bpy.app.handlers.render_stats.append(on_render_stats)
+    trials = []
+    try:
+        with tempfile.TemporaryDirectory(prefix="pe_estimate_") as tmp:
+            render.resolution_percentage = trial_percentage
+
+            # Fixed per-frame overhead: same frame and size, a single sample
+            scene.frame_set(frames[0])
+            scene.camera = cameras[0]
+            scene.cycles.samples = 1
+            fixed_seconds, _ = _render_trial(scene, os.path.join(tmp, "overhead"))
+
+            scene.cycles.samples = trial_samples
+            for frame in frames:
+                scene.frame_set(frame)
+                for camera in cameras:
+                    scene.camera = camera
+                    seconds, size = _render_trial(scene, os.path.join(tmp, f"{camera.name}_{frame:05d}"))
+                    trials.append({'frame': frame, 'camera': camera.name, 'seconds': seconds, 'bytes': size})
+    finally:
+        bpy.app.handlers.render_stats.remove(on_render_stats)
+        scene.frame_set(original_frame)
+        render.resolution_percentage = full_percentage
+        scene.cycles.samples = full_samples
+
+    trial_seconds = np.array([t['seconds'] for t in trials])
+    trial_bytes = np.array([t['bytes'] for t in trials], dtype=np.float64)
+    trace_seconds = np.maximum(trial_seconds - fixed_seconds, 0.0)
+    image_seconds = fixed_seconds + trace_seconds * work_ratio
+
+    # One sequence frame renders every camera
+    seconds_per_frame = float(image_seconds.mean()) * len(cameras)
+    bytes_per_frame = float(trial_bytes.mean()) * pixel_ratio * len(cameras)
+
+    peak_memory_mb = None
+    if peaks:
+        film_mb = (full_pixels - trial_pixels) * FILM_BYTES_PER_PIXEL / (1024 * 1024)
+        peak_memory_mb = max(peaks) + film_mb
+
+    return {
+        'frames': sequence_frames,
+        'cameras': [camera.name for camera in cameras],
+        'seconds_per_frame': seconds_per_frame,
+        'max_seconds_per_frame': float(image_seconds.max()) * len(cameras),
+        'total_seconds': seconds_per_frame * sequence_frames,
+        'bytes_per_frame': bytes_per_frame,
+        'total_bytes': bytes_per_frame * sequence_frames,
+        'peak_memory_mb': peak_memory_mb,
+        'trial': {
+            'frames': frames,
+            'resolution_percentage': trial_percentage,
+            'samples': trial_samples,
+            'full_samples': full_samples,
+            'fixed_seconds': fixed_seconds,
+            'renders': trials,
+        },
+    }
@@ -0,0 +1,507 @@
+"""
+Content-hash render cache: reuse frames whose evaluated scene is unchanged.
+
+Before each eye render, the evaluated scene is reduced to one digest: the
+render settings, the world, the active view layer, and for every object
+instance its world matrix, visibility settings, modifiers, materials and
+evaluated geometry, plus the eye camera. Rendered EXRs are hard-linked into
+a content-addressed store (`<output_path>/render_cache/<digest>.exr`); a
+later render with the same digest links the stored file into place instead
+of rendering. Tweaking one light or a camera path stretch therefore only
+re-renders the frames it changes, and identical frames (a static hold)
+render once.
+
+Datablocks without animation are hashed once per run, geometry once per
+run for objects without modifiers or deforming parents, so hashing costs
+milliseconds next to a VR render. Whatever cannot be hashed reliably makes
+the frame uncacheable and it renders as usual:
+
+- motion blur (the image depends on the neighbouring frames)
+- particle systems, hair curves, point clouds, volumes and grease pencil
+- images with unsaved edits
+- several rendered view layers, or a rendered view layer that is not the
+  active one (only that one is evaluated here)
+- animated objects that render but are hidden in the viewport (the
+  viewport depsgraph does not evaluate them)
+
+The scene is read from the viewport depsgraph, so render-only differences
+in geometry (the 'Is Viewport' node) go unnoticed; modifier render levels
+are part of the digest.
+"""
+
+import hashlib
+import logging
+import os
+import shutil
+from pathlib import Path
+
+import bpy
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+RENDER_CACHE_DIR_NAME = "render_cache"
+
+# Nested (non-ID) structs followed when hashing RNA properties
+MAX_RNA_DEPTH = 3
+
+# Runtime and bookkeeping properties of datablocks that never change the image
+RUNTIME_PROPS = frozenset({
+    'rna_type', 'session_uid', 'users', 'is_evaluated', 'original', 'tag', 'is_runtime_data',
+    'use_fake_user', 'use_extra_user', 'preview', 'is_library_indirect', 'library_weak_reference',
+    'asset_data', 'override_library', 'is_editmode', 'is_missing', 'is_embedded_data', 'id_type',
+    'mode', 'motion_path', 'is_from_instancer', 'is_from_set', 'active_material_index',
+    'active_shape_key_index', 'hide_viewport', 'hide_select', 'display_type', 'display_bounds_type',
+    'empty_display_type', 'empty_display_size', 'view_center', 'filepath', 'depsgraph',
+    'active_layer_collection', 'active_aov', 'active_aov_index', 'active_lightgroup',
+    'active_lightgroup_index',
+})
+
+# Node editor layout
+NODE_UI_PROPS = RUNTIME_PROPS | frozenset({
+    'location', 'location_absolute', 'width', 'width_hidden', 'height', 'dimensions', 'select',
+    'hide', 'label', 'use_custom_color', 'color', 'parent', 'name',
+})
+
+# Object types drawn from their evaluated mesh
+MESH_TYPES = ('MESH', 'CURVE', 'SURFACE', 'FONT', 'META')
+
+# Object types that render geometry this module cannot hash
+UNHASHABLE_TYPES = ('CURVES', 'POINTCLOUD', 'VOLUME', 'GPENCIL', 'GREASEPENCIL')
+
+# Parent types that deform the child's geometry without a modifier
+DEFORMING_PARENTS = ('ARMATURE', 'LATTICE', 'CURVE')
+
+# Attribute data_type -> (foreach_get key, values per element, dtype)
+ATTRIBUTE_ARRAYS = {
+    'FLOAT': ('value', 1, np.float32),
+    'INT': ('value', 1, np.int32),
+    'INT8': ('value', 1, np.int32),
+    'BOOLEAN': ('value', 1, np.bool_),
+    'FLOAT2': ('vector', 2, np.float32),
+    'INT32_2D': ('value', 2, np.int32),
+    'FLOAT_VECTOR': ('vector', 3, np.float32),
+    'FLOAT_COLOR': ('color', 4, np.float32),
+    'BYTE_COLOR': ('color', 4, np.float32),
+    'QUATERNION': ('value', 4, np.float32),
+    'FLOAT4X4': ('value', 16, np.float32),
+}
+
+
+class Uncacheable(Exception):
+    """The frame depends on state the digest cannot capture."""
+
+
+def _plain(value):
+    """RNA values (arrays, matrices, enum sets, IDs) as hashable plain Python values."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, bpy.types.ID):
+        return value.name_full
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(value))
+    try:
+        return tuple(_plain(item) for item in value)
+    except TypeError:
+        return str(value)
+
+
+def _is_animated(id_data):
+    """Whether an action, NLA track or driver can change the datablock between frames."""
+    anim = getattr(id_data, 'animation_data', None)
+    return anim is not None and (anim.action is not None or len(anim.nla_tracks) > 0 or len(anim.drivers) > 0)
+
+
+def _custom_props(id_data):
+    """ID properties, e.g. Geometry Nodes modifier inputs or values read by Attribute nodes."""
+    items = []
+    for key in sorted(id_data.keys()):
+        value = id_data[key]
+        if hasattr(value, 'to_dict'):
+            value = value.to_dict()
+        elif hasattr(value, 'to_list'):
+            value = value.to_list()
+        items.append((key, repr(value)))
+    return items
+
+
+def _digest(*parts):
+    return hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+
+
+def _hash_array(h, collection, key, width, dtype):
+    values = np.empty(len(collection) * width, dtype=dtype)
+    collection.foreach_get(key, values)
+    h.update(values.tobytes())
+
+
+def mesh_digest(mesh):
+    """
+    Digest of a mesh's topology, attributes (positions, UVs, colors...) and materials.
+
+    Raises:
+        Uncacheable: If the mesh has an attribute type without a known layout
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr((len(mesh.vertices), len(mesh.edges), len(mesh.polygons), len(mesh.loops))).encode())
+    _hash_array(h, mesh.edges, 'vertices', 2, np.int32)
+    _hash_array(h, mesh.loops, 'vertex_index', 1, np.int32)
+    _hash_array(h, mesh.polygons, 'loop_start', 1, np.int32)
+    for attribute in sorted(mesh.attributes, key=lambda attribute: attribute.name):
+        # '.select_vert' and friends are edit state; topology is hashed above
+        if attribute.name.startswith("."):
+            continue
+        layout = ATTRIBUTE_ARRAYS.get(attribute.data_type)
+        if layout is None:
+            raise Uncacheable(f"mesh '{mesh.name}' has a {attribute.data_type} attribute")
+        h.update(repr((attribute.name, attribute.data_type, attribute.domain)).encode())
+        _hash_array(h, attribute.data, *layout)
+    # Custom normals (Blender 4.1+)
+    if hasattr(mesh, 'corner_normals'):
+        _hash_array(h, mesh.corner_normals, 'vector', 3, np.float32)
+    h.update(repr([material.name_full if material else None for material in mesh.materials]).encode())
+    return h.hexdigest()
+
+
+class RenderCache:
+    """
+    Content-addressed store of rendered frames.
+
+    Args:
+        folder (str | Path): Store folder, on the same file system as the
+            sequences so frames can be hard-linked
+        scene (bpy.types.Scene): Scene being rendered
+    """
+
+    def __init__(self, folder, scene):
+        self.folder = Path(folder)
+        self.scene = scene
+        self.reused = 0
+        self.rendered = 0
+        self.uncacheable = 0
+        # Set once a file system refuses hard links; stored copies then
+        # look unreferenced, so prune() leaves the store alone
+        self.copied = False
+        self._ids = {}
+        self._geometry = {}
+        self._frame = None
+        self._frame_ids = {}
+        self._reasons = set()
+
+    # -- Digests --
+
+    def _rna_items(self, struct, skip, varies, depth=0):
+        items = []
+        for prop in struct.bl_rna.properties:
+            name = prop.identifier
+            if name in skip or name.startswith("show_"):
+                continue
+            try:
+                value = getattr(struct, name)
+            except AttributeError:
+                continue
+            if prop.type == 'COLLECTION':
+                continue
+            if prop.type == 'POINTER':
+                if value is None:
+                    items.append((name, None))
+                elif isinstance(value, bpy.types.ID):
+                    items.append((name, self._ref(value, varies)))
+                elif depth < MAX_RNA_DEPTH:
+                    items.append((name, self._rna_items(value, skip, varies, depth + 1)))
+                continue
+            items.append((name, _plain(value)))
+        return items
+
+    def _ref(self, id_data, varies):
+        """A referenced datablock: its digest for look-affecting types, else its name."""
+        if isinstance(id_data, (bpy.types.Material, bpy.types.NodeTree, bpy.types.Image, bpy.types.Light,
+                                bpy.types.Camera, bpy.types.World, bpy.types.Texture)):
+            digest, id_varies = self.id_digest(id_data)
+            if id_varies:
+                varies.append(id_data.name_full)
+            return id_data.name_full, digest
+        if isinstance(id_data, bpy.types.Collection):
+            # Light linking and holdout collections act through their members
+            return id_data.name_full, tuple(sorted(obj.name_full for obj in id_data.all_objects))
+        return id_data.name_full
+
+    def id_digest(self, id_data):
+        """
+        Digest of a material, node tree, image, light, camera, world or texture.
+
+        Returns:
+            tuple: (digest, varies); varies means it can change between frames,
+                so it is not reused for the next frame
+        """
+        # Not the name: every material's embedded tree is called 'Shader Nodetree'
+        key = id_data.original.session_uid
+        cached = self._ids.get(key) or self._frame_ids.get(key)
+        if cached is not None:
+            return cached
+
+        varies = []
+        if _is_animated(id_data):
+            varies.append(id_data.name_full)
+        if isinstance(id_data, bpy.types.Image):
+            items = self._image_items(id_data, varies)
+        else:
+            items = self._rna_items(id_data, RUNTIME_PROPS, varies)
+            items.append(_custom_props(id_data))
+            if isinstance(id_data, bpy.types.NodeTree):
+                items.append(self._tree_items(id_data, varies))
+
+        result = (_digest(type(id_data).__name__, items), bool(varies))
+        (self._frame_ids if varies else self._ids)[key] = result
+        return result
+
+    def _tree_items(self, tree, varies):
+        nodes = []
+        for node in sorted(tree.nodes, key=lambda node: node.name):
+            sockets = [
+                (socket.identifier, socket.enabled, _plain(getattr(socket, 'default_value', None)))
+                for socket in (*node.inputs, *node.outputs)
+            ]
+            nodes.append((node.name, node.bl_idname, self._rna_items(node, NODE_UI_PROPS, varies), sockets))
+        links = sorted(
+            (link.from_node.name, link.from_socket.identifier, link.to_node.name,
+             link.to_socket.identifier, link.is_muted)
+            for link in tree.links
+        )
+        return nodes, links
+
+    def _image_items(self, image, varies):
+        if image.is_dirty:
+            raise Uncacheable(f"image '{image.name}' has unsaved changes")
+        path = bpy.path.abspath(image.filepath, library=image.library)
+        try:
+            stat = os.stat(path)
+            file_state = (stat.st_size, stat.st_mtime_ns)
+        except OSError:
+            file_state = None
+        items = [
+            image.filepath, image.source, image.colorspace_settings.name, image.alpha_mode,
+            image.use_half_precision, image.use_view_as_render, file_state,
+            image.packed_file.size if image.packed_file else None,
+        ]
+        if image.source == 'GENERATED':
+            items += [image.generated_type, tuple(image.generated_color), image.generated_width,
+                      image.generated_height, image.use_generated_float]
+        if image.source in ('SEQUENCE', 'MOVIE'):
+            # The node's image user picks the frame; the scene frame moves it
+            items.append(self.scene.frame_current)
+            varies.append(image.name_full)
+        return items
+
+    def _object_digest(self, obj, is_instance):
+        """Digest of an evaluated object: settings, modifiers, materials and geometry."""
+        varies = []
+        items = [obj.type, self._rna_items(obj, RUNTIME_PROPS, varies), _custom_props(obj)]
+        items.append([
+            (modifier.name, self._rna_items(modifier, RUNTIME_PROPS, varies), _custom_props(modifier))
+            for modifier in obj.modifiers
+        ])
+        items.append([
+            (slot.link, self._ref(slot.material, varies) if slot.material else None)
+            for slot in obj.material_slots
+        ])
+        if len(obj.particle_systems) > 0:
+            raise Uncacheable(f"'{obj.name}' has particle systems")
+        if obj.type in UNHASHABLE_TYPES:
+            raise Uncacheable(f"'{obj.name}' is a {obj.type.lower()} object")
+        if obj.type in MESH_TYPES:
+            items.append(self._geometry_digest(obj, is_instance))
+        return _digest(items)
+
+    def _geometry_digest(self, obj, is_instance):
+        if obj.type == 'MESH':
+            mesh = obj.data
+            static = (not is_instance and len(obj.modifiers) == 0 and mesh.shape_keys is None
+                      and obj.parent_type not in DEFORMING_PARENTS and not _is_animated(mesh.original))
+            if static:
+                key = mesh.original.session_uid
+                if key not in self._geometry:
+                    self._geometry[key] = mesh_digest(mesh)
+                return self._geometry[key]
+            return mesh_digest(mesh)
+        if is_instance:
+            raise Uncacheable(f"'{obj.name}' instances {obj.type.lower()} geometry")
+        mesh = obj.to_mesh()
+        try:
+            return mesh_digest(mesh) if mesh is not None else None
+        finally:
+            obj.to_mesh_clear()
+
+    def _scene_items(self, view_layer):
+        scene = self.scene
+        varies = []
+        items = [
+            bpy.app.version_string,
+            self._rna_items(scene.render, RUNTIME_PROPS, varies),
+            self._rna_items(scene.cycles, RUNTIME_PROPS, varies),
+            self._rna_items(scene.view_settings, RUNTIME_PROPS, varies),
+            self._rna_items(scene.display_settings, RUNTIME_PROPS, varies),
+            self._rna_items(view_layer, RUNTIME_PROPS, varies),
+            self._layer_collection_items(view_layer.layer_collection),
+            self._ref(scene.world, varies) if scene.world else None,
+            self._ref(scene.node_tree, varies) if scene.use_nodes and scene.node_tree else None,
+        ]
+        # Frame-dependent noise or burnt-in frame numbers
+        if scene.cycles.use_animated_seed or scene.render.use_stamp:
+            items.append(scene.frame_current)
+        return items
+
+    def _layer_collection_items(self, layer_collection):
+        return (
+            layer_collection.name, layer_collection.exclude, layer_collection.holdout,
+            layer_collection.indirect_only,
+            [self._layer_collection_items(child) for child in layer_collection.children],
+        )
+
+    def _depsgraph(self):
+        """The evaluated depsgraph of the one rendered view layer."""
+        layers = [layer for layer in self.scene.view_layers if layer.use]
+        if len(layers) != 1:
+            raise Uncacheable("the scene renders several view layers")
+        if bpy.context.scene != self.scene or bpy.context.view_layer != layers[0]:
+            raise Uncacheable(f"view layer '{layers[0].name}' is not the active one")
+        return layers[0], bpy.context.evaluated_depsgraph_get()
+
+    def frame_digest(self):
+        """
+        Digest of the evaluated scene at the current frame, without the camera choice.
+
+        Raises:
+            Uncacheable: If the frame depends on state the digest cannot capture
+        """
+        scene = self.scene
+        if scene.render.use_motion_blur:
+            raise Uncacheable("motion blur is on")
+        view_layer, depsgraph = self._depsgraph()
+        self._frame_ids = {}
+
+        objects = {}
+        records = []
+        in_depsgraph = set()
+        for instance in depsgraph.object_instances:
+            obj = instance.object
+            is_instance = instance.is_instance
+            if is_instance:
+                key = (instance.parent.original.name_full, tuple(instance.persistent_id), obj.name_full)
+            else:
+                key = (obj.original.name_full,)
+                in_depsgraph.add(obj.original.name_full)
+            data_uid = obj.data.session_uid if obj.data is not None else None
+            object_key = (obj.name_full, is_instance, data_uid)
+            if object_key not in objects:
+                objects[object_key] = self._object_digest(obj, is_instance)
+            matrix = np.asarray(instance.matrix_world, dtype=np.float32).tobytes()
+            records.append((key, matrix, objects[object_key]))
+
+        # Objects hidden in the viewport still render, from their original data
+        for obj in view_layer.objects:
+            if obj.hide_render or obj.name_full in in_depsgraph:
+                continue
+            if _is_animated(obj) or obj.parent is not None or len(obj.constraints) > 0 \
+                    or len(obj.modifiers) > 0 or obj.instance_type != 'NONE':
+                raise Uncacheable(f"'{obj.name}' renders but is hidden in the viewport")
+            records.append(((obj.name_full,), np.asarray(obj.matrix_world, dtype=np.float32).tobytes(),
+                            self._object_digest(obj, False)))
+
+        records.sort(key=lambda record: record[0])
+        h = hashlib.blake2b(repr(self._scene_items(view_layer)).encode(), digest_size=16)
+        for key, matrix, digest in records:
+            h.update(repr((key, digest)).encode())
+            h.update(matrix)
+        return h.hexdigest()
+
+    def frame_key(self, camera):
+        """
+        Store key of the current frame seen through `camera`, or None if the
+        frame is uncacheable (the reason is logged once).
+        """
+        frame = self.scene.frame_current
+        if self._frame is None or self._frame[0] != frame:
+            try:
+                self._frame = (frame, self.frame_digest())
+            except Uncacheable as e:
+                self._frame = (frame, None)
+                if str(e) not in self._reasons:
+                    self._reasons.add(str(e))
+                    logger.warning("Render cache off for frame %d: %s", frame, e)
+        if self._frame[1] is None:
+            self.uncacheable += 1
+            return None
+        return _digest(self._frame[1], camera.name_full)
+
+    # -- Store --
+
+    def _entry(self, key, path):
+        return self.folder / f"{key}{Path(path).suffix}"
+
+    def _link(self, source, target):
+        target = Path(target)
+        # Per process, so workers storing the same frame never collide
+        temporary = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+        try:
+            os.link(source, temporary)
+        except OSError:
+            self.copied = True
+            shutil.copy2(source, temporary)
+        os.replace(temporary, target)
+
+    def reuse(self, key, path):
+        """
+        Puts the stored frame for `key` at `path`.
+
+        Returns:
+            bool: True if the frame was reused, False if it must be rendered
+        """
+        entry = self._entry(key, path)
+        if not entry.exists():
+            return False
+        if not (os.path.exists(path) and os.path.samefile(entry, path)):
+            self._link(entry, path)
+        self.reused += 1
+        return True
+
+    def release(self, path):
+        """
+        Removes the file about to be rendered to `path`.
+
+        Blender may overwrite an existing file in place, which would also
+        change the stored frame it is linked to.
+        """
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+    def store(self, key, path):
+        """Adds the frame just rendered to `path` to the store."""
+        self.rendered += 1
+        entry = self._entry(key, path)
+        if entry.exists():
+            return
+        self.folder.mkdir(parents=True, exist_ok=True)
+        # If another worker stored the same frame meanwhile, this replaces it with an equal one
+        self._link(path, entry)
+
+    def prune(self):
+        """
+        Deletes stored frames no sequence links to any more.
+
+        Returns:
+            int: Files deleted
+        """
+        if self.copied or not self.folder.is_dir():
+            return 0
+        deleted = 0
+        for entry in self.folder.iterdir():
+            try:
+                if entry.suffix != ".tmp" and entry.stat().st_nlink == 1:
+                    entry.unlink()
+                    deleted += 1
+            except OSError:
+                logger.exception("Could not prune %s", entry)
+        return deleted
@@ -0,0 +1,81 @@
+"""
+Background render worker: renders one horizontal band of one frame.
+
+Started by utils.workers in a separate Blender process on a saved copy of
+the scene, which already carries the render settings:
+
+    blender --background --factory-startup scene.blend --python-exit-code 1 \
+        --python render_worker.py -- --scene Scene --frame 12 \
+        --min-y 0.5 --max-y 0.75 --output /tmp/frame_0012_band_01
+
+--factory-startup resets the Cycles device preferences, so a scene that
+renders on the GPU gets its compute device type passed as --device-type.
+
+Only bpy and the standard library are used, so the addon does not need to
+be installed in the worker's Blender.
+"""
+
+import argparse
+import sys
+
+import bpy
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Render one border band of a frame")
+    parser.add_argument("--scene", required=True, help="Scene to render")
+    parser.add_argument("--frame", type=int, required=True, help="Frame number")
+    parser.add_argument("--min-y", type=float, required=True, help="Band bottom (0 = image bottom)")
+    parser.add_argument("--max-y", type=float, required=True, help="Band top (1 = image top)")
+    parser.add_argument("--output", required=True, help="Output path without extension")
+    parser.add_argument("--threads", type=int, default=0, help="Render threads (0 = auto)")
+    parser.add_argument("--device-type", help="Cycles compute device type to enable (e.g. OPTIX)")
+    return parser.parse_args(argv)
+
+
+def enable_gpu_compute(device_type):
+    """Enables the Cycles devices of `device_type` (as utils.blender.enable_gpu_compute), returns how many."""
+    try:
+        cycles_prefs = bpy.context.preferences.addons['cycles'].preferences
+        cycles_prefs.compute_device_type = device_type
+    except (AttributeError, KeyError, TypeError):
+        return 0
+    cycles_prefs.refresh_devices()
+    enabled = 0
+    for device in cycles_prefs.devices:
+        if device.type == device_type:
+            device.use = True
+            enabled += 1
+    return enabled
+
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    args = parse_args(argv)
+
+    scene = bpy.data.scenes[args.scene]
+    render = scene.render
+
+    # Full-width band, cropped so the file holds only the band's rows
+    render.use_border = True
+    render.use_crop_to_border = True
+    render.border_min_x = 0.0
+    render.border_max_x = 1.0
+    render.border_min_y = args.min_y
+    render.border_max_y = args.max_y
+
+    if args.threads > 0:
+        render.threads_mode = 'FIXED'
+        render.threads = args.threads
+
+    if args.device_type and not enable_gpu_compute(args.device_type):
+        print(f"Warning: no {args.device_type} device found, rendering on the CPU", file=sys.stderr)
+
+    render.use_file_extension = True
+    render.filepath = args.output
+    scene.frame_set(args.frame)
+    bpy.ops.render.render(write_still=True, scene=scene.name)
+
+
+if __name__ == "__main__":
+    main()
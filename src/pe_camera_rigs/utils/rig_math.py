@@ -0,0 +1,286 @@
+"""
+Reference evaluator for the Orbit and Isometric rig math, and the stereo
+IPD schedule.
+
+Pure Python/NumPy, no bpy: importable outside Blender for previews, bakes
+and as a test oracle against the Geometry Nodes output. Every function
+takes whole frame arrays and evaluates them in one vectorized pass.
+
+Keep in sync with create_orbit_camera_node_group() and
+create_isometric_camera_node_group() in nodes.py.
+"""
+
+import math
+import numbers
+
+import numpy as np
+
+# ============================================================================
+# Orbit Rig
+# ============================================================================
+
+# Easing indices used by the "Easing" socket of the orbit node group
+EASING_LINEAR = 0
+EASING_EASE_IN_OUT = 1
+EASING_EASE_IN = 2
+EASING_EASE_OUT = 3
+
+EASING_MODES = {
+    'LINEAR': EASING_LINEAR,
+    'EASE_IN_OUT': EASING_EASE_IN_OUT,
+    'EASE_IN': EASING_EASE_IN,
+    'EASE_OUT': EASING_EASE_OUT,
+}
+
+
+def orbit_progress(frames, duration=240, speed_multiplier=1.0, reverse=False):
+    """
+    Normalized orbit progress (0-1) for an array of frames.
+
+    Args:
+        frames (array-like): Frame numbers
+        duration (int): Duration (Frames) of one revolution
+        speed_multiplier (float): Speed Multiplier
+        reverse (bool): Reverse Direction
+
+    Returns:
+        np.ndarray: (N,) progress values
+    """
+    frames = np.asarray(frames, dtype=np.float64)
+    duration = max(int(duration), 1)
+
+    # Math node MODULO is a truncated (C fmod) modulo
+    progress = np.fmod(frames * speed_multiplier, duration) / duration
+    if reverse:
+        progress = 1.0 - progress
+    return progress
+
+
+def apply_easing(progress, easing=EASING_LINEAR):
+    """
+    Applies the orbit easing curve to progress values.
+
+    Args:
+        progress (np.ndarray): Progress values from orbit_progress()
+        easing (int | str): Easing index or name from EASING_MODES
+
+    Returns:
+        np.ndarray: Eased progress values
+    """
+    if isinstance(easing, str):
+        easing = EASING_MODES.get(easing, EASING_LINEAR)
+
+    if easing == EASING_EASE_IN:
+        return progress ** 2
+    if easing == EASING_EASE_OUT:
+        return 1.0 - (1.0 - progress) ** 2
+    # EASING_EASE_IN_OUT: the Float Curve in the node group has colinear
+    # control points, so it evaluates as identity just like LINEAR.
+    return np.array(progress, dtype=np.float64, copy=True)
+
+
+def orbit_angles(frames, duration=240, speed_multiplier=1.0, reverse=False,
+                 easing=EASING_LINEAR, start_angle_offset=0.0):
+    """
+    Orbit angle in radians for an array of frames.
+
+    Start Angle Offset is added as-is, exactly like the node group does.
+
+    Returns:
+        np.ndarray: (N,) angles in radians
+    """
+    progress = orbit_progress(frames, duration, speed_multiplier, reverse)
+    return apply_easing(progress, easing) * 2.0 * np.pi + start_angle_offset
+
+
+def sample_orbit_path(frames, radius=3.0, height=1.5, duration=240, speed_multiplier=1.0,
+                      reverse=False, easing=EASING_LINEAR, start_angle_offset=0.0,
+                      target_location=(0.0, 0.0, 0.0)):
+    """
+    Evaluates the orbit camera position for an array of frames.
+
+    Positions are in the controller's local space, like the node group output.
+
+    Args:
+        frames (array-like): Frame numbers to sample
+        radius (float): Orbit Radius
+        height (float): Camera Height
+        duration (int): Duration (Frames) of one revolution
+        speed_multiplier (float): Speed Multiplier
+        reverse (bool): Reverse Direction
+        easing (int | str): Easing index or name
+        start_angle_offset (float): Start Angle Offset
+        target_location (tuple): Location of the Target Object
+
+    Returns:
+        np.ndarray: (N, 3) camera locations
+    """
+    angle = orbit_angles(frames, duration, speed_multiplier, reverse, easing, start_angle_offset)
+
+    locations = np.empty((len(angle), 3), dtype=np.float64)
+    locations[:, 0] = radius * np.cos(angle)
+    locations[:, 1] = radius * np.sin(angle)
+    locations[:, 2] = height
+    locations += np.asarray(target_location, dtype=np.float64)
+    return locations
+
+
+def look_at_euler(locations, target):
+    """
+    Computes XYZ Euler rotations that aim a camera's -Z axis at a target.
+
+    The camera is kept level (no roll), like a Track To constraint with
+    Up Y. Rotations are unwrapped so baked F-curves never flip.
+
+    Args:
+        locations (np.ndarray): (N, 3) camera locations
+        target (array-like): (3,) or (N, 3) target locations
+
+    Returns:
+        np.ndarray: (N, 3) Euler rotations in radians
+    """
+    locations = np.atleast_2d(np.asarray(locations, dtype=np.float64))
+    direction = np.asarray(target, dtype=np.float64) - locations
+    horizontal = np.hypot(direction[:, 0], direction[:, 1])
+
+    rotations = np.zeros_like(locations)
+    rotations[:, 0] = np.arctan2(horizontal, -direction[:, 2])
+    rotations[:, 2] = np.unwrap(np.arctan2(-direction[:, 0], direction[:, 1]))
+    return rotations
+
+
+def evaluate_orbit(frames, target_location=(0.0, 0.0, 0.0), **params):
+    """
+    Evaluates camera locations and look-at rotations for an orbit rig.
+
+    Args:
+        frames (array-like): Frame numbers to sample
+        target_location (tuple): Location of the Target Object
+        **params: Remaining keyword arguments of sample_orbit_path()
+
+    Returns:
+        tuple: ((N, 3) locations, (N, 3) Euler rotations)
+    """
+    locations = sample_orbit_path(frames, target_location=target_location, **params)
+    return locations, look_at_euler(locations, target_location)
+
+
+# ============================================================================
+# Isometric Rig
+# ============================================================================
+
+# Projection order matches the "Projection Type" socket of the isometric node group
+ISOMETRIC_PROJECTIONS = (
+    'GAME_2_1',
+    'GAME_4_3',
+    'TRUE_ISOMETRIC',
+    'DIMETRIC',
+    'MILITARY',
+    'CAVALIER',
+    'CUSTOM',
+)
+
+# (Tilt X, Roll Y, Rotation Z) in radians, as fed to Set Rotation
+ISOMETRIC_PRESET_ANGLES = {
+    'GAME_2_1': (math.radians(26.565), 0.0, math.radians(45.0)),
+    'GAME_4_3': (math.radians(30.0), 0.0, math.radians(45.0)),
+    'TRUE_ISOMETRIC': (math.radians(35.264), 0.0, math.radians(45.0)),
+    'DIMETRIC': (math.radians(30.0), 0.0, math.radians(45.0)),
+    'MILITARY': (math.radians(90.0), 0.0, 0.0),
+    'CAVALIER': (0.0, 0.0, math.radians(45.0)),
+}
+
+
+def isometric_euler(projection_type, custom_rotation_z=math.radians(45.0),
+                    custom_tilt_x=math.radians(35.264), custom_roll_y=0.0):
+    """
+    Camera rotation for an isometric projection preset.
+
+    Args:
+        projection_type (str | int): Projection identifier or socket index
+        custom_rotation_z (float): Custom Rotation Z in radians (CUSTOM only)
+        custom_tilt_x (float): Custom Tilt X in radians (CUSTOM only)
+        custom_roll_y (float): Custom Roll Y in radians (CUSTOM only)
+
+    Returns:
+        tuple: (x, y, z) Euler rotation in radians
+
+    Raises:
+        ValueError: If the projection type is unknown
+    """
+    # Integral also covers NumPy integers from vectorized callers
+    if isinstance(projection_type, numbers.Integral):
+        if not 0 <= projection_type < len(ISOMETRIC_PROJECTIONS):
+            raise ValueError(f"Invalid projection index: {projection_type}")
+        projection_type = ISOMETRIC_PROJECTIONS[int(projection_type)]
+
+    if projection_type == 'CUSTOM':
+        return (custom_tilt_x, custom_roll_y, custom_rotation_z)
+    if projection_type not in ISOMETRIC_PRESET_ANGLES:
+        raise ValueError(f"Invalid projection type: {projection_type}")
+    return ISOMETRIC_PRESET_ANGLES[projection_type]
+
+
+def evaluate_isometric(projection_types, rotation_steps=1, **custom):
+    """
+    Camera rotations for several projections and evenly spaced turns.
+
+    Useful for direction sprite sheets: with rotation_steps=8 every
+    projection is evaluated at 8 headings, 45° apart, around Z.
+
+    Args:
+        projection_types (iterable): Projection identifiers or socket indices
+        rotation_steps (int): Number of headings per projection
+        **custom: Custom angles passed to isometric_euler()
+
+    Returns:
+        np.ndarray: (len(projection_types), rotation_steps, 3) Euler rotations
+    """
+    base = np.array([isometric_euler(p, **custom) for p in projection_types], dtype=np.float64)
+    base = base.reshape(-1, 3)
+    steps = max(int(rotation_steps), 1)
+
+    rotations = np.repeat(base[:, np.newaxis, :], steps, axis=1)
+    rotations[:, :, 2] += np.arange(steps) * (2.0 * np.pi / steps)
+    return rotations
+
+
+# ============================================================================
+# Stereo Rigs
+# ============================================================================
+
+# Stereo base rule of thumb: IPD = subject distance / 30
+IPD_DISTANCE_RATIO = 30.0
+
+
+def ipd_schedule(distances, ratio=IPD_DISTANCE_RATIO, min_ipd=5.0, max_ipd=64.0, smoothing=0):
+    """
+    Per-frame IPD from the distance to the subject.
+
+    The stereo base follows the 1/ratio rule (a subject 1.92m away gets
+    64mm with the default ratio of 30), clamped so close-ups do not
+    hyper-converge and distant shots do not turn into hyper-stereo.
+
+    Args:
+        distances (array-like): (N,) subject distances in meters, one per frame
+        ratio (float): Subject distance / stereo base
+        min_ipd (float): Smallest IPD in millimeters
+        max_ipd (float): Largest IPD in millimeters
+        smoothing (int): Width in frames of a moving average applied before
+            clamping, to keep depth from pumping with jittery motion (0 = off)
+
+    Returns:
+        np.ndarray: (N,) IPD in millimeters
+    """
+    distances = np.asarray(distances, dtype=np.float64)
+    ipd = distances * 1000.0 / ratio
+
+    window = int(smoothing)
+    if window > 1 and len(ipd) > 1:
+        # Edge padding keeps the ends from being pulled towards zero
+        pad_before = window // 2
+        pad_after = window - 1 - pad_before
+        padded = np.pad(ipd, (pad_before, pad_after), mode='edge')
+        ipd = np.convolve(padded, np.full(window, 1.0 / window), mode='valid')
+
+    return np.clip(ipd, min_ipd, max_ipd)
@@ -1,98 +1,491 @@
 import bpy
 import math
+import os
 
-def create_cyclorama(context, size, color):
-    """Creates a simple mesh-based cyclorama stage."""
-    # Basic implementation: creates a plane and curves it.
-    size_map = {'SMALL': 10, 'MEDIUM': 20, 'LARGE': 30}
-    plane_size = size_map.get(size, 20)
-
-    bpy.ops.mesh.primitive_plane_add(size=plane_size, enter_editmode=True)
-    cyc_obj = context.active_object
-    cyc_obj.name = "Cyclorama"
-    
-    # Simple curve using proportional editing
-    bpy.ops.mesh.select_all(action='DESELECT')
-    bpy.ops.object.mode_set(mode='OBJECT')
-    # Select back edges to extrude up for the wall
-    for edge in cyc_obj.data.edges:
-        is_back_edge = True
-        for v_idx in edge.vertices:
-            if cyc_obj.data.vertices[v_idx].co[1] > -plane_size / 2.1:
-                is_back_edge = False
-                break
-        if is_back_edge:
-            edge.select = True
-
-    bpy.ops.object.mode_set(mode='EDIT')
-    
-    bpy.ops.mesh.extrude_region_move(
-        TRANSFORM_OT_translate={"value": (0, 0, plane_size / 4)}
-    )
-    
-    bpy.ops.object.mode_set(mode='OBJECT')
-    
-    # Add bevel and subdivision modifiers
-    cyc_obj.modifiers.new(name='Bevel', type='BEVEL')
-    cyc_obj.modifiers['Bevel'].width = plane_size / 10
-    cyc_obj.modifiers['Bevel'].segments = 16
-    
-    cyc_obj.modifiers.new(name='Subdivision', type='SUBSURF')
-    cyc_obj.modifiers['Subdivision'].levels = 2
-    
-    bpy.ops.object.shade_smooth()
+from ..constants import CYCLORAMA_NAME, REFERENCE_CAPSULE_NAME, REFERENCE_SPHERE_NAME
+from .lazy import lazy_import
+
+# The property groups import the enum items below at registration
+np = lazy_import("numpy")
+rig_math = lazy_import(".rig_math", __package__)
+
+CYCLORAMA_SIZES = {'SMALL': 10, 'MEDIUM': 20, 'LARGE': 30}
+
+CYCLORAMA_COLORS = {
+    'WHITE': (0.8, 0.8, 0.8, 1),
+    'GRAY': (0.18, 0.18, 0.18, 1),
+    'BLACK': (0.01, 0.01, 0.01, 1),
+}
+
+
+def cyclorama_profile(size, resolution=16):
+    """
+    Computes the (y, z) cross-section of a cyclorama cove.
+
+    The floor runs from the front edge (+Y) to the cove, a quarter circle
+    bends it up into the back wall (-Y).
+
+    Args:
+        size (float): Floor depth and width in meters
+        resolution (int): Segments in the curved cove
+
+    Returns:
+        np.ndarray: (N, 2) profile points ordered front floor to wall top
+    """
+    half = size / 2
+    radius = size / 10
+    wall_height = size / 4
+    resolution = max(int(resolution), 1)
+
+    theta = np.linspace(0.0, np.pi / 2, resolution + 1)
+    cove = np.stack([
+        -half + radius - radius * np.sin(theta),
+        radius - radius * np.cos(theta),
+    ], axis=1)
+
+    return np.vstack([
+        [[half, 0.0]],
+        cove,
+        [[-half, wall_height]],
+    ])
+
+
+def build_cyclorama_mesh(name, size, resolution=16, width_segments=1):
+    """
+    Builds a curved cyclorama mesh from vertex and face arrays.
+
+    No operators, edit mode or modifiers: the cove is already curved, so
+    the stage is cheap to create, works in background mode, and renders
+    without live Bevel/Subdivision evaluation.
+
+    Args:
+        name (str): Mesh datablock name
+        size (float): Floor depth and width in meters
+        resolution (int): Segments in the curved cove
+        width_segments (int): Segments across the width (X)
+
+    Returns:
+        bpy.types.Mesh: The new mesh
+    """
+    profile = cyclorama_profile(size, resolution)
+    xs = np.linspace(-size / 2, size / 2, max(int(width_segments), 1) + 1)
+    rows, cols = len(profile), len(xs)
+
+    # Vertex grid: one row per profile point, one column per X position
+    verts = np.empty((rows, cols, 3), dtype=np.float32)
+    verts[:, :, 0] = xs[np.newaxis, :]
+    verts[:, :, 1] = profile[:, 0, np.newaxis]
+    verts[:, :, 2] = profile[:, 1, np.newaxis]
+
+    # Quads wound so normals face into the stage (up on the floor, +Y on the wall)
+    grid = np.arange(rows * cols).reshape(rows, cols)
+    quads = np.stack([
+        grid[:-1, :-1], grid[1:, :-1], grid[1:, 1:], grid[:-1, 1:],
+    ], axis=-1).reshape(-1, 4)
+    face_count = len(quads)
+
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(rows * cols)
+    mesh.vertices.foreach_set("co", verts.ravel())
+    mesh.loops.add(face_count * 4)
+    mesh.loops.foreach_set("vertex_index", quads.ravel().astype(np.int32))
+    mesh.polygons.add(face_count)
+    mesh.polygons.foreach_set("loop_start", np.arange(0, face_count * 4, 4, dtype=np.int32))
+    mesh.polygons.foreach_set("use_smooth", np.ones(face_count, dtype=bool))
+
+    # UVs: U across the width, V along the unrolled profile
+    arc = np.concatenate([[0.0], np.cumsum(np.linalg.norm(np.diff(profile, axis=0), axis=1))])
+    uv_grid = np.empty((rows, cols, 2), dtype=np.float32)
+    uv_grid[:, :, 0] = (xs[np.newaxis, :] + size / 2) / size
+    uv_grid[:, :, 1] = (arc / arc[-1])[:, np.newaxis]
+    uv_layer = mesh.uv_layers.new(name="UVMap")
+    uv_layer.data.foreach_set("uv", uv_grid.reshape(-1, 2)[quads.ravel()].ravel())
+
+    mesh.update(calc_edges=True)
+    mesh.validate()
+    return mesh
+
+
+def create_cyclorama(collection, size, color, resolution=16):
+    """
+    Creates a curved cyclorama stage.
+
+    Args:
+        collection (bpy.types.Collection): Collection to link the object into
+        size (str): 'SMALL' (10m), 'MEDIUM' (20m) or 'LARGE' (30m)
+        color (str): 'WHITE', 'GRAY' or 'BLACK'
+        resolution (int): Segments in the curved cove
+
+    Returns:
+        bpy.types.Object: The cyclorama object
+    """
+    plane_size = CYCLORAMA_SIZES.get(size, 20)
+
+    mesh = build_cyclorama_mesh(f"{CYCLORAMA_NAME}_Mesh", plane_size, resolution)
+    cyc_obj = bpy.data.objects.new(CYCLORAMA_NAME, mesh)
+    collection.objects.link(cyc_obj)
 
     # Add material
-    color_map = {
-        'WHITE': (0.8, 0.8, 0.8, 1),
-        'GRAY': (0.18, 0.18, 0.18, 1),
-        'BLACK': (0.01, 0.01, 0.01, 1),
-    }
     mat = bpy.data.materials.new(name=f"Cyclorama_{color}")
     mat.use_nodes = True
-    mat.node_tree.nodes["Principled BSDF"].inputs["Base Color"].default_value = color_map.get(color, (0.18, 0.18, 0.18, 1))
-    cyc_obj.data.materials.append(mat)
-    
+    mat.node_tree.nodes["Principled BSDF"].inputs["Base Color"].default_value = CYCLORAMA_COLORS.get(color, (0.18, 0.18, 0.18, 1))
+    mesh.materials.append(mat)
+
     return cyc_obj
 
-def create_lighting_preset(context, preset):
-    """Creates a set of lights based on a preset name."""
-    # Basic implementation of 3-point studio lighting
-    if preset == '3POINT_STUDIO':
-        # Key light
-        bpy.ops.object.light_add(type='AREA', location=(3, -3, 3))
-        key_light = context.active_object
-        key_light.name = "Key_Light"
-        key_light.data.energy = 1600
-        
-        # Fill light
-        bpy.ops.object.light_add(type='AREA', location=(-3, -3, 2))
-        fill_light = context.active_object
-        fill_light.name = "Fill_Light"
-        fill_light.data.energy = 500
-        fill_light.data.size = 5
-
-        # Rim light
-        bpy.ops.object.light_add(type='POINT', location=(-2, 4, 2))
-        rim_light = context.active_object
-        rim_light.name = "Rim_Light"
-        rim_light.data.energy = 900
-    
-    # Position lights to point at origin
-    for obj in context.scene.objects:
-        if obj.type == 'LIGHT' and 'Light' in obj.name:
-            # Add a track to constraint to point at the world origin
-            # Instead of creating a target object, just point lights at origin
-            track_to = obj.constraints.new(type='TRACK_TO')
-            # No need for a target object - lights will naturally point at origin
-            # when constraint is evaluated with no target
-            track_to.track_axis = 'TRACK_NEGATIVE_Z'
-            track_to.up_axis = 'UP_Y'
-
-
-def add_reference_sphere(context):
+
+# Lighting presets: every light is created aimed at its target, so no
+# constraints are evaluated. 'world' sets the scene background when a scene
+# is passed to create_lighting_preset().
+LIGHTING_PRESETS = {
+    '3POINT_STUDIO': {
+        'label': "3-Point (Studio)",
+        'description': "Professional 3-point studio lighting",
+        'lights': (
+            {'name': "Key_Light", 'type': 'AREA', 'location': (3, -3, 3), 'energy': 1600, 'size': 1.0},
+            {'name': "Fill_Light", 'type': 'AREA', 'location': (-3, -3, 2), 'energy': 500, 'size': 5.0},
+            {'name': "Rim_Light", 'type': 'POINT', 'location': (-2, 4, 2), 'energy': 900},
+        ),
+    },
+    '3POINT_OUTDOOR': {
+        'label': "3-Point (Outdoor)",
+        'description': "Outdoor 3-point with sun",
+        'lights': (
+            {'name': "Sun_Light", 'type': 'SUN', 'location': (4, -6, 8), 'energy': 4.0, 'size': 0.01},
+            {'name': "Bounce_Light", 'type': 'AREA', 'location': (-4, -3, 1), 'energy': 800, 'size': 4.0},
+            {'name': "Rim_Light", 'type': 'SPOT', 'location': (-2, 5, 3), 'energy': 1500},
+        ),
+        'world': {'color': (0.45, 0.6, 0.9), 'strength': 0.8},
+    },
+    'DOME': {
+        'label': "Dome (Environment)",
+        'description': "Soft, even light from the world background only",
+        'lights': (),
+        'world': {'color': (0.5, 0.5, 0.5), 'strength': 1.0},
+    },
+    'LOW_KEY': {
+        'label': "Low-Key",
+        'description': "Dramatic single hard key with a faint rim on a dark world",
+        'lights': (
+            {'name': "Key_Light", 'type': 'SPOT', 'location': (2.5, -2.5, 3.5), 'energy': 2500, 'size': 0.05},
+            {'name': "Rim_Light", 'type': 'AREA', 'location': (-1.5, 3, 2.5), 'energy': 300, 'size': 0.5},
+        ),
+        'world': {'color': (0.0, 0.0, 0.0), 'strength': 0.0},
+    },
+    'HDRI': {
+        'label': "HDRI World",
+        'description': "Image-based lighting from a local .hdr/.exr environment map",
+        'lights': (),
+        'hdri': True,
+    },
+}
+
+# Shared EnumProperty items for every rig's lighting option
+LIGHTING_PRESET_ITEMS = [('NONE', "None", "No lights added")] + [
+    (key, preset['label'], preset['description']) for key, preset in LIGHTING_PRESETS.items()
+]
+
+# Point the lights are aimed at: a standing subject at the origin
+LIGHTING_TARGET = (0.0, 0.0, 1.0)
+
+# World importance-sampling options exposed by the rigs. 'RESOLUTION' picks
+# a manual map size from the render resolution, the others map to Cycles.
+HDRI_SAMPLING_ITEMS = [
+    ('RESOLUTION', "Match Render Resolution", "Importance map sized from the render resolution preset"),
+    ('AUTOMATIC', "Cycles Automatic", "Let Cycles size the importance map from the image"),
+    ('MANUAL', "Manual", "Use the given map resolution"),
+    ('NONE', "None", "No importance sampling (only for very flat environments)"),
+]
+
+# Importance map size limits (Cycles world 'sample_map_resolution')
+HDRI_MAP_RESOLUTION_MIN = 256
+HDRI_MAP_RESOLUTION_MAX = 4096
+
+
+def add_light(collection, name, light_type, location, energy, size=None, rotation=None, data_name=None):
+    """
+    Creates a light object without operators.
+
+    The light data named `data_name` is reused when it exists with the same
+    type, so re-running a preset does not pile up light datablocks.
+
+    Args:
+        collection (bpy.types.Collection): Collection to link the light into
+        name (str): Object name
+        light_type (str): 'POINT', 'SUN', 'SPOT' or 'AREA'
+        location (tuple): World location
+        energy (float): Power in watts (irradiance in W/m² for suns)
+        size (float, optional): Area light size or point/spot/sun radius
+        rotation (tuple, optional): XYZ Euler rotation in radians
+        data_name (str, optional): Light data name. Defaults to "<name>_Data".
+
+    Returns:
+        bpy.types.Object: The light object
+    """
+    data_name = data_name or f"{name}_Data"
+    light_data = bpy.data.lights.get(data_name)
+    if light_data is None or light_data.type != light_type:
+        light_data = bpy.data.lights.new(name=data_name, type=light_type)
+
+    light_data.energy = energy
+    if size is not None:
+        if light_type == 'AREA':
+            light_data.size = size
+        elif light_type == 'SUN':
+            light_data.angle = size
+        else:
+            light_data.shadow_soft_size = size
+
+    light_obj = bpy.data.objects.new(name=name, object_data=light_data)
+    light_obj.location = location
+    if rotation is not None:
+        light_obj.rotation_euler = rotation
+    collection.objects.link(light_obj)
+    return light_obj
+
+
+def apply_world_preset(scene, color, strength):
+    """Sets the scene's world background color and strength."""
+    world = scene.world
+    if world is None:
+        world = bpy.data.worlds.new("World")
+        scene.world = world
+    world.use_nodes = True
+    background = world.node_tree.nodes.get("Background")
+    if background is not None:
+        background.inputs["Color"].default_value = (*color, 1.0)
+        background.inputs["Strength"].default_value = strength
+    return world
+
+
+def hdri_map_resolution(render_width, image_width=None):
+    """
+    Picks an importance map resolution for a panoramic render.
+
+    One map cell per ~4 pixels of a full 360° render is enough to find every
+    bright feature the camera can resolve; a larger map only costs memory
+    and build time. The result is a power of two, clamped to the HDRI size.
+
+    Args:
+        render_width (int): Width of the equivalent 360° frame in pixels
+            (the SBS width for VR180, which is two 180° eyes)
+        image_width (int, optional): Environment image width in pixels
+
+    Returns:
+        int: Map resolution for world.cycles.sample_map_resolution
+    """
+    resolution = 2 ** int(round(math.log2(max(render_width, 1) / 4)))
+    if image_width:
+        resolution = min(resolution, 2 ** int(math.log2(max(image_width, 1))))
+    return int(min(max(resolution, HDRI_MAP_RESOLUTION_MIN), HDRI_MAP_RESOLUTION_MAX))
+
+
+def hdri_file_exists(filepath):
+    """True if `filepath` (may be blend-relative) points to an existing file."""
+    return bool(filepath) and os.path.isfile(bpy.path.abspath(filepath))
+
+
+def setup_hdri_world(scene, filepath, strength=1.0, sampling_method='RESOLUTION',
+                     map_resolution=1024, render_width=None):
+    """
+    Lights the scene with an environment map through the world node tree.
+
+    Args:
+        scene (bpy.types.Scene): Scene whose world is set up
+        filepath (str): Path to a .hdr or .exr environment image
+        strength (float): Background strength
+        sampling_method (str): Identifier from HDRI_SAMPLING_ITEMS
+        map_resolution (int): Map size used with 'MANUAL'
+        render_width (int, optional): 360°-equivalent render width used with
+            'RESOLUTION'. Defaults to the scene's resolution_x.
+
+    Returns:
+        bpy.types.World: The configured world
+
+    Raises:
+        FileNotFoundError: If the environment image does not exist
+    """
+    if not hdri_file_exists(filepath):
+        raise FileNotFoundError(f"HDRI not found: {filepath}")
+
+    world = scene.world
+    if world is None:
+        world = bpy.data.worlds.new("World")
+        scene.world = world
+    world.use_nodes = True
+
+    nodes = world.node_tree.nodes
+    links = world.node_tree.links
+    nodes.clear()
+
+    env_node = nodes.new('ShaderNodeTexEnvironment')
+    env_node.location = (-300, 0)
+    env_node.image = bpy.data.images.load(bpy.path.abspath(filepath), check_existing=True)
+
+    background = nodes.new('ShaderNodeBackground')
+    background.inputs["Strength"].default_value = strength
+
+    output = nodes.new('ShaderNodeOutputWorld')
+    output.location = (200, 0)
+
+    links.new(env_node.outputs["Color"], background.inputs["Color"])
+    links.new(background.outputs["Background"], output.inputs["Surface"])
+
+    if sampling_method == 'RESOLUTION':
+        width = render_width or scene.render.resolution_x
+        map_resolution = hdri_map_resolution(width, env_node.image.size[0])
+        sampling_method = 'MANUAL'
+    world.cycles.sampling_method = sampling_method
+    if sampling_method == 'MANUAL':
+        world.cycles.sample_map_resolution = map_resolution
+
+    return world
+
+
+def create_lighting_preset(collection, preset, scene=None, hdri=None):
+    """
+    Creates a set of lights from the LIGHTING_PRESETS table.
+
+    Orientations are computed for all lights at once, so the lights are
+    aimed at LIGHTING_TARGET without Track To constraints. Only the objects
+    created here are touched.
+
+    Args:
+        collection (bpy.types.Collection): Collection to link the lights into
+        preset (str): Key of LIGHTING_PRESETS, e.g. '3POINT_STUDIO'
+        scene (bpy.types.Scene, optional): Scene whose world background is
+            set by presets that define one
+        hdri (dict, optional): Keyword arguments for setup_hdri_world(),
+            required by the 'HDRI' preset
+
+    Returns:
+        list: The created light objects
+
+    Raises:
+        KeyError: If the preset is unknown
+        ValueError: If the HDRI preset is used without a scene or file
+    """
+    if preset not in LIGHTING_PRESETS:
+        raise KeyError(f"Unknown lighting preset '{preset}'")
+    spec = LIGHTING_PRESETS[preset]
+
+    lights = []
+    if spec['lights']:
+        locations = np.array([light['location'] for light in spec['lights']], dtype=np.float64)
+        rotations = rig_math.look_at_euler(locations, LIGHTING_TARGET)
+
+        for light, rotation in zip(spec['lights'], rotations):
+            lights.append(add_light(
+                collection, light['name'], light['type'], light['location'], light['energy'],
+                size=light.get('size'), rotation=tuple(rotation),
+                data_name=f"PE_{preset}_{light['name']}",
+            ))
+
+    if scene is not None and 'world' in spec:
+        apply_world_preset(scene, **spec['world'])
+
+    if spec.get('hdri'):
+        if scene is None or not hdri:
+            raise ValueError("The HDRI preset needs a scene and an HDRI file")
+        setup_hdri_world(scene, **hdri)
+
+    return lights
+
+
+def lathe_geometry(profile, segments=32):
+    """
+    Revolves a (radius, z) profile around the Z axis.
+
+    The profile runs bottom to top; points with radius 0 become poles.
+
+    Args:
+        profile (np.ndarray): (N, 2) array of (radius, z)
+        segments (int): Segments around the axis
+
+    Returns:
+        tuple: ((V, 3) vertex array, list of face index tuples)
+    """
+    profile = np.asarray(profile, dtype=np.float64)
+    theta = np.linspace(0.0, 2 * np.pi, segments, endpoint=False)
+    cos, sin = np.cos(theta), np.sin(theta)
+
+    verts = []
+    rings = []  # Per profile point: list of vertex indices (one for poles)
+    for radius, z in profile:
+        start = sum(len(r) for r in rings)
+        # sin(pi) is ~1e-16, not 0: profiles built with trig still close their poles
+        if radius <= 0.0 or np.isclose(radius, 0.0, atol=1e-9):
+            verts.append(np.array([[0.0, 0.0, z]]))
+            rings.append([start])
+        else:
+            verts.append(np.stack([radius * cos, radius * sin, np.full(segments, z)], axis=1))
+            rings.append(list(range(start, start + segments)))
+
+    faces = []
+    for lower, upper in zip(rings[:-1], rings[1:]):
+        for j in range(segments):
+            k = (j + 1) % segments
+            if len(lower) == 1:
+                faces.append((upper[k], upper[j], lower[0]))
+            elif len(upper) == 1:
+                faces.append((lower[j], lower[k], upper[0]))
+            else:
+                faces.append((lower[j], lower[k], upper[k], upper[j]))
+
+    return np.concatenate(verts), faces
+
+
+def create_lathe_object(collection, name, profile, location, segments=32):
+    """
+    Creates a smooth-shaded object by revolving a profile with from_pydata.
+
+    Args:
+        collection (bpy.types.Collection): Collection to link the object into
+        name (str): Object name; the mesh gets a "_Mesh" suffix
+        profile (np.ndarray): (N, 2) array of (radius, z), bottom to top
+        location (tuple): World location
+        segments (int): Segments around the axis
+
+    Returns:
+        bpy.types.Object: The new object
+    """
+    verts, faces = lathe_geometry(profile, segments)
+
+    mesh = bpy.data.meshes.new(f"{name}_Mesh")
+    mesh.from_pydata(verts.tolist(), [], faces)
+    mesh.polygons.foreach_set("use_smooth", np.ones(len(faces), dtype=bool))
+    mesh.update()
+
+    obj = bpy.data.objects.new(name, mesh)
+    obj.location = location
+    collection.objects.link(obj)
+    return obj
+
+
+def sphere_profile(radius, rings=16):
+    """(radius, z) profile of a UV sphere centered at 0, bottom to top."""
+    phi = np.linspace(np.pi, 0.0, rings + 1)
+    return np.stack([radius * np.sin(phi), radius * np.cos(phi)], axis=1)
+
+
+def capsule_profile(radius, depth, rings=8):
+    """(radius, z) profile of a capsule of total height `depth` centered at 0."""
+    half_cylinder = max(depth / 2 - radius, 0.0)
+    phi = np.linspace(np.pi, np.pi / 2, rings + 1)
+    bottom = np.stack([radius * np.sin(phi), -half_cylinder + radius * np.cos(phi)], axis=1)
+    top = bottom[::-1] * (1, -1)
+    return np.vstack([bottom, top])
+
+
+def add_reference_sphere(collection):
     """Adds a simple sphere for scale reference."""
-    bpy.ops.mesh.primitive_uv_sphere_add(radius=0.5, location=(0, 0, 1))
-    ref_sphere = context.active_object
-    ref_sphere.name = "Reference_Sphere"
-    return ref_sphere
+    return create_lathe_object(
+        collection, REFERENCE_SPHERE_NAME, sphere_profile(0.5), location=(0, 0, 1)
+    )
+
+
+def add_reference_capsule(collection):
+    """Adds a person-sized capsule (1.3m tall) for scale reference."""
+    return create_lathe_object(
+        collection, REFERENCE_CAPSULE_NAME, capsule_profile(0.25, 1.3), location=(0, 0, 0.9)
+    )
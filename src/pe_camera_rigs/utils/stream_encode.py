@@ -0,0 +1,344 @@
+"""
+Streaming encode: turns frames into video while the sequence still renders.
+
+The renderer (or a FrameWatcher polling the output folder) reports each
+finished frame to a StreamAssembler. The assembler runs in its own thread
+behind a bounded queue: it reads the frame's EXRs, packs them (mono,
+side-by-side or top/bottom), converts linear to 8-bit sRGB and pipes the
+raw pixels into an ffmpeg process. Encoding overlaps rendering, so the
+video is done a few frames after the last render instead of after a
+separate encode pass.
+
+Needs an `ffmpeg` executable on PATH and the OpenImageIO module bundled
+with Blender (bpy image datablocks cannot be used outside the main thread).
+"""
+
+import logging
+import os
+import queue
+import shutil
+import subprocess
+import threading
+import time
+
+import numpy as np
+
+from .image_io import HAS_OIIO, read_image
+
+logger = logging.getLogger(__name__)
+
+# Frames reported but not yet encoded; a full queue holds the renderer back
+STREAM_QUEUE_FRAMES = 4
+
+# Seconds a watched file must stay unmodified before it is read
+WATCH_SETTLE_SECONDS = 1.0
+WATCH_POLL_SECONDS = 0.25
+
+# H.264 settings: (crf, x264 preset)
+STREAM_QUALITY = {
+    'DRAFT': (28, "veryfast"),
+    'FINAL': (16, "slow"),
+}
+
+# Linear [0, 1] in 65536 steps -> 8-bit sRGB
+SRGB_LUT_SIZE = 65536
+_linear = np.linspace(0.0, 1.0, SRGB_LUT_SIZE)
+SRGB_LUT = np.round(255.0 * np.where(
+    _linear <= 0.0031308, 12.92 * _linear, 1.055 * np.power(_linear, 1 / 2.4) - 0.055
+)).astype(np.uint8)
+del _linear
+
+def find_ffmpeg():
+    """
+    Returns the ffmpeg executable path.
+
+    Raises:
+        ValueError: If ffmpeg is not on PATH
+    """
+    path = shutil.which("ffmpeg")
+    if path is None:
+        raise ValueError("Encode While Rendering needs ffmpeg on PATH (Blender's built-in FFmpeg is not callable)")
+    return path
+
+
+def linear_to_srgb8(pixels, out):
+    """
+    Converts linear float RGB to 8-bit sRGB (Standard view transform) into `out`.
+
+    `pixels` is clipped and scaled in place.
+    """
+    np.clip(pixels, 0.0, 1.0, out=pixels)
+    pixels *= SRGB_LUT_SIZE - 1
+    pixels += 0.5
+    out[...] = SRGB_LUT[pixels.astype(np.uint16)]
+
+
+class FrameEncoder:
+    """
+    An ffmpeg process encoding raw RGB frames from its stdin to H.264.
+
+    `pix_fmt` is the ffmpeg name of the input layout: 'rgb24' (uint8) or
+    'rgb48le' (uint16, as kept by the raw frame cache).
+    """
+
+    def __init__(self, output_path, width, height, fps, quality='FINAL', pix_fmt="rgb24"):
+        crf, preset = STREAM_QUALITY[quality]
+        self.output_path = str(output_path)
+        self.log_path = f"{self.output_path}.log"
+        command = [
+            find_ffmpeg(), "-y", "-loglevel", "warning",
+            "-f", "rawvideo", "-pix_fmt", pix_fmt,
+            "-s", f"{width}x{height}", "-r", str(fps),
+            "-i", "-",
+            # yuv420p needs even dimensions
+            "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+            "-c:v", "libx264", "-preset", preset, "-crf", str(crf),
+            "-pix_fmt", "yuv420p", "-movflags", "+faststart",
+            self.output_path,
+        ]
+        # stderr goes to a file so a chatty ffmpeg can never block on a full pipe
+        self._log = open(self.log_path, 'w', encoding='utf-8')
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE, stderr=self._log)
+
+    def write(self, frame):
+        """
+        Writes (rows, width, 3) pixels in the input pixel format.
+
+        A frame may be written in several calls, e.g. one per stacked eye.
+        Contiguous arrays (including memmaps) are passed without a copy.
+        """
+        try:
+            self.process.stdin.write(memoryview(np.ascontiguousarray(frame)))
+        except BrokenPipeError:
+            raise RuntimeError(f"ffmpeg stopped early, see {self.log_path}")
+
+    def close(self):
+        """
+        Finishes the video.
+
+        Raises:
+            RuntimeError: If ffmpeg exits with a non-zero code
+        """
+        try:
+            self.process.stdin.close()
+        except BrokenPipeError:
+            pass
+        code = self.process.wait()
+        self._log.close()
+        if code != 0:
+            raise RuntimeError(f"ffmpeg exited with code {code}, see {self.log_path}")
+
+
+class StreamAssembler(threading.Thread):
+    """
+    Encodes frames in order as they are reported finished.
+
+    Args:
+        frame_inputs (callable): frame -> image paths (one for 'MONO', two otherwise)
+        layout (str): 'MONO', 'SBS' (first image left) or 'TB' (first image on top)
+        frame_start (int): First frame of the video
+        frame_end (int): Last frame of the video
+        output_path (str): Video file
+        fps (float): Frame rate
+        quality (str): STREAM_QUALITY key
+    """
+
+    def __init__(self, frame_inputs, layout, frame_start, frame_end, output_path, fps, quality='FINAL'):
+        super().__init__(name="pe-stream-assembler", daemon=True)
+        if not HAS_OIIO:
+            raise ValueError("Encode While Rendering needs the OpenImageIO module bundled with Blender")
+        find_ffmpeg()
+
+        self.frame_inputs = frame_inputs
+        self.layout = layout
+        self.frame_start = frame_start
+        self.frame_end = frame_end
+        self.output_path = output_path
+        self.fps = fps
+        self.quality = quality
+
+        self.queue = queue.Queue(maxsize=STREAM_QUEUE_FRAMES)
+        self.encoded = 0
+        self.error = None
+        self._encoder = None
+        self._frame = None
+
+    def _put(self, item):
+        # Fail instead of blocking forever when the encoder thread has died
+        while True:
+            if self.error is not None:
+                raise RuntimeError(f"Streaming encode failed: {self.error}") from self.error
+            if not self.is_alive():
+                # Every frame is encoded already
+                return
+            try:
+                self.queue.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.finish()
+            return
+        # Close the video but let the render error propagate
+        try:
+            self.finish()
+        except RuntimeError:
+            logger.exception("Streaming encode failed after an earlier error")
+
+    def frame_ready(self, frame):
+        """Reports that all images of `frame` are written. Blocks while the queue is full."""
+        self._put(frame)
+
+    def finish(self):
+        """
+        Waits for the queued frames and closes the video.
+
+        Returns:
+            int: Frames encoded
+
+        Raises:
+            RuntimeError: If reading, packing or encoding failed
+        """
+        if self.is_alive():
+            self._put(None)
+            self.join()
+        if self.error is not None:
+            raise RuntimeError(f"Streaming encode failed: {self.error}") from self.error
+
+        expected = self.frame_end - self.frame_start + 1
+        if self.encoded < expected:
+            logger.warning("Streamed %d of %d frames to %s", self.encoded, expected, self.output_path)
+        return self.encoded
+
+    def run(self):
+        next_frame = self.frame_start
+        # Frames can be reported out of order by parallel renders
+        pending = set()
+        try:
+            while next_frame <= self.frame_end:
+                frame = self.queue.get()
+                if frame is None:
+                    break
+                if frame >= next_frame:
+                    pending.add(frame)
+                while next_frame in pending:
+                    pending.discard(next_frame)
+                    self._encode(next_frame)
+                    next_frame += 1
+        except Exception as e:
+            logger.exception("Streaming encode failed at frame %d", next_frame)
+            self.error = e
+        finally:
+            if self._encoder is not None:
+                try:
+                    self._encoder.close()
+                except RuntimeError as e:
+                    self.error = self.error or e
+            # Unblock a producer waiting on a full queue
+            while not self.queue.empty():
+                self.queue.get_nowait()
+
+    def _encode(self, frame):
+        images = [read_image(path, channels=3) for path in self.frame_inputs(frame)]
+        height, width = images[0].shape[:2]
+        for image in images[1:]:
+            if image.shape[:2] != (height, width):
+                raise ValueError(f"Frame {frame}: images differ in size")
+
+        rows = height * 2 if self.layout == 'TB' else height
+        cols = width * 2 if self.layout == 'SBS' else width
+        if self._frame is None:
+            # Packed frame buffer reused for every frame
+            self._frame = np.empty((rows, cols, 3), dtype=np.uint8)
+            self._encoder = FrameEncoder(self.output_path, cols, rows, self.fps, self.quality)
+        elif self._frame.shape[:2] != (rows, cols):
+            raise ValueError(f"Frame {frame} is {width}x{height}, unlike the first frame")
+
+        for index, image in enumerate(images):
+            if self.layout == 'SBS':
+                target = self._frame[:, index * width:(index + 1) * width]
+            elif self.layout == 'TB':
+                target = self._frame[index * height:(index + 1) * height]
+            else:
+                target = self._frame
+            linear_to_srgb8(image, target)
+
+        self._encoder.write(self._frame)
+        self.encoded += 1
+
+
+def remove_frames(frame_inputs, frame_start, frame_end):
+    """Deletes the images of frame_start..frame_end (frame -> paths), missing ones are skipped."""
+    for frame in range(frame_start, frame_end + 1):
+        for path in frame_inputs(frame):
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+
+class FrameWatcher(threading.Thread):
+    """
+    Polls for frames rendered by other processes and reports them in order.
+
+    A frame counts as finished once all its images exist and none has been
+    modified for WATCH_SETTLE_SECONDS. The images of the watched range are
+    deleted when the watcher starts, so files of an earlier run are never
+    taken for new frames or read while a worker overwrites them. Frames
+    hard-linked from the render cache keep the stored file's old mtime; they
+    appear complete (linked under a temporary name, then renamed) and are
+    reported as soon as they exist.
+    """
+
+    def __init__(self, assembler):
+        super().__init__(name="pe-stream-watcher", daemon=True)
+        self.assembler = assembler
+        self._renders_done = threading.Event()
+
+    def __enter__(self):
+        remove_frames(self.assembler.frame_inputs, self.assembler.frame_start, self.assembler.frame_end)
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def stop(self):
+        """Call once the renders are done; returns after the last frames are reported."""
+        self._renders_done.set()
+        self.join()
+
+    def _settled(self, frame):
+        now = time.time()
+        try:
+            return all(
+                now - os.path.getmtime(path) >= WATCH_SETTLE_SECONDS
+                for path in self.assembler.frame_inputs(frame)
+            )
+        except OSError:
+            return False
+
+    def run(self):
+        frame = self.assembler.frame_start
+        try:
+            while frame <= self.assembler.frame_end:
+                if self._settled(frame):
+                    self.assembler.frame_ready(frame)
+                    frame += 1
+                elif self._renders_done.is_set():
+                    # Give files written just before the renders ended time to settle
+                    time.sleep(WATCH_SETTLE_SECONDS)
+                    if not self._settled(frame):
+                        logger.warning("Frame %d was never rendered, stream stops there", frame)
+                        break
+                else:
+                    self._renders_done.wait(WATCH_POLL_SECONDS)
+        except RuntimeError:
+            # The assembler failed; finish() reports it
+            pass
@@ -0,0 +1,248 @@
+"""
+Background Blender worker processes.
+
+Band-tiled rendering: a frame is split into horizontal bands with the
+render border. Each band renders in its own `blender --background` process
+(render_worker.py) on a saved copy of the scene, and the bands are stitched
+back into one image with NumPy. Per-process memory is bounded by the band
+size, and several bands of the same frame render at once.
+
+Frame-chunk rendering: workers run the CLI's render step (cli.py) on a
+frame chunk, optionally pinned to their own CPU set (utils/affinity.py).
+"""
+
+import logging
+import os
+import subprocess
+import tempfile
+from pathlib import Path
+
+import bpy
+import numpy as np
+
+from .affinity import popen_pinned
+from .blender import gpu_compute_device_type
+from .image_io import read_image, write_image
+
+logger = logging.getLogger(__name__)
+
+WORKER_SCRIPT = Path(__file__).with_name("render_worker.py")
+CLI_SCRIPT = Path(__file__).resolve().parent.parent / "cli.py"
+
+# Fraction of a pixel added to border edges so Blender's truncation of
+# border * height lands on the intended row
+BORDER_PIXEL_OFFSET = 0.25
+
+# Lines of worker output kept for error messages
+ERROR_TAIL_LINES = 20
+
+
+def band_borders(height, bands):
+    """
+    Splits an image height into horizontal bands, top to bottom.
+
+    Args:
+        height (int): Image height in pixels
+        bands (int): Number of bands
+
+    Returns:
+        list: Dicts with 'top' (first row, 0 = image top), 'rows', and the
+            'min_y'/'max_y' render border (0 = image bottom) selecting them
+    """
+    bands = max(1, min(int(bands), height))
+    edges = np.linspace(0, height, bands + 1).round().astype(int)
+
+    borders = []
+    for top, bottom in zip(edges[:-1], edges[1:]):
+        # Border y runs bottom-up; rows top-down
+        min_row, max_row = height - bottom, height - top
+        borders.append({
+            'top': int(top),
+            'rows': int(bottom - top),
+            'min_y': 0.0 if min_row == 0 else (min_row + BORDER_PIXEL_OFFSET) / height,
+            'max_y': 1.0 if max_row == height else (max_row + BORDER_PIXEL_OFFSET) / height,
+        })
+    return borders
+
+
+def worker_command(blend_path, scene_name, frame, border, output, threads=0, device_type=None):
+    """Builds the command line of one band worker; `device_type` re-enables the GPU it renders on."""
+    command = [
+        bpy.app.binary_path,
+        "--background",
+        "--factory-startup",
+        str(blend_path),
+        "--python-exit-code", "1",
+        "--python", str(WORKER_SCRIPT),
+        "--",
+        "--scene", scene_name,
+        "--frame", str(frame),
+        "--min-y", repr(border['min_y']),
+        "--max-y", repr(border['max_y']),
+        "--output", str(output),
+        "--threads", str(threads),
+    ]
+    if device_type:
+        command += ["--device-type", device_type]
+    return command
+
+
+def frame_chunks(start, end, count):
+    """Splits start..end (inclusive) into at most `count` contiguous (start, end) chunks."""
+    total = end - start + 1
+    count = max(1, min(count, total))
+    size, extra = divmod(total, count)
+    chunks = []
+    for index in range(count):
+        chunk_end = start + size + (1 if index < extra else 0) - 1
+        chunks.append((start, chunk_end))
+        start = chunk_end + 1
+    return chunks
+
+
+def cli_worker_command(blend_path, rig, scene_name, frames, threads, extra=(), device_type=None):
+    """
+    Builds the command of a worker running the CLI's render step on a frame chunk.
+
+    Args:
+        blend_path (str): Saved .blend the worker loads
+        rig (str): CLI rig name ('vr180', ...)
+        scene_name (str): Scene holding the rig
+        frames (tuple): (start, end) chunk
+        threads (int): Render threads, 0 for Blender's automatic count
+        extra (list): Further CLI arguments (e.g. ['--eye', 'left'])
+        device_type (str, optional): Cycles compute device type to enable in
+            the worker (utils.blender.gpu_compute_device_type()); its
+            --factory-startup would otherwise render GPU scenes on the CPU
+    """
+    command = [
+        bpy.app.binary_path,
+        "--background",
+        "--factory-startup",
+        str(blend_path),
+        "--python-exit-code", "1",
+        "--python", str(CLI_SCRIPT),
+        "--",
+        rig, "render",
+        "--scene", scene_name,
+        "--frames", f"{frames[0]}-{frames[1]}",
+        "--threads", str(threads),
+        "--worker",
+        *extra,
+    ]
+    if device_type:
+        command += ["--device-type", device_type]
+    return command
+
+
+def run_workers(commands, max_workers, cpu_sets=None):
+    """
+    Runs commands as subprocesses, at most `max_workers` at a time.
+
+    Output goes to a temporary file per worker rather than a pipe: a pipe is
+    only drained when its worker is waited for, and a full pipe would stall
+    every other worker that prints render progress meanwhile.
+
+    Args:
+        commands (list): Command lines
+        max_workers (int): Workers running at once
+        cpu_sets (list, optional): CPU ids to pin each command to, same order
+            as `commands` (utils.affinity.partition_cpus())
+
+    Raises:
+        RuntimeError: If any worker exits with a non-zero code; the message
+            carries the tail of its output
+    """
+    pending = list(enumerate(commands))
+    running = []
+    failures = []
+
+    while pending or running:
+        while pending and len(running) < max_workers:
+            index, command = pending.pop(0)
+            log = tempfile.TemporaryFile(mode='w+', encoding='utf-8', errors='replace')
+            process = popen_pinned(
+                command, cpu_sets[index] if cpu_sets else None,
+                stdout=log, stderr=subprocess.STDOUT, text=True,
+            )
+            running.append((process, log))
+
+        # Wait for the oldest worker; bands of a frame and frame chunks take similar time
+        process, log = running.pop(0)
+        with log:
+            process.wait()
+            if process.returncode != 0:
+                log.seek(0)
+                tail = "\n".join(log.read().splitlines()[-ERROR_TAIL_LINES:])
+                failures.append(f"exit code {process.returncode}:\n{tail}")
+
+    if failures:
+        raise RuntimeError(f"{len(failures)} render worker(s) failed, first: {failures[0]}")
+
+
+def stitch_bands(band_paths, borders, width, height, output_path, bit_depth='32', exr_codec='ZIP'):
+    """
+    Stitches band images into one frame.
+
+    The frame is preallocated once and each band is copied into its rows,
+    so peak memory is one frame plus one band.
+
+    Raises:
+        ValueError: If a band's size does not match its border
+    """
+    frame = None
+    for path, border in zip(band_paths, borders):
+        band = read_image(path)
+        if band.shape[:2] != (border['rows'], width):
+            raise ValueError(
+                f"Band {path} is {band.shape[1]}x{band.shape[0]}, expected {width}x{border['rows']}"
+            )
+        if frame is None:
+            frame = np.empty((height, width, band.shape[2]), dtype=np.float32)
+        frame[border['top']:border['top'] + border['rows']] = band
+
+    write_image(output_path, frame, bit_depth=bit_depth, exr_codec=exr_codec)
+
+
+def render_frame_bands(blend_path, scene, frame, bands, workers, output_path, band_dir):
+    """
+    Renders one frame as bands in parallel worker processes and stitches it.
+
+    Args:
+        blend_path (str): Saved .blend holding the configured scene
+        scene (bpy.types.Scene): The scene (for name, resolution and output settings)
+        frame (int): Frame number
+        bands (int): Number of horizontal bands
+        workers (int): Worker processes running at once
+        output_path (str): Stitched EXR path
+        band_dir (str): Folder for the temporary band files
+    """
+    render = scene.render
+    scale = render.resolution_percentage / 100
+    width = int(render.resolution_x * scale)
+    height = int(render.resolution_y * scale)
+    borders = band_borders(height, bands)
+
+    # Split the machine's threads between the workers running at once
+    threads = max(1, (os.cpu_count() or 1) // max(1, workers))
+
+    outputs = [Path(band_dir) / f"frame_{frame:05d}_band_{i:02d}" for i in range(len(borders))]
+    device_type = gpu_compute_device_type(scene)
+    commands = [
+        worker_command(blend_path, scene.name, frame, border, output, threads, device_type)
+        for border, output in zip(borders, outputs)
+    ]
+    logger.info("Rendering frame %d as %d bands with %d workers", frame, len(borders), workers)
+    run_workers(commands, workers)
+
+    band_paths = [f"{output}{render.file_extension}" for output in outputs]
+    try:
+        stitch_bands(
+            band_paths, borders, width, height, output_path,
+            bit_depth=render.image_settings.color_depth,
+            exr_codec=render.image_settings.exr_codec,
+        )
+    finally:
+        for path in band_paths:
+            if os.path.exists(path):
+                os.remove(path)